@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Temps de démarrage des trois applications (gestionnaire de projet, post-its, mots de passe)
+
+Chaque mesure s'exécute dans un nouvel interpréteur, depuis un dossier temporaire
+(aucune donnée réelle n'est lue ni écrite) :
+- import : chargement du module de l'application et de ses dépendances ;
+- première image : de l'import jusqu'à l'affichage de la fenêtre principale.
+
+La première image demande un affichage (DISPLAY sous Linux) ; sans affichage, seul
+le temps d'import est mesuré.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# nom -> (script, classe de l'application, attribut de la fenêtre principale ou None)
+APPS = {
+    "gestion_projet": ("gestion_projet_files/main.py", "App", None),
+    "post_it": ("post_it/post_it.py", "PostItApp", "root"),
+    "password_manager": ("password_manager/Password manager.py", "PasswordManager", "root"),
+}
+
+# Temps maximal d'attente de l'affichage de la fenêtre (s)
+FIRST_FRAME_TIMEOUT = 30
+
+
+def has_display():
+    """Indique si une fenêtre Tk peut être ouverte"""
+    return sys.platform in ("win32", "darwin") or bool(os.environ.get("DISPLAY"))
+
+
+def measure(name, first_frame):
+    """Mesure un démarrage dans le processus courant ; retourne les durées en secondes"""
+    script, class_name, window_attribute = APPS[name]
+    path = os.path.join(ROOT, script)
+    sys.path.insert(0, os.path.dirname(path))
+
+    start = time.perf_counter()
+    spec = importlib.util.spec_from_file_location(f"startup_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    result = {"import": time.perf_counter() - start}
+    if not first_frame:
+        return result
+
+    app = getattr(module, class_name)()
+    window = getattr(app, window_attribute) if window_attribute else app
+    deadline = time.perf_counter() + FIRST_FRAME_TIMEOUT
+    while not window.winfo_viewable():
+        window.update()
+        if time.perf_counter() > deadline:
+            raise TimeoutError(f"{name} : fenêtre non affichée après {FIRST_FRAME_TIMEOUT} s")
+    result["first_frame"] = time.perf_counter() - start
+
+    if hasattr(app, "default_admin_thread"):
+        app.default_admin_thread.join()
+    window.destroy()
+    return result
+
+
+def run_child(name, first_frame):
+    """Lance une mesure dans un nouvel interpréteur, depuis un dossier vide"""
+    with tempfile.TemporaryDirectory() as directory:
+        command = [sys.executable, os.path.abspath(__file__), "--child", name]
+        if not first_frame:
+            command.append("--import-only")
+        output = subprocess.run(command, cwd=directory, capture_output=True, text=True)
+    if output.returncode != 0:
+        raise RuntimeError(output.stderr.strip().splitlines()[-1] if output.stderr.strip() else "échec")
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Temps d'import et de première image des applications")
+    parser.add_argument("apps", nargs="*", metavar="app", help=f"Applications à mesurer parmi {', '.join(APPS)} (défaut: toutes)")
+    parser.add_argument("--runs", type=int, default=5, help="Démarrages mesurés par application")
+    parser.add_argument("--import-only", action="store_true", help="Ne mesurer que le temps d'import")
+    parser.add_argument("--child", choices=list(APPS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child, not args.import_only)))
+        return 0
+
+    unknown = [name for name in args.apps if name not in APPS]
+    if unknown:
+        parser.error(f"application inconnue : {', '.join(unknown)}")
+
+    first_frame = not args.import_only and has_display()
+    if not args.import_only and not first_frame:
+        print("⚠️ Aucun affichage disponible : seul le temps d'import est mesuré")
+
+    for name in args.apps or list(APPS):
+        try:
+            runs = [run_child(name, first_frame) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"❌ {name} : {e}")
+            continue
+        line = f"✅ {name:<17} import {statistics.median(r['import'] for r in runs) * 1000:7.1f} ms"
+        if first_frame:
+            line += f"   première image {statistics.median(r['first_frame'] for r in runs) * 1000:7.1f} ms"
+        print(line + f"   (médiane de {args.runs})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
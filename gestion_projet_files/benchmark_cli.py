@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Débit de l'outil en ligne de commande (project_cli.py), en projets par seconde
+
+Des projets de test (arbre, tâches liées et dépendantes, journal, blocs) sont
+écrits dans un dossier temporaire, puis chaque commande les traite dans le
+processus courant et avec un pool de processus.
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from project_cli import expand_paths, run
+from project_core import LogEntry, Project, ProjectBlock, Task, TreeNode, save_project_file
+
+COMMANDS = ("validate", "convert", "export", "report")
+
+
+def build_project(index, node_count, task_count, entry_count):
+    """Projet de test : arbre à deux niveaux, tâches liées aux noeuds, journal et blocs"""
+    root = TreeNode(f"Projet {index}", 400, 200)
+    nodes = [root]
+    for i in range(1, node_count):
+        node = TreeNode(f"Noeud {i}", i % 40 * 120, i // 40 * 80)
+        root.add_child(node)
+        nodes.append(node)
+    tasks = []
+    for i in range(task_count):
+        task = Task(title=f"Tâche {i}", description="Description de la tâche " * 4,
+                    status=("À faire", "En cours", "Terminé")[i % 3], due_date=f"{i % 28 + 1:02d}/06/2025",
+                    linked_node=nodes[i % node_count])
+        task.dependencies = tasks[-2:]
+        tasks.append(task)
+    entries = [LogEntry(title=f"Décision {i}", description="Détail de la décision " * 4, author="Équipe")
+               for i in range(entry_count)]
+    blocks = [ProjectBlock(name=f"Bloc {i}", category="Process") for i in range(5)]
+    charter = {'objective': "Livrer le projet " * 10, 'risks': "Retards fournisseurs\n" * 5}
+    return Project(f"projet{index}", charter, nodes, None, tasks, entries, [], blocks)
+
+
+def measure(command, items, options, jobs):
+    start = time.perf_counter()
+    results = run(command, items, options, jobs)
+    elapsed = time.perf_counter() - start
+    assert all(result.ok for result in results), [result for result in results if not result.ok][:1]
+    return len(items) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Débit de project_cli.py (projets par seconde)")
+    parser.add_argument("--projects", type=int, default=200, help="Projets générés")
+    parser.add_argument("--nodes", type=int, default=200, help="Noeuds par projet")
+    parser.add_argument("--tasks", type=int, default=400, help="Tâches par projet")
+    parser.add_argument("--entries", type=int, default=200, help="Entrées du journal par projet")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Processus du pool")
+    parser.add_argument("--commands", nargs="+", choices=COMMANDS, default=list(COMMANDS), help="Commandes mesurées")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        projects_dir = os.path.join(directory, "projets")
+        os.makedirs(projects_dir)
+        for index in range(args.projects):
+            project = build_project(index, args.nodes, args.tasks, args.entries)
+            save_project_file(project, os.path.join(projects_dir, f"projet{index}.prjt"))
+        size = sum(os.path.getsize(path) for path, _ in expand_paths([projects_dir])) / args.projects
+        print(f"📦 {args.projects} projets générés ({size / 1024:.0f} Kio chacun)")
+
+        items = list(expand_paths([projects_dir]))
+        options = {'output_dir': os.path.join(directory, "sortie"), 'indent': 2,
+                   'formats': ["charter-md", "log-md"], 'reports': ["documents", "usage"]}
+        for command in args.commands:
+            sequential = measure(command, items, options, 1)
+            parallel = measure(command, items, options, args.jobs)
+            print(f"⏱️ {command:9} : {sequential:6.0f} projets/s (1 processus), "
+                  f"{parallel:6.0f} projets/s ({args.jobs} processus, x{parallel / sequential:.1f})")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Mémoire de l'historique annuler / rétablir, par étape
+
+Un projet de test (arbre, tâches, journal) reçoit une suite de modifications
+courantes : renommage et déplacement de noeuds, changement de statut, ajout et
+suppression de noeuds et d'entrées du journal. La mémoire retenue par l'historique
+(tracemalloc, y compris les objets créés par les modifications) est comparée à
+celle d'un historique par copies complètes du projet (copy.deepcopy à chaque
+étape), mesurée sur quelques étapes.
+"""
+
+import argparse
+import copy
+import random
+import tracemalloc
+
+from project_core import LogEntry, Task, TreeNode
+from undo_stack import DEFAULT_MAX_BYTES, UndoStack
+
+# Étapes de l'historique par copies complètes (coûteuses) mesurées pour l'estimation
+SNAPSHOT_STEPS = 20
+
+
+def build_project(node_count, task_count, entry_count):
+    """Projet de test : arbre à deux niveaux, tâches liées aux noeuds, journal"""
+    root = TreeNode("Racine", 400, 200)
+    nodes = [root]
+    for i in range(1, node_count):
+        node = TreeNode(f"Noeud {i}", i % 40 * 120, i // 40 * 80)
+        root.add_child(node)
+        nodes.append(node)
+    tasks = [Task(title=f"Tâche {i}", description="Description de la tâche " * 4,
+                  linked_node=nodes[i % node_count]) for i in range(task_count)]
+    entries = [LogEntry(title=f"Décision {i}", description="Détail de la décision " * 4) for i in range(entry_count)]
+    return {"tree": nodes, "tasks": tasks, "log": entries}
+
+
+def edit(stack, project, rng, step):
+    """Une modification annulable choisie au hasard"""
+    nodes, tasks, entries = project["tree"], project["tasks"], project["log"]
+    kind = step % 5
+    if kind == 0:
+        with stack.transaction("Renommer le noeud", "tree") as t:
+            t.set(rng.choice(nodes), text=f"Noeud renommé {step}")
+    elif kind == 1:
+        node = rng.choice(nodes)
+        x, y = node.x, node.y
+        node.x += 10
+        node.y += 5
+        with stack.transaction("Déplacer le noeud", "tree") as t:
+            t.changed(node, x=x, y=y)
+    elif kind == 2:
+        with stack.transaction("Changer le statut", "tasks") as t:
+            t.set(rng.choice(tasks), status=rng.choice(["À faire", "En cours", "Terminé"]))
+    elif kind == 3:
+        parent = nodes[0]
+        node = TreeNode(f"Nouveau {step}", parent.x + 100, parent.y + 80, parent=parent)
+        with stack.transaction("Ajouter un enfant", "tree") as t:
+            t.append(parent.children, node)
+            t.append(nodes, node)
+    else:
+        with stack.transaction("Supprimer l'entrée", "log") as t:
+            t.remove(entries, rng.choice(entries))
+            t.append(entries, LogEntry(title=f"Décision {step}", description="Détail de la décision " * 4))
+
+
+def measure_undo_stack(project, steps, max_bytes):
+    rng = random.Random(1)
+    stack = UndoStack(max_bytes=max_bytes, max_steps=steps)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for step in range(steps):
+        edit(stack, project, rng, step)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    # Vérification : tout annuler puis tout rétablir
+    while stack.undo():
+        pass
+    while stack.redo():
+        pass
+    return stack, used
+
+
+def measure_snapshots(project, steps):
+    rng = random.Random(1)
+    stack = UndoStack()
+    snapshots = []
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for step in range(steps):
+        snapshots.append(copy.deepcopy(project))
+        edit(stack, project, rng, step)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mémoire par étape de l'historique annuler / rétablir")
+    parser.add_argument("--steps", type=int, default=5000, help="Modifications enregistrées")
+    parser.add_argument("--nodes", type=int, default=500, help="Noeuds de l'arbre")
+    parser.add_argument("--tasks", type=int, default=1000, help="Tâches")
+    parser.add_argument("--entries", type=int, default=500, help="Entrées du journal")
+    parser.add_argument("--max-bytes", type=int, default=DEFAULT_MAX_BYTES, help="Budget mémoire de l'historique")
+    args = parser.parse_args()
+
+    project = build_project(args.nodes, args.tasks, args.entries)
+    stack, used = measure_undo_stack(project, args.steps, args.max_bytes)
+    kept = len(stack)
+    print(f"📜 Historique : {kept} étapes conservées sur {args.steps} "
+          f"(estimation {stack.bytes_used / 1024:.0f} Kio, budget {args.max_bytes / 1024:.0f} Kio)")
+    print(f"   mesuré : {used / 1024:.0f} Kio, soit {used / max(kept, 1):.0f} octets par étape")
+
+    snapshot_used = measure_snapshots(build_project(args.nodes, args.tasks, args.entries), SNAPSHOT_STEPS)
+    per_snapshot = snapshot_used / SNAPSHOT_STEPS
+    print(f"📸 Copies complètes : {per_snapshot / 1024:.0f} Kio par étape "
+          f"({per_snapshot * kept / 1024 / 1024:.0f} Mio pour {kept} étapes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""Aperçus des documents : vignettes d'images, de PDF et d'extraits de fichiers texte"""
+
+import hashlib
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Taille maximale des vignettes (pixels) et nombre de threads de génération
+THUMBNAIL_SIZE = (120, 80)
+WORKER_COUNT = 4
+# Extrait des fichiers texte : nombre de lignes, caractères par ligne et octets lus
+TEXT_SNIPPET_LINES = 8
+TEXT_SNIPPET_COLUMNS = 32
+TEXT_SNIPPET_BYTES = 4096
+# Taille des blocs lus pour calculer l'empreinte du contenu
+HASH_CHUNK_SIZE = 1024 * 1024
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".tif", ".tiff"}
+TEXT_EXTENSIONS = {".txt", ".md", ".csv", ".json", ".py", ".js", ".html", ".css", ".xml", ".log"}
+PDF_EXTENSIONS = {".pdf"}
+
+
+def supports(path):
+    """Indique si un aperçu peut être construit pour ce type de fichier"""
+    extension = os.path.splitext(path)[1].lower()
+    return extension in IMAGE_EXTENSIONS or extension in TEXT_EXTENSIONS or extension in PDF_EXTENSIONS
+
+
+def content_hash(path):
+    """Empreinte SHA-256 du contenu d'un fichier"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def render_image(path, size):
+    """Réduit une image à la taille de la vignette"""
+    from PIL import Image, ImageOps
+
+    with Image.open(path) as image:
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(size)
+        return image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+
+
+def render_text(path, size):
+    """Rend les premières lignes d'un fichier texte dans une image"""
+    from PIL import Image, ImageDraw, ImageFont
+
+    with open(path, "rb") as f:
+        text = f.read(TEXT_SNIPPET_BYTES).decode("utf-8", errors="replace")
+    lines = [line.rstrip()[:TEXT_SNIPPET_COLUMNS] for line in text.splitlines()[:TEXT_SNIPPET_LINES]]
+
+    image = Image.new("RGB", size, "#FAFAFA")
+    draw = ImageDraw.Draw(image)
+    line_height = max(8, (size[1] - 4) // TEXT_SNIPPET_LINES)
+    try:
+        font = ImageFont.load_default(size=line_height - 1)
+    except TypeError:
+        # Pillow < 10.1 : police bitmap de taille fixe
+        font = ImageFont.load_default()
+    for i, line in enumerate(lines):
+        draw.text((3, 2 + i * line_height), line, fill="#333333", font=font)
+    draw.rectangle((0, 0, size[0] - 1, size[1] - 1), outline="#BDBDBD")
+    return image
+
+
+def render_pdf(path, size):
+    """Rend la première page d'un PDF (PyMuPDF ou pypdfium2) ; None si aucun n'est installé"""
+    from PIL import Image
+
+    try:
+        import fitz
+    except ImportError:
+        fitz = None
+    if fitz is not None:
+        with fitz.open(path) as document:
+            page = document[0]
+            zoom = min(size[0] / page.rect.width, size[1] / page.rect.height)
+            pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+            return Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+
+    try:
+        import pypdfium2
+    except ImportError:
+        return None
+    document = pypdfium2.PdfDocument(path)
+    try:
+        page = document[0]
+        width, height = page.get_size()
+        image = page.render(scale=min(size[0] / width, size[1] / height)).to_pil()
+        image.thumbnail(size)
+        return image
+    finally:
+        document.close()
+
+
+def build_thumbnail(path, size=THUMBNAIL_SIZE):
+    """Construit la vignette d'un fichier (image PIL), ou None si ce type n'a pas d'aperçu"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in IMAGE_EXTENSIONS:
+        return render_image(path, size)
+    if extension in TEXT_EXTENSIONS:
+        return render_text(path, size)
+    if extension in PDF_EXTENSIONS:
+        return render_pdf(path, size)
+    return None
+
+
+class ThumbnailService:
+    """Génère les vignettes dans un pool de threads, avec un cache sur disque.
+
+    Les vignettes sont enregistrées en PNG dans cache_dir sous une clé formée de
+    l'empreinte du contenu et de la taille demandée : un fichier renommé ou copié
+    réutilise sa vignette, un fichier modifié en obtient une nouvelle. Les résultats
+    sont déposés dans une file lue par l'interface (poll), seul thread à créer des
+    widgets.
+    """
+
+    def __init__(self, cache_dir, size=THUMBNAIL_SIZE, worker_count=WORKER_COUNT):
+        self.cache_dir = cache_dir
+        self.size = tuple(size)
+        self.executor = ThreadPoolExecutor(max_workers=worker_count, thread_name_prefix="thumbnail")
+        self.results = queue.Queue()
+        self.lock = threading.Lock()
+        # (chemin, date de modification, taille) -> empreinte, pour ne pas relire un fichier inchangé
+        self.hashes = {}
+        # chemin en cours de génération -> clés des demandes en attente
+        self.pending = {}
+
+    def cache_path(self, digest):
+        return os.path.join(self.cache_dir, f"{digest}_{self.size[0]}x{self.size[1]}.png")
+
+    def request(self, key, path):
+        """Demande la vignette de path ; (key, image ou None) sera retourné par poll()"""
+        with self.lock:
+            if path in self.pending:
+                self.pending[path].append(key)
+                return
+            self.pending[path] = [key]
+        self.executor.submit(self.load, path).add_done_callback(lambda future: self._deliver(path, future))
+
+    def _deliver(self, path, future):
+        image = None if future.cancelled() or future.exception() else future.result()
+        with self.lock:
+            for key in self.pending.pop(path, []):
+                self.results.put((key, image))
+
+    def poll(self):
+        """Retourne les vignettes prêtes depuis le dernier appel : [(key, image ou None)]"""
+        ready = []
+        while True:
+            try:
+                ready.append(self.results.get_nowait())
+            except queue.Empty:
+                return ready
+
+    def has_pending(self):
+        with self.lock:
+            return bool(self.pending) or not self.results.empty()
+
+    def load(self, path):
+        """Vignette de path depuis le cache, générée et enregistrée si elle en est absente"""
+        from PIL import Image
+
+        stat = os.stat(path)
+        signature = (path, stat.st_mtime_ns, stat.st_size)
+        digest = self.hashes.get(signature)
+        if digest is None:
+            digest = self.hashes[signature] = content_hash(path)
+
+        cached = self.cache_path(digest)
+        if os.path.exists(cached):
+            with Image.open(cached) as image:
+                image.load()
+                return image
+
+        image = build_thumbnail(path, self.size)
+        if image is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Écriture atomique : un autre thread ne lit jamais une vignette incomplète
+            temporary = f"{cached}.{threading.get_ident()}.tmp"
+            image.save(temporary, "PNG")
+            os.replace(temporary, cached)
+        return image
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -7,400 +7,55 @@ import datetime
 import math
 import json
 import shutil
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-import markdown2
-
-class TreeNode:
-    def __init__(self, text="Node", x=0, y=0, parent=None):
-        self.text = text
-        self.x = x
-        self.y = y
-        self.parent = parent
-        self.children = []
-        self.width = 80
-        self.height = 40
-        self.color = "#E3F2FD"
-        self.text_color = "#000000"
-        self.border_color = "#2196F3"
-        self.selected = False
-        self.canvas_id = None
-        self.text_id = None
-        
-    def add_child(self, child):
-        child.parent = self
-        self.children.append(child)
-        
-    def remove_child(self, child):
-        if child in self.children:
-            child.parent = None
-            self.children.remove(child)
-            
-    def get_depth(self):
-        if self.parent is None:
-            return 0
-        return self.parent.get_depth() + 1
-        
-    def get_all_descendants(self):
-        descendants = []
-        for child in self.children:
-            descendants.append(child)
-            descendants.extend(child.get_all_descendants())
-        return descendants
-
-class Task:
-    def __init__(self, title="Nouvelle tâche", description="", status="À faire", priority="Moyenne", assignee="", due_date="", linked_node=None):
-        self.id = id(self)  # ID unique basé sur l'adresse mémoire
-        self.title = title
-        self.description = description
-        self.status = status  # "À faire", "En cours", "Terminé"
-        self.priority = priority  # "Basse", "Moyenne", "Critique"
-        self.assignee = assignee
-        self.due_date = due_date
-        self.linked_node = linked_node  # Lien vers un noeud de l'arbre
-        self.created_date = datetime.datetime.now().strftime('%d/%m/%Y')
-        
-    def to_dict(self):
-        """Convertir la tâche en dictionnaire pour la sauvegarde"""
-        return {
-            'title': self.title,
-            'description': self.description,
-            'status': self.status,
-            'priority': self.priority,
-            'assignee': self.assignee,
-            'due_date': self.due_date,
-            'linked_node_text': self.linked_node.text if self.linked_node else None,
-            'created_date': self.created_date.isoformat() if hasattr(self, 'created_date') and isinstance(self.created_date, datetime.datetime) else datetime.datetime.now().isoformat()
-        }
-    
-    @classmethod
-    def from_dict(cls, data, tree_nodes=None):
-        """Créer une tâche depuis un dictionnaire"""
-        task = cls(
-            title=data.get('title', ''),
-            description=data.get('description', ''),
-            status=data.get('status', 'À faire'),
-            priority=data.get('priority', 'Moyenne'),
-            assignee=data.get('assignee', ''),
-            due_date=data.get('due_date', '')
-        )
-        
-        # Restaurer le lien avec le nœud
-        linked_node_text = data.get('linked_node_text')
-        if linked_node_text and tree_nodes:
-            for node in tree_nodes:
-                if node.text == linked_node_text:
-                    task.linked_node = node
-                    break
-        
-        # Restaurer la date de création
-        if 'created_date' in data:
-            try:
-                task.created_date = datetime.datetime.fromisoformat(data['created_date'])
-            except:
-                task.created_date = datetime.datetime.now()
-        
-        return task
-    
-
-class LogEntry:
-    def __init__(self, entry_type="manual", title="", description="", author="", category="Decision"):
-        self.id = id(self)
-        self.timestamp = datetime.datetime.now()
-        self.entry_type = entry_type  # "auto" (automatique) ou "manual"
-        self.title = title
-        self.description = description
-        self.author = author
-        self.category = category  # "Decision", "Technical", "Meeting", "Node", "Task", "Status"
-        
-    def to_dict(self):
-        """Convertir l'entrée en dictionnaire pour la sauvegarde"""
-        timestamp_iso = self.timestamp.isoformat() if isinstance(self.timestamp, datetime.datetime) else datetime.datetime.now().isoformat()
-        
-        return {
-            'entry_type': self.entry_type,
-            'title': self.title,
-            'description': self.description,
-            'author': self.author,
-            'category': self.category,
-            'timestamp': timestamp_iso
-        }
-    
-    @classmethod
-    def from_dict(cls, data):
-        """Créer une entrée depuis un dictionnaire"""
-        entry = cls(
-            entry_type=data.get('entry_type', 'manual'),
-            title=data.get('title', ''),
-            description=data.get('description', ''),
-            author=data.get('author', ''),
-            category=data.get('category', 'Other')
-        )
-        
-        # Restaurer le timestamp
-        if 'timestamp' in data:
-            try:
-                entry.timestamp = datetime.datetime.fromisoformat(data['timestamp'])
-            except:
-                entry.timestamp = datetime.datetime.now()
-        
-        return entry
-
-class Document:
-    def __init__(self, filename="", file_path="", category="General", version="1.0", linked_node=None, description=""):
-        self.id = id(self)
-        self.filename = filename
-        self.file_path = file_path
-        self.stored_path = ""
-        self.category = category
-        self.version = version
-        self.linked_node = linked_node
-        self.description = description
-        self.tags = []
-        self.upload_date = datetime.datetime.now()
-        self.file_size = os.path.getsize(file_path) if file_path and os.path.exists(file_path) else 0
-        self.file_type = os.path.splitext(filename)[1].lower() if filename else ""
-        
-    def format_file_size(self):
-        """Formater la taille du fichier de manière lisible"""
-        if self.file_size < 1024:
-            return f"{self.file_size} B"
-        elif self.file_size < 1024 * 1024:
-            return f"{self.file_size / 1024:.1f} KB"
-        elif self.file_size < 1024 * 1024 * 1024:
-            return f"{self.file_size / (1024 * 1024):.1f} MB"
-        else:
-            return f"{self.file_size / (1024 * 1024 * 1024):.1f} GB"
-            
-    def get_file_type_icon(self):
-        """Obtenir l'icône selon le type de fichier"""
-        icons = {
-            ".pdf": "📄", ".doc": "📝", ".docx": "📝", ".txt": "📝", ".md": "📝",
-            ".xls": "📊", ".xlsx": "📊", ".csv": "📊",
-            ".ppt": "📽️", ".pptx": "📽️",
-            ".jpg": "🖼️", ".jpeg": "🖼️", ".png": "🖼️", ".gif": "🖼️", ".bmp": "🖼️",
-            ".zip": "📦", ".rar": "📦", ".7z": "📦",
-            ".py": "🐍", ".js": "📜", ".html": "🌐", ".css": "🎨", ".json": "📋"
-        }
-        return icons.get(self.file_type, "📄")
-        
-    def get_category_icon(self):
-        """Obtenir l'icône selon la catégorie"""
-        icons = {
-            "Spécifications": "📋", "Tests": "🧪", "Livrables": "📦",
-            "Documentation": "📚", "Images": "🖼️", "Code": "💻",
-            "Rapports": "📊", "General": "📄"
-        }
-        return icons.get(self.category, "📄")
-    def to_dict(self):
-        """Convertir le document en dictionnaire pour la sauvegarde"""
-        upload_date_iso = self.upload_date.isoformat() if isinstance(self.upload_date, datetime.datetime) else datetime.datetime.now().isoformat()
-        
-        return {
-            'id': getattr(self, 'id', id(self)),
-            'filename': self.filename,
-            'file_path': getattr(self, 'file_path', ''),
-            'stored_path': getattr(self, 'stored_path', ''),
-            'category': self.category,
-            'version': self.version,
-            'description': getattr(self, 'description', ''),
-            'tags': getattr(self, 'tags', []),
-            'upload_date': upload_date_iso,
-            'file_size': getattr(self, 'file_size', 0),
-            'file_type': getattr(self, 'file_type', ''),
-            'linked_node_text': self.linked_node.text if getattr(self, 'linked_node', None) else None
-        }
-    
-    @classmethod
-    def from_dict(cls, data, tree_nodes=None):
-        """Créer un document depuis un dictionnaire"""
-        doc = cls(
-            filename=data.get('filename', ''),
-            file_path=data.get('file_path', ''),
-            category=data.get('category', 'General'),
-            version=data.get('version', '1.0')
-        )
-        
-        # Restaurer les attributs
-        doc.id = data.get('id', id(doc))
-        doc.stored_path = data.get('stored_path', '')
-        doc.description = data.get('description', '')
-        doc.tags = data.get('tags', [])
-        doc.file_size = data.get('file_size', 0)
-        doc.file_type = data.get('file_type', '')
-        
-        # Restaurer la date
-        if 'upload_date' in data:
-            try:
-                doc.upload_date = datetime.datetime.fromisoformat(data['upload_date'])
-            except:
-                doc.upload_date = datetime.datetime.now()
-        
-        # Restaurer le lien avec le nœud
-        linked_node_text = data.get('linked_node_text')
-        if linked_node_text and tree_nodes:
-            for node in tree_nodes:
-                if node.text == linked_node_text:
-                    doc.linked_node = node
-                    break
-        
-        return doc
-
-class ProjectBlock:
-    """Classe pour représenter un bloc de projet réutilisable"""
-    def __init__(self, name="Nouveau Bloc", description="", category="General", domain="", client=""):
-        self.id = id(self)
-        self.name = name
-        self.description = description
-        self.category = category  # "Process", "Testing", "CI/CD", "Hardware", "Software", etc.
-        self.domain = domain  # "Embedded", "Web", "Mobile", "IoT", etc.
-        self.client = client  # Pour les blocs spécifiques client
-        self.created_date = datetime.datetime.now()
-        self.last_used = None
-        self.usage_count = 0
-        self.success_rate = 0.0  # Pourcentage de succès dans les projets
-        self.average_duration = 0  # Durée moyenne en jours
-        self.tags = []
-        
-        # Contenu du bloc
-        self.nodes = []  # Liste des nœuds (sérialisés)
-        self.tasks = []  # Liste des tâches templates
-        self.documents = []  # Documents templates/exemples
-        self.resources = []  # Templates de ressources
-        self.notes = ""  # Notes d'utilisation
-        
-        # Historique d'utilisation
-        self.usage_history = []  # Liste des utilisations avec résultats
-        
-    def to_dict(self):
-        """Convertir le bloc en dictionnaire pour la sauvegarde"""
-        # Gérer last_used
-        last_used_iso = None
-        if hasattr(self, 'last_used') and self.last_used:
-            if isinstance(self.last_used, datetime.datetime):
-                last_used_iso = self.last_used.isoformat()
-            elif isinstance(self.last_used, str):
-                last_used_iso = self.last_used
-        
-        # Gérer created_date
-        created_date_iso = datetime.datetime.now().isoformat()
-        if hasattr(self, 'created_date'):
-            if isinstance(self.created_date, datetime.datetime):
-                created_date_iso = self.created_date.isoformat()
-            elif isinstance(self.created_date, str):
-                created_date_iso = self.created_date
-        
-        return {
-            'name': self.name,
-            'description': self.description,
-            'category': self.category,
-            'domain': getattr(self, 'domain', ''),
-            'client': getattr(self, 'client', ''),
-            'tags': getattr(self, 'tags', []),
-            'nodes': getattr(self, 'nodes', []),
-            'tasks': getattr(self, 'tasks', []),
-            'usage_count': getattr(self, 'usage_count', 0),
-            'success_rate': getattr(self, 'success_rate', 0.0),
-            'average_duration': getattr(self, 'average_duration', 0.0),
-            'last_used': last_used_iso,
-            'created_date': created_date_iso,
-            'notes': getattr(self, 'notes', ''),
-            'usage_history': getattr(self, 'usage_history', [])
-        }
-    
-    @classmethod
-    def from_dict(cls, data):
-        """Créer un bloc depuis un dictionnaire"""
-        block = cls(
-            name=data.get('name', ''),
-            description=data.get('description', ''),
-            category=data.get('category', 'General'),
-            domain=data.get('domain', ''),
-            client=data.get('client', '')
-        )
-        
-        # Restaurer les attributs
-        block.tags = data.get('tags', [])
-        block.nodes = data.get('nodes', [])
-        block.tasks = data.get('tasks', [])
-        block.usage_count = data.get('usage_count', 0)
-        block.success_rate = data.get('success_rate', 0.0)
-        block.average_duration = data.get('average_duration', 0.0)
-        block.notes = data.get('notes', '')
-        block.usage_history = data.get('usage_history', [])
-        
-        # Restaurer les dates
-        if 'last_used' in data and data['last_used']:
-            try:
-                block.last_used = datetime.datetime.fromisoformat(data['last_used'])
-            except:
-                block.last_used = None
-        
-        if 'created_date' in data:
-            try:
-                block.created_date = datetime.datetime.fromisoformat(data['created_date'])
-            except:
-                block.created_date = datetime.datetime.now()
-        
-        return block
-        
-    def add_usage_record(self, project_name, duration_days, success=True, notes=""):
-        """Ajouter un enregistrement d'utilisation"""
-        record = {
-            'project_name': project_name,
-            'date': datetime.datetime.now().isoformat(),
-            'duration_days': duration_days,
-            'success': success,
-            'notes': notes
-        }
-        self.usage_history.append(record)
-        self.usage_count += 1
-        self.last_used = datetime.datetime.now()
-        
-        # Recalculer les statistiques
-        self.calculate_statistics()
-        
-    def calculate_statistics(self):
-        """Recalculer les statistiques basées sur l'historique"""
-        if not self.usage_history:
-            return
-            
-        # Taux de succès
-        successful_uses = sum(1 for record in self.usage_history if record.get('success', True))
-        self.success_rate = (successful_uses / len(self.usage_history)) * 100
-        
-        # Durée moyenne
-        durations = [record.get('duration_days', 0) for record in self.usage_history if record.get('duration_days', 0) > 0]
-        if durations:
-            self.average_duration = sum(durations) / len(durations)
-            
-    def get_category_icon(self):
-        """Obtenir l'icône selon la catégorie"""
-        icons = {
-            "Process": "⚙️", "Testing": "🧪", "CI/CD": "🔄", "Hardware": "🔌",
-            "Software": "💻", "Integration": "🔗", "Validation": "✅", "Documentation": "📚",
-            "Planning": "📅", "Quality": "🎯", "Security": "🔒", "General": "📦"
-        }
-        return icons.get(self.category, "📦")
-
-class BlockUsageRecord:
-    """Enregistrement d'utilisation d'un bloc"""
-    def __init__(self, block_id, project_name, start_date, end_date=None, success=True, notes="", lessons_learned=""):
-        self.block_id = block_id
-        self.project_name = project_name
-        self.start_date = start_date
-        self.end_date = end_date
-        self.success = success
-        self.notes = notes
-        self.lessons_learned = lessons_learned
-        self.duration_days = 0
-        
-        if end_date and start_date:
-            self.duration_days = (end_date - start_date).days
-
-
+import document_preview
+from model_dates import format_date, parse_date, parse_datetime, parse_relative_date, parse_task_date
+from model_events import EventBus, NODE_CREATED, NODE_DELETED, NODE_EVENTS, NODE_RENAMED
+from project_core import (Document, LogEntry, Project, ProjectBlock, ProjectFormatError, Task, TreeNode,
+                          charter_markdown, decision_log_markdown, document_report, project_from_data,
+                          read_project_data, save_project_file, stored_name, usage_report, write_charter_pdf)
+from reminder_scheduler import ReminderScheduler
+from task_repository import TaskRepository
+from task_schedule import TaskSchedule
+from task_tree_sync import TaskTreeSync
+from tree_rollup import TreeRollup
+from timeline_view import TimelineView, ZOOM_STEP
+from undo_stack import UndoStack
+from view_manager import ViewManager
+from workspace_catalog import CatalogIndexer, WorkspaceCatalog, default_catalog_path
+
+# Vignettes des documents : dossier du cache (dans le stockage des documents),
+# délai avant de charger les cartes visibles et intervalle de lecture des résultats (ms)
+THUMBNAIL_CACHE_DIR = ".thumbnails"
+THUMBNAIL_CHECK_MS = 100
+THUMBNAIL_POLL_MS = 50
+
+# Corbeille des documents supprimés (dans le stockage des documents), vidée quand
+# la suppression ne peut plus être annulée
+DOCUMENT_TRASH_DIR = ".trash"
+
+# Catalogue des projets de l'espace de travail : intervalle de lecture de l'indexation (ms)
+# et projets listés au plus (base SQLite dans le dossier de données de l'utilisateur)
+CATALOG_POLL_MS = 200
+CATALOG_MAX_ROWS = 200
+
+# Tris de la liste des projets du catalogue
+CATALOG_ORDERS = {
+    "Nom": "name",
+    "Date de sauvegarde": "date",
+    "Nombre de tâches": "tasks",
+    "Avancement": "progress",
+}
+
+# Titre affiché pour chaque module de la barre latérale
+VIEW_TITLES = {
+    "home": "Accueil",
+    "charter": "🗂 Cadrage Projet",
+    "tree": "🌳 Diagramme en Arbre",
+    "tasks": "✅ Module de Suivi des Tâches",
+    "log": "💬 Journal de Bord / Carnet de Décisions",
+    "documents": "📁 Gestionnaire de Documents",
+    "blocks": "📦 Bibliothèque de Blocs Réutilisables",
+}
 
 class App(ctk.CTk):
     def __init__(self):
@@ -415,6 +70,46 @@ class App(ctk.CTk):
         ctk.set_appearance_mode("dark")  # "light" ou "dark"
         ctk.set_default_color_theme("blue")  # "blue", "green", "dark-blue"
         
+        # Ordonnancement des tâches (dépendances, chemin critique), resynchronisé après
+        # un chargement, un import ou une annulation (voir get_task_schedule)
+        self.task_schedule = TaskSchedule()
+        self.task_schedule_stale = True
+        
+        # Tâches du projet, indexées par statut, priorité, responsable et échéance
+        self.tasks = TaskRepository()
+        
+        # Rappels d'échéance : un seul minuteur, armé pour la prochaine échéance
+        self.reminders = ReminderScheduler(self.tasks, self.on_tasks_due, self.after, self.after_cancel)
+        
+        # Totaux des sous-arbres du diagramme (avancement, tâches critiques, documents)
+        self.tree_rollup = TreeRollup(on_change=self.on_rollup_change)
+        self.tasks.on_change = self.on_task_change
+        
+        # Historique annuler / rétablir (Ctrl+Z, Ctrl+Y)
+        self.undo_stack = UndoStack(on_change=self.on_undo_change)
+        
+        # Événements du modèle (noeuds, liens des tâches) et synchronisation tâches / arbre
+        self.events = EventBus()
+        self.tree_sync = TaskTreeSync(self.events, self.tasks, self.undo_stack, Task)
+        self.events.subscribe_batch(self.on_model_events, last=True)
+        self.bind("<Control-z>", self.undo)
+        self.bind("<Control-y>", self.redo)
+        self.bind("<Control-Z>", self.redo)
+        
+        # Vignettes des documents : service créé à la première carte, cartes en attente d'affichage
+        self.thumbnail_service = None
+        self.thumbnail_cards = []
+        self.thumbnail_check_id = None
+        self.thumbnail_polling = False
+        
+        # Catalogue des projets (.prjt) des dossiers de l'espace de travail, indexé en arrière-plan
+        catalog_path = default_catalog_path()
+        self.catalog = WorkspaceCatalog(catalog_path)
+        self.catalog_indexer = CatalogIndexer(catalog_path)
+        self.catalog_polling = False
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>", "<Configure>"):
+            self.bind(sequence, self.schedule_thumbnail_check, add="+")
+        
         # Créer l'interface utilisateur
         self.create_widgets()
         
@@ -434,6 +129,17 @@ class App(ctk.CTk):
         # Barre de statut
         self.create_status_bar()
         
+        # Modules construits à leur premier affichage, puis masqués et réaffichés
+        self.views = ViewManager(self.create_view_frame, self.activate_view)
+        self.views.register("home", self.build_home, self.refresh_catalog_list, depends=("catalog",))
+        self.views.register("charter", self.build_project_charter, depends=("charter",))
+        self.views.register("tree", self.build_tree_diagram, self.redraw_tree_all, depends=("tree", "rollups"))
+        self.views.register("tasks", self.build_task_tracker, self.refresh_task_view, depends=("tasks", "tree"))
+        self.views.register("log", self.build_decision_log, self.refresh_log_view, depends=("log",))
+        self.views.register("documents", self.build_document_manager, self.refresh_document_manager,
+                            depends=("documents", "tree"))
+        self.views.register("blocks", self.build_block_library, self.refresh_block_view, depends=("blocks",))
+        
         # Afficher le contenu par défaut après que tous les widgets soient créés
         self.show_home()
         
@@ -527,6 +233,16 @@ class App(ctk.CTk):
         )
         self.appearance_mode_optionemenu.grid(row=12, column=0, padx=20, pady=(10, 10))
         
+        # Annuler / rétablir
+        undo_frame = ctk.CTkFrame(self.sidebar_frame, fg_color="transparent")
+        undo_frame.grid(row=13, column=0, padx=20, pady=(0, 10))
+        self.undo_button = ctk.CTkButton(undo_frame, text="↶ Annuler", width=88,
+                                         command=self.undo)
+        self.undo_button.pack(side="left", padx=(0, 4))
+        self.redo_button = ctk.CTkButton(undo_frame, text="↷ Rétablir", width=88,
+                                         command=self.redo)
+        self.redo_button.pack(side="left")
+        
     def create_main_frame(self):
         """Créer le frame principal de contenu"""
         self.main_frame = ctk.CTkFrame(self)
@@ -542,10 +258,11 @@ class App(ctk.CTk):
         )
         self.main_title.grid(row=0, column=0, padx=20, pady=10)
         
-        # Zone de contenu principal
-        self.content_frame = ctk.CTkScrollableFrame(self.main_frame)
-        self.content_frame.grid(row=1, column=0, padx=20, pady=(0, 20), sticky="nsew")
-        self.content_frame.grid_columnconfigure(0, weight=1)
+        # Zone de contenu principal : chaque module y a son propre cadre (self.content_frame)
+        self.content_area = ctk.CTkScrollableFrame(self.main_frame)
+        self.content_area.grid(row=1, column=0, padx=20, pady=(0, 20), sticky="nsew")
+        self.content_area.grid_columnconfigure(0, weight=1)
+        self.content_frame = self.content_area
         
     def create_status_bar(self):
         """Créer la barre de statut"""
@@ -559,15 +276,24 @@ class App(ctk.CTk):
         )
         self.status_label.grid(row=0, column=0, padx=10, pady=5, sticky="w")
         
-    def clear_content(self):
-        """Effacer le contenu actuel"""
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
+    def create_view_frame(self):
+        """Créer le cadre d'un module dans la zone de contenu"""
+        frame = ctk.CTkFrame(self.content_area, fg_color="transparent")
+        frame.grid(row=0, column=0, sticky="nsew")
+        frame.grid_columnconfigure(0, weight=1)
+        return frame
+        
+    def activate_view(self, name, frame):
+        """Le module affiché construit ses widgets dans son cadre (self.content_frame)"""
+        self.content_frame = frame
+        self.main_title.configure(text=VIEW_TITLES[name])
             
     def show_home(self):
         """Afficher la page d'accueil"""
-        self.clear_content()
-        self.main_title.configure(text="Accueil")
+        self.views.show("home")
+        
+    def build_home(self):
+        """Construire la page d'accueil (une seule fois, voir ViewManager)"""
         
         # Contenu de la page d'accueil
         welcome_text = ctk.CTkTextbox(self.content_frame, height=200)
@@ -598,12 +324,145 @@ class App(ctk.CTk):
         )
         example_button2.grid(row=0, column=1, padx=10, pady=10)
         
+        self.build_workspace_catalog()
+        
         self.update_status("Page d'accueil affichée")
         
+    def build_workspace_catalog(self):
+        """Section « Espace de travail » de l'accueil : projets du catalogue, recherche et tri"""
+        self.content_frame.grid_columnconfigure(0, weight=1)
+        self.content_frame.grid_rowconfigure(2, weight=1)
+        
+        catalog_frame = ctk.CTkFrame(self.content_frame)
+        catalog_frame.grid(row=2, column=0, padx=20, pady=10, sticky="nsew")
+        catalog_frame.grid_columnconfigure(0, weight=1)
+        catalog_frame.grid_rowconfigure(2, weight=1)
+        
+        ctk.CTkLabel(catalog_frame, text="📚 Espace de travail",
+                    font=ctk.CTkFont(size=16, weight="bold")).grid(row=0, column=0, padx=10, pady=(10, 5), sticky="w")
+        
+        toolbar = ctk.CTkFrame(catalog_frame, fg_color="transparent")
+        toolbar.grid(row=1, column=0, padx=10, pady=5, sticky="ew")
+        toolbar.grid_columnconfigure(2, weight=1)
+        
+        ctk.CTkButton(toolbar, text="➕ Ajouter un dossier", width=150,
+                    command=self.add_catalog_folder).grid(row=0, column=0, padx=(0, 5))
+        ctk.CTkButton(toolbar, text="🔄 Réindexer", width=110,
+                    command=self.start_catalog_indexing).grid(row=0, column=1, padx=5)
+        
+        self.catalog_search_var = tk.StringVar()
+        self.catalog_search_var.trace_add("write", lambda *args: self.refresh_catalog_list())
+        ctk.CTkEntry(toolbar, textvariable=self.catalog_search_var,
+                    placeholder_text="🔍 Rechercher dans tous les projets...").grid(row=0, column=2, padx=5, sticky="ew")
+        
+        self.catalog_order_var = tk.StringVar(value="Nom")
+        ctk.CTkOptionMenu(toolbar, values=list(CATALOG_ORDERS), variable=self.catalog_order_var, width=160,
+                        command=lambda value: self.refresh_catalog_list()).grid(row=0, column=3, padx=5)
+        
+        self.catalog_status_label = ctk.CTkLabel(toolbar, text="", text_color="gray")
+        self.catalog_status_label.grid(row=0, column=4, padx=(5, 0))
+        
+        self.catalog_list = ctk.CTkScrollableFrame(catalog_frame, height=250)
+        self.catalog_list.grid(row=2, column=0, padx=10, pady=(5, 10), sticky="nsew")
+        self.catalog_list.grid_columnconfigure(0, weight=1)
+        
+        self.refresh_catalog_list()
+        self.start_catalog_indexing()
+        
+    def refresh_catalog_list(self):
+        """Afficher les projets du catalogue correspondant à la recherche (sans relire les fichiers)"""
+        for widget in self.catalog_list.winfo_children():
+            widget.destroy()
+        
+        query = self.catalog_search_var.get()
+        order = CATALOG_ORDERS.get(self.catalog_order_var.get(), "name")
+        projects = self.catalog.projects(query, order, limit=CATALOG_MAX_ROWS + 1)
+        
+        if not self.catalog.folders():
+            ctk.CTkLabel(self.catalog_list, text="Ajoutez un dossier contenant vos fichiers .prjt",
+                        text_color="gray").grid(row=0, column=0, pady=20)
+            return
+        if not projects:
+            ctk.CTkLabel(self.catalog_list, text="Aucun projet trouvé",
+                        text_color="gray").grid(row=0, column=0, pady=20)
+            return
+        
+        for row, project in enumerate(projects[:CATALOG_MAX_ROWS]):
+            item = ctk.CTkFrame(self.catalog_list)
+            item.grid(row=row, column=0, padx=5, pady=2, sticky="ew")
+            item.grid_columnconfigure(0, weight=1)
+            
+            ctk.CTkLabel(item, text=project['name'], font=ctk.CTkFont(weight="bold"),
+                        anchor="w").grid(row=0, column=0, padx=10, pady=(5, 0), sticky="w")
+            
+            if project['error']:
+                details = f"⚠️ Fichier illisible : {project['error']}"
+            else:
+                saved = format_date(parse_datetime(project['save_date'])) if project['save_date'] else "?"
+                details = (f"📅 {saved}   🌳 {project['nodes']}   ✅ {project['tasks_done']}/{project['tasks']}   "
+                           f"💬 {project['log_entries']}   📄 {project['documents']}   📦 {project['blocks']}")
+            ctk.CTkLabel(item, text=details, text_color="gray",
+                        anchor="w").grid(row=1, column=0, padx=10, sticky="w")
+            ctk.CTkLabel(item, text=project['path'], text_color="gray", font=ctk.CTkFont(size=10),
+                        anchor="w").grid(row=2, column=0, padx=10, pady=(0, 5), sticky="w")
+            
+            ctk.CTkButton(item, text="Ouvrir", width=80,
+                        command=lambda path=project['path']: self.open_project_file(path)).grid(
+                            row=0, column=1, rowspan=3, padx=10, pady=5)
+        
+        if len(projects) > CATALOG_MAX_ROWS:
+            ctk.CTkLabel(self.catalog_list, text=f"… seuls les {CATALOG_MAX_ROWS} premiers projets sont affichés",
+                        text_color="gray").grid(row=CATALOG_MAX_ROWS, column=0, pady=5)
+            
+    def add_catalog_folder(self):
+        """Ajouter un dossier de projets à l'espace de travail et l'indexer"""
+        folder = filedialog.askdirectory(title="Ajouter un dossier de projets")
+        if not folder:
+            return
+        self.catalog.add_folder(folder)
+        self.refresh_catalog_list()
+        self.start_catalog_indexing()
+        
+    def start_catalog_indexing(self):
+        """Indexer en arrière-plan les projets nouveaux ou modifiés des dossiers de l'espace de travail"""
+        if not self.catalog.folders():
+            return
+        self.catalog_indexer.start()
+        if not self.catalog_polling:
+            self.catalog_polling = True
+            self.poll_catalog_indexing()
+            
+    def poll_catalog_indexing(self):
+        """Afficher la progression de l'indexation ; rafraîchir la liste à la fin"""
+        status = None
+        finished = False
+        for message in self.catalog_indexer.poll():
+            if message[0] == "progress":
+                status = f"Indexation {message[1]}/{message[2]}"
+            elif message[0] == "done":
+                stats = message[1]
+                status = f"{self.catalog.count()} projets ({stats['indexed']} indexés)"
+                finished = True
+            else:
+                status = f"⚠️ {message[1]}"
+                finished = True
+        
+        if status and hasattr(self, 'catalog_status_label') and self.catalog_status_label.winfo_exists():
+            self.catalog_status_label.configure(text=status)
+        if finished:
+            self.views.refresh("catalog")
+        
+        if self.catalog_indexer.running() or not self.catalog_indexer.results.empty():
+            self.after(CATALOG_POLL_MS, self.poll_catalog_indexing)
+        else:
+            self.catalog_polling = False
+        
     def show_project_charter(self):
         """Afficher le module de cadrage / charte de projet"""
-        self.clear_content()
-        self.main_title.configure(text="🗂 Cadrage Projet")
+        self.views.show("charter")
+        
+    def build_project_charter(self):
+        """Construire le module de cadrage / charte de projet (une seule fois, voir ViewManager)"""
         
         # Configurer content_frame pour utiliser tout l'espace disponible
         self.content_frame.grid_rowconfigure(1, weight=1)
@@ -844,52 +703,7 @@ class App(ctk.CTk):
             )
             
             if filename:
-                from reportlab.lib.pagesizes import letter
-                from reportlab.pdfgen import canvas
-                from reportlab.lib.utils import ImageReader
-                
-                c = canvas.Canvas(filename, pagesize=letter)
-                width, height = letter
-                
-                # Titre
-                c.setFont("Helvetica-Bold", 20)
-                c.drawString(50, height - 50, "Charte de Projet")
-                
-                # Date
-                c.setFont("Helvetica", 10)
-                c.drawString(50, height - 70, f"Créé le : {datetime.datetime.now().strftime('%d/%m/%Y à %H:%M')}")
-                
-                y_position = height - 100
-                
-                sections = [
-                    ("Objectif principal", self.charter_data.get('objective', '')),
-                    ("Livrables attendus", self.charter_data.get('deliverables', '')),
-                    ("Parties prenantes", self.charter_data.get('stakeholders', '')),
-                    ("Contraintes", self.charter_data.get('constraints', '')),
-                    ("Hypothèses initiales", self.charter_data.get('assumptions', ''))
-                ]
-                
-                for title, content in sections:
-                    if y_position < 100:  # Nouvelle page si nécessaire
-                        c.showPage()
-                        y_position = height - 50
-                        
-                    c.setFont("Helvetica-Bold", 12)
-                    c.drawString(50, y_position, title)
-                    y_position -= 20
-                    
-                    c.setFont("Helvetica", 10)
-                    lines = content.split('\n')
-                    for line in lines:
-                        if y_position < 100:
-                            c.showPage()
-                            y_position = height - 50
-                        c.drawString(70, y_position, line[:80])  # Limiter la longueur
-                        y_position -= 15
-                    
-                    y_position -= 10
-                
-                c.save()
+                write_charter_pdf(self.charter_data, filename)
                 messagebox.showinfo("Export PDF", f"Charte exportée avec succès :\n{filename}")
                 self.update_status("Charte exportée en PDF")
                 
@@ -910,62 +724,7 @@ class App(ctk.CTk):
             )
             
             if filename:
-                # Créer le contenu Markdown
-                md_content = f"""# 🗂 Charte de Projet
-
-    *Créé le : {datetime.datetime.now().strftime('%d/%m/%Y à %H:%M')}*
-
-    ## 🎯 Objectif principal
-
-    {self.charter_data.get('objective', '')}
-
-    ## 📦 Livrables attendus
-
-    {self.charter_data.get('deliverables', '')}
-
-    ## 👥 Parties prenantes / Intervenants clés
-
-    {self.charter_data.get('stakeholders', '')}
-
-    ## ⚠️ Contraintes
-
-    {self.charter_data.get('constraints', '')}
-
-    ## 💭 Hypothèses initiales
-
-    {self.charter_data.get('assumptions', '')}
-
-    ## ✅ Critères de succès
-
-    {self.charter_data.get('success_criteria', '')}
-
-    ## 💰 Budget estimé
-
-    {self.charter_data.get('budget', '')}
-
-    ## 📅 Échéancier
-
-    {self.charter_data.get('schedule', '')}
-
-    ## ⚡ Risques identifiés
-
-    {self.charter_data.get('risks', '')}
-
-    ## 🔧 Technologies / Outils
-
-    {self.charter_data.get('technology', '')}
-
-    ## 🎯 Mesures de qualité
-
-    {self.charter_data.get('quality', '')}
-
-    ## 📢 Communication
-
-    {self.charter_data.get('communication', '')}
-
-    ---
-    *Document généré automatiquement par l'application de gestion de projet*
-    """
+                md_content = charter_markdown(self.charter_data)
                 
                 with open(filename, 'w', encoding='utf-8') as f:
                     f.write(md_content)
@@ -1084,9 +843,11 @@ Document généré automatiquement par l'application de gestion de projet
         self.update_status("Aperçu de la charte affiché")
         
     def show_tree_diagram(self):
-        """Afficher le module de diagramme en arbre - CORRIGÉ"""
-        self.clear_content()
-        self.main_title.configure(text="🌳 Diagramme en Arbre")
+        """Afficher le module de diagramme en arbre"""
+        self.views.show("tree")
+        
+    def build_tree_diagram(self):
+        """Construire le module de diagramme en arbre (une seule fois, voir ViewManager)"""
         
         # ✅ CORRECTION : Initialiser seulement si nécessaire
         if not hasattr(self, 'tree_nodes'):
@@ -1240,9 +1001,11 @@ Document généré automatiquement par l'application de gestion de projet
     def create_tree_root_node(self):
         """Créer le noeud racine"""
         root_node = TreeNode("Racine", 400, 200)
-        self.tree_nodes.append(root_node)
+        with self.undo_stack.transaction("Créer la racine", "tree") as t:
+            t.append(self.tree_nodes, root_node)
         self.draw_tree_node(root_node)
         self.update_tree_statistics()
+        self.views.invalidate("tree")
 
     def draw_tree_node(self, node):
         """Dessiner un noeud sur le canvas"""
@@ -1283,6 +1046,44 @@ Document généré automatiquement par l'application de gestion de projet
             font=("Arial", 10),
             tags="node_text"
         )
+        
+        self.draw_node_badge(node)
+
+    def draw_node_badge(self, node):
+        """Dessiner les totaux du sous-arbre d'un noeud : barre d'avancement et badge"""
+        for item in getattr(node, 'badge_ids', []):
+            self.tree_canvas.delete(item)
+        node.badge_ids = []
+        
+        rollup = self.tree_rollup.totals_of(node)
+        if not rollup.total and not rollup.documents:
+            return
+        x, y, w, h = node.x, node.y, node.width, node.height
+        
+        # Barre d'avancement le long du bord inférieur du noeud
+        if rollup.total:
+            left, bottom = x - w/2, y + h/2
+            node.badge_ids.append(self.tree_canvas.create_rectangle(
+                left, bottom - 4, left + w * rollup.progress, bottom,
+                fill="#4CAF50", outline="", tags="badge"
+            ))
+        
+        # Badge : tâches terminées / total, tâches critiques, documents
+        parts = []
+        if rollup.total:
+            parts.append(f"✓ {rollup.done}/{rollup.total}")
+        if rollup.critical:
+            parts.append(f"🔥 {rollup.critical}")
+        if rollup.documents:
+            parts.append(f"📄 {rollup.documents}")
+        node.badge_ids.append(self.tree_canvas.create_text(
+            x + w/2, y - h/2 - 2,
+            text="  ".join(parts),
+            anchor="se",
+            fill="#555555",
+            font=("Arial", 8),
+            tags="badge"
+        ))
 
     def draw_tree_connections(self):
         """Dessiner toutes les connexions"""
@@ -1339,6 +1140,8 @@ Document généré automatiquement par l'application de gestion de projet
         if self.tree_mode == "select":
             self.select_node_at(x, y)
             self.drag_data = {"x": x, "y": y, "item": self.selected_tree_node}
+            if self.selected_tree_node:
+                self.drag_data["origin"] = (self.selected_tree_node.x, self.selected_tree_node.y)
         elif self.tree_mode == "add_node":
             self.create_node_at(x, y)
         elif self.tree_mode == "connect":
@@ -1365,6 +1168,11 @@ Document généré automatiquement par l'application de gestion de projet
 
     def on_tree_canvas_release(self, event):
         """Gérer le relâchement"""
+        node = self.drag_data.get("item")
+        if node and "origin" in self.drag_data:
+            x, y = self.drag_data["origin"]
+            with self.undo_stack.transaction("Déplacer le noeud", "tree") as t:
+                t.changed(node, x=x, y=y)
         self.drag_data = {"x": 0, "y": 0, "item": None}
 
     def select_node_at(self, x, y):
@@ -1387,14 +1195,18 @@ Document généré automatiquement par l'application de gestion de projet
             self.selected_tree_node.selected = True
             self.update_properties_panel()
         
+        self.update_tree_statistics()
         self.redraw_tree_all()
 
     def create_node_at(self, x, y):
         """Créer un nouveau noeud"""
         new_node = TreeNode(f"Noeud {len(self.tree_nodes) + 1}", x, y)
-        self.tree_nodes.append(new_node)
+        with self.undo_stack.transaction("Créer un noeud", "tree") as t:
+            t.append(self.tree_nodes, new_node)
+            self.events.publish(NODE_CREATED, new_node)
         self.draw_tree_node(new_node)
         self.update_tree_statistics()
+        self.views.invalidate("tree")
 
     def handle_connection_at(self, x, y):
         """Gérer la création de connexions"""
@@ -1406,7 +1218,10 @@ Document généré automatiquement par l'application de gestion de projet
                 self.update_status("Sélectionnez le noeud de destination")
             else:
                 if self.connection_start != clicked_node:
-                    self.connection_start.add_child(clicked_node)
+                    with self.undo_stack.transaction("Connecter des noeuds", "tree") as t:
+                        t.set(clicked_node, parent=self.connection_start)
+                        t.append(self.connection_start.children, clicked_node)
+                    self.tree_rollup.restructure()
                     self.redraw_tree_all()
                     self.update_status("Connexion créée")
                 self.connection_start = None
@@ -1427,24 +1242,31 @@ Document généré automatiquement par l'application de gestion de projet
 
     def delete_tree_node(self, node):
         """Supprimer un noeud"""
-        # Supprimer des enfants du parent
-        if node.parent:
-            node.parent.remove_child(node)
-        
-        # Déplacer les enfants vers le parent
-        for child in node.children[:]:
-            node.remove_child(child)
-            if node.parent:
-                node.parent.add_child(child)
-        
-        # Supprimer de la liste
-        self.tree_nodes.remove(node)
+        with self.undo_stack.transaction(f"Supprimer le noeud '{node.text}'", "tree") as t:
+            # Supprimer des enfants du parent
+            parent = node.parent
+            if parent:
+                t.remove(parent.children, node)
+                t.set(node, parent=None)
+            
+            # Déplacer les enfants vers le parent
+            for child in node.children[:]:
+                t.remove(node.children, child)
+                t.set(child, parent=parent)
+                if parent:
+                    t.append(parent.children, child)
+            
+            # Supprimer de la liste ; ses tâches sont détachées (TaskTreeSync)
+            t.remove(self.tree_nodes, node)
+            self.events.publish(NODE_DELETED, node)
         
         if self.selected_tree_node == node:
             self.selected_tree_node = None
             
+        self.tree_rollup.restructure()
         self.redraw_tree_all()
         self.update_tree_statistics()
+        self.views.invalidate("tree")
 
     def tree_center_view(self):
         """Centrer la vue sur les noeuds"""
@@ -1472,21 +1294,29 @@ Document généré automatiquement par l'application de gestion de projet
 
     def clear_tree(self):
         """Effacer tout le diagramme"""
-        if messagebox.askyesno("Confirmation", "Effacer tout le diagramme ?\n\nCette action est irréversible !"):
-            self.tree_nodes.clear()
-            self.selected_tree_node = None
-            self.connection_start = None
-            self.tree_canvas.delete("all")
-            self.create_tree_root_node()
+        if messagebox.askyesno("Confirmation", "Effacer tout le diagramme ?\n\nVous pourrez l'annuler avec Ctrl+Z."):
+            with self.undo_stack.transaction("Effacer le diagramme", "tree") as t, self.events.batch():
+                for node in self.tree_nodes:
+                    self.events.publish(NODE_DELETED, node)
+                t.replace(self.tree_nodes, [])
+                self.selected_tree_node = None
+                self.connection_start = None
+                self.tree_canvas.delete("all")
+                self.create_tree_root_node()
+            self.tree_rollup.restructure()
             self.update_status("Diagramme effacé et réinitialisé")
 
     def update_node_text(self, event=None):
         """Mettre à jour le texte du noeud sélectionné"""
         if self.selected_tree_node:
             new_text = self.tree_text_entry.get().strip()
-            if new_text:
-                self.selected_tree_node.text = new_text
+            if new_text and new_text != self.selected_tree_node.text:
+                old_text = self.selected_tree_node.text
+                with self.undo_stack.transaction("Renommer le noeud", "tree") as t:
+                    t.set(self.selected_tree_node, text=new_text)
+                    self.events.publish(NODE_RENAMED, self.selected_tree_node, old_text)
                 self.redraw_tree_all()
+                self.views.invalidate("tree")
 
     def update_properties_panel(self):
         """Mettre à jour le panel de propriétés"""
@@ -1501,11 +1331,14 @@ Document généré automatiquement par l'application de gestion de projet
             return
         
         parent = self.selected_tree_node
-        child = TreeNode("Nouveau", parent.x + 100, parent.y + 80)
-        parent.add_child(child)
-        self.tree_nodes.append(child)
+        child = TreeNode("Nouveau", parent.x + 100, parent.y + 80, parent=parent)
+        with self.undo_stack.transaction("Ajouter un enfant", "tree") as t:
+            t.append(parent.children, child)
+            t.append(self.tree_nodes, child)
+            self.events.publish(NODE_CREATED, child)
         self.redraw_tree_all()
         self.update_tree_statistics()
+        self.views.invalidate("tree")
 
     def delete_selected_node(self):
         """Supprimer le noeud sélectionné"""
@@ -1523,12 +1356,25 @@ Document généré automatiquement par l'application de gestion de projet
     def update_tree_statistics(self):
         """Mettre à jour les statistiques"""
         count = len(self.tree_nodes)
-        self.tree_stats_label.configure(text=f"Noeuds: {count}")
+        stats_text = f"Noeuds: {count}"
+        
+        # Totaux du sous-arbre sélectionné
+        if self.selected_tree_node:
+            rollup = self.tree_rollup.totals_of(self.selected_tree_node)
+            if rollup.total:
+                stats_text += f"\nTâches: {rollup.done}/{rollup.total} ({rollup.progress:.0%})"
+            if rollup.critical:
+                stats_text += f"\n🔥 Critiques: {rollup.critical}"
+            if rollup.documents:
+                stats_text += f"\n📄 Documents: {rollup.documents}"
+        self.tree_stats_label.configure(text=stats_text)
         
     def show_task_tracker(self):
         """Afficher le module de suivi des tâches"""
-        self.clear_content()
-        self.main_title.configure(text="✅ Module de Suivi des Tâches")
+        self.views.show("tasks")
+        
+    def build_task_tracker(self):
+        """Construire le module de suivi des tâches (une seule fois, voir ViewManager)"""
         
         # ✅ CORRECTION : Configuration de l'expansion complète
         self.content_frame.grid_rowconfigure(1, weight=1)  # Ligne principale des tâches
@@ -1536,7 +1382,7 @@ Document généré automatiquement par l'application de gestion de projet
         
         # Initialiser les variables des tâches si nécessaire
         if not hasattr(self, 'tasks'):
-            self.tasks = []
+            self.tasks = TaskRepository()
         if not hasattr(self, 'task_view_mode'):
             self.task_view_mode = "kanban"
         
@@ -1558,6 +1404,8 @@ Document généré automatiquement par l'application de gestion de projet
                     command=self.sync_tasks_with_tree).grid(row=0, column=1, padx=5, pady=5)
         ctk.CTkButton(main_buttons_frame, text="📝 Tâches d'exemple", 
                     command=self.create_sample_tasks).grid(row=0, column=2, padx=5, pady=5)
+        ctk.CTkButton(main_buttons_frame, text="⚡ Chemin critique", 
+                    command=self.show_critical_path).grid(row=0, column=3, padx=5, pady=5)
         
         # Sélecteur de vue
         view_frame = ctk.CTkFrame(toolbar_frame)
@@ -1574,6 +1422,10 @@ Document généré automatiquement par l'application de gestion de projet
                                     command=lambda: self.change_task_view("table"))
         view_table_btn.grid(row=0, column=2, padx=2, pady=5)
         
+        view_timeline_btn = ctk.CTkButton(view_frame, text="📅 Chronologie", width=100, height=25,
+                                    command=lambda: self.change_task_view("timeline"))
+        view_timeline_btn.grid(row=0, column=3, padx=2, pady=5)
+        
         # Statistiques
         stats_frame = ctk.CTkFrame(toolbar_frame)
         stats_frame.grid(row=0, column=2, padx=20, pady=5)
@@ -1689,6 +1541,9 @@ Document généré automatiquement par l'application de gestion de projet
         if self.task_view_mode == "kanban":
             print("   ➡️ Affichage vue Kanban")
             self.show_kanban_view()
+        elif self.task_view_mode == "timeline":
+            print("   ➡️ Affichage vue Chronologie")
+            self.show_timeline_view()
         else:
             print("   ➡️ Affichage vue Tableau")
             self.show_table_view()
@@ -1732,7 +1587,7 @@ Document généré automatiquement par l'application de gestion de projet
             column_scroll.pack(fill="both", expand=True, padx=5, pady=5)
             
             # Tâches dans cette colonne
-            tasks_in_status = [task for task in self.tasks if task.status == status]
+            tasks_in_status = self.tasks.with_value("status", status)
             
             for task in tasks_in_status:
                 self.create_kanban_task_card_enhanced(column_scroll, task, column_width - 30)
@@ -1761,15 +1616,24 @@ Document généré automatiquement par l'application de gestion de projet
             assignee_label.pack(anchor="w", padx=10, pady=2)
             
         # Échéance
-        if task.due_date:
-            due_label = ctk.CTkLabel(card, text=f"📅 {task.due_date}")
+        if task.due_date_label:
+            due_label = ctk.CTkLabel(card, text=f"📅 {task.due_date_label}")
             due_label.pack(anchor="w", padx=10, pady=2)
             
+        # Planning : durée, début au plus tôt et marge (rouge si la tâche est critique)
+        schedule = self.get_task_schedule()
+        schedule_label = ctk.CTkLabel(card, text=self.format_task_schedule(task),
+                                    text_color="#F44336" if schedule.is_critical(task) else "#666666")
+        schedule_label.pack(anchor="w", padx=10, pady=2)
+            
         # Lien avec noeud de l'arbre
         if task.linked_node:
             node_label = ctk.CTkLabel(card, text=f"🌳 {task.linked_node.text}", 
                                     text_color="#2196F3")
             node_label.pack(anchor="w", padx=10, pady=2)
+        elif task.orphaned:
+            orphan_label = ctk.CTkLabel(card, text="⚠️ Noeud supprimé", text_color="#FF9800")
+            orphan_label.pack(anchor="w", padx=10, pady=2)
             
         # Boutons d'action
         buttons_frame = ctk.CTkFrame(card)
@@ -1838,6 +1702,10 @@ Document généré automatiquement par l'application de gestion de projet
         title_text = task.title
         if task.linked_node:
             title_text += f" 🌳"
+        elif task.orphaned:
+            title_text += " ⚠️"
+        if self.get_task_schedule().is_critical(task):
+            title_text += " ⚡"
         title_label = ctk.CTkLabel(row_frame, text=title_text, anchor="w")
         title_label.grid(row=0, column=0, padx=5, pady=5, sticky="ew")  # ✅ sticky="ew"
         
@@ -1859,7 +1727,7 @@ Document généré automatiquement par l'application de gestion de projet
         assignee_label.grid(row=0, column=3, padx=5, pady=5, sticky="ew")  # ✅ sticky="ew"
         
         # ✅ CORRECTION : Échéance avec gestion des dates vides
-        due_text = task.due_date if task.due_date and task.due_date.strip() else "-"
+        due_text = task.due_date_label or "-"
         due_label = ctk.CTkLabel(row_frame, text=due_text)
         due_label.grid(row=0, column=4, padx=5, pady=5, sticky="ew")  # ✅ sticky="ew"
         
@@ -1915,6 +1783,28 @@ Document généré automatiquement par l'application de gestion de projet
         for i, task in enumerate(self.tasks):
             self.create_table_task_row_enhanced(table_scroll, task, i)
 
+    def show_timeline_view(self):
+        """Afficher la vue chronologique (Gantt) : seules les barres visibles sont dessinées"""
+        schedule = self.get_task_schedule()
+        
+        # Zoom de l'axe du temps
+        zoom_frame = ctk.CTkFrame(self.task_content_frame)
+        zoom_frame.grid(row=0, column=0, sticky="ew", padx=10, pady=(10, 0))
+        
+        timeline = TimelineView(self.task_content_frame, self.tasks,
+                                width=self.task_area_width - 60,
+                                height=max(400, self.task_area_height - 150),
+                                on_open=self.edit_task, is_critical=schedule.is_critical)
+        timeline.grid(row=1, column=0, sticky="nsew", padx=10, pady=10)
+        
+        ctk.CTkButton(zoom_frame, text="🔍 +", width=50, height=25,
+                    command=lambda: timeline.zoom(ZOOM_STEP)).pack(side="left", padx=2, pady=5)
+        ctk.CTkButton(zoom_frame, text="🔍 −", width=50, height=25,
+                    command=lambda: timeline.zoom(1 / ZOOM_STEP)).pack(side="left", padx=2, pady=5)
+        ctk.CTkLabel(zoom_frame, text="Ctrl + molette : zoom · Maj + molette : défilement horizontal · "
+                                      "double-clic : modifier la tâche",
+                    text_color="#666666").pack(side="left", padx=10)
+
     def change_task_view(self, view_mode):
         """Changer le mode de vue des tâches"""
         self.task_view_mode = view_mode
@@ -1997,7 +1887,7 @@ Document généré automatiquement par l'application de gestion de projet
         due_entry = ctk.CTkEntry(main_frame, width=400, placeholder_text="JJ/MM/AAAA")
         due_entry.pack(fill='x', pady=(0, 10))
         if task:
-            due_entry.insert(0, task.due_date)
+            due_entry.insert(0, task.due_date_label)
             
         # Lien avec noeud de l'arbre
         ctk.CTkLabel(main_frame, text="Lien avec noeud de l'arbre:", font=ctk.CTkFont(weight="bold")).pack(anchor='w', pady=(0, 5))
@@ -2094,7 +1984,7 @@ Document généré automatiquement par l'application de gestion de projet
         
         # Vérifier que les tâches existent
         if not hasattr(self, 'tasks'):
-            self.tasks = []
+            self.tasks = TaskRepository()
         
         # Compter les tâches créées
         created_count = 0
@@ -2215,7 +2105,7 @@ Document généré automatiquement par l'application de gestion de projet
         due_entry = ctk.CTkEntry(main_frame, width=400, placeholder_text="JJ/MM/AAAA")
         due_entry.pack(fill='x', pady=(0, 10))
         if task:
-            due_entry.insert(0, task.due_date)
+            due_entry.insert(0, task.due_date_label)
             
         # Lien avec noeud de l'arbre
         ctk.CTkLabel(main_frame, text="Lien avec noeud de l'arbre:", font=ctk.CTkFont(weight="bold")).pack(anchor='w', pady=(0, 5))
@@ -2227,7 +2117,23 @@ Document généré automatiquement par l'application de gestion de projet
         
         linked_node_var = tk.StringVar(value=task.linked_node.text if task and task.linked_node else "Aucun")
         node_menu = ctk.CTkOptionMenu(main_frame, values=node_options, variable=linked_node_var)
-        node_menu.pack(fill='x', pady=(0, 20))
+        node_menu.pack(fill='x', pady=(0, 10))
+        
+        # Durée
+        ctk.CTkLabel(main_frame, text="Durée (jours):", font=ctk.CTkFont(weight="bold")).pack(anchor='w', pady=(0, 5))
+        duration_entry = ctk.CTkEntry(main_frame, width=400)
+        duration_entry.pack(fill='x', pady=(0, 10))
+        duration_entry.insert(0, f"{task.duration:g}" if task else "1")
+        
+        # Dépendances : tâches à terminer avant celle-ci
+        ctk.CTkLabel(main_frame, text="Dépend de:", font=ctk.CTkFont(weight="bold")).pack(anchor='w', pady=(0, 5))
+        other_tasks = [other for other in self.tasks if other is not task]
+        dependencies_listbox = tk.Listbox(main_frame, selectmode="multiple", height=6, exportselection=False)
+        dependencies_listbox.pack(fill='x', pady=(0, 20))
+        for index, other in enumerate(other_tasks):
+            dependencies_listbox.insert("end", other.title)
+            if task and other in task.dependencies:
+                dependencies_listbox.selection_set(index)
         
         # Variable pour le résultat
         result = {"saved": False}
@@ -2237,6 +2143,29 @@ Document généré automatiquement par l'application de gestion de projet
             if not title_entry.get().strip():
                 messagebox.showerror("Erreur", "Le titre est obligatoire!")
                 return
+            try:
+                duration = float(duration_entry.get().strip().replace(",", "."))
+                if duration < 0:
+                    raise ValueError
+            except ValueError:
+                messagebox.showerror("Erreur", "La durée doit être un nombre de jours positif!")
+                return
+            if duration.is_integer():
+                duration = int(duration)
+            due_text = due_entry.get().strip()
+            due_date = parse_date(due_text)
+            # Échéance illisible lue dans le fichier et laissée telle quelle : conservée en texte
+            kept_text = task.due_date_text if task and due_text == task.due_date_text else ""
+            if due_text and due_date is None and not kept_text:
+                messagebox.showerror("Erreur", "L'échéance doit être une date au format JJ/MM/AAAA!")
+                return
+            
+            dependencies = [other_tasks[index] for index in dependencies_listbox.curselection()]
+            if task:
+                cycle = self.get_task_schedule().find_cycle(task, dependencies)
+                if cycle is not None:
+                    messagebox.showerror("Erreur", f"Dépendance circulaire : '{cycle.title}' dépend déjà de cette tâche!")
+                    return
                 
             # Trouver le noeud lié
             linked_node = None
@@ -2246,27 +2175,37 @@ Document généré automatiquement par l'application de gestion de projet
                         linked_node = node
                         break
             
-            if task:
-                # Modifier la tâche existante
-                task.title = title_entry.get().strip()
-                task.description = desc_textbox.get("1.0", "end-1c")
-                task.status = status_var.get()
-                task.priority = priority_var.get()
-                task.assignee = assignee_entry.get().strip()
-                task.due_date = due_entry.get().strip()
-                task.linked_node = linked_node
-            else:
-                # Créer une nouvelle tâche
-                new_task = Task(
-                    title=title_entry.get().strip(),
-                    description=desc_textbox.get("1.0", "end-1c"),
-                    status=status_var.get(),
-                    priority=priority_var.get(),
-                    assignee=assignee_entry.get().strip(),
-                    due_date=due_entry.get().strip(),
-                    linked_node=linked_node
-                )
-                self.tasks.append(new_task)
+            with self.undo_stack.transaction("Modifier la tâche" if task else "Ajouter une tâche", "tasks") as t:
+                if task:
+                    # Modifier la tâche existante
+                    t.set(task,
+                          title=title_entry.get().strip(),
+                          description=desc_textbox.get("1.0", "end-1c"),
+                          status=status_var.get(),
+                          priority=priority_var.get(),
+                          assignee=assignee_entry.get().strip(),
+                          due_date=due_date,
+                          due_date_text=kept_text,
+                          linked_node=linked_node,
+                          duration=duration,
+                          dependencies=dependencies)
+                else:
+                    # Créer une nouvelle tâche
+                    new_task = Task(
+                        title=title_entry.get().strip(),
+                        description=desc_textbox.get("1.0", "end-1c"),
+                        status=status_var.get(),
+                        priority=priority_var.get(),
+                        assignee=assignee_entry.get().strip(),
+                        due_date=due_date,
+                        linked_node=linked_node,
+                        duration=duration,
+                        dependencies=dependencies
+                    )
+                    t.append(self.tasks, new_task)
+            
+            # Recalcul limité aux tâches en amont et en aval
+            self.get_task_schedule().update(task or new_task)
             
             result["saved"] = True
             dialog.destroy()
@@ -2291,12 +2230,20 @@ Document généré automatiquement par l'application de gestion de projet
     def delete_task(self, task):
         """Supprimer une tâche"""
         if messagebox.askyesno("Confirmation", f"Supprimer la tâche '{task.title}' ?"):
-            self.tasks.remove(task)
+            schedule = self.get_task_schedule()
+            dependents = schedule.dependents(task)
+            with self.undo_stack.transaction(f"Supprimer la tâche '{task.title}'", "tasks") as t:
+                # Les tâches qui en dépendaient n'attendent plus cette tâche
+                for dependent in dependents:
+                    t.set(dependent, dependencies=[other for other in dependent.dependencies if other is not task])
+                t.remove(self.tasks, task)
+            schedule.remove_task(task)
             self.refresh_task_view()
             
     def change_task_status(self, task, new_status):
         """Changer le statut d'une tâche"""
-        task.status = new_status
+        with self.undo_stack.transaction(f"Statut de '{task.title}' : {new_status}", "tasks") as t:
+            t.set(task, status=new_status)
         self.refresh_task_view()
         
     def sync_tasks_with_tree(self):
@@ -2312,28 +2259,17 @@ Document généré automatiquement par l'application de gestion de projet
         
         # Vérifier que les tâches existent
         if not hasattr(self, 'tasks'):
-            self.tasks = []
+            self.tasks = TaskRepository()
         
         # Compter les tâches créées
         created_count = 0
         
-        for node in self.tree_nodes:
-            # Vérifier si une tâche existe déjà pour ce noeud
-            existing_task = None
-            for task in self.tasks:
-                if hasattr(task, 'linked_node') and task.linked_node == node:
-                    existing_task = task
-                    break
-                    
-            if not existing_task:
-                # Créer une nouvelle tâche pour ce noeud
-                new_task = Task(
-                    title=f"Tâche: {node.text}",
-                    description=f"Tâche automatiquement créée pour le noeud '{node.text}'",
-                    linked_node=node
-                )
-                self.tasks.append(new_task)
-                created_count += 1
+        # Une tâche pour chaque noeud qui n'en a pas (table noeud -> tâches de TaskTreeSync)
+        with self.undo_stack.transaction("Synchroniser les tâches avec l'arbre", "tasks"), self.events.batch():
+            for node in self.tree_nodes:
+                if self.tree_sync.ensure_task(node):
+                    created_count += 1
+        self.task_schedule_stale = True
                 
         if created_count > 0:
             messagebox.showinfo("Synchronisation", f"{created_count} nouvelle(s) tâche(s) créée(s)!")
@@ -2358,18 +2294,52 @@ Document généré automatiquement par l'application de gestion de projet
     def update_task_stats(self):
         """Mettre à jour les statistiques des tâches"""
         total = len(self.tasks)
-        todo = len([t for t in self.tasks if t.status == "À faire"])
-        in_progress = len([t for t in self.tasks if t.status == "En cours"])
-        done = len([t for t in self.tasks if t.status == "Terminé"])
-        critical = len([t for t in self.tasks if t.priority == "Critique"])
+        todo = self.tasks.count_by("status", "À faire")
+        in_progress = self.tasks.count_by("status", "En cours")
+        done = self.tasks.count_by("status", "Terminé")
+        critical = self.tasks.count_by("priority", "Critique")
+        overdue = len(self.tasks.overdue())
         
         stats_text = f"Total: {total} | À faire: {todo} | En cours: {in_progress} | Terminé: {done}"
         if critical > 0:
             stats_text += f" | 🔥 Critique: {critical}"
+        if overdue > 0:
+            stats_text += f" | ⏰ En retard: {overdue}"
+        if total:
+            stats_text += f" | ⏱️ Durée: {self.get_task_schedule().project_duration():g} j"
             
         if hasattr(self, 'task_stats_label'):
             self.task_stats_label.configure(text=stats_text)
         
+    def get_task_schedule(self):
+        """Ordonnancement des tâches, resynchronisé avec self.tasks s'il a été invalidé"""
+        if self.task_schedule_stale:
+            for task, prerequisite in self.task_schedule.sync(getattr(self, 'tasks', [])):
+                print(f"⚠️ Dépendance circulaire ignorée : '{task.title}' -> '{prerequisite.title}'")
+            self.task_schedule_stale = False
+        return self.task_schedule
+        
+    def format_task_schedule(self, task):
+        """Résumé du planning d'une tâche (jours comptés depuis le début du projet)"""
+        schedule = self.get_task_schedule()
+        return (f"⏱️ {task.duration:g} j · début J+{schedule.early_start(task):g}"
+                f" · marge {schedule.slack(task):g} j")
+        
+    def show_critical_path(self):
+        """Afficher le chemin critique et la durée du projet"""
+        if not getattr(self, 'tasks', None):
+            messagebox.showinfo("Chemin critique", "Aucune tâche.")
+            return
+        schedule = self.get_task_schedule()
+        critical = schedule.critical_path()
+        lines = [f"J+{schedule.early_start(task):g} → J+{schedule.early_finish(task):g}  {task.title}"
+                 for task in critical[:20]]
+        if len(critical) > 20:
+            lines.append(f"... et {len(critical) - 20} autre(s)")
+        messagebox.showinfo("Chemin critique",
+                            f"Durée du projet : {schedule.project_duration():g} jours\n"
+                            f"Tâches critiques (sans marge) : {len(critical)}\n\n" + "\n".join(lines))
+        
     def example_action(self):
         """Action d'exemple"""
         messagebox.showinfo("Information", "Action exécutée avec succès !")
@@ -2380,14 +2350,91 @@ Document généré automatiquement par l'application de gestion de projet
         ctk.set_appearance_mode(new_appearance_mode.lower())
         self.update_status(f"Thème changé : {new_appearance_mode}")
         
+    def undo(self, event=None):
+        """Annuler la dernière modification"""
+        if event is not None and isinstance(self.focus_get(), (tk.Entry, tk.Text)):
+            return  # Laisser le champ de saisie gérer Ctrl+Z
+        command = self.undo_stack.undo()
+        self.update_status(f"↶ Annulé : {command.label}" if command else "Rien à annuler")
+        
+    def redo(self, event=None):
+        """Rétablir la dernière modification annulée"""
+        if event is not None and isinstance(self.focus_get(), (tk.Entry, tk.Text)):
+            return
+        command = self.undo_stack.redo()
+        self.update_status(f"↷ Rétabli : {command.label}" if command else "Rien à rétablir")
+        
+    def on_undo_change(self, command):
+        """Après une annulation ou un rétablissement : mettre à jour les modules concernés"""
+        if "tree" in command.keys:
+            if getattr(self, 'selected_tree_node', None) not in getattr(self, 'tree_nodes', []):
+                self.selected_tree_node = None
+            self.tree_rollup.restructure()
+        if "tasks" in command.keys:
+            self.task_schedule_stale = True
+        if "documents" in command.keys:
+            self.tree_rollup.sync_documents(self.documents)
+        if "blocks" in command.keys:
+            self.save_project_blocks()
+        self.views.refresh(*command.keys)
+        
     def update_status(self, message: str):
         """Mettre à jour la barre de statut"""
         if hasattr(self, 'status_label'):
             self.status_label.configure(text=message)
         
+    def on_task_change(self, task):
+        """Une tâche a été ajoutée, retirée ou modifiée (appelé par TaskRepository)"""
+        present = task in self.tasks
+        # Tâche ajoutée ou retirée (y compris par la synchronisation avec l'arbre) :
+        # l'ordonnancement sera resynchronisé à sa prochaine lecture
+        if present != (task in self.task_schedule):
+            self.task_schedule_stale = True
+        self.reminders.update(task)
+        self.tree_rollup.update_task(task, present)
+        self.tree_sync.task_changed(task, present)
+        
+    def on_model_events(self, events):
+        """Fin d'un lot d'événements : rafraîchir une seule fois les tâches modifiées par la synchronisation"""
+        # Les actions sur les tâches rafraîchissent déjà leur vue ; seules les actions sur
+        # l'arbre modifient des tâches sans l'afficher
+        if any(event.kind in NODE_EVENTS for event in events) and any(event.kind not in NODE_EVENTS for event in events):
+            self.views.refresh("tasks")
+        
+    def on_rollup_change(self, nodes):
+        """Totaux des sous-arbres modifiés (nodes, ou None pour tous) : badges à redessiner"""
+        if self.views.current != "tree":
+            self.views.invalidate("rollups")
+        elif nodes is None:
+            self.redraw_tree_all()
+            self.update_tree_statistics()
+        else:
+            visible = set(self.tree_nodes)
+            for node in nodes:
+                if node in visible:
+                    self.draw_node_badge(node)
+            self.update_tree_statistics()
+        
+    def on_tasks_due(self, tasks):
+        """Rappel des tâches arrivées à échéance (appelé par ReminderScheduler)"""
+        titles = ", ".join(task.title for task in tasks[:3])
+        if len(tasks) > 3:
+            titles += f" (+{len(tasks) - 3})"
+        self.update_status(f"⏰ Échéance : {titles}")
+        self.bell()
+        # Le nombre de tâches en retard a changé
+        self.update_task_stats()
+        
     def on_closing(self):
         """Gestionnaire de fermeture de l'application"""
         if messagebox.askokcancel("Quitter", "Voulez-vous vraiment quitter l'application ?"):
+            if self.thumbnail_service:
+                self.thumbnail_service.close()
+            self.reminders.stop()
+            self.catalog_indexer.stop()
+            self.catalog.close()
+            # Vide la corbeille des documents
+            self.undo_stack.clear()
             self.destroy()
             
     def create_sample_tasks(self):
@@ -2435,14 +2482,27 @@ Document généré automatiquement par l'application de gestion de projet
             )
         ]
         
-        self.tasks.extend(sample_tasks)
+        # Durées et dépendances : analyse -> architecture -> développement -> tests, documentation après l'analyse
+        analysis, architecture, development, tests, documentation = sample_tasks
+        for task, duration, dependencies in ((analysis, 5, []), (architecture, 3, [analysis]),
+                                             (development, 10, [architecture]), (tests, 4, [development]),
+                                             (documentation, 2, [analysis])):
+            task.duration = duration
+            task.dependencies = dependencies
+        
+        with self.undo_stack.transaction("Créer des tâches d'exemple", "tasks") as t:
+            for task in sample_tasks:
+                t.append(self.tasks, task)
+        self.task_schedule_stale = True
         self.refresh_task_view()
         self.update_status(f"{len(sample_tasks)} tâches d'exemple créées")
         
     def show_decision_log(self):
         """Afficher le module journal de bord / carnet de décisions"""
-        self.clear_content()
-        self.main_title.configure(text="💬 Journal de Bord / Carnet de Décisions")
+        self.views.show("log")
+        
+    def build_decision_log(self):
+        """Construire le module journal de bord / carnet de décisions (une seule fois, voir ViewManager)"""
         
         # ✅ CORRECTION : Configuration de l'expansion complète
         self.content_frame.grid_rowconfigure(1, weight=1)  # Ligne principale du journal
@@ -2796,7 +2856,8 @@ Document généré automatiquement par l'application de gestion de projet
                 category=category_var.get()
             )
             
-            self.log_entries.append(new_entry)
+            with self.undo_stack.transaction("Ajouter une entrée au journal", "log") as t:
+                t.append(self.log_entries, new_entry)
             result["saved"] = True
             dialog.destroy()
             
@@ -2843,6 +2904,9 @@ Document généré automatiquement par l'application de gestion de projet
             auto_entries.sort(key=lambda x: x.timestamp)
             for old_entry in auto_entries[:100]:  # Supprimer les 100 plus anciennes
                 self.log_entries.remove(old_entry)
+        
+        # Entrée ajoutée depuis un autre module : le journal sera rafraîchi à son affichage
+        self.views.invalidate("log")
                 
     def refresh_log_view(self):
         """Rafraîchir l'affichage du journal"""
@@ -2881,18 +2945,14 @@ Document généré automatiquement par l'application de gestion de projet
             
         # Filtre par date
         if hasattr(self, 'log_date_from') and self.log_date_from.get():
-            try:
-                date_from = datetime.datetime.strptime(self.log_date_from.get(), "%d/%m/%Y")
-                filtered = [e for e in filtered if e.timestamp.date() >= date_from.date()]
-            except ValueError:
-                pass  # Ignorer les dates invalides
+            date_from = parse_date(self.log_date_from.get())
+            if date_from:  # Ignorer les dates invalides
+                filtered = [e for e in filtered if e.timestamp.date() >= date_from]
                 
         if hasattr(self, 'log_date_to') and self.log_date_to.get():
-            try:
-                date_to = datetime.datetime.strptime(self.log_date_to.get(), "%d/%m/%Y")
-                filtered = [e for e in filtered if e.timestamp.date() <= date_to.date()]
-            except ValueError:
-                pass  # Ignorer les dates invalides
+            date_to = parse_date(self.log_date_to.get())
+            if date_to:  # Ignorer les dates invalides
+                filtered = [e for e in filtered if e.timestamp.date() <= date_to]
                 
         return filtered
         
@@ -3074,10 +3134,12 @@ Document généré automatiquement par l'application de gestion de projet
                 messagebox.showerror("Erreur", "Le titre est obligatoire!")
                 return
                 
-            entry.title = title_entry.get().strip()
-            entry.description = desc_textbox.get("1.0", "end-1c")
-            entry.author = author_entry.get().strip()
-            entry.category = category_var.get()
+            with self.undo_stack.transaction("Modifier une entrée du journal", "log") as t:
+                t.set(entry,
+                      title=title_entry.get().strip(),
+                      description=desc_textbox.get("1.0", "end-1c"),
+                      author=author_entry.get().strip(),
+                      category=category_var.get())
             
             result["saved"] = True
             dialog.destroy()
@@ -3103,7 +3165,8 @@ Document généré automatiquement par l'application de gestion de projet
     def delete_log_entry(self, entry):
         """Supprimer une entrée de journal"""
         if messagebox.askyesno("Confirmation", f"Supprimer l'entrée '{entry.title}' ?"):
-            self.log_entries.remove(entry)
+            with self.undo_stack.transaction(f"Supprimer l'entrée '{entry.title}'", "log") as t:
+                t.remove(self.log_entries, entry)
             self.refresh_log_view()
             self.update_status("Entrée supprimée")
             
@@ -3149,37 +3212,8 @@ Document généré automatiquement par l'application de gestion de projet
         
         if filename:
             try:
-                filtered_entries = self.get_filtered_log_entries()
-                filtered_entries.sort(key=lambda x: x.timestamp, reverse=True)
-                
-                content = f"""# 💬 Journal de Bord / Carnet de Décisions
-
-    *Exporté le : {datetime.datetime.now().strftime('%d/%m/%Y à %H:%M')}*
-    *Nombre d'entrées : {len(filtered_entries)}*
-
----
-
-"""
-                
-                for entry in filtered_entries:
-                    entry_type = "🤖 AUTOMATIQUE" if entry.entry_type == "auto" else "👤 MANUELLE"
-                    
-                    content += f"""## {entry.title}
-
-**📅 Date :** {entry.timestamp.strftime('%d/%m/%Y à %H:%M:%S')}
-**👤 Auteur :** {entry.author}
-**🏷️ Catégorie :** {entry.category}
-**🔧 Type :** {entry_type}
-
-**📝 Description :**
-{entry.description}
-
----
-
-"""
-                
                 with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                    f.write(decision_log_markdown(self.get_filtered_log_entries()))
                     
                 messagebox.showinfo("Export", f"Journal exporté avec succès :\n{filename}")
                 self.update_status("Journal exporté")
@@ -3202,18 +3236,22 @@ Document généré automatiquement par l'application de gestion de projet
         )
         
         if response is True:  # Tout supprimer
-            self.log_entries.clear()
+            with self.undo_stack.transaction("Vider le journal", "log") as t:
+                t.replace(self.log_entries, [])
             self.refresh_log_view()
             self.update_status("Journal vidé complètement")
         elif response is False:  # Supprimer seulement les automatiques
-            self.log_entries = [e for e in self.log_entries if e.entry_type == "manual"]
+            with self.undo_stack.transaction("Supprimer les entrées automatiques", "log") as t:
+                t.replace(self.log_entries, [e for e in self.log_entries if e.entry_type == "manual"])
             self.refresh_log_view()
             self.update_status("Entrées automatiques supprimées")
 
     def show_document_manager(self):
         """Afficher le module de gestion documentaire"""
-        self.clear_content()
-        self.main_title.configure(text="📁 Gestionnaire de Documents")
+        self.views.show("documents")
+        
+    def build_document_manager(self):
+        """Construire le module de gestion documentaire (une seule fois, voir ViewManager)"""
         
         # ✅ CORRECTION : Configuration de l'expansion complète
         self.content_frame.grid_rowconfigure(1, weight=1)  # Ligne principale des documents
@@ -3314,7 +3352,11 @@ Document généré automatiquement par l'application de gestion de projet
         # Scrollbars pour la zone de documents
         doc_v_scrollbar = ttk.Scrollbar(doc_canvas_frame, orient="vertical", command=self.doc_canvas.yview)
         doc_h_scrollbar = ttk.Scrollbar(doc_canvas_frame, orient="horizontal", command=self.doc_canvas.xview)
-        self.doc_canvas.configure(yscrollcommand=doc_v_scrollbar.set, xscrollcommand=doc_h_scrollbar.set)
+        def on_doc_scroll(*args):
+            doc_v_scrollbar.set(*args)
+            self.schedule_thumbnail_check()
+            
+        self.doc_canvas.configure(yscrollcommand=on_doc_scroll, xscrollcommand=doc_h_scrollbar.set)
         
         doc_v_scrollbar.grid(row=0, column=1, sticky="ns")
         doc_h_scrollbar.grid(row=1, column=0, sticky="ew")
@@ -3375,6 +3417,7 @@ Document généré automatiquement par l'application de gestion de projet
         # Nettoyer le contenu actuel
         for widget in self.doc_content_frame.winfo_children():
             widget.destroy()
+        self.thumbnail_cards = []
             
         # Filtrer les documents
         filtered_docs = self.get_filtered_documents()
@@ -3416,14 +3459,15 @@ Document généré automatiquement par l'application de gestion de projet
 
     def create_document_card_enhanced(self, parent, doc, row, col, card_width):
         """Créer une carte de document améliorée pour la vue grille"""
-        card = ctk.CTkFrame(parent, width=card_width, height=280)
+        card = ctk.CTkFrame(parent, width=card_width, height=320)
         card.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
         card.grid_propagate(False)
         
-        # Icône du type de fichier (plus grande)
+        # Icône du type de fichier (plus grande), remplacée par la vignette une fois la carte visible
         icon_label = ctk.CTkLabel(card, text=doc.get_file_type_icon(), 
                                 font=ctk.CTkFont(size=36))
         icon_label.pack(pady=(15, 8))
+        self.register_document_thumbnail(icon_label, doc)
         
         # Nom du document (avec wrapping amélioré)
         name_label = ctk.CTkLabel(card, text=doc.filename, 
@@ -3715,7 +3759,10 @@ Document généré automatiquement par l'application de gestion de projet
                 doc.stored_path = stored_path
                 
                 # Ajouter à la liste
-                self.documents.append(doc)
+                with self.undo_stack.transaction(f"Ajouter le document '{doc.filename}'", "documents") as t:
+                    t.append(self.documents, doc)
+                    self.record_document_file(t, doc, deleted=False)
+                self.tree_rollup.update_document(doc)
                 
                 # Enregistrement automatique dans le journal
                 if hasattr(self, 'add_automatic_log_entry'):
@@ -3875,7 +3922,10 @@ Document généré automatiquement par l'application de gestion de projet
                 doc.stored_path = stored_path
                 
                 # Ajouter à la liste
-                self.documents.append(doc)
+                with self.undo_stack.transaction(f"Importer le document '{doc.filename}'", "documents") as t:
+                    t.append(self.documents, doc)
+                    self.record_document_file(t, doc, deleted=False)
+                self.tree_rollup.update_document(doc)
                 imported_count += 1
                 
             except Exception as e:
@@ -3901,6 +3951,7 @@ Document généré automatiquement par l'application de gestion de projet
         # Nettoyer le contenu actuel
         for widget in self.doc_content_frame.winfo_children():
             widget.destroy()
+        self.thumbnail_cards = []
             
         # Filtrer les documents
         filtered_docs = self.get_filtered_documents()
@@ -3918,6 +3969,14 @@ Document généré automatiquement par l'application de gestion de projet
                 
         self.update_document_stats(filtered_docs)
         
+    def refresh_document_manager(self):
+        """Mettre à jour le module documents masqué (nœuds de l'arbre et documents)"""
+        nodes = ["Tous"] + [node.text for node in getattr(self, 'tree_nodes', [])]
+        self.doc_node_filter.configure(values=nodes)
+        if self.doc_node_filter.get() not in nodes:
+            self.doc_node_filter.set("Tous")
+        self.refresh_document_view()
+        
     def get_filtered_documents(self):
         """Obtenir les documents filtrés selon les critères"""
         filtered = self.documents.copy()
@@ -3950,14 +4009,15 @@ Document généré automatiquement par l'application de gestion de projet
             
     def create_document_card(self, parent, doc, row, col):
         """Créer une carte de document pour la vue grille"""
-        card = ctk.CTkFrame(parent, width=200, height=250)
+        card = ctk.CTkFrame(parent, width=200, height=290)
         card.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
         card.grid_propagate(False)
         
-        # Icône du type de fichier
+        # Icône du type de fichier, remplacée par la vignette une fois la carte visible
         icon_label = ctk.CTkLabel(card, text=doc.get_file_type_icon(), 
                                 font=ctk.CTkFont(size=32))
         icon_label.pack(pady=(15, 5))
+        self.register_document_thumbnail(icon_label, doc)
         
         # Nom du document
         name_label = ctk.CTkLabel(card, text=doc.filename, 
@@ -3996,6 +4056,59 @@ Document généré automatiquement par l'application de gestion de projet
         ctk.CTkButton(buttons_frame, text="🗑️", width=30, height=25,
                     command=lambda: self.delete_document(doc)).pack(side="right", padx=1)
                     
+    def register_document_thumbnail(self, label, doc):
+        """Associe l'icône d'une carte à la vignette du document, chargée quand la carte devient visible"""
+        if doc.stored_path and document_preview.supports(doc.stored_path) and os.path.exists(doc.stored_path):
+            self.thumbnail_cards.append((label, doc))
+            self.schedule_thumbnail_check()
+            
+    def schedule_thumbnail_check(self, event=None):
+        """Planifie la recherche des cartes visibles (regroupe les événements de défilement)"""
+        if self.thumbnail_cards and self.thumbnail_check_id is None:
+            self.thumbnail_check_id = self.after(THUMBNAIL_CHECK_MS, self.load_visible_thumbnails)
+            
+    def load_visible_thumbnails(self):
+        """Demande les vignettes des cartes entrées dans la zone visible"""
+        self.thumbnail_check_id = None
+        if not hasattr(self, 'doc_canvas') or not self.doc_canvas.winfo_exists():
+            self.thumbnail_cards = []
+            return
+            
+        # Zone visible : intersection du canevas des documents et de la fenêtre
+        top = max(self.doc_canvas.winfo_rooty(), self.winfo_rooty())
+        bottom = min(self.doc_canvas.winfo_rooty() + self.doc_canvas.winfo_height(),
+                     self.winfo_rooty() + self.winfo_height())
+        
+        remaining = []
+        for label, doc in self.thumbnail_cards:
+            if not label.winfo_exists():
+                continue
+            label_top = label.winfo_rooty()
+            if label.winfo_ismapped() and label_top + label.winfo_height() >= top and label_top <= bottom:
+                if self.thumbnail_service is None:
+                    self.thumbnail_service = document_preview.ThumbnailService(
+                        os.path.join(self.documents_storage_path, THUMBNAIL_CACHE_DIR))
+                self.thumbnail_service.request(label, doc.stored_path)
+            else:
+                remaining.append((label, doc))
+        self.thumbnail_cards = remaining
+        
+        if self.thumbnail_service and not self.thumbnail_polling:
+            self.thumbnail_polling = True
+            self.poll_thumbnails()
+            
+    def poll_thumbnails(self):
+        """Affiche les vignettes prêtes ; continue tant que des générations sont en cours"""
+        for label, image in self.thumbnail_service.poll():
+            if image is not None and label.winfo_exists():
+                thumbnail = ctk.CTkImage(light_image=image, dark_image=image, size=image.size)
+                label.configure(image=thumbnail, text="")
+                
+        if self.thumbnail_service.has_pending():
+            self.after(THUMBNAIL_POLL_MS, self.poll_thumbnails)
+        else:
+            self.thumbnail_polling = False
+            
     def show_documents_list(self, documents):
         """Afficher les documents en vue liste"""
         # En-têtes
@@ -4173,18 +4286,16 @@ Document généré automatiquement par l'application de gestion de projet
                             break
                 
                 # Mettre à jour le document
-                doc.filename = name_entry.get().strip()
-                doc.category = category_var.get()
-                doc.version = version_entry.get().strip()
-                doc.description = desc_textbox.get("1.0", "end-1c")
-                doc.linked_node = linked_node
-                
-                # Traiter les tags
                 tags_text = tags_entry.get().strip()
-                if tags_text:
-                    doc.tags = [tag.strip() for tag in tags_text.split(",") if tag.strip()]
-                else:
-                    doc.tags = []
+                with self.undo_stack.transaction(f"Modifier le document '{doc.filename}'", "documents") as t:
+                    t.set(doc,
+                          filename=name_entry.get().strip(),
+                          category=category_var.get(),
+                          version=version_entry.get().strip(),
+                          description=desc_textbox.get("1.0", "end-1c"),
+                          linked_node=linked_node,
+                          tags=[tag.strip() for tag in tags_text.split(",") if tag.strip()])
+                self.tree_rollup.update_document(doc)
                 
                 # Enregistrement automatique dans le journal
                 if hasattr(self, 'add_automatic_log_entry'):
@@ -4222,20 +4333,19 @@ Document généré automatiquement par l'application de gestion de projet
         """Supprimer un document"""
         if messagebox.askyesno("Confirmation", 
                             f"Supprimer le document '{doc.filename}' ?\n\n"
-                            f"Le fichier sera supprimé définitivement."):
+                            f"Vous pourrez l'annuler avec Ctrl+Z."):
             try:
-                # Supprimer le fichier physique
-                if os.path.exists(doc.stored_path):
-                    os.remove(doc.stored_path)
-                    
-                # Supprimer de la liste
-                self.documents.remove(doc)
+                # Le fichier physique est placé dans la corbeille tant que la suppression peut être annulée
+                with self.undo_stack.transaction(f"Supprimer le document '{doc.filename}'", "documents") as t:
+                    self.record_document_file(t, doc, deleted=True)
+                    t.remove(self.documents, doc)
+                self.tree_rollup.update_document(doc, present=False)
                 
                 # Enregistrement automatique dans le journal
                 if hasattr(self, 'add_automatic_log_entry'):
                     self.add_automatic_log_entry(
                         title=f"Document supprimé : '{doc.filename}'",
-                        description=f"Document supprimé définitivement.",
+                        description="Document supprimé (annulable avec Ctrl+Z).",
                         category="Document"
                     )
                 
@@ -4245,6 +4355,36 @@ Document généré automatiquement par l'application de gestion de projet
             except Exception as e:
                 messagebox.showerror("Erreur", f"Erreur lors de la suppression :\n{str(e)}")
                 
+    def record_document_file(self, t, doc, deleted):
+        """Enregistrer dans une transaction l'ajout ou la suppression du fichier d'un document
+        
+        Un fichier supprimé est déplacé dans la corbeille, d'où l'annulation le restaure ;
+        il n'est effacé que lorsque la suppression quitte l'historique. Le fichier d'un
+        ajout annulé est effacé de la même façon.
+        """
+        stored_path = doc.stored_path
+        if not stored_path or not os.path.exists(stored_path):
+            return
+        trash_path = os.path.join(self.documents_storage_path, DOCUMENT_TRASH_DIR, os.path.basename(stored_path))
+        
+        def to_trash():
+            os.makedirs(os.path.dirname(trash_path), exist_ok=True)
+            shutil.move(stored_path, trash_path)
+            
+        def from_trash():
+            if os.path.exists(trash_path):
+                shutil.move(trash_path, stored_path)
+                
+        def purge(applied):
+            # Le fichier est dans la corbeille si la suppression est appliquée ou l'ajout annulé
+            if applied == deleted and os.path.exists(trash_path):
+                os.remove(trash_path)
+                
+        if deleted:
+            t.call(to_trash, from_trash, purge)
+        else:
+            t.call(from_trash, to_trash, purge)
+            
     def open_document_folder(self, doc):
         """Ouvrir le dossier contenant le document"""
         try:
@@ -4294,58 +4434,8 @@ Document généré automatiquement par l'application de gestion de projet
         
         if filename:
             try:
-                # Trier les documents par catégorie
-                docs_by_category = {}
-                for doc in self.documents:
-                    if doc.category not in docs_by_category:
-                        docs_by_category[doc.category] = []
-                    docs_by_category[doc.category].append(doc)
-                
-                content = f"""# 📁 Rapport de Gestion Documentaire
-
-    *Généré le : {datetime.datetime.now().strftime('%d/%m/%Y à %H:%M')}*
-    *Nombre total de documents : {len(self.documents)}*
-
-    ## 📊 Statistiques Générales
-
-    """
-                
-                # Statistiques par catégorie
-                for category, docs in docs_by_category.items():
-                    total_size = sum(doc.file_size for doc in docs)
-                    size_text = f"{total_size/(1024*1024):.1f} MB" if total_size > 1024*1024 else f"{total_size/1024:.1f} KB"
-                    content += f"- **{category}** : {len(docs)} document(s) - {size_text}\n"
-                
-                content += "\n---\n\n"
-                
-                # Détail par catégorie
-                for category, docs in sorted(docs_by_category.items()):
-                    icon = docs[0].get_category_icon() if docs else "📄"
-                    content += f"## {icon} {category}\n\n"
-                    
-                    for doc in sorted(docs, key=lambda x: x.filename):
-                        linked_text = f" (🌳 {doc.linked_node.text})" if doc.linked_node else ""
-                        tags_text = f" [Tags: {', '.join(doc.tags)}]" if doc.tags else ""
-                        
-                        content += f"""### {doc.get_file_type_icon()} {doc.filename}
-
-    - **Version :** {doc.version}
-    - **Taille :** {doc.format_file_size()}
-    - **Date d'ajout :** {doc.upload_date.strftime('%d/%m/%Y à %H:%M')}
-    - **Description :** {doc.description or "Aucune description"}
-    - **Nœud lié :** {doc.linked_node.text if doc.linked_node else "Aucun"}{tags_text}
-
-    """
-                
-                content += f"""
-    ---
-
-    *Rapport généré automatiquement par l'application de gestion de projet*
-    *Chemin de stockage : {self.documents_storage_path}*
-    """
-                
                 with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                    f.write(document_report(self.documents, self.documents_storage_path))
                     
                 messagebox.showinfo("Rapport généré", f"Rapport sauvegardé avec succès :\n{filename}")
                 self.update_status("Rapport des documents généré")
@@ -4355,8 +4445,10 @@ Document généré automatiquement par l'application de gestion de projet
                         
     def show_block_library(self):
         """Afficher le module de bibliothèque de blocs réutilisables"""
-        self.clear_content()
-        self.main_title.configure(text="📦 Bibliothèque de Blocs Réutilisables")
+        self.views.show("blocks")
+        
+    def build_block_library(self):
+        """Construire le module de bibliothèque de blocs réutilisables (une seule fois, voir ViewManager)"""
         
         # ✅ CORRECTION : Configuration de l'expansion complète
         self.content_frame.grid_rowconfigure(1, weight=1)  # Ligne principale des blocs
@@ -5770,7 +5862,8 @@ Document généré automatiquement par l'application de gestion de projet
                 new_block.tasks = [task.to_dict() for task in linked_tasks]
             
             # Ajouter à la bibliothèque
-            self.project_blocks.append(new_block)
+            with self.undo_stack.transaction(f"Créer le bloc '{new_block.name}'", "blocks") as t:
+                t.append(self.project_blocks, new_block)
             self.save_project_blocks()
             
             # Enregistrement dans le journal
@@ -6083,15 +6176,15 @@ Document généré automatiquement par l'application de gestion de projet
                 position = position_var.get()
                 project_name = project_name_entry.get().strip() or "Projet sans nom"
                 
-                # Import des nœuds
-                if block.nodes and position != "skip":
-                    imported_nodes = self.import_nodes_from_structure(block.nodes, position)
-                    print(f"✅ {len(imported_nodes)} nœuds importés")
-                
-                # Import des tâches
-                if import_tasks_var.get() and block.tasks:
-                    imported_tasks = self.import_tasks_from_block(block, adapt_dates_var.get(), preserve_links_var.get())
-                    print(f"✅ {len(imported_tasks)} tâches importées")
+                # Import des nœuds puis des tâches : une seule étape d'annulation
+                with self.undo_stack.transaction(f"Importer le bloc '{block.name}'", "tree", "tasks"), self.events.batch():
+                    if block.nodes and position != "skip":
+                        imported_nodes = self.import_nodes_from_structure(block.nodes, position)
+                        print(f"✅ {len(imported_nodes)} nœuds importés")
+                    
+                    if import_tasks_var.get() and block.tasks:
+                        imported_tasks = self.import_tasks_from_block(block, adapt_dates_var.get(), preserve_links_var.get())
+                        print(f"✅ {len(imported_tasks)} tâches importées")
                 
                 # Enregistrer l'utilisation
                 block.add_usage_record(project_name, 0, True, "Import dans projet")
@@ -6138,7 +6231,7 @@ Document généré automatiquement par l'application de gestion de projet
         if not hasattr(self, 'tree_nodes'):
             self.tree_nodes = []
         
-        def create_node_from_dict(node_dict, parent=None, offset_x=0, offset_y=0):
+        def create_node_from_dict(t, node_dict, parent=None, offset_x=0, offset_y=0):
             """Créer un nœud depuis un dictionnaire"""
             # Créer le nœud
             new_node = TreeNode(
@@ -6151,87 +6244,121 @@ Document généré automatiquement par l'application de gestion de projet
             
             # Définir le parent
             if parent:
-                parent.add_child(new_node)
+                new_node.parent = parent
+                t.append(parent.children, new_node)
             
             # Ajouter à la liste des nœuds
-            self.tree_nodes.append(new_node)
+            t.append(self.tree_nodes, new_node)
+            self.events.publish(NODE_CREATED, new_node)
             
             # Créer les enfants récursivement
             for child_dict in node_dict.get('children', []):
-                create_node_from_dict(child_dict, new_node, offset_x, offset_y)
+                create_node_from_dict(t, child_dict, new_node, offset_x, offset_y)
             
             return new_node
         
         imported_nodes = []
         
-        if position == "racine":
-            # Nouvelle racine - décaler pour éviter les conflits
-            offset_x = 500 if self.tree_nodes else 0
-            offset_y = 100
-            root_node = create_node_from_dict(node_structure, None, offset_x, offset_y)
-            imported_nodes.append(root_node)
-            
-        elif position == "enfant" and hasattr(self, 'selected_tree_node') and self.selected_tree_node:
-            # Enfant du nœud sélectionné
-            offset_x = self.selected_tree_node.x + 150
-            offset_y = self.selected_tree_node.y + 100
-            child_node = create_node_from_dict(node_structure, self.selected_tree_node, offset_x, offset_y)
-            imported_nodes.append(child_node)
-            
-        elif position == "remplacer":
-            # Remplacer l'arbre actuel
-            if messagebox.askyesno("Confirmation", "Remplacer complètement l'arbre actuel ?"):
-                self.tree_nodes.clear()
-                root_node = create_node_from_dict(node_structure, None, 400, 200)
+        with self.undo_stack.transaction("Importer des noeuds", "tree") as t:
+            if position == "racine":
+                # Nouvelle racine - décaler pour éviter les conflits
+                offset_x = 500 if self.tree_nodes else 0
+                offset_y = 100
+                root_node = create_node_from_dict(t, node_structure, None, offset_x, offset_y)
                 imported_nodes.append(root_node)
+                
+            elif position == "enfant" and hasattr(self, 'selected_tree_node') and self.selected_tree_node:
+                # Enfant du nœud sélectionné
+                offset_x = self.selected_tree_node.x + 150
+                offset_y = self.selected_tree_node.y + 100
+                child_node = create_node_from_dict(t, node_structure, self.selected_tree_node, offset_x, offset_y)
+                imported_nodes.append(child_node)
+                
+            elif position == "remplacer":
+                # Remplacer l'arbre actuel
+                if messagebox.askyesno("Confirmation", "Remplacer complètement l'arbre actuel ?"):
+                    t.replace(self.tree_nodes, [])
+                    root_node = create_node_from_dict(t, node_structure, None, 400, 200)
+                    imported_nodes.append(root_node)
         
         # Redessiner l'arbre
         if hasattr(self, 'redraw_tree_all'):
             self.redraw_tree_all()
+        self.views.invalidate("tree")
             
         return imported_nodes
 
     def import_tasks_from_block(self, block, adapt_dates=True, preserve_links=True):
         """Importer les tâches depuis un bloc"""
         if not hasattr(self, 'tasks'):
-            self.tasks = []
+            self.tasks = TaskRepository()
         
         imported_tasks = []
-        
-        for task_data in block.tasks:
-            # Créer la tâche
-            if isinstance(task_data, dict):
-                new_task = Task(
-                    title=task_data.get('title', 'Tâche importée'),
-                    description=task_data.get('description', ''),
-                    status=task_data.get('status', 'À faire'),
-                    priority=task_data.get('priority', 'Moyenne'),
-                    assignee=task_data.get('assignee', ''),
-                    due_date=task_data.get('due_date', '') if not adapt_dates else self.adapt_date_to_current(),
-                    linked_node=None  # Sera lié plus tard si preserve_links
-                )
-            else:
-                # Ancienne structure ou format différent
-                new_task = Task(title=str(task_data), description="Tâche importée depuis un bloc")
-            
-            # Lien avec nœud si demandé
-            if preserve_links and isinstance(task_data, dict) and task_data.get('linked_node'):
-                # Chercher le nœud correspondant dans l'arbre actuel
-                for node in getattr(self, 'tree_nodes', []):
-                    if node.text == task_data['linked_node']:
-                        new_task.linked_node = node
-                        break
-            
-            self.tasks.append(new_task)
-            imported_tasks.append(new_task)
-        
+        unreadable_dates = []
+        
+        with self.undo_stack.transaction("Importer des tâches", "tasks") as t:
+            for task_data in block.tasks:
+                # Créer la tâche
+                if isinstance(task_data, dict):
+                    new_task = Task(
+                        title=task_data.get('title', 'Tâche importée'),
+                        description=task_data.get('description', ''),
+                        status=task_data.get('status', 'À faire'),
+                        priority=task_data.get('priority', 'Moyenne'),
+                        assignee=task_data.get('assignee', ''),
+                        due_date=self.imported_due_date(task_data.get('due_date', ''), adapt_dates),
+                        linked_node=None,  # Sera lié plus tard si preserve_links
+                        duration=task_data.get('duration', 1)
+                    )
+                else:
+                    # Ancienne structure ou format différent
+                    new_task = Task(title=str(task_data), description="Tâche importée depuis un bloc")
+                
+                # Lien avec nœud si demandé
+                if preserve_links and isinstance(task_data, dict) and task_data.get('linked_node'):
+                    # Chercher le nœud correspondant dans l'arbre actuel
+                    for node in getattr(self, 'tree_nodes', []):
+                        if node.text == task_data['linked_node']:
+                            new_task.linked_node = node
+                            break
+                
+                t.append(self.tasks, new_task)
+                imported_tasks.append(new_task)
+                if new_task.due_date_text:
+                    unreadable_dates.append(f"• {new_task.title} : {new_task.due_date_text}")
+            
+            # Dépendances entre les tâches importées
+            saved = [(task, data) for task, data in zip(imported_tasks, block.tasks) if isinstance(data, dict)]
+            Task.restore_dependencies([task for task, _ in saved], [data for _, data in saved])
+        
+        self.task_schedule_stale = True
+        self.views.invalidate("tasks")
+        if unreadable_dates:
+            messagebox.showwarning("Échéances illisibles",
+                                   "Ces échéances ne sont ni des dates ni des délais (J+n, Semaine n) ; "
+                                   "elles sont conservées en texte :\n\n" + "\n".join(unreadable_dates))
         return imported_tasks
 
+    def imported_due_date(self, value, adapt_dates=True):
+        """Échéance d'une tâche importée d'un bloc
+
+        Les délais (J+5, Semaine 2) partent de la date d'import ; une date absolue est
+        gardée, ou remplacée par adapt_date_to_current si adapt_dates ; un texte
+        illisible est conservé tel quel (Task.due_date_text).
+        """
+        today = datetime.date.today()
+        relative = parse_relative_date(value, today)
+        if relative is not None:
+            return relative
+        if parse_date(value) is None:
+            return value or (self.adapt_date_to_current() if adapt_dates else None)
+        return self.adapt_date_to_current() if adapt_dates else value
+
     def adapt_date_to_current(self):
         """Adapter une date au projet actuel (ajouter 1 semaine par exemple)"""
         from datetime import datetime, timedelta
         future_date = datetime.now() + timedelta(days=7)
-        return future_date.strftime('%d/%m/%Y')
+        return future_date.date()
 
     def edit_block(self, block):
         """Éditer un bloc (nouveau ou existant)"""
@@ -6340,19 +6467,16 @@ Document généré automatiquement par l'application de gestion de projet
             
             if block:
                 # Modifier le bloc existant
-                block.name = name_entry.get().strip()
-                block.description = desc_textbox.get("1.0", "end-1c")
-                block.category = category_var.get()
-                block.domain = domain_var.get()
-                block.client = client_entry.get().strip()
-                block.notes = notes_textbox.get("1.0", "end-1c")
-                
-                # Traiter les tags
                 tags_text = tags_entry.get().strip()
-                if tags_text:
-                    block.tags = [tag.strip() for tag in tags_text.split(",") if tag.strip()]
-                else:
-                    block.tags = []
+                with self.undo_stack.transaction(f"Modifier le bloc '{block.name}'", "blocks") as t:
+                    t.set(block,
+                          name=name_entry.get().strip(),
+                          description=desc_textbox.get("1.0", "end-1c"),
+                          category=category_var.get(),
+                          domain=domain_var.get(),
+                          client=client_entry.get().strip(),
+                          notes=notes_textbox.get("1.0", "end-1c"),
+                          tags=[tag.strip() for tag in tags_text.split(",") if tag.strip()])
             else:
                 # Créer un nouveau bloc
                 new_block = ProjectBlock(
@@ -6370,7 +6494,8 @@ Document généré automatiquement par l'application de gestion de projet
                     new_block.tags = [tag.strip() for tag in tags_text.split(",") if tag.strip()]
                 
                 # Ajouter à la bibliothèque
-                self.project_blocks.append(new_block)
+                with self.undo_stack.transaction(f"Créer le bloc '{new_block.name}'", "blocks") as t:
+                    t.append(self.project_blocks, new_block)
             
             # Sauvegarder
             self.save_project_blocks()
@@ -6413,11 +6538,12 @@ Document généré automatiquement par l'application de gestion de projet
     def delete_block(self, block):
         """Supprimer un bloc de la bibliothèque"""
         if messagebox.askyesno("Confirmation", 
-                            f"Supprimer définitivement le bloc '{block.name}' ?\n\n"
-                            f"Cette action est irréversible.\n"
+                            f"Supprimer le bloc '{block.name}' ?\n\n"
+                            f"Vous pourrez l'annuler avec Ctrl+Z.\n"
                             f"Le bloc a été utilisé {block.usage_count} fois."):
             try:
-                self.project_blocks.remove(block)
+                with self.undo_stack.transaction(f"Supprimer le bloc '{block.name}'", "blocks") as t:
+                    t.remove(self.project_blocks, block)
                 self.save_project_blocks()
                 
                 # Enregistrement dans le journal
@@ -6505,25 +6631,25 @@ Document généré automatiquement par l'application de gestion de projet
                 # Importer les blocs
                 imported_count = 0
                 renamed_count = 0
-                
-                for block_data in imported_blocks:
-                    try:
-                        new_block = ProjectBlock.from_dict(block_data)
-                        
-                        # Vérifier les doublons de nom
-                        original_name = new_block.name
-                        counter = 1
-                        while any(b.name == new_block.name for b in self.project_blocks):
-                            new_block.name = f"{original_name} (Importé {counter})"
-                            counter += 1
-                            renamed_count += 1
-                        
-                        self.project_blocks.append(new_block)
-                        imported_count += 1
-                        
-                    except Exception as e:
-                        print(f"Erreur lors de l'import du bloc : {str(e)}")
-                        continue
+                with self.undo_stack.transaction("Importer des blocs", "blocks") as t:
+                    for block_data in imported_blocks:
+                        try:
+                            new_block = ProjectBlock.from_dict(block_data)
+                            
+                            # Vérifier les doublons de nom
+                            original_name = new_block.name
+                            counter = 1
+                            while any(b.name == new_block.name for b in self.project_blocks):
+                                new_block.name = f"{original_name} (Importé {counter})"
+                                counter += 1
+                                renamed_count += 1
+                            
+                            t.append(self.project_blocks, new_block)
+                            imported_count += 1
+                            
+                        except Exception as e:
+                            print(f"Erreur lors de l'import du bloc : {str(e)}")
+                            continue
                 
                 # Sauvegarder
                 self.save_project_blocks()
@@ -6564,108 +6690,8 @@ Document généré automatiquement par l'application de gestion de projet
         
         if filename:
             try:
-                # Trier les blocs par usage
-                blocks_by_usage = sorted(self.project_blocks, key=lambda x: x.usage_count, reverse=True)
-                
-                content = f"""# 📊 Rapport d'Usage - Bibliothèque de Blocs
-
-    *Généré le : {datetime.datetime.now().strftime('%d/%m/%Y à %H:%M')}*
-    *Total de blocs : {len(self.project_blocks)}*
-
-    ## 📈 Statistiques Globales
-
-    """
-                
-                # Statistiques générales
-                total_usage = sum(b.usage_count for b in self.project_blocks)
-                used_blocks = len([b for b in self.project_blocks if b.usage_count > 0])
-                avg_success = sum(b.success_rate for b in self.project_blocks if b.usage_count > 0) / max(used_blocks, 1)
-                
-                content += f"""- **Total d'utilisations** : {total_usage}
-    - **Blocs utilisés** : {used_blocks}/{len(self.project_blocks)} ({used_blocks/len(self.project_blocks)*100:.0f}%)
-    - **Taux de succès moyen** : {avg_success:.0f}%
-    - **Blocs inutilisés** : {len(self.project_blocks) - used_blocks}
-
-    """
-                
-                # Top 10 des blocs les plus utilisés
-                content += "## 🏆 Top 10 - Blocs les Plus Utilisés\n\n"
-                
-                for i, block in enumerate(blocks_by_usage[:10]):
-                    if block.usage_count > 0:
-                        success_indicator = "🟢" if block.success_rate > 80 else "🟡" if block.success_rate > 60 else "🔴"
-                        content += f"{i+1}. **{block.name}** {success_indicator}\n"
-                        content += f"   - Utilisé {block.usage_count} fois\n"
-                        content += f"   - Succès : {block.success_rate:.0f}%\n"
-                        content += f"   - Durée moyenne : {block.average_duration:.0f}j\n"
-                        content += f"   - Catégorie : {block.category}\n\n"
-                
-                # Analyse par catégorie
-                content += "## 🏷️ Analyse par Catégorie\n\n"
-                
-                categories = {}
-                for block in self.project_blocks:
-                    if block.category not in categories:
-                        categories[block.category] = {
-                            'count': 0, 'total_usage': 0, 'avg_success': [], 'blocks': []
-                        }
-                    categories[block.category]['count'] += 1
-                    categories[block.category]['total_usage'] += block.usage_count
-                    if block.usage_count > 0:
-                        categories[block.category]['avg_success'].append(block.success_rate)
-                    categories[block.category]['blocks'].append(block)
-                
-                for category, data in sorted(categories.items()):
-                    avg_success_cat = sum(data['avg_success']) / max(len(data['avg_success']), 1)
-                    content += f"### {block.get_category_icon() if hasattr(block, 'get_category_icon') else '📦'} {category}\n\n"
-                    content += f"- **Nombre de blocs** : {data['count']}\n"
-                    content += f"- **Utilisations totales** : {data['total_usage']}\n"
-                    content += f"- **Succès moyen** : {avg_success_cat:.0f}%\n"
-                    content += f"- **Blocs utilisés** : {len(data['avg_success'])}/{data['count']}\n\n"
-                
-                # Analyse par domaine
-                content += "## 🌐 Analyse par Domaine\n\n"
-                
-                domains = {}
-                for block in self.project_blocks:
-                    domain = block.domain or "Non spécifié"
-                    if domain not in domains:
-                        domains[domain] = {'count': 0, 'total_usage': 0, 'blocks': []}
-                    domains[domain]['count'] += 1
-                    domains[domain]['total_usage'] += block.usage_count
-                    domains[domain]['blocks'].append(block)
-                
-                for domain, data in sorted(domains.items(), key=lambda x: x[1]['total_usage'], reverse=True):
-                    content += f"- **{domain}** : {data['count']} blocs, {data['total_usage']} utilisations\n"
-                
-                # Blocs problématiques
-                problematic_blocks = [b for b in self.project_blocks if b.usage_count > 0 and b.success_rate < 70]
-                if problematic_blocks:
-                    content += "\n## ⚠️ Blocs à Améliorer (< 70% de succès)\n\n"
-                    for block in sorted(problematic_blocks, key=lambda x: x.success_rate):
-                        content += f"- **{block.name}** : {block.success_rate:.0f}% de succès ({block.usage_count} utilisations)\n"
-                        if block.notes:
-                            content += f"  Notes : {block.notes[:100]}...\n"
-                        content += "\n"
-                
-                # Recommandations
-                content += "\n## 💡 Recommandations\n\n"
-                
-                unused_blocks = [b for b in self.project_blocks if b.usage_count == 0]
-                if unused_blocks:
-                    content += f"1. **Promouvoir l'utilisation** : {len(unused_blocks)} blocs n'ont jamais été utilisés\n"
-                
-                if problematic_blocks:
-                    content += f"2. **Améliorer la qualité** : {len(problematic_blocks)} blocs ont un taux de succès faible\n"
-                
-                high_success_blocks = [b for b in self.project_blocks if b.usage_count > 2 and b.success_rate > 90]
-                if high_success_blocks:
-                    content += f"3. **Dupliquer les bonnes pratiques** : {len(high_success_blocks)} blocs ont un excellent taux de succès\n"
-                
-                content += f"\n---\n\n*Rapport généré automatiquement par l'application de gestion de projet*"
-                
                 with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                    f.write(usage_report(self.project_blocks))
                 
                 messagebox.showinfo("Rapport généré", 
                                 f"Rapport d'usage sauvegardé avec succès !\n\n"
@@ -6868,13 +6894,18 @@ Document généré automatiquement par l'application de gestion de projet
             if not title_entry.get().strip():
                 messagebox.showerror("Erreur", "Le titre est obligatoire!")
                 return
+            # Même lecture qu'à l'import du bloc : date, J+n ou Semaine n
+            due_text = due_entry.get().strip()
+            if due_text and parse_task_date(due_text, datetime.date.today()) is None:
+                messagebox.showerror("Erreur", "L'échéance doit être une date (JJ/MM/AAAA) ou un délai (J+5, Semaine 2)!")
+                return
             
             new_task_data = {
                 'title': title_entry.get().strip(),
                 'description': desc_textbox.get("1.0", "end-1c"),
                 'priority': priority_var.get(),
                 'assignee': assignee_entry.get().strip(),
-                'due_date': due_entry.get().strip(),
+                'due_date': due_text,
                 'status': status_var.get(),
                 'notes': notes_textbox.get("1.0", "end-1c"),
                 'created_date': datetime.datetime.now().strftime('%d/%m/%Y')
@@ -6994,92 +7025,49 @@ Document généré automatiquement par l'application de gestion de projet
             return
         
         try:
-            # Créer la structure de données complète du projet
-            project_data = {
-                'metadata': {
-                    'project_name': os.path.splitext(os.path.basename(filename))[0],
-                    'save_date': datetime.datetime.now().isoformat(),
-                    'app_version': '1.0',
-                    'file_type': 'prjt',
-                    'description': f'Projet sauvegardé le {datetime.datetime.now().strftime("%d/%m/%Y à %H:%M")}'
-                },
-                
-                # Données de la charte de projet
-                'charter_data': getattr(self, 'charter_data', {}),
-                
-                # Données de l'arbre
-                'tree_data': {
-                    'nodes': self.serialize_all_tree_nodes() if hasattr(self, 'tree_nodes') and self.tree_nodes else [],
-                    'selected_node': self.selected_tree_node.text if hasattr(self, 'selected_tree_node') and self.selected_tree_node else None
-                },
-                
-                # Données des tâches
-                'tasks_data': {
-                    'tasks': [task.to_dict() for task in getattr(self, 'tasks', [])],
-                    'view_mode': getattr(self, 'task_view_mode', 'kanban')
-                },
-                
-                # Données du journal
-                'log_data': {
-                    'entries': [entry.to_dict() for entry in getattr(self, 'log_entries', [])],
-                    'filters': {
+            # Projet complet, avec les réglages des modules (affichage, filtres)
+            project = Project(
+                name=os.path.splitext(os.path.basename(filename))[0],
+                charter_data=getattr(self, 'charter_data', {}),
+                tree_nodes=getattr(self, 'tree_nodes', []),
+                selected_node=getattr(self, 'selected_tree_node', None),
+                tasks=self.tasks,
+                log_entries=getattr(self, 'log_entries', []),
+                documents=getattr(self, 'documents', []),
+                blocks=getattr(self, 'project_blocks', []),
+                settings={
+                    'tasks_data': {'view_mode': getattr(self, 'task_view_mode', 'kanban')},
+                    'log_data': {'filters': {
                         'author': getattr(self, 'log_filter_author', 'Tous'),
                         'category': getattr(self, 'log_filter_category', 'Toutes'),
                         'date_from': getattr(self, 'log_filter_date_from', ''),
                         'date_to': getattr(self, 'log_filter_date_to', '')
+                    }},
+                    'documents_data': {
+                        'view_mode': getattr(self, 'doc_view_mode', 'grid'),
+                        'filters': {
+                            'category': getattr(self, 'doc_filter_category', 'Toutes'),
+                            'node': getattr(self, 'doc_filter_node', 'Tous')
+                        }
+                    },
+                    'blocks_data': {
+                        'view_mode': getattr(self, 'block_view_mode', 'grid'),
+                        'filters': {
+                            'category': getattr(self, 'block_filter_category', 'Toutes'),
+                            'domain': getattr(self, 'block_filter_domain', 'Tous')
+                        }
+                    },
+                    'ui_config': {
+                        'appearance_mode': ctk.get_appearance_mode(),
+                        'last_module': self.get_current_module(),
+                        'window_size': f"{self.winfo_width()}x{self.winfo_height()}",
+                        'window_position': f"+{self.winfo_x()}+{self.winfo_y()}"
                     }
-                },
-                
-                # Données des documents
-                'documents_data': {
-                    'documents': [self.serialize_document(doc) for doc in getattr(self, 'documents', [])],
-                    'view_mode': getattr(self, 'doc_view_mode', 'grid'),
-                    'filters': {
-                        'category': getattr(self, 'doc_filter_category', 'Toutes'),
-                        'node': getattr(self, 'doc_filter_node', 'Tous')
-                    }
-                },
-                
-                # Données des blocs (référence seulement)
-                'blocks_data': {
-                    'used_blocks': [block.to_dict() for block in getattr(self, 'project_blocks', [])],
-                    'view_mode': getattr(self, 'block_view_mode', 'grid'),
-                    'filters': {
-                        'category': getattr(self, 'block_filter_category', 'Toutes'),
-                        'domain': getattr(self, 'block_filter_domain', 'Tous')
-                    }
-                },
-                
-                # Configuration de l'interface
-                'ui_config': {
-                    'appearance_mode': ctk.get_appearance_mode(),
-                    'last_module': self.get_current_module(),
-                    'window_size': f"{self.winfo_width()}x{self.winfo_height()}",
-                    'window_position': f"+{self.winfo_x()}+{self.winfo_y()}"
                 }
-            }
+            )
             
-            # Sauvegarder le fichier principal
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(project_data, f, ensure_ascii=False, indent=2)
-            
-            # Sauvegarder les fichiers associés si nécessaire
-            project_dir = os.path.splitext(filename)[0] + "_files"
-            if not os.path.exists(project_dir):
-                os.makedirs(project_dir)
-            
-            # Copier les documents dans le dossier du projet
-            documents_saved = 0
-            if hasattr(self, 'documents') and self.documents:
-                documents_project_dir = os.path.join(project_dir, "documents")
-                if not os.path.exists(documents_project_dir):
-                    os.makedirs(documents_project_dir)
-                
-                for doc in self.documents:
-                    if os.path.exists(doc.stored_path):
-                        new_path = os.path.join(documents_project_dir, f"{doc.id}_{doc.filename}")
-                        shutil.copy2(doc.stored_path, new_path)
-                        documents_saved += 1
+            # Fichier principal et copies des documents dans le dossier du projet
+            documents_saved = save_project_file(project, filename)
             
             # Message de confirmation
             message = f"Projet sauvegardé avec succès !\n\n"
@@ -7101,6 +7089,7 @@ Document généré automatiquement par l'application de gestion de projet
                 )
             
             self.update_status(f"Projet sauvegardé : {os.path.basename(filename)}")
+            self.start_catalog_indexing()
             
         except Exception as e:
             messagebox.showerror("Erreur", f"Erreur lors de la sauvegarde :\n{str(e)}")
@@ -7112,9 +7101,11 @@ Document généré automatiquement par l'application de gestion de projet
             title="Ouvrir un projet"
         )
         
-        if not filename:
-            return
-        
+        if filename:
+            self.open_project_file(filename)
+            
+    def open_project_file(self, filename):
+        """Charger le projet du fichier filename (boîte de dialogue ou catalogue de l'accueil)"""
         # Demander confirmation si des données existent déjà
         if self.has_project_data():
             if not messagebox.askyesno("Confirmation", 
@@ -7126,11 +7117,9 @@ Document généré automatiquement par l'application de gestion de projet
         
         try:
             # Charger le fichier
-            with open(filename, 'r', encoding='utf-8') as f:
-                project_data = json.load(f)
-            
-            # Vérifier la structure
-            if 'metadata' not in project_data:
+            try:
+                project_data = read_project_data(filename)
+            except ProjectFormatError:
                 messagebox.showerror("Erreur", "Format de fichier invalide !")
                 return
             
@@ -7143,83 +7132,68 @@ Document généré automatiquement par l'application de gestion de projet
                                         f"Voulez-vous quand même essayer de l'ouvrir ?"):
                     return
             
+            project = project_from_data(project_data, filename)
+            
             # Effacer les données actuelles
             self.clear_all_project_data()
             
-            # Charger les métadonnées
-            project_name = metadata.get('project_name', 'Projet sans nom')
-            save_date = metadata.get('save_date', 'Date inconnue')
-            
-            # Charger la charte de projet
-            self.charter_data = project_data.get('charter_data', {})
-            
-            # Charger l'arbre
-            tree_data = project_data.get('tree_data', {})
-            if tree_data.get('nodes'):
-                self.load_tree_from_data(tree_data['nodes'])
-                # Restaurer la sélection
-                selected_node_text = tree_data.get('selected_node')
-                if selected_node_text and hasattr(self, 'tree_nodes'):
-                    for node in self.tree_nodes:
-                        if node.text == selected_node_text:
-                            self.selected_tree_node = node
-                            node.selected = True
-                            break
-            
-            # Charger les tâches
-            tasks_data = project_data.get('tasks_data', {})
-            self.tasks = []
-            for task_dict in tasks_data.get('tasks', []):
-                task = Task.from_dict(task_dict, getattr(self, 'tree_nodes', []))
-                self.tasks.append(task)
-            self.task_view_mode = tasks_data.get('view_mode', 'kanban')
-            
-            # Charger le journal
-            log_data = project_data.get('log_data', {})
-            self.log_entries = []
-            for entry_dict in log_data.get('entries', []):
-                entry = LogEntry.from_dict(entry_dict)
-                self.log_entries.append(entry)
-            
-            # Restaurer les filtres du journal
-            log_filters = log_data.get('filters', {})
+            project_name = project.name
+            save_date = project.save_date or 'Date inconnue'
+            
+            # Charte et arbre
+            self.charter_data = project.charter_data
+            if not hasattr(self, 'tree_nodes'):
+                self.tree_nodes = []
+            self.tree_nodes.extend(project.tree_nodes)
+            self.tree_rollup.restructure()
+            self.selected_tree_node = project.selected_node
+            if project.selected_node:
+                project.selected_node.selected = True
+            
+            # Tâches
+            settings = project.settings
+            self.tasks.extend(project.tasks)
+            self.task_schedule_stale = True
+            self.task_view_mode = settings['tasks_data'].get('view_mode', 'kanban')
+            
+            # Journal et ses filtres
+            self.log_entries = project.log_entries
+            log_filters = settings['log_data'].get('filters', {})
             self.log_filter_author = log_filters.get('author', 'Tous')
             self.log_filter_category = log_filters.get('category', 'Toutes')
             self.log_filter_date_from = log_filters.get('date_from', '')
             self.log_filter_date_to = log_filters.get('date_to', '')
             
-            # Charger les documents
-            documents_data = project_data.get('documents_data', {})
-            self.documents = []
-            project_dir = os.path.splitext(filename)[0] + "_files"
-            documents_project_dir = os.path.join(project_dir, "documents")
-            
-            loaded_docs = 0
-            for doc_dict in documents_data.get('documents', []):
-                doc = self.deserialize_document(doc_dict, documents_project_dir)
-                if doc:
-                    self.documents.append(doc)
-                    loaded_docs += 1
-            
-            self.doc_view_mode = documents_data.get('view_mode', 'grid')
-            doc_filters = documents_data.get('filters', {})
+            # Documents : copies du dossier du projet vers le stockage de l'application
+            if not hasattr(self, 'documents_storage_path'):
+                self.documents_storage_path = os.path.join(os.getcwd(), "documents_storage")
+            os.makedirs(self.documents_storage_path, exist_ok=True)
+            for doc in project.documents:
+                new_stored_path = os.path.join(self.documents_storage_path, stored_name(doc))
+                shutil.copy2(doc.stored_path, new_stored_path)
+                doc.stored_path = new_stored_path
+            for warning in project.warnings:
+                print(f"⚠️ {warning}")
+            for doc in project.missing_documents:
+                print(f"⚠️ Document manquant : {doc.filename}")
+            self.documents = project.documents
+            loaded_docs = len(self.documents)
+            
+            self.tree_rollup.sync_documents(self.documents)
+            self.doc_view_mode = settings['documents_data'].get('view_mode', 'grid')
+            doc_filters = settings['documents_data'].get('filters', {})
             self.doc_filter_category = doc_filters.get('category', 'Toutes')
             self.doc_filter_node = doc_filters.get('node', 'Tous')
             
-            # Charger les blocs
-            blocks_data = project_data.get('blocks_data', {})
-            self.project_blocks = []
-            for block_dict in blocks_data.get('used_blocks', []):
-                block = ProjectBlock.from_dict(block_dict)
-                self.project_blocks.append(block)
-            
-            self.block_view_mode = blocks_data.get('view_mode', 'grid')
-            block_filters = blocks_data.get('filters', {})
+            # Blocs
+            self.project_blocks = project.blocks
+            self.block_view_mode = settings['blocks_data'].get('view_mode', 'grid')
+            block_filters = settings['blocks_data'].get('filters', {})
             self.block_filter_category = block_filters.get('category', 'Toutes')
             self.block_filter_domain = block_filters.get('domain', 'Tous')
             
             # Restaurer la configuration de l'interface
-            ui_config = project_data.get('ui_config', {})
+            ui_config = settings['ui_config']
             if ui_config.get('appearance_mode'):
                 ctk.set_appearance_mode(ui_config['appearance_mode'])
             
@@ -7250,138 +7224,6 @@ Document généré automatiquement par l'application de gestion de projet
         except Exception as e:
             messagebox.showerror("Erreur", f"Erreur lors du chargement :\n{str(e)}")
 
-    def serialize_all_tree_nodes(self):
-        """Sérialiser tous les nœuds de l'arbre"""
-        if not hasattr(self, 'tree_nodes') or not self.tree_nodes:
-            return []
-        
-        # Trouver les nœuds racines (sans parent)
-        root_nodes = [node for node in self.tree_nodes if node.parent is None]
-        
-        def node_to_dict(node):
-            """Convertir un nœud en dictionnaire"""
-            return {
-                'text': node.text,
-                'x': node.x,
-                'y': node.y,
-                'width': getattr(node, 'width', 80),
-                'height': getattr(node, 'height', 40),
-                'color': getattr(node, 'color', '#E3F2FD'),
-                'text_color': getattr(node, 'text_color', '#000000'),
-                'border_color': getattr(node, 'border_color', '#2196F3'),
-                'selected': getattr(node, 'selected', False),
-                'children': [node_to_dict(child) for child in getattr(node, 'children', [])]
-            }
-        
-        return [node_to_dict(root) for root in root_nodes]
-
-    def load_tree_from_data(self, nodes_data):
-        """Charger l'arbre depuis les données sérialisées"""
-        if not hasattr(self, 'tree_nodes'):
-            self.tree_nodes = []
-        else:
-            self.tree_nodes.clear()
-        
-        self.selected_tree_node = None
-        
-        def create_node_from_dict(node_dict, parent=None):
-            node = TreeNode(
-                text=node_dict.get('text', 'Nœud'),
-                x=node_dict.get('x', 100),
-                y=node_dict.get('y', 100),
-                parent=parent
-            )
-            
-            node.width = node_dict.get('width', 80)
-            node.height = node_dict.get('height', 40)
-            node.color = node_dict.get('color', '#E3F2FD')
-            node.text_color = node_dict.get('text_color', '#000000')
-            node.border_color = node_dict.get('border_color', '#2196F3')
-            node.selected = node_dict.get('selected', False)
-            
-            if parent:
-                parent.add_child(node)
-            
-            self.tree_nodes.append(node)
-            
-            # Créer les enfants récursivement
-            for child_dict in node_dict.get('children', []):
-                create_node_from_dict(child_dict, node)
-            
-            return node
-        
-        # Créer tous les nœuds
-        for root_dict in nodes_data:
-            create_node_from_dict(root_dict)
-
-    def serialize_document(self, doc):
-        """Sérialiser un document pour la sauvegarde"""
-        # Vérifier que upload_date est un datetime
-        upload_date_iso = doc.upload_date.isoformat() if isinstance(doc.upload_date, datetime.datetime) else datetime.datetime.now().isoformat()
-        
-        return {
-            'id': getattr(doc, 'id', id(doc)),
-            'filename': doc.filename,
-            'original_path': getattr(doc, 'file_path', ''),
-            'stored_path': getattr(doc, 'stored_path', ''),
-            'category': doc.category,
-            'version': doc.version,
-            'description': getattr(doc, 'description', ''),
-            'tags': getattr(doc, 'tags', []),
-            'upload_date': upload_date_iso,
-            'file_size': getattr(doc, 'file_size', 0),
-            'file_type': getattr(doc, 'file_type', ''),
-            'linked_node_text': doc.linked_node.text if getattr(doc, 'linked_node', None) else None
-        }
-
-    def deserialize_document(self, doc_dict, documents_dir):
-        """Désérialiser un document depuis la sauvegarde"""
-        try:
-            # Récréer le document
-            doc = Document(
-                filename=doc_dict.get('filename', ''),
-                file_path=doc_dict.get('original_path', ''),
-                category=doc_dict.get('category', 'General'),
-                version=doc_dict.get('version', '1.0'),
-                description=doc_dict.get('description', '')
-            )
-            
-            doc.id = doc_dict.get('id', id(doc))
-            doc.tags = doc_dict.get('tags', [])
-            doc.upload_date = datetime.datetime.fromisoformat(doc_dict.get('upload_date', datetime.datetime.now().isoformat()))
-            doc.file_size = doc_dict.get('file_size', 0)
-            doc.file_type = doc_dict.get('file_type', '')
-            
-            # Chercher le fichier dans le dossier du projet
-            expected_file = os.path.join(documents_dir, f"{doc.id}_{doc.filename}")
-            if os.path.exists(expected_file):
-                # Copier vers le stockage de l'application
-                if not hasattr(self, 'documents_storage_path'):
-                    self.documents_storage_path = os.path.join(os.getcwd(), "documents_storage")
-                    if not os.path.exists(self.documents_storage_path):
-                        os.makedirs(self.documents_storage_path)
-                
-                new_stored_path = os.path.join(self.documents_storage_path, f"{doc.id}_{doc.filename}")
-                shutil.copy2(expected_file, new_stored_path)
-                doc.stored_path = new_stored_path
-            else:
-                print(f"⚠️ Document manquant : {doc.filename}")
-                return None
-            
-            # Lier au nœud si spécifié
-            linked_node_text = doc_dict.get('linked_node_text')
-            if linked_node_text and hasattr(self, 'tree_nodes'):
-                for node in self.tree_nodes:
-                    if node.text == linked_node_text:
-                        doc.linked_node = node
-                        break
-            
-            return doc
-            
-        except Exception as e:
-            print(f"Erreur lors de la désérialisation du document : {str(e)}")
-            return None
-
     def has_project_data(self):
         """Vérifier si des données de projet existent"""
         return (hasattr(self, 'tree_nodes') and self.tree_nodes) or \
@@ -7400,6 +7242,7 @@ Document généré automatiquement par l'application de gestion de projet
         # Effacer les tâches
         if hasattr(self, 'tasks'):
             self.tasks.clear()
+        self.task_schedule_stale = True
         
         # Effacer le journal
         if hasattr(self, 'log_entries'):
@@ -7408,6 +7251,7 @@ Document généré automatiquement par l'application de gestion de projet
         # Effacer les documents
         if hasattr(self, 'documents'):
             self.documents.clear()
+            self.tree_rollup.sync_documents(self.documents)
         
         # Effacer les blocs
         if hasattr(self, 'project_blocks'):
@@ -7416,6 +7260,10 @@ Document généré automatiquement par l'application de gestion de projet
         # Effacer la charte
         self.charter_data = {}
         
+        # Tous les modules seront reconstruits avec les nouvelles données
+        self.views.reset()
+        self.undo_stack.clear()
+        
         # Réinitialiser les filtres
         self.task_view_mode = "kanban"
         self.doc_view_mode = "grid"
@@ -7431,24 +7279,7 @@ Document généré automatiquement par l'application de gestion de projet
 
     def get_current_module(self):
         """Obtenir le module actuellement affiché"""
-        title = self.main_title.cget("text")
-        
-        if "Accueil" in title:
-            return "home"
-        elif "Cadrage" in title:
-            return "charter"
-        elif "Arbre" in title:
-            return "tree"
-        elif "Tâches" in title:
-            return "tasks"
-        elif "Journal" in title:
-            return "log"
-        elif "Documents" in title:
-            return "documents"
-        elif "Blocs" in title:
-            return "blocks"
-        else:
-            return "home"
+        return self.views.current or "home"
 
     def restore_module_view(self, module):
         """Restaurer la vue d'un module"""
@@ -7511,9 +7342,9 @@ Document généré automatiquement par l'application de gestion de projet
         # Tâches
         tasks_count = len(getattr(self, 'tasks', []))
         if tasks_count > 0:
-            todo = len([t for t in self.tasks if t.status == "À faire"])
-            in_progress = len([t for t in self.tasks if t.status == "En cours"])
-            done = len([t for t in self.tasks if t.status == "Terminé"])
+            todo = self.tasks.count_by("status", "À faire")
+            in_progress = self.tasks.count_by("status", "En cours")
+            done = self.tasks.count_by("status", "Terminé")
             stats.append(f"✅ Tâches : {tasks_count} (🔄 {todo} à faire, ⚡ {in_progress} en cours, ✅ {done} terminées)")
         else:
             stats.append(f"✅ Tâches : {tasks_count}")
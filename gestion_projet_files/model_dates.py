@@ -0,0 +1,87 @@
+"""Lecture et écriture des dates du modèle (tâches, entrées du journal, blocs)
+
+Les objets du modèle conservent de vraies dates : datetime.date pour une échéance,
+datetime.datetime pour une date de création ou un horodatage. Les textes saisis ou
+lus dans un fichier (JJ/MM/AAAA, AAAA-MM-JJ, ISO 8601) ne sont convertis qu'ici ;
+l'affichage et la sauvegarde repassent aussi par ce module.
+"""
+
+import datetime
+import re
+
+DATE_FORMATS = ("%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y")
+DISPLAY_FORMAT = "%d/%m/%Y"
+
+# Échéances relatives des modèles de blocs : « J+5 » (5 jours après), « Semaine 2 »
+RELATIVE_DAY = re.compile(r"^J\s*([+-])\s*(\d+)$", re.IGNORECASE)
+RELATIVE_WEEK = re.compile(r"^(?:Semaine|S)\s*(\d+)$", re.IGNORECASE)
+
+
+def parse_date(value):
+    """Date (datetime.date) d'une valeur datetime, date ou texte ; None si illisible"""
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    if not value or not isinstance(value, str):
+        return None
+    value = value.strip()
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, date_format).date()
+        except ValueError:
+            pass
+    try:
+        return datetime.datetime.fromisoformat(value).date()
+    except ValueError:
+        return None
+
+
+def parse_relative_date(value, reference):
+    """Date d'une échéance relative (J+n, Semaine n) comptée depuis reference ; None sinon
+
+    « Semaine 1 » est la semaine qui commence à reference, « Semaine 2 » la suivante.
+    """
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    match = RELATIVE_DAY.match(value)
+    if match:
+        days = int(match.group(2))
+        return reference + datetime.timedelta(days=days if match.group(1) == "+" else -days)
+    match = RELATIVE_WEEK.match(value)
+    if match and int(match.group(1)) >= 1:
+        return reference + datetime.timedelta(weeks=int(match.group(1)) - 1)
+    return None
+
+
+def parse_task_date(value, reference=None):
+    """Échéance saisie : date absolue, ou relative (J+n, Semaine n) si reference est donnée ; None si illisible"""
+    day = parse_date(value)
+    if day is None and reference is not None:
+        day = parse_relative_date(value, parse_date(reference))
+    return day
+
+
+def parse_datetime(value):
+    """Date et heure (datetime.datetime) d'une valeur datetime, date ou texte ; None si illisible"""
+    if isinstance(value, datetime.datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.datetime.fromisoformat(value.strip())
+        except ValueError:
+            pass
+    day = parse_date(value)
+    return datetime.datetime.combine(day, datetime.time()) if day else None
+
+
+def format_date(value):
+    """Date au format d'affichage (JJ/MM/AAAA), chaîne vide sans date"""
+    day = parse_date(value)
+    return day.strftime(DISPLAY_FORMAT) if day else ""
+
+
+def to_iso(value):
+    """Date ou date et heure au format ISO 8601 pour la sauvegarde (None sans date)"""
+    return value.isoformat() if isinstance(value, datetime.date) else None
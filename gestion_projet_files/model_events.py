@@ -0,0 +1,86 @@
+"""Événements du modèle : noeuds créés, renommés ou supprimés, tâches liées ou déliées
+
+Les actions de l'utilisateur publient un événement par changement. Deux sortes
+d'abonnés :
+
+- subscribe(kind, handler) : appelé aussitôt, pour chaque événement de ce type ;
+- subscribe_batch(listener) : appelé une fois avec tous les événements d'un lot
+  (bloc with bus.batch(), ou un seul événement publié hors lot). Un abonné de lot
+  peut publier à son tour : les nouveaux événements forment un tour suivant. Les
+  abonnés last=True (interface) ne sont appelés qu'une fois, avec tous les
+  événements du lot et des tours suivants : un import en masse ne déclenche qu'un
+  seul rafraîchissement.
+"""
+
+from collections import namedtuple
+
+NODE_CREATED = "node_created"
+NODE_RENAMED = "node_renamed"
+NODE_DELETED = "node_deleted"
+TASK_LINKED = "task_linked"
+TASK_UNLINKED = "task_unlinked"
+NODE_EVENTS = (NODE_CREATED, NODE_RENAMED, NODE_DELETED)
+
+# target : noeud ou tâche ; value : ancien texte (renommage) ou noeud (lien)
+Event = namedtuple("Event", "kind target value")
+
+
+class EventBus:
+    def __init__(self):
+        self.handlers = {}
+        self.batch_listeners = []
+        self.last_listeners = []
+        # Événements publiés pas encore remis aux abonnés de lot, et ceux du lot en cours
+        self.pending = []
+        self.delivered = []
+        self.depth = 0
+
+    def subscribe(self, kind, handler):
+        self.handlers.setdefault(kind, []).append(handler)
+
+    def subscribe_batch(self, listener, last=False):
+        (self.last_listeners if last else self.batch_listeners).append(listener)
+
+    def publish(self, kind, target, value=None):
+        event = Event(kind, target, value)
+        self.pending.append(event)
+        with self.batch():
+            for handler in self.handlers.get(kind, ()):
+                handler(event)
+        return event
+
+    def batch(self):
+        """Bloc with : les abonnés de lot sont appelés une fois, à la sortie du bloc le plus externe"""
+        return _Batch(self)
+
+    def _flush(self):
+        self.depth += 1
+        try:
+            while self.pending:
+                events, self.pending = self.pending, []
+                self.delivered.extend(events)
+                for listener in self.batch_listeners:
+                    listener(events)
+        finally:
+            self.depth -= 1
+        events, self.delivered = self.delivered, []
+        if events:
+            for listener in self.last_listeners:
+                listener(events)
+
+
+class _Batch:
+    __slots__ = ("bus",)
+
+    def __init__(self, bus):
+        self.bus = bus
+
+    def __enter__(self):
+        self.bus.depth += 1
+        return self.bus
+
+    def __exit__(self, exc_type, exc, tb):
+        self.bus.depth -= 1
+        if not self.bus.depth:
+            self.bus._flush()
+        return False
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Traitement des fichiers projet (.prjt) en ligne de commande, sans interface graphique
+
+    python project_cli.py validate projets/
+    python project_cli.py convert projets/ -o convertis/
+    python project_cli.py export projets/ -o exports/ --formats charter-md log-md
+    python project_cli.py report projets/ -o rapports/
+
+Les fichiers, ou les dossiers (parcourus récursivement), sont répartis entre les
+processus d'un pool (--jobs ; 1 : tout dans le processus courant). Les fichiers
+produits reprennent l'arborescence des dossiers donnés.
+"""
+
+import argparse
+import functools
+import os
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from project_core import (PROJECT_EXTENSION, ProjectFormatError, charter_markdown, decision_log_markdown,
+                          document_report, load_project_file, project_documents_dir, project_from_data,
+                          read_project_data, save_project_file, usage_report, validate_project_data,
+                          write_charter_pdf)
+from task_repository import DONE_STATUS
+
+# Exports : format -> suffixe du fichier produit
+EXPORT_FORMATS = {
+    "charter-md": "_charte.md",
+    "charter-pdf": "_charte.pdf",
+    "log-md": "_journal.md",
+}
+
+# Rapports : nom -> suffixe du fichier produit
+REPORTS = {
+    "documents": "_documents.md",
+    "usage": "_blocs.md",
+}
+
+# Résultat du traitement d'un fichier ; messages : problèmes ou fichiers produits
+Result = namedtuple("Result", "path ok messages")
+
+
+def expand_paths(paths):
+    """(fichier, chemin relatif) des fichiers projet donnés ou contenus dans les dossiers donnés"""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, filenames in os.walk(path):
+                dirs.sort()
+                for filename in sorted(filenames):
+                    if filename.lower().endswith(PROJECT_EXTENSION):
+                        file_path = os.path.join(root, filename)
+                        yield file_path, os.path.relpath(file_path, path)
+        else:
+            yield path, os.path.basename(path)
+
+
+def output_path(options, relative, suffix):
+    """Fichier produit pour le projet de chemin relatif relative, dans le dossier de sortie"""
+    stem = os.path.splitext(relative)[0]
+    path = os.path.join(options['output_dir'], stem + suffix)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    return path
+
+
+def write_text(path, content):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return path
+
+
+def validate(path, relative, options):
+    data = read_project_data(path)
+    problems = validate_project_data(data, path)
+    # Le modèle doit aussi se construire sans erreur
+    project_from_data(data, path)
+    return not problems, problems
+
+
+def convert(path, relative, options):
+    """Réécrit le projet au format actuel (dates ISO, liens et dépendances normalisés)"""
+    project = load_project_file(path)
+    messages = project.warnings + [f"document « {doc.filename} » : copie manquante, conservé sans fichier"
+                                   for doc in project.missing_documents]
+    project.documents.extend(project.missing_documents)
+    target = output_path(options, relative, PROJECT_EXTENSION)
+    save_project_file(project, target, indent=options['indent'])
+    return True, messages + [target]
+
+
+def export(path, relative, options):
+    project = load_project_file(path)
+    outputs = []
+    for export_format in options['formats']:
+        target = output_path(options, relative, EXPORT_FORMATS[export_format])
+        if export_format == "charter-md":
+            outputs.append(write_text(target, charter_markdown(project.charter_data)))
+        elif export_format == "charter-pdf":
+            write_charter_pdf(project.charter_data, target)
+            outputs.append(target)
+        elif export_format == "log-md":
+            outputs.append(write_text(target, decision_log_markdown(project.log_entries)))
+    return True, outputs
+
+
+def report(path, relative, options):
+    project = load_project_file(path)
+    done = sum(1 for task in project.tasks if task.status == DONE_STATUS)
+    messages = [f"🌳 {len(project.tree_nodes)} noeuds, ✅ {done}/{len(project.tasks)} tâches, "
+                f"💬 {len(project.log_entries)} entrées, 📄 {len(project.documents)} documents, "
+                f"📦 {len(project.blocks)} blocs"]
+    if "documents" in options['reports'] and project.documents:
+        target = output_path(options, relative, REPORTS["documents"])
+        messages.append(write_text(target, document_report(project.documents, project_documents_dir(path))))
+    if "usage" in options['reports'] and project.blocks:
+        target = output_path(options, relative, REPORTS["usage"])
+        messages.append(write_text(target, usage_report(project.blocks)))
+    return True, messages
+
+
+COMMANDS = {
+    "validate": validate,
+    "convert": convert,
+    "export": export,
+    "report": report,
+}
+
+
+def process_file(command, options, item):
+    """Traite un fichier (dans un processus du pool) ; les erreurs deviennent un résultat en échec"""
+    path, relative = item
+    try:
+        ok, messages = COMMANDS[command](path, relative, options)
+    except ProjectFormatError as e:
+        return Result(path, False, [str(e)])
+    except ImportError as e:
+        return Result(path, False, [f"dépendance manquante : {e.name}"])
+    except Exception as e:
+        # Toute autre erreur (RecursionError d'un arbre trop profond...) n'échoue que ce fichier ;
+        # KeyboardInterrupt n'est pas une Exception et arrête le traitement
+        return Result(path, False, [f"{type(e).__name__} : {e}"])
+    return Result(path, ok, messages)
+
+
+def run(command, items, options, jobs=None):
+    """Résultats du traitement des fichiers items (voir expand_paths), dans leur ordre"""
+    items = list(items)
+    worker = functools.partial(process_file, command, options)
+    jobs = min(jobs or os.cpu_count() or 1, len(items) or 1)
+    if jobs == 1:
+        return [worker(item) for item in items]
+    # Lots de fichiers par processus : moins d'allers-retours pour les petits projets
+    chunksize = max(1, len(items) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(worker, items, chunksize=chunksize))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Validation, conversion, exports et rapports de fichiers projet")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_command(name, help_text, output=True):
+        command = subparsers.add_parser(name, help=help_text)
+        command.add_argument("paths", nargs="+", help="Fichiers .prjt ou dossiers qui en contiennent")
+        command.add_argument("-j", "--jobs", type=int, default=None,
+                             help="Processus en parallèle (défaut : nombre de processeurs)")
+        if output:
+            command.add_argument("-o", "--output-dir", required=True, help="Dossier des fichiers produits")
+        return command
+
+    add_command("validate", "Vérifier les fichiers projet", output=False)
+    convert_command = add_command("convert", "Réécrire les projets au format actuel")
+    convert_command.add_argument("--compact", action="store_true", help="JSON sans indentation")
+    export_command = add_command("export", "Exporter la charte et le journal")
+    export_command.add_argument("--formats", nargs="+", choices=list(EXPORT_FORMATS),
+                                default=["charter-md", "log-md"], help="Exports à produire")
+    report_command = add_command("report", "Résumé des projets et rapports documents / blocs")
+    report_command.add_argument("--reports", nargs="+", choices=list(REPORTS), default=list(REPORTS),
+                                help="Rapports à produire")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    options = {
+        'output_dir': getattr(args, 'output_dir', None),
+        'indent': None if getattr(args, 'compact', False) else 2,
+        'formats': getattr(args, 'formats', []),
+        'reports': getattr(args, 'reports', []),
+    }
+
+    items = list(expand_paths(args.paths))
+    if not items:
+        print("⚠️ Aucun fichier projet trouvé")
+        return 1
+
+    start = time.perf_counter()
+    results = run(args.command, items, options, args.jobs)
+    elapsed = time.perf_counter() - start
+
+    failures = 0
+    for result in results:
+        failures += not result.ok
+        print(f"{'✅' if result.ok else '❌'} {result.path}")
+        for message in result.messages:
+            print(f"   {message}")
+    print(f"📊 {len(results)} projets, {failures} en échec, en {elapsed:.2f} s "
+          f"({len(results) / max(elapsed, 1e-9):.0f} projets/s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,997 @@
+"""Modèle d'un projet et fichiers .prjt, sans interface graphique
+
+Classes du modèle (noeuds de l'arbre, tâches, journal, documents, blocs), lecture
+et écriture des fichiers projet, validation, rapports et exports. L'application Tk
+(main.py) et l'outil en ligne de commande (project_cli.py) s'en servent ; ce module
+n'importe ni tkinter ni customtkinter.
+"""
+
+import datetime
+import json
+import os
+import shutil
+
+from model_dates import format_date, parse_date, parse_datetime, to_iso
+from task_repository import WATCHED_FIELDS
+
+PROJECT_EXTENSION = ".prjt"
+PROJECT_FILE_TYPE = "prjt"
+APP_VERSION = "1.0"
+
+
+class ProjectFormatError(ValueError):
+    """Fichier qui n'est pas un projet (.prjt) lisible"""
+
+
+class TreeNode:
+    def __init__(self, text="Node", x=0, y=0, parent=None):
+        self.text = text
+        self.x = x
+        self.y = y
+        self.parent = parent
+        self.children = []
+        self.width = 80
+        self.height = 40
+        self.color = "#E3F2FD"
+        self.text_color = "#000000"
+        self.border_color = "#2196F3"
+        self.selected = False
+        self.canvas_id = None
+        self.text_id = None
+        self.badge_ids = []
+        
+    def add_child(self, child):
+        child.parent = self
+        self.children.append(child)
+        
+    def remove_child(self, child):
+        if child in self.children:
+            child.parent = None
+            self.children.remove(child)
+            
+    def get_depth(self):
+        if self.parent is None:
+            return 0
+        return self.parent.get_depth() + 1
+        
+    def get_all_descendants(self):
+        descendants = []
+        for child in self.children:
+            descendants.append(child)
+            descendants.extend(child.get_all_descendants())
+        return descendants
+
+class Task:
+    def __init__(self, title="Nouvelle tâche", description="", status="À faire", priority="Moyenne", assignee="", due_date="", linked_node=None,
+                 duration=1, dependencies=None):
+        self.id = id(self)  # ID unique basé sur l'adresse mémoire
+        self.title = title
+        self.description = description
+        self.status = status  # "À faire", "En cours", "Terminé"
+        self.priority = priority  # "Basse", "Moyenne", "Critique"
+        self.assignee = assignee
+        self.due_date = due_date
+        self.linked_node = linked_node  # Lien vers un noeud de l'arbre
+        self.duration = duration  # Durée estimée en jours
+        self.dependencies = dependencies or []  # Tâches à terminer avant de commencer celle-ci
+        self.orphaned = False  # Noeud lié supprimé du diagramme
+        self.created_date = datetime.datetime.now()
+        
+    def __setattr__(self, name, value):
+        # Dates toujours typées : échéance (date ou None) et création (datetime) ;
+        # une échéance illisible (« fin du lot 2 ») est gardée telle quelle dans due_date_text
+        if name == 'due_date':
+            text = value.strip() if isinstance(value, str) else ""
+            value = parse_date(value)
+            object.__setattr__(self, 'due_date_text', text if value is None else "")
+        elif name == 'created_date':
+            value = parse_datetime(value) or datetime.datetime.now()
+        # Une tâche de la liste du projet (TaskRepository) tient ses index à jour
+        repository = self.__dict__.get('repository')
+        if repository is not None and name in WATCHED_FIELDS:
+            old_value = self.__dict__.get(name)
+            object.__setattr__(self, name, value)
+            repository.reindex(self, name, old_value)
+        else:
+            object.__setattr__(self, name, value)
+        
+    def to_dict(self):
+        """Convertir la tâche en dictionnaire pour la sauvegarde"""
+        return {
+            'title': self.title,
+            'description': self.description,
+            'status': self.status,
+            'priority': self.priority,
+            'assignee': self.assignee,
+            'due_date': to_iso(self.due_date) or self.due_date_text or None,
+            'linked_node_text': self.linked_node.text if self.linked_node else None,
+            'id': self.id,
+            'duration': self.duration,
+            'depends_on': [task.id for task in self.dependencies],
+            'orphaned': self.orphaned,
+            'created_date': to_iso(self.created_date)
+        }
+    
+    @property
+    def due_date_label(self):
+        """Échéance affichée : date JJ/MM/AAAA, sinon le texte illisible conservé"""
+        return format_date(self.due_date) or self.due_date_text
+
+    @classmethod
+    def from_dict(cls, data, tree_nodes=None):
+        """Créer une tâche depuis un dictionnaire"""
+        task = cls(
+            title=data.get('title', ''),
+            description=data.get('description', ''),
+            status=data.get('status', 'À faire'),
+            priority=data.get('priority', 'Moyenne'),
+            assignee=data.get('assignee', ''),
+            due_date=data.get('due_date', ''),
+            duration=data.get('duration', 1)
+        )
+        task.orphaned = data.get('orphaned', False)
+        
+        # Restaurer le lien avec le nœud
+        linked_node_text = data.get('linked_node_text')
+        if linked_node_text and tree_nodes:
+            for node in tree_nodes:
+                if node.text == linked_node_text:
+                    task.linked_node = node
+                    break
+        
+        # Restaurer la date de création (date du jour si absente ou illisible)
+        if 'created_date' in data:
+            task.created_date = data['created_date']
+        
+        return task
+    
+    @staticmethod
+    def restore_dependencies(tasks, tasks_data):
+        """Rétablir les dépendances de tâches créées par from_dict (ids de la sauvegarde)"""
+        saved_ids = {data.get('id'): task for task, data in zip(tasks, tasks_data) if data.get('id') is not None}
+        for task, data in zip(tasks, tasks_data):
+            task.dependencies = [saved_ids[task_id] for task_id in data.get('depends_on', [])
+                                 if task_id in saved_ids and saved_ids[task_id] is not task]
+    
+
+class LogEntry:
+    def __init__(self, entry_type="manual", title="", description="", author="", category="Decision"):
+        self.id = id(self)
+        self.timestamp = datetime.datetime.now()
+        self.entry_type = entry_type  # "auto" (automatique) ou "manual"
+        self.title = title
+        self.description = description
+        self.author = author
+        self.category = category  # "Decision", "Technical", "Meeting", "Node", "Task", "Status"
+        
+    def to_dict(self):
+        """Convertir l'entrée en dictionnaire pour la sauvegarde"""
+        return {
+            'entry_type': self.entry_type,
+            'title': self.title,
+            'description': self.description,
+            'author': self.author,
+            'category': self.category,
+            'timestamp': to_iso(self.timestamp)
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Créer une entrée depuis un dictionnaire"""
+        entry = cls(
+            entry_type=data.get('entry_type', 'manual'),
+            title=data.get('title', ''),
+            description=data.get('description', ''),
+            author=data.get('author', ''),
+            category=data.get('category', 'Other')
+        )
+        
+        # Restaurer le timestamp
+        if 'timestamp' in data:
+            entry.timestamp = parse_datetime(data['timestamp']) or datetime.datetime.now()
+        
+        return entry
+
+class Document:
+    def __init__(self, filename="", file_path="", category="General", version="1.0", linked_node=None, description=""):
+        self.id = id(self)
+        self.filename = filename
+        self.file_path = file_path
+        self.stored_path = ""
+        self.category = category
+        self.version = version
+        self.linked_node = linked_node
+        self.description = description
+        self.tags = []
+        self.upload_date = datetime.datetime.now()
+        self.file_size = os.path.getsize(file_path) if file_path and os.path.exists(file_path) else 0
+        self.file_type = os.path.splitext(filename)[1].lower() if filename else ""
+        
+    def format_file_size(self):
+        """Formater la taille du fichier de manière lisible"""
+        if self.file_size < 1024:
+            return f"{self.file_size} B"
+        elif self.file_size < 1024 * 1024:
+            return f"{self.file_size / 1024:.1f} KB"
+        elif self.file_size < 1024 * 1024 * 1024:
+            return f"{self.file_size / (1024 * 1024):.1f} MB"
+        else:
+            return f"{self.file_size / (1024 * 1024 * 1024):.1f} GB"
+            
+    def get_file_type_icon(self):
+        """Obtenir l'icône selon le type de fichier"""
+        icons = {
+            ".pdf": "📄", ".doc": "📝", ".docx": "📝", ".txt": "📝", ".md": "📝",
+            ".xls": "📊", ".xlsx": "📊", ".csv": "📊",
+            ".ppt": "📽️", ".pptx": "📽️",
+            ".jpg": "🖼️", ".jpeg": "🖼️", ".png": "🖼️", ".gif": "🖼️", ".bmp": "🖼️",
+            ".zip": "📦", ".rar": "📦", ".7z": "📦",
+            ".py": "🐍", ".js": "📜", ".html": "🌐", ".css": "🎨", ".json": "📋"
+        }
+        return icons.get(self.file_type, "📄")
+        
+    def get_category_icon(self):
+        """Obtenir l'icône selon la catégorie"""
+        icons = {
+            "Spécifications": "📋", "Tests": "🧪", "Livrables": "📦",
+            "Documentation": "📚", "Images": "🖼️", "Code": "💻",
+            "Rapports": "📊", "General": "📄"
+        }
+        return icons.get(self.category, "📄")
+    def to_dict(self):
+        """Convertir le document en dictionnaire pour la sauvegarde"""
+        return {
+            'id': getattr(self, 'id', id(self)),
+            'filename': self.filename,
+            'file_path': getattr(self, 'file_path', ''),
+            'stored_path': getattr(self, 'stored_path', ''),
+            'category': self.category,
+            'version': self.version,
+            'description': getattr(self, 'description', ''),
+            'tags': getattr(self, 'tags', []),
+            'upload_date': to_iso(self.upload_date),
+            'file_size': getattr(self, 'file_size', 0),
+            'file_type': getattr(self, 'file_type', ''),
+            'linked_node_text': self.linked_node.text if getattr(self, 'linked_node', None) else None
+        }
+    
+    @classmethod
+    def from_dict(cls, data, tree_nodes=None):
+        """Créer un document depuis un dictionnaire"""
+        doc = cls(
+            filename=data.get('filename', ''),
+            file_path=data.get('file_path', ''),
+            category=data.get('category', 'General'),
+            version=data.get('version', '1.0')
+        )
+        
+        # Restaurer les attributs
+        doc.id = data.get('id', id(doc))
+        doc.stored_path = data.get('stored_path', '')
+        doc.description = data.get('description', '')
+        doc.tags = data.get('tags', [])
+        doc.file_size = data.get('file_size', 0)
+        doc.file_type = data.get('file_type', '')
+        
+        # Restaurer la date
+        if 'upload_date' in data:
+            doc.upload_date = parse_datetime(data['upload_date']) or datetime.datetime.now()
+        
+        # Restaurer le lien avec le nœud
+        linked_node_text = data.get('linked_node_text')
+        if linked_node_text and tree_nodes:
+            for node in tree_nodes:
+                if node.text == linked_node_text:
+                    doc.linked_node = node
+                    break
+        
+        return doc
+
+class ProjectBlock:
+    """Classe pour représenter un bloc de projet réutilisable"""
+    def __init__(self, name="Nouveau Bloc", description="", category="General", domain="", client=""):
+        self.id = id(self)
+        self.name = name
+        self.description = description
+        self.category = category  # "Process", "Testing", "CI/CD", "Hardware", "Software", etc.
+        self.domain = domain  # "Embedded", "Web", "Mobile", "IoT", etc.
+        self.client = client  # Pour les blocs spécifiques client
+        self.created_date = datetime.datetime.now()
+        self.last_used = None
+        self.usage_count = 0
+        self.success_rate = 0.0  # Pourcentage de succès dans les projets
+        self.average_duration = 0  # Durée moyenne en jours
+        self.tags = []
+        
+        # Contenu du bloc
+        self.nodes = []  # Liste des nœuds (sérialisés)
+        self.tasks = []  # Liste des tâches templates
+        self.documents = []  # Documents templates/exemples
+        self.resources = []  # Templates de ressources
+        self.notes = ""  # Notes d'utilisation
+        
+        # Historique d'utilisation
+        self.usage_history = []  # Liste des utilisations avec résultats
+        
+    def to_dict(self):
+        """Convertir le bloc en dictionnaire pour la sauvegarde"""
+        return {
+            'name': self.name,
+            'description': self.description,
+            'category': self.category,
+            'domain': getattr(self, 'domain', ''),
+            'client': getattr(self, 'client', ''),
+            'tags': getattr(self, 'tags', []),
+            'nodes': getattr(self, 'nodes', []),
+            'tasks': getattr(self, 'tasks', []),
+            'usage_count': getattr(self, 'usage_count', 0),
+            'success_rate': getattr(self, 'success_rate', 0.0),
+            'average_duration': getattr(self, 'average_duration', 0.0),
+            'last_used': to_iso(getattr(self, 'last_used', None)),
+            'created_date': to_iso(self.created_date),
+            'notes': getattr(self, 'notes', ''),
+            'usage_history': getattr(self, 'usage_history', [])
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Créer un bloc depuis un dictionnaire"""
+        block = cls(
+            name=data.get('name', ''),
+            description=data.get('description', ''),
+            category=data.get('category', 'General'),
+            domain=data.get('domain', ''),
+            client=data.get('client', '')
+        )
+        
+        # Restaurer les attributs
+        block.tags = data.get('tags', [])
+        block.nodes = data.get('nodes', [])
+        block.tasks = data.get('tasks', [])
+        block.usage_count = data.get('usage_count', 0)
+        block.success_rate = data.get('success_rate', 0.0)
+        block.average_duration = data.get('average_duration', 0.0)
+        block.notes = data.get('notes', '')
+        block.usage_history = data.get('usage_history', [])
+        
+        # Restaurer les dates
+        block.last_used = parse_datetime(data.get('last_used'))
+        if 'created_date' in data:
+            block.created_date = parse_datetime(data['created_date']) or datetime.datetime.now()
+        
+        return block
+        
+    def add_usage_record(self, project_name, duration_days, success=True, notes=""):
+        """Ajouter un enregistrement d'utilisation"""
+        record = {
+            'project_name': project_name,
+            'date': datetime.datetime.now().isoformat(),
+            'duration_days': duration_days,
+            'success': success,
+            'notes': notes
+        }
+        self.usage_history.append(record)
+        self.usage_count += 1
+        self.last_used = datetime.datetime.now()
+        
+        # Recalculer les statistiques
+        self.calculate_statistics()
+        
+    def calculate_statistics(self):
+        """Recalculer les statistiques basées sur l'historique"""
+        if not self.usage_history:
+            return
+            
+        # Taux de succès
+        successful_uses = sum(1 for record in self.usage_history if record.get('success', True))
+        self.success_rate = (successful_uses / len(self.usage_history)) * 100
+        
+        # Durée moyenne
+        durations = [record.get('duration_days', 0) for record in self.usage_history if record.get('duration_days', 0) > 0]
+        if durations:
+            self.average_duration = sum(durations) / len(durations)
+            
+    def get_category_icon(self):
+        """Obtenir l'icône selon la catégorie"""
+        icons = {
+            "Process": "⚙️", "Testing": "🧪", "CI/CD": "🔄", "Hardware": "🔌",
+            "Software": "💻", "Integration": "🔗", "Validation": "✅", "Documentation": "📚",
+            "Planning": "📅", "Quality": "🎯", "Security": "🔒", "General": "📦"
+        }
+        return icons.get(self.category, "📦")
+
+class BlockUsageRecord:
+    """Enregistrement d'utilisation d'un bloc"""
+    def __init__(self, block_id, project_name, start_date, end_date=None, success=True, notes="", lessons_learned=""):
+        self.block_id = block_id
+        self.project_name = project_name
+        self.start_date = start_date
+        self.end_date = end_date
+        self.success = success
+        self.notes = notes
+        self.lessons_learned = lessons_learned
+        self.duration_days = 0
+        
+        if end_date and start_date:
+            self.duration_days = (end_date - start_date).days
+
+
+class Project:
+    """Contenu d'un fichier projet
+
+    settings : réglages de l'interface enregistrés avec le projet (modes d'affichage,
+    filtres des modules, ui_config), par section du fichier, ex. {'tasks_data':
+    {'view_mode': 'kanban'}}.
+    """
+
+    def __init__(self, name="Projet sans nom", charter_data=None, tree_nodes=None, selected_node=None,
+                 tasks=None, log_entries=None, documents=None, blocks=None, settings=None):
+        self.name = name
+        self.save_date = None
+        self.charter_data = charter_data if charter_data is not None else {}
+        self.tree_nodes = tree_nodes if tree_nodes is not None else []
+        self.selected_node = selected_node
+        self.tasks = tasks if tasks is not None else []
+        self.log_entries = log_entries if log_entries is not None else []
+        self.documents = documents if documents is not None else []
+        self.blocks = blocks if blocks is not None else []
+        self.settings = settings if settings is not None else {}
+        # Documents du fichier dont la copie manque dans <projet>_files/documents
+        self.missing_documents = []
+        # Avertissements de la lecture du fichier (valeurs conservées sans être comprises)
+        self.warnings = []
+
+    def to_data(self):
+        """Contenu du fichier .prjt (dictionnaire JSON)"""
+        now = datetime.datetime.now()
+        settings = self.settings
+        return {
+            'metadata': {
+                'project_name': self.name,
+                'save_date': now.isoformat(),
+                'app_version': APP_VERSION,
+                'file_type': PROJECT_FILE_TYPE,
+                'description': f'Projet sauvegardé le {now.strftime("%d/%m/%Y à %H:%M")}'
+            },
+            'charter_data': self.charter_data,
+            'tree_data': {
+                'nodes': serialize_tree(self.tree_nodes),
+                'selected_node': self.selected_node.text if self.selected_node else None
+            },
+            'tasks_data': {
+                'tasks': [task.to_dict() for task in self.tasks],
+                **settings.get('tasks_data', {})
+            },
+            'log_data': {
+                'entries': [entry.to_dict() for entry in self.log_entries],
+                **settings.get('log_data', {})
+            },
+            'documents_data': {
+                'documents': [serialize_document(doc) for doc in self.documents],
+                **settings.get('documents_data', {})
+            },
+            'blocks_data': {
+                'used_blocks': [block.to_dict() for block in self.blocks],
+                **settings.get('blocks_data', {})
+            },
+            'ui_config': settings.get('ui_config', {})
+        }
+
+
+# Clés des sections du fichier qui ne sont pas des réglages de l'interface
+CONTENT_KEYS = {
+    'tasks_data': 'tasks',
+    'log_data': 'entries',
+    'documents_data': 'documents',
+    'blocks_data': 'used_blocks',
+}
+
+
+def serialize_tree(tree_nodes):
+    """Arbre sérialisé : les noeuds racines (sans parent) et leurs enfants"""
+    def node_to_dict(node):
+        return {
+            'text': node.text,
+            'x': node.x,
+            'y': node.y,
+            'width': getattr(node, 'width', 80),
+            'height': getattr(node, 'height', 40),
+            'color': getattr(node, 'color', '#E3F2FD'),
+            'text_color': getattr(node, 'text_color', '#000000'),
+            'border_color': getattr(node, 'border_color', '#2196F3'),
+            'selected': getattr(node, 'selected', False),
+            'children': [node_to_dict(child) for child in getattr(node, 'children', [])]
+        }
+
+    return [node_to_dict(node) for node in tree_nodes if node.parent is None]
+
+
+def build_tree(nodes_data):
+    """Noeuds de l'arbre sérialisé, parents avant enfants"""
+    tree_nodes = []
+
+    def create_node_from_dict(node_dict, parent=None):
+        node = TreeNode(
+            text=node_dict.get('text', 'Nœud'),
+            x=node_dict.get('x', 100),
+            y=node_dict.get('y', 100),
+            parent=parent
+        )
+        node.width = node_dict.get('width', 80)
+        node.height = node_dict.get('height', 40)
+        node.color = node_dict.get('color', '#E3F2FD')
+        node.text_color = node_dict.get('text_color', '#000000')
+        node.border_color = node_dict.get('border_color', '#2196F3')
+        node.selected = node_dict.get('selected', False)
+        if parent:
+            parent.add_child(node)
+        tree_nodes.append(node)
+
+        for child_dict in node_dict.get('children', []):
+            create_node_from_dict(child_dict, node)
+
+    for root_dict in nodes_data:
+        create_node_from_dict(root_dict)
+    return tree_nodes
+
+
+def find_node(tree_nodes, text):
+    """Premier noeud portant ce texte (les liens sont sauvegardés par texte)"""
+    if text:
+        for node in tree_nodes:
+            if node.text == text:
+                return node
+    return None
+
+
+def serialize_document(doc):
+    """Document tel qu'enregistré dans un fichier projet"""
+    return {
+        'id': getattr(doc, 'id', id(doc)),
+        'filename': doc.filename,
+        'original_path': getattr(doc, 'file_path', ''),
+        'stored_path': getattr(doc, 'stored_path', ''),
+        'category': doc.category,
+        'version': doc.version,
+        'description': getattr(doc, 'description', ''),
+        'tags': getattr(doc, 'tags', []),
+        'upload_date': to_iso(doc.upload_date),
+        'file_size': getattr(doc, 'file_size', 0),
+        'file_type': getattr(doc, 'file_type', ''),
+        'linked_node_text': doc.linked_node.text if getattr(doc, 'linked_node', None) else None
+    }
+
+
+def deserialize_document(doc_dict, tree_nodes=()):
+    """Document d'un fichier projet ; stored_path est à renseigner par l'appelant"""
+    doc = Document(
+        filename=doc_dict.get('filename', ''),
+        file_path=doc_dict.get('original_path', ''),
+        category=doc_dict.get('category', 'General'),
+        version=doc_dict.get('version', '1.0'),
+        description=doc_dict.get('description', '')
+    )
+    doc.id = doc_dict.get('id', id(doc))
+    doc.tags = doc_dict.get('tags', [])
+    doc.upload_date = parse_datetime(doc_dict.get('upload_date')) or datetime.datetime.now()
+    doc.file_size = doc_dict.get('file_size', 0)
+    doc.file_type = doc_dict.get('file_type', '')
+    doc.linked_node = find_node(tree_nodes, doc_dict.get('linked_node_text'))
+    return doc
+
+
+def stored_name(doc):
+    """Nom de la copie d'un document dans le dossier d'un projet ou le stockage de l'application"""
+    return f"{doc.id}_{doc.filename}"
+
+
+def project_documents_dir(filename):
+    """Dossier des copies des documents d'un fichier projet"""
+    return os.path.join(os.path.splitext(filename)[0] + "_files", "documents")
+
+
+def read_project_data(filename):
+    """Contenu JSON d'un fichier projet ; ProjectFormatError s'il n'en est pas un"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        try:
+            data = json.load(f)
+        except ValueError as e:
+            raise ProjectFormatError(f"JSON invalide : {e}") from e
+    if not isinstance(data, dict) or 'metadata' not in data:
+        raise ProjectFormatError("Format de fichier invalide !")
+    return data
+
+
+def project_from_data(data, filename):
+    """Projet d'un contenu lu par read_project_data (filename situe les copies des documents)"""
+    metadata = data.get('metadata', {})
+    project = Project(name=metadata.get('project_name', 'Projet sans nom'))
+    project.save_date = metadata.get('save_date')
+    project.charter_data = data.get('charter_data', {})
+
+    tree_data = data.get('tree_data', {})
+    project.tree_nodes = build_tree(tree_data.get('nodes', []))
+    project.selected_node = find_node(project.tree_nodes, tree_data.get('selected_node'))
+
+    tasks_data = data.get('tasks_data', {}).get('tasks', [])
+    project.tasks = [Task.from_dict(task_dict, project.tree_nodes) for task_dict in tasks_data]
+    Task.restore_dependencies(project.tasks, tasks_data)
+    project.warnings.extend(f"tâche « {task.title} » : échéance illisible conservée en texte ({task.due_date_text})"
+                            for task in project.tasks if task.due_date_text)
+
+    project.log_entries = [LogEntry.from_dict(entry) for entry in data.get('log_data', {}).get('entries', [])]
+
+    documents_dir = project_documents_dir(filename)
+    for doc_dict in data.get('documents_data', {}).get('documents', []):
+        doc = deserialize_document(doc_dict, project.tree_nodes)
+        path = os.path.join(documents_dir, stored_name(doc))
+        if os.path.exists(path):
+            doc.stored_path = path
+            project.documents.append(doc)
+        else:
+            project.missing_documents.append(doc)
+
+    project.blocks = [ProjectBlock.from_dict(block) for block in data.get('blocks_data', {}).get('used_blocks', [])]
+
+    for section, content_key in CONTENT_KEYS.items():
+        project.settings[section] = {key: value for key, value in data.get(section, {}).items() if key != content_key}
+    project.settings['ui_config'] = data.get('ui_config', {})
+    return project
+
+
+def load_project_file(filename):
+    """Projet d'un fichier .prjt"""
+    return project_from_data(read_project_data(filename), filename)
+
+
+def save_project_file(project, filename, indent=2):
+    """Écrit le fichier projet et copie ses documents dans <projet>_files/documents ; retourne les documents copiés"""
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(project.to_data(), f, ensure_ascii=False, indent=indent)
+
+    documents_dir = project_documents_dir(filename)
+    documents_saved = 0
+    for doc in project.documents:
+        if doc.stored_path and os.path.exists(doc.stored_path):
+            os.makedirs(documents_dir, exist_ok=True)
+            target = os.path.join(documents_dir, stored_name(doc))
+            if os.path.abspath(doc.stored_path) != os.path.abspath(target):
+                shutil.copy2(doc.stored_path, target)
+            documents_saved += 1
+    return documents_saved
+
+
+def validate_project_data(data, filename):
+    """Problèmes d'un contenu lu par read_project_data (liste vide si le projet est valide)"""
+    problems = []
+    file_type = data.get('metadata', {}).get('file_type', '')
+    if file_type and file_type != PROJECT_FILE_TYPE:
+        problems.append(f"type de fichier '{file_type}' au lieu de '{PROJECT_FILE_TYPE}'")
+
+    node_texts = set()
+    stack = list(data.get('tree_data', {}).get('nodes', []))
+    duplicates = set()
+    while stack:
+        node = stack.pop()
+        text = node.get('text', 'Nœud')
+        if text in node_texts:
+            duplicates.add(text)
+        node_texts.add(text)
+        stack.extend(node.get('children', []))
+    for text in sorted(duplicates):
+        problems.append(f"plusieurs noeuds « {text} » : les liens vers ce noeud sont ambigus")
+
+    tasks = data.get('tasks_data', {}).get('tasks', [])
+    task_ids = {task.get('id') for task in tasks}
+    for task in tasks:
+        title = task.get('title', '')
+        node_text = task.get('linked_node_text')
+        if node_text and node_text not in node_texts:
+            problems.append(f"tâche « {title} » : noeud « {node_text} » introuvable")
+        if task.get('due_date') and parse_date(task['due_date']) is None:
+            problems.append(f"tâche « {title} » : échéance illisible ({task['due_date']})")
+        for task_id in task.get('depends_on', []):
+            if task_id not in task_ids:
+                problems.append(f"tâche « {title} » : dépendance {task_id} introuvable")
+
+    documents_dir = project_documents_dir(filename)
+    for doc in data.get('documents_data', {}).get('documents', []):
+        name = f"{doc.get('id')}_{doc.get('filename', '')}"
+        if not os.path.exists(os.path.join(documents_dir, name)):
+            problems.append(f"document « {doc.get('filename', '')} » : copie manquante dans {documents_dir}")
+        node_text = doc.get('linked_node_text')
+        if node_text and node_text not in node_texts:
+            problems.append(f"document « {doc.get('filename', '')} » : noeud « {node_text} » introuvable")
+    return problems
+
+
+# --- Rapports et exports
+
+CHARTER_PDF_SECTIONS = (
+    ("Objectif principal", 'objective'),
+    ("Livrables attendus", 'deliverables'),
+    ("Parties prenantes", 'stakeholders'),
+    ("Contraintes", 'constraints'),
+    ("Hypothèses initiales", 'assumptions'),
+)
+
+
+def write_charter_pdf(charter_data, filename):
+    """Exporte la charte en PDF (reportlab)"""
+    # reportlab n'est chargé qu'au premier export (démarrage plus rapide)
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    c = canvas.Canvas(filename, pagesize=letter)
+    width, height = letter
+
+    # Titre
+    c.setFont("Helvetica-Bold", 20)
+    c.drawString(50, height - 50, "Charte de Projet")
+
+    # Date
+    c.setFont("Helvetica", 10)
+    c.drawString(50, height - 70, f"Créé le : {datetime.datetime.now().strftime('%d/%m/%Y à %H:%M')}")
+
+    y_position = height - 100
+    for title, key in CHARTER_PDF_SECTIONS:
+        if y_position < 100:  # Nouvelle page si nécessaire
+            c.showPage()
+            y_position = height - 50
+
+        c.setFont("Helvetica-Bold", 12)
+        c.drawString(50, y_position, title)
+        y_position -= 20
+
+        c.setFont("Helvetica", 10)
+        for line in charter_data.get(key, '').split('\n'):
+            if y_position < 100:
+                c.showPage()
+                y_position = height - 50
+            c.drawString(70, y_position, line[:80])  # Limiter la longueur
+            y_position -= 15
+
+        y_position -= 10
+
+    c.save()
+
+
+def charter_markdown(charter_data):
+    """Charte de projet en Markdown"""
+    return f"""# 🗂 Charte de Projet
+
+    *Créé le : {datetime.datetime.now().strftime('%d/%m/%Y à %H:%M')}*
+
+    ## 🎯 Objectif principal
+
+    {charter_data.get('objective', '')}
+
+    ## 📦 Livrables attendus
+
+    {charter_data.get('deliverables', '')}
+
+    ## 👥 Parties prenantes / Intervenants clés
+
+    {charter_data.get('stakeholders', '')}
+
+    ## ⚠️ Contraintes
+
+    {charter_data.get('constraints', '')}
+
+    ## 💭 Hypothèses initiales
+
+    {charter_data.get('assumptions', '')}
+
+    ## ✅ Critères de succès
+
+    {charter_data.get('success_criteria', '')}
+
+    ## 💰 Budget estimé
+
+    {charter_data.get('budget', '')}
+
+    ## 📅 Échéancier
+
+    {charter_data.get('schedule', '')}
+
+    ## ⚡ Risques identifiés
+
+    {charter_data.get('risks', '')}
+
+    ## 🔧 Technologies / Outils
+
+    {charter_data.get('technology', '')}
+
+    ## 🎯 Mesures de qualité
+
+    {charter_data.get('quality', '')}
+
+    ## 📢 Communication
+
+    {charter_data.get('communication', '')}
+
+    ---
+    *Document généré automatiquement par l'application de gestion de projet*
+    """
+
+
+def decision_log_markdown(entries):
+    """Journal de bord en Markdown, entrées les plus récentes d'abord"""
+    entries = sorted(entries, key=lambda x: x.timestamp, reverse=True)
+
+    content = f"""# 💬 Journal de Bord / Carnet de Décisions
+
+    *Exporté le : {datetime.datetime.now().strftime('%d/%m/%Y à %H:%M')}*
+    *Nombre d'entrées : {len(entries)}*
+
+---
+
+"""
+
+    for entry in entries:
+        entry_type = "🤖 AUTOMATIQUE" if entry.entry_type == "auto" else "👤 MANUELLE"
+
+        content += f"""## {entry.title}
+
+**📅 Date :** {entry.timestamp.strftime('%d/%m/%Y à %H:%M:%S')}
+**👤 Auteur :** {entry.author}
+**🏷️ Catégorie :** {entry.category}
+**🔧 Type :** {entry_type}
+
+**📝 Description :**
+{entry.description}
+
+---
+
+"""
+    return content
+
+
+def document_report(documents, storage_path):
+    """Rapport des documents en Markdown, par catégorie"""
+    # Trier les documents par catégorie
+    docs_by_category = {}
+    for doc in documents:
+        docs_by_category.setdefault(doc.category, []).append(doc)
+
+    content = f"""# 📁 Rapport de Gestion Documentaire
+
+    *Généré le : {datetime.datetime.now().strftime('%d/%m/%Y à %H:%M')}*
+    *Nombre total de documents : {len(documents)}*
+
+    ## 📊 Statistiques Générales
+
+    """
+
+    # Statistiques par catégorie
+    for category, docs in docs_by_category.items():
+        total_size = sum(doc.file_size for doc in docs)
+        size_text = f"{total_size/(1024*1024):.1f} MB" if total_size > 1024*1024 else f"{total_size/1024:.1f} KB"
+        content += f"- **{category}** : {len(docs)} document(s) - {size_text}\n"
+
+    content += "\n---\n\n"
+
+    # Détail par catégorie
+    for category, docs in sorted(docs_by_category.items()):
+        icon = docs[0].get_category_icon() if docs else "📄"
+        content += f"## {icon} {category}\n\n"
+
+        for doc in sorted(docs, key=lambda x: x.filename):
+            tags_text = f" [Tags: {', '.join(doc.tags)}]" if doc.tags else ""
+
+            content += f"""### {doc.get_file_type_icon()} {doc.filename}
+
+    - **Version :** {doc.version}
+    - **Taille :** {doc.format_file_size()}
+    - **Date d'ajout :** {doc.upload_date.strftime('%d/%m/%Y à %H:%M')}
+    - **Description :** {doc.description or "Aucune description"}
+    - **Nœud lié :** {doc.linked_node.text if doc.linked_node else "Aucun"}{tags_text}
+
+    """
+
+    content += f"""
+    ---
+
+    *Rapport généré automatiquement par l'application de gestion de projet*
+    *Chemin de stockage : {storage_path}*
+    """
+    return content
+
+
+def usage_report(blocks):
+    """Rapport d'usage des blocs en Markdown"""
+    # Trier les blocs par usage
+    blocks_by_usage = sorted(blocks, key=lambda x: x.usage_count, reverse=True)
+
+    content = f"""# 📊 Rapport d'Usage - Bibliothèque de Blocs
+
+    *Généré le : {datetime.datetime.now().strftime('%d/%m/%Y à %H:%M')}*
+    *Total de blocs : {len(blocks)}*
+
+    ## 📈 Statistiques Globales
+
+    """
+
+    # Statistiques générales
+    total_usage = sum(b.usage_count for b in blocks)
+    used_blocks = len([b for b in blocks if b.usage_count > 0])
+    avg_success = sum(b.success_rate for b in blocks if b.usage_count > 0) / max(used_blocks, 1)
+
+    content += f"""- **Total d'utilisations** : {total_usage}
+    - **Blocs utilisés** : {used_blocks}/{len(blocks)} ({used_blocks/max(len(blocks), 1)*100:.0f}%)
+    - **Taux de succès moyen** : {avg_success:.0f}%
+    - **Blocs inutilisés** : {len(blocks) - used_blocks}
+
+    """
+
+    # Top 10 des blocs les plus utilisés
+    content += "## 🏆 Top 10 - Blocs les Plus Utilisés\n\n"
+
+    for i, block in enumerate(blocks_by_usage[:10]):
+        if block.usage_count > 0:
+            success_indicator = "🟢" if block.success_rate > 80 else "🟡" if block.success_rate > 60 else "🔴"
+            content += f"{i+1}. **{block.name}** {success_indicator}\n"
+            content += f"   - Utilisé {block.usage_count} fois\n"
+            content += f"   - Succès : {block.success_rate:.0f}%\n"
+            content += f"   - Durée moyenne : {block.average_duration:.0f}j\n"
+            content += f"   - Catégorie : {block.category}\n\n"
+
+    # Analyse par catégorie
+    content += "## 🏷️ Analyse par Catégorie\n\n"
+
+    categories = {}
+    for block in blocks:
+        data = categories.setdefault(block.category, {'count': 0, 'total_usage': 0, 'avg_success': [], 'blocks': []})
+        data['count'] += 1
+        data['total_usage'] += block.usage_count
+        if block.usage_count > 0:
+            data['avg_success'].append(block.success_rate)
+        data['blocks'].append(block)
+
+    for category, data in sorted(categories.items()):
+        avg_success_cat = sum(data['avg_success']) / max(len(data['avg_success']), 1)
+        content += f"### {data['blocks'][0].get_category_icon()} {category}\n\n"
+        content += f"- **Nombre de blocs** : {data['count']}\n"
+        content += f"- **Utilisations totales** : {data['total_usage']}\n"
+        content += f"- **Succès moyen** : {avg_success_cat:.0f}%\n"
+        content += f"- **Blocs utilisés** : {len(data['avg_success'])}/{data['count']}\n\n"
+
+    # Analyse par domaine
+    content += "## 🌐 Analyse par Domaine\n\n"
+
+    domains = {}
+    for block in blocks:
+        data = domains.setdefault(block.domain or "Non spécifié", {'count': 0, 'total_usage': 0, 'blocks': []})
+        data['count'] += 1
+        data['total_usage'] += block.usage_count
+        data['blocks'].append(block)
+
+    for domain, data in sorted(domains.items(), key=lambda x: x[1]['total_usage'], reverse=True):
+        content += f"- **{domain}** : {data['count']} blocs, {data['total_usage']} utilisations\n"
+
+    # Blocs problématiques
+    problematic_blocks = [b for b in blocks if b.usage_count > 0 and b.success_rate < 70]
+    if problematic_blocks:
+        content += "\n## ⚠️ Blocs à Améliorer (< 70% de succès)\n\n"
+        for block in sorted(problematic_blocks, key=lambda x: x.success_rate):
+            content += f"- **{block.name}** : {block.success_rate:.0f}% de succès ({block.usage_count} utilisations)\n"
+            if block.notes:
+                content += f"  Notes : {block.notes[:100]}...\n"
+            content += "\n"
+
+    # Recommandations
+    content += "\n## 💡 Recommandations\n\n"
+
+    unused_blocks = [b for b in blocks if b.usage_count == 0]
+    if unused_blocks:
+        content += f"1. **Promouvoir l'utilisation** : {len(unused_blocks)} blocs n'ont jamais été utilisés\n"
+
+    if problematic_blocks:
+        content += f"2. **Améliorer la qualité** : {len(problematic_blocks)} blocs ont un taux de succès faible\n"
+
+    high_success_blocks = [b for b in blocks if b.usage_count > 2 and b.success_rate > 90]
+    if high_success_blocks:
+        content += f"3. **Dupliquer les bonnes pratiques** : {len(high_success_blocks)} blocs ont un excellent taux de succès\n"
+
+    content += "\n---\n\n*Rapport généré automatiquement par l'application de gestion de projet*"
+    return content
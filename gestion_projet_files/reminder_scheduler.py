@@ -0,0 +1,113 @@
+"""Rappels d'échéance des tâches, planifiés avec un seul minuteur Tk (after)
+
+Les prochaines échéances sont gardées dans un tas (heapq) ; seul le premier rappel
+arme un minuteur. Modifier l'échéance ou le statut d'une tâche ajoute une nouvelle
+entrée et invalide l'ancienne sur place (elle est écartée en sortie de tas) : aucune
+tâche n'est parcourue, ni à intervalle régulier ni à chaque modification.
+"""
+
+import datetime
+import heapq
+import itertools
+
+from task_repository import DONE_STATUS
+
+# Heure du rappel le jour de l'échéance
+REMINDER_TIME = datetime.time(9, 0)
+# Délai maximal d'un minuteur (ms) : un réveil de l'ordinateur ou un changement
+# d'heure est rattrapé au plus tard après ce délai
+MAX_DELAY_MS = 60 * 60 * 1000
+
+
+class ReminderScheduler:
+    """Rappel unique de chaque tâche non terminée de tasks, à son échéance
+
+    after(delay_ms, callback) et after_cancel(timer) sont ceux de la fenêtre Tk ;
+    on_due(tasks) reçoit les tâches arrivées à échéance (ou déjà en retard).
+    """
+
+    def __init__(self, tasks, on_due, after, after_cancel, now=datetime.datetime.now):
+        self.tasks = tasks
+        self.on_due = on_due
+        self.after = after
+        self.after_cancel = after_cancel
+        self.now = now
+        # [heure du rappel, numéro, tâche] ; tâche None : entrée invalidée
+        self.heap = []
+        self.entries = {}
+        # tâche -> heure du rappel déjà signalé (pas de nouveau rappel sans changement)
+        self.notified = {}
+        self.counter = itertools.count()
+        self.timer = None
+        self.armed_at = None
+
+    def reminder_time(self, task):
+        if task not in self.tasks or task.status == DONE_STATUS or task.due_date is None:
+            return None
+        return datetime.datetime.combine(task.due_date, REMINDER_TIME)
+
+    def update(self, task):
+        """Prend en compte une tâche ajoutée, retirée ou modifiée"""
+        when = self.reminder_time(task)
+        entry = self.entries.get(task)
+        if entry is not None:
+            if entry[0] == when:
+                return
+            entry[-1] = None
+            del self.entries[task]
+        if when is None:
+            self.notified.pop(task, None)
+        elif self.notified.get(task) != when:
+            self.notified.pop(task, None)
+            entry = [when, next(self.counter), task]
+            self.entries[task] = entry
+            heapq.heappush(self.heap, entry)
+        if len(self.heap) > 2 * len(self.entries) + 64:
+            # Trop d'entrées invalidées : le tas est reconstruit
+            self.heap = [entry for entry in self.heap if entry[-1] is not None]
+            heapq.heapify(self.heap)
+        self._arm()
+
+    def next_reminder(self):
+        """(heure, tâche) du prochain rappel, ou None"""
+        heap = self.heap
+        while heap and heap[0][-1] is None:
+            heapq.heappop(heap)
+        return (heap[0][0], heap[0][-1]) if heap else None
+
+    def _arm(self):
+        head = self.next_reminder()
+        if head is None:
+            self.stop()
+            return
+        when = head[0]
+        if self.timer is not None and self.armed_at == when:
+            return
+        self.stop()
+        delay = (when - self.now()).total_seconds() * 1000
+        self.armed_at = when
+        self.timer = self.after(int(min(max(delay, 0), MAX_DELAY_MS)), self._fire)
+
+    def _fire(self):
+        self.timer = None
+        self.armed_at = None
+        now = self.now()
+        due = []
+        head = self.next_reminder()
+        while head is not None and head[0] <= now:
+            entry = heapq.heappop(self.heap)
+            task = entry[-1]
+            del self.entries[task]
+            self.notified[task] = entry[0]
+            due.append(task)
+            head = self.next_reminder()
+        self._arm()
+        if due:
+            self.on_due(due)
+
+    def stop(self):
+        """Annule le minuteur en cours"""
+        if self.timer is not None:
+            self.after_cancel(self.timer)
+        self.timer = None
+        self.armed_at = None
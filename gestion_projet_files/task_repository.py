@@ -0,0 +1,173 @@
+"""Liste des tâches avec index secondaires (statut, priorité, responsable, échéance)
+
+TaskRepository se comporte comme une liste : les modules et l'historique annuler /
+rétablir la modifient par append, insert, remove, del et remplacement [:]. À chaque
+modification, il tient à jour des index valeur -> tâches (statut, priorité,
+responsable) et, pour chaque statut, la liste des tâches triées par échéance. Une
+tâche de la liste signale elle-même le changement d'un attribut indexé
+(Task.__setattr__ appelle reindex). Compter les tâches d'un statut, remplir une
+colonne Kanban ou lister les tâches en retard coûte ainsi de l'ordre du résultat,
+sans parcourir toutes les tâches. on_change(task) est appelée après l'ajout, le
+retrait ou la modification d'une tâche (rappels d'échéance).
+"""
+
+import bisect
+import datetime
+import heapq
+from collections.abc import MutableSequence
+
+from model_dates import parse_date
+
+# Attributs indexés par valeur, et attributs dont un changement est signalé
+# (index, on_change)
+INDEXED_FIELDS = ("status", "priority", "assignee")
+WATCHED_FIELDS = INDEXED_FIELDS + ("due_date", "linked_node")
+DONE_STATUS = "Terminé"
+
+
+class TaskRepository(MutableSequence):
+    """Tâches du projet (dans l'ordre de la liste) et leurs index"""
+
+    def __init__(self, tasks=(), on_change=None):
+        self.items = []
+        self.on_change = on_change
+        # champ -> valeur -> tâches (dict ordonné utilisé comme ensemble)
+        self.indexes = {field: {} for field in INDEXED_FIELDS}
+        # statut -> [(jour ordinal de l'échéance, id, tâche)] triée
+        self.due_dates = {}
+        # tâche -> (statut, jour ordinal) de son entrée dans due_dates
+        self.due_keys = {}
+        self.extend(tasks)
+
+    # --- Liste
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __contains__(self, task):
+        return task.__dict__.get("repository") is self
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            for task in self.items[index]:
+                self._unindex(task)
+            self.items[index] = value
+            for task in value:
+                self._index(task)
+        else:
+            self._unindex(self.items[index])
+            self._index(value)
+            self.items[index] = value
+
+    def __delitem__(self, index):
+        removed = self.items[index] if isinstance(index, slice) else [self.items[index]]
+        del self.items[index]
+        for task in removed:
+            self._unindex(task)
+
+    def insert(self, index, task):
+        self._index(task)
+        self.items.insert(index, task)
+
+    def clear(self):
+        removed = self.items
+        self.items = []
+        for task in removed:
+            task.__dict__["repository"] = None
+        for index in self.indexes.values():
+            index.clear()
+        self.due_dates.clear()
+        self.due_keys.clear()
+        if self.on_change:
+            for task in removed:
+                self.on_change(task)
+
+    def __repr__(self):
+        return f"TaskRepository({self.items!r})"
+
+    # --- Index
+
+    def _index(self, task):
+        if task in self:
+            raise ValueError(f"Tâche déjà présente : {task.title}")
+        task.__dict__["repository"] = self
+        for field in INDEXED_FIELDS:
+            self.indexes[field].setdefault(getattr(task, field), {})[task] = None
+        self._index_due_date(task)
+        if self.on_change:
+            self.on_change(task)
+
+    def _unindex(self, task):
+        task.__dict__["repository"] = None
+        for field in INDEXED_FIELDS:
+            self._discard(field, getattr(task, field), task)
+        self._unindex_due_date(task)
+        if self.on_change:
+            self.on_change(task)
+
+    def _discard(self, field, value, task):
+        tasks = self.indexes[field].get(value)
+        if tasks is not None:
+            tasks.pop(task, None)
+            if not tasks:
+                del self.indexes[field][value]
+
+    def _index_due_date(self, task):
+        due = parse_date(task.due_date)
+        if due is not None:
+            key = (due.toordinal(), id(task), task)
+            bisect.insort(self.due_dates.setdefault(task.status, []), key)
+            self.due_keys[task] = (task.status, key)
+
+    def _unindex_due_date(self, task):
+        entry = self.due_keys.pop(task, None)
+        if entry is not None:
+            status, key = entry
+            tasks = self.due_dates[status]
+            del tasks[bisect.bisect_left(tasks, key[:2])]
+            if not tasks:
+                del self.due_dates[status]
+
+    def reindex(self, task, field, old_value):
+        """Appelée par une tâche de la liste après le changement d'un attribut suivi"""
+        if field in INDEXED_FIELDS:
+            self._discard(field, old_value, task)
+            self.indexes[field].setdefault(getattr(task, field), {})[task] = None
+        if field in ("status", "due_date"):
+            self._unindex_due_date(task)
+            self._index_due_date(task)
+        if self.on_change:
+            self.on_change(task)
+
+    # --- Requêtes
+
+    def with_value(self, field, value):
+        """Tâches dont l'attribut field vaut value"""
+        return list(self.indexes[field].get(value, ()))
+
+    def count_by(self, field, value):
+        return len(self.indexes[field].get(value, ()))
+
+    def values(self, field):
+        """Valeurs présentes d'un attribut indexé"""
+        return list(self.indexes[field])
+
+    def by_due_date(self, statuses=None):
+        """Tâches ayant une échéance, de la plus proche à la plus lointaine"""
+        statuses = self.due_dates if statuses is None else statuses
+        lists = [self.due_dates[status] for status in statuses if status in self.due_dates]
+        return [task for _, _, task in heapq.merge(*lists)]
+
+    def overdue(self, today=None):
+        """Tâches non terminées dont l'échéance est passée, par échéance"""
+        limit = (today or datetime.date.today()).toordinal()
+        lists = [tasks[:bisect.bisect_left(tasks, (limit,))]
+                 for status, tasks in self.due_dates.items() if status != DONE_STATUS]
+        return [task for _, _, task in heapq.merge(*lists)]
@@ -0,0 +1,296 @@
+"""Ordonnancement des tâches : dépendances, durées et chemin critique (méthode CPM)
+
+Les tâches forment un graphe orienté (prérequis -> tâche) dont l'ordre topologique
+est maintenu à chaque ajout de dépendance (algorithme de Pearce et Kelly) : seules
+les tâches situées entre les deux extrémités de la nouvelle dépendance sont
+réordonnées, et une dépendance qui fermerait un cycle est refusée (CycleError).
+
+Pour chaque tâche sont conservés le début au plus tôt et la durée du plus long
+chemin qui part de son début (tail) ; le début au plus tard s'en déduit (durée du
+projet - tail). Une modification ne recalcule que les tâches en aval (début au plus
+tôt) et en amont (tail) de ce qui a changé, dans l'ordre topologique, au moment de
+la prochaine lecture.
+"""
+
+import heapq
+
+# Tolérance sur la marge pour les durées non entières
+EPSILON = 1e-9
+
+
+class CycleError(ValueError):
+    """La dépendance demandée fermerait un cycle"""
+
+
+class TaskSchedule:
+    """Graphe des dépendances et dates au plus tôt / au plus tard des tâches (en jours)"""
+
+    def __init__(self):
+        self.durations = {}
+        self.predecessors = {}
+        self.successors = {}
+        # tâche -> rang dans l'ordre topologique (rangs uniques, pas forcément contigus)
+        self.order = {}
+        self.next_rank = 0
+        self.start = {}
+        self.tail = {}
+        # Tâches dont le début au plus tôt (forward) ou le tail (backward) est à recalculer
+        self.forward = set()
+        self.backward = set()
+        self.finish = None
+        # Nombre de tâches recalculées par la dernière mise à jour
+        self.recomputed = 0
+
+    def __len__(self):
+        return len(self.durations)
+
+    def __contains__(self, task):
+        return task in self.durations
+
+    # --- Modifications
+
+    def add_task(self, task, duration=1):
+        self.durations[task] = duration
+        self.predecessors[task] = set()
+        self.successors[task] = set()
+        self.order[task] = self.next_rank
+        self.next_rank += 1
+        self.start[task] = 0
+        self.tail[task] = duration
+        self.forward.add(task)
+        self.backward.add(task)
+
+    def remove_task(self, task):
+        for prerequisite in self.predecessors.pop(task):
+            self.successors[prerequisite].discard(task)
+            self.backward.add(prerequisite)
+        for dependent in self.successors.pop(task):
+            self.predecessors[dependent].discard(task)
+            self.forward.add(dependent)
+        for values in (self.durations, self.order, self.start, self.tail):
+            del values[task]
+        self.forward.discard(task)
+        self.backward.discard(task)
+        self.finish = None
+
+    def set_duration(self, task, duration):
+        if self.durations[task] != duration:
+            self.durations[task] = duration
+            self.forward.add(task)
+            self.backward.add(task)
+
+    def add_dependency(self, task, prerequisite):
+        """task ne peut commencer qu'à la fin de prerequisite ; CycleError si cela ferme un cycle"""
+        if prerequisite in self.predecessors[task]:
+            return
+        if prerequisite is task:
+            raise CycleError(task)
+        self._reorder(prerequisite, task)
+        self.predecessors[task].add(prerequisite)
+        self.successors[prerequisite].add(task)
+        self.forward.add(task)
+        self.backward.add(prerequisite)
+
+    def remove_dependency(self, task, prerequisite):
+        if prerequisite in self.predecessors[task]:
+            self.predecessors[task].discard(prerequisite)
+            self.successors[prerequisite].discard(task)
+            self.forward.add(task)
+            self.backward.add(prerequisite)
+
+    def update(self, task):
+        """Prend en compte une tâche ajoutée ou modifiée (attributs duration et dependencies).
+
+        Lève CycleError, sans rien modifier, si ses nouvelles dépendances ferment un cycle.
+        """
+        if any(prerequisite is task for prerequisite in task.dependencies):
+            raise CycleError(task)
+        if task not in self.durations:
+            self.add_task(task, task.duration)
+        wanted = {prerequisite for prerequisite in task.dependencies if prerequisite in self.durations}
+        existing = self.predecessors[task]
+        cycle = self.find_cycle(task, wanted - existing)
+        if cycle is not None:
+            raise CycleError(cycle)
+        self.set_duration(task, task.duration)
+        for prerequisite in existing - wanted:
+            self.remove_dependency(task, prerequisite)
+        for prerequisite in wanted - existing:
+            self.add_dependency(task, prerequisite)
+
+    def sync(self, tasks):
+        """Aligne l'ordonnancement sur tasks (attributs duration et dependencies).
+
+        Retourne les dépendances ignorées car elles fermaient un cycle : [(tâche, prérequis)].
+        """
+        current = set(tasks)
+        for task in [task for task in self.durations if task not in current]:
+            self.remove_task(task)
+
+        # Nouvelles tâches rangées après leurs prérequis : leurs dépendances n'imposent
+        # aucune réorganisation (chargement d'un projet)
+        for task in self._sorted_new_tasks(tasks, current):
+            self.add_task(task, task.duration)
+
+        # Retraits d'abord : un état final sans cycle n'en crée aucun en cours de route
+        added = []
+        for task in tasks:
+            self.set_duration(task, task.duration)
+            wanted = {prerequisite for prerequisite in task.dependencies if prerequisite in current}
+            existing = self.predecessors[task]
+            for prerequisite in existing - wanted:
+                self.remove_dependency(task, prerequisite)
+            added.extend((task, prerequisite) for prerequisite in wanted - existing)
+
+        rejected = []
+        for task, prerequisite in added:
+            try:
+                self.add_dependency(task, prerequisite)
+            except CycleError:
+                rejected.append((task, prerequisite))
+        return rejected
+
+    def _sorted_new_tasks(self, tasks, current):
+        """Tâches absentes de l'ordonnancement, chacune après ses prérequis (parcours en profondeur)"""
+        visited = set()
+        result = []
+        for root in tasks:
+            if root in self.durations or root in visited:
+                continue
+            visited.add(root)
+            stack = [(root, iter(root.dependencies))]
+            while stack:
+                task, prerequisites = stack[-1]
+                for prerequisite in prerequisites:
+                    if prerequisite in current and prerequisite not in self.durations and prerequisite not in visited:
+                        visited.add(prerequisite)
+                        stack.append((prerequisite, iter(prerequisite.dependencies)))
+                        break
+                else:
+                    stack.pop()
+                    result.append(task)
+        return result
+
+    # --- Ordre topologique
+
+    def _reorder(self, source, target):
+        """Garantit rang(source) < rang(target) avant l'ajout de la dépendance source -> target"""
+        order = self.order
+        lower, upper = order[target], order[source]
+        if lower > upper:
+            return
+
+        # Tâches atteintes depuis target sans dépasser le rang de source
+        after = self._reach(target, self.successors, lambda task: order[task] <= upper, source)
+        # Tâches qui mènent à source sans descendre sous le rang de target
+        before = self._reach(source, self.predecessors, lambda task: order[task] >= lower)
+
+        tasks = sorted(before, key=order.__getitem__) + sorted(after, key=order.__getitem__)
+        for task, rank in zip(tasks, sorted(order[task] for task in tasks)):
+            order[task] = rank
+
+    def _reach(self, origin, edges, inside, forbidden=None):
+        found = {origin}
+        stack = [origin]
+        while stack:
+            for task in edges[stack.pop()]:
+                if task is forbidden:
+                    raise CycleError(forbidden)
+                if task not in found and inside(task):
+                    found.add(task)
+                    stack.append(task)
+        return found
+
+    def find_cycle(self, task, prerequisites):
+        """Premier prérequis dont la dépendance fermerait un cycle (None s'il n'y en a pas)"""
+        for prerequisite in prerequisites:
+            if prerequisite is task:
+                return prerequisite
+            if task not in self.order or prerequisite not in self.order:
+                continue
+            upper = self.order[prerequisite]
+            if self.order[task] < upper:
+                try:
+                    self._reach(task, self.successors, lambda other: self.order[other] <= upper, prerequisite)
+                except CycleError:
+                    return prerequisite
+        return None
+
+    # --- Calcul
+
+    def _update(self):
+        if not self.forward and not self.backward:
+            return
+        order = self.order
+        recomputed = 0
+
+        # Dates au plus tôt, des prérequis vers les tâches dépendantes
+        seeds, queued = self.forward, set(self.forward)
+        heap = [(order[task], task) for task in queued]
+        heapq.heapify(heap)
+        while heap:
+            task = heapq.heappop(heap)[1]
+            recomputed += 1
+            start = max((self.start[p] + self.durations[p] for p in self.predecessors[task]), default=0)
+            if start != self.start[task] or task in seeds:
+                self.start[task] = start
+                for dependent in self.successors[task]:
+                    if dependent not in queued:
+                        queued.add(dependent)
+                        heapq.heappush(heap, (order[dependent], dependent))
+
+        # Plus long chemin jusqu'à la fin du projet, dans l'ordre inverse
+        seeds, queued = self.backward, set(self.backward)
+        heap = [(-order[task], task) for task in queued]
+        heapq.heapify(heap)
+        while heap:
+            task = heapq.heappop(heap)[1]
+            recomputed += 1
+            tail = self.durations[task] + max((self.tail[s] for s in self.successors[task]), default=0)
+            if tail != self.tail[task] or task in seeds:
+                self.tail[task] = tail
+                for prerequisite in self.predecessors[task]:
+                    if prerequisite not in queued:
+                        queued.add(prerequisite)
+                        heapq.heappush(heap, (-order[prerequisite], prerequisite))
+
+        self.forward = set()
+        self.backward = set()
+        self.finish = None
+        self.recomputed = recomputed
+
+    def project_duration(self):
+        self._update()
+        if self.finish is None:
+            self.finish = max((self.start[task] + self.durations[task] for task in self.durations), default=0)
+        return self.finish
+
+    def early_start(self, task):
+        self._update()
+        return self.start[task]
+
+    def early_finish(self, task):
+        return self.early_start(task) + self.durations[task]
+
+    def late_start(self, task):
+        return self.project_duration() - self.tail[task]
+
+    def late_finish(self, task):
+        return self.late_start(task) + self.durations[task]
+
+    def slack(self, task):
+        """Marge totale : retard possible sans retarder la fin du projet"""
+        return self.late_start(task) - self.early_start(task)
+
+    def is_critical(self, task):
+        return self.slack(task) <= EPSILON
+
+    def critical_path(self):
+        """Tâches sans marge, par date de début au plus tôt"""
+        finish = self.project_duration()
+        critical = [task for task in self.durations if finish - self.tail[task] - self.start[task] <= EPSILON]
+        return sorted(critical, key=lambda task: (self.start[task], self.order[task]))
+
+    def dependents(self, task):
+        """Tâches qui dépendent directement de task"""
+        return set(self.successors.get(task, ()))
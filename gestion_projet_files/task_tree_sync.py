@@ -0,0 +1,96 @@
+"""Synchronisation des tâches avec les noeuds du diagramme, pilotée par les événements
+
+TaskTreeSync tient la table noeud -> tâches liées, mise à jour à chaque ajout,
+retrait ou changement de lien d'une tâche (task_changed, qui publie task_linked /
+task_unlinked). À partir des événements de noeuds :
+
+- un noeud créé sans tâche reçoit sa tâche « Tâche: <texte> » (à la fin du lot,
+  pour que les tâches importées avec lui comptent) ;
+- un noeud renommé renomme les tâches qui portent encore le titre automatique ;
+- les tâches d'un noeud supprimé sont déliées et marquées orphelines.
+
+Chaque événement ne touche que les tâches du noeud concerné. Les modifications
+passent par l'historique : elles rejoignent la transaction de l'action qui a publié
+l'événement et s'annulent avec elle. Rien n'est modifié pendant une annulation.
+"""
+
+from model_events import NODE_CREATED, NODE_DELETED, NODE_RENAMED, TASK_LINKED, TASK_UNLINKED
+
+AUTO_TITLE = "Tâche: {}"
+AUTO_DESCRIPTION = "Tâche automatiquement créée pour le noeud '{}'"
+
+
+class TaskTreeSync:
+    """make_task(title=, description=, linked_node=) crée une tâche (classe Task de l'application)"""
+
+    def __init__(self, bus, tasks, undo_stack, make_task):
+        self.bus = bus
+        self.tasks = tasks
+        self.undo_stack = undo_stack
+        self.make_task = make_task
+        # noeud -> tâches liées (dict ordonné utilisé comme ensemble), tâche -> noeud
+        self.node_tasks = {}
+        self.task_nodes = {}
+        # Créer une tâche pour chaque nouveau noeud
+        self.auto_create = True
+        bus.subscribe(NODE_RENAMED, self.on_node_renamed)
+        bus.subscribe(NODE_DELETED, self.on_node_deleted)
+        bus.subscribe_batch(self.on_events)
+
+    def tasks_of(self, node):
+        return list(self.node_tasks.get(node, ()))
+
+    def task_changed(self, task, present=True):
+        """Prend en compte une tâche ajoutée, retirée ou liée à un autre noeud"""
+        node = task.linked_node if present else None
+        old_node = self.task_nodes.get(task)
+        if node is old_node:
+            return
+        if old_node is not None:
+            del self.task_nodes[task]
+            tasks = self.node_tasks[old_node]
+            del tasks[task]
+            if not tasks:
+                del self.node_tasks[old_node]
+            self.bus.publish(TASK_UNLINKED, task, old_node)
+        if node is not None:
+            self.task_nodes[task] = node
+            self.node_tasks.setdefault(node, {})[task] = None
+            self.bus.publish(TASK_LINKED, task, node)
+            if getattr(task, 'orphaned', False) and not self.undo_stack.replaying:
+                with self.undo_stack.transaction("Lier la tâche", "tasks") as t:
+                    t.set(task, orphaned=False)
+
+    def ensure_task(self, node):
+        """Crée la tâche d'un noeud qui n'en a aucune ; la retourne (None si le noeud en a déjà)"""
+        if node in self.node_tasks:
+            return None
+        task = self.make_task(title=AUTO_TITLE.format(node.text),
+                              description=AUTO_DESCRIPTION.format(node.text),
+                              linked_node=node)
+        with self.undo_stack.transaction("Créer la tâche du noeud", "tasks") as t:
+            t.append(self.tasks, task)
+        return task
+
+    def on_events(self, events):
+        if not self.auto_create or self.undo_stack.replaying:
+            return
+        for event in events:
+            if event.kind == NODE_CREATED:
+                self.ensure_task(event.target)
+
+    def on_node_renamed(self, event):
+        node, old_text = event.target, event.value
+        old_title = AUTO_TITLE.format(old_text)
+        renamed = [task for task in self.tasks_of(node) if task.title == old_title]
+        if renamed and not self.undo_stack.replaying:
+            with self.undo_stack.transaction("Renommer les tâches du noeud", "tasks") as t:
+                for task in renamed:
+                    t.set(task, title=AUTO_TITLE.format(node.text))
+
+    def on_node_deleted(self, event):
+        orphans = self.tasks_of(event.target)
+        if orphans and not self.undo_stack.replaying:
+            with self.undo_stack.transaction("Détacher les tâches du noeud", "tasks") as t:
+                for task in orphans:
+                    t.set(task, linked_node=None, orphaned=True)
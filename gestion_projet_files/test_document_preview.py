@@ -0,0 +1,79 @@
+import os
+import shutil
+import tempfile
+import time
+
+from PIL import Image
+
+import document_preview
+from document_preview import ThumbnailService
+
+
+def wait_for_results(service, count, timeout=10):
+    results = []
+    deadline = time.monotonic() + timeout
+    while len(results) < count and time.monotonic() < deadline:
+        results.extend(service.poll())
+        time.sleep(0.01)
+    return dict(results)
+
+
+def test_thumbnails_are_generated_in_background_and_cached_by_content():
+    """Test la génération des vignettes (image, texte) et la réutilisation du cache par contenu"""
+    directory = tempfile.mkdtemp()
+    try:
+        image_path = os.path.join(directory, "capture.png")
+        Image.new("RGB", (600, 400), "red").save(image_path)
+        text_path = os.path.join(directory, "notes.md")
+        with open(text_path, "w", encoding="utf-8") as f:
+            f.write("# Compte rendu\n\n- Décision : lancer le lot 2\n")
+        copy_path = os.path.join(directory, "copie.png")
+        shutil.copy(image_path, copy_path)
+
+        cache_dir = os.path.join(directory, "cache")
+        service = ThumbnailService(cache_dir, size=(120, 80), worker_count=2)
+        try:
+            service.request("image", image_path)
+            service.request("text", text_path)
+            results = wait_for_results(service, 2)
+            assert results["image"].size == (120, 80)
+            assert results["text"].size == (120, 80)
+            assert not service.has_pending()
+
+            # Une copie du fichier réutilise la vignette en cache
+            service.request("copy", copy_path)
+            assert wait_for_results(service, 1)["copy"].size == (120, 80)
+            assert len(os.listdir(cache_dir)) == 2
+
+            # Un fichier modifié obtient une nouvelle vignette
+            Image.new("RGB", (100, 400), "blue").save(copy_path)
+            service.request("modified", copy_path)
+            assert wait_for_results(service, 1)["modified"].size == (20, 80)
+            assert len(os.listdir(cache_dir)) == 3
+        finally:
+            service.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_unsupported_and_unreadable_files():
+    """Test les types sans aperçu et les fichiers illisibles (aucune vignette, pas d'erreur)"""
+    directory = tempfile.mkdtemp()
+    try:
+        archive_path = os.path.join(directory, "livrables.zip")
+        broken_path = os.path.join(directory, "corrompu.png")
+        for path in (archive_path, broken_path):
+            with open(path, "wb") as f:
+                f.write(b"not an image")
+        assert not document_preview.supports(archive_path)
+        assert document_preview.build_thumbnail(archive_path) is None
+
+        service = ThumbnailService(os.path.join(directory, "cache"))
+        try:
+            service.request("broken", broken_path)
+            service.request("again", broken_path)
+            assert wait_for_results(service, 2) == {"broken": None, "again": None}
+        finally:
+            service.close()
+    finally:
+        shutil.rmtree(directory)
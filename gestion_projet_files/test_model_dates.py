@@ -0,0 +1,36 @@
+import datetime
+
+from model_dates import format_date, parse_date, parse_datetime, parse_relative_date, parse_task_date, to_iso
+
+
+def test_dates_are_parsed_once_and_round_trip():
+    """Test la lecture des formats saisis ou sauvegardés, l'affichage et la sauvegarde ISO"""
+    day = datetime.date(2024, 12, 15)
+    for text in ("15/12/2024", " 2024-12-15 ", "15-12-2024", "2024-12-15T10:30:00"):
+        assert parse_date(text) == day
+    assert parse_date(day) is day and parse_date(datetime.datetime(2024, 12, 15, 8)) == day
+    assert parse_date("bientôt") is None and parse_date("") is None and parse_date(None) is None
+
+    moment = datetime.datetime(2024, 12, 15, 10, 30)
+    assert parse_datetime(moment.isoformat()) == moment
+    assert parse_datetime("15/12/2024") == datetime.datetime(2024, 12, 15)
+    assert parse_datetime(day) == datetime.datetime(2024, 12, 15) and parse_datetime("illisible") is None
+
+    assert format_date(day) == format_date(moment) == format_date("2024-12-15") == "15/12/2024"
+    assert format_date(None) == ""
+    assert parse_date(to_iso(day)) == day and parse_datetime(to_iso(moment)) == moment
+    assert to_iso(None) is None
+
+
+def test_relative_due_dates():
+    """Test les délais des modèles de blocs (J+n, Semaine n) comptés depuis une date de référence"""
+    reference = datetime.date(2025, 1, 6)
+    assert parse_relative_date("J+5", reference) == datetime.date(2025, 1, 11)
+    assert parse_relative_date(" j - 1 ", reference) == datetime.date(2025, 1, 5)
+    assert parse_relative_date("Semaine 1", reference) == reference
+    assert parse_relative_date("semaine 3", reference) == datetime.date(2025, 1, 20)
+    assert parse_relative_date("Semaine 0", reference) is None and parse_relative_date("fin du lot", reference) is None
+
+    assert parse_task_date("15/01/2025", reference) == datetime.date(2025, 1, 15)
+    assert parse_task_date("J+2", "2025-01-06") == datetime.date(2025, 1, 8)
+    assert parse_task_date("J+2") is None and parse_task_date("fin du lot", reference) is None
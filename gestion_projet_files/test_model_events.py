@@ -0,0 +1,30 @@
+from model_events import NODE_CREATED, TASK_LINKED, EventBus
+
+
+def test_batches_deliver_once_after_cascades():
+    """Test les abonnés immédiats, les lots et les événements publiés en cascade"""
+    bus = EventBus()
+    immediate, rounds, settled = [], [], []
+    bus.subscribe(NODE_CREATED, lambda event: immediate.append(event.target))
+    bus.subscribe_batch(lambda events: rounds.append([event.kind for event in events]))
+    bus.subscribe_batch(settled.append, last=True)
+
+    # Hors lot : un événement, un appel
+    bus.publish(NODE_CREATED, "a")
+    assert immediate == ["a"] and rounds == [[NODE_CREATED]] and len(settled) == 1
+
+    # Un abonné de lot qui publie : tour suivant, mais un seul appel final
+    def link(events):
+        for event in events:
+            if event.kind == NODE_CREATED:
+                bus.publish(TASK_LINKED, f"tâche {event.target}", event.target)
+    bus.subscribe_batch(link)
+    rounds.clear()
+    settled.clear()
+    with bus.batch():
+        for name in "bcd":
+            bus.publish(NODE_CREATED, name)
+        assert rounds == [] and settled == []
+    assert immediate == list("abcd")
+    assert rounds == [[NODE_CREATED] * 3, [TASK_LINKED] * 3]
+    assert len(settled) == 1 and [event.target for event in settled[0]][3:] == ["tâche b", "tâche c", "tâche d"]
@@ -0,0 +1,85 @@
+import json
+import os
+import shutil
+import tempfile
+
+from project_cli import expand_paths, main, run
+from project_core import LogEntry, Project, Task, TreeNode, load_project_file, save_project_file
+
+
+def write_projects(directory, count):
+    os.makedirs(os.path.join(directory, "archives"))
+    for index in range(count):
+        node = TreeNode(f"Noeud {index}")
+        task = Task(title=f"Tâche {index}", due_date="01/03/2025", linked_node=node)
+        project = Project(f"projet{index}", {'objective': f"Objectif {index}"}, [node], None, [task],
+                          [LogEntry(title=f"Décision {index}")])
+        folder = directory if index % 2 else os.path.join(directory, "archives")
+        save_project_file(project, os.path.join(folder, f"projet{index}.prjt"))
+
+
+def test_commands_process_projects_in_parallel():
+    """Test les commandes validate, convert, export et report, dans le processus courant et avec un pool"""
+    directory = tempfile.mkdtemp()
+    try:
+        projects = os.path.join(directory, "projets")
+        write_projects(projects, 4)
+        items = list(expand_paths([projects]))
+        assert len(items) == 4 and os.path.join("archives", "projet0.prjt") in [item[1] for item in items]
+
+        options = {'output_dir': os.path.join(directory, "sortie"), 'indent': None,
+                   'formats': ["charter-md", "log-md"], 'reports': ["documents", "usage"]}
+        for jobs in (1, 2):
+            assert all(result.ok for result in run("validate", items, options, jobs))
+            results = run("export", items, options, jobs)
+            assert [result.path for result in results] == [item[0] for item in items]
+
+        charter = os.path.join(directory, "sortie", "archives", "projet0_charte.md")
+        with open(charter, encoding="utf-8") as f:
+            assert "Objectif 0" in f.read()
+
+        assert main(["convert", projects, "-o", os.path.join(directory, "convertis"), "--compact", "-j", "2"]) == 0
+        converted = load_project_file(os.path.join(directory, "convertis", "projet1.prjt"))
+        assert converted.tasks[0].linked_node is converted.tree_nodes[0]
+
+        # Échéance illisible : conservée par la conversion et signalée
+        project = load_project_file(items[0][0])
+        project.tasks[0].due_date = "J+5"
+        save_project_file(project, items[0][0])
+        result, = run("convert", items[:1], options, 1)
+        assert result.ok and "échéance illisible conservée en texte (J+5)" in result.messages[0]
+        assert load_project_file(result.messages[-1]).tasks[0].due_date_text == "J+5"
+        assert main(["report", projects, "-o", os.path.join(directory, "rapports"), "-j", "1"]) == 0
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_failures_are_reported_per_file(capsys):
+    """Test qu'un fichier invalide échoue sans interrompre le traitement des autres"""
+    directory = tempfile.mkdtemp()
+    try:
+        write_projects(directory, 2)
+        with open(os.path.join(directory, "casse.prjt"), "w", encoding="utf-8") as f:
+            json.dump({'metadata': {}, 'tasks_data': {'tasks': [{'title': "T", 'depends_on': [9]}]}}, f)
+
+        assert main(["validate", directory, "-j", "2"]) == 1
+        output = capsys.readouterr().out
+        assert "❌" in output and "dépendance 9 introuvable" in output
+        assert output.count("✅") == 2
+
+        # Arbre trop profond pour la lecture récursive : seul ce fichier échoue
+        depth = 5000
+        with open(os.path.join(directory, "profond.prjt"), "w", encoding="utf-8") as f:
+            f.write('{"metadata": {}, "tree_data": {"nodes": [' + '{"text": "noeud", "children": [' * depth
+                    + '{"text": "feuille"}' + ']}' * depth + ']}}')
+        results = run("convert", list(expand_paths([directory])), {'output_dir': os.path.join(directory, "sortie"),
+                                                                   'indent': None}, 2)
+        failed = [result for result in results if not result.ok]
+        assert [os.path.basename(result.path) for result in failed] == ["profond.prjt"]
+        assert failed[0].messages[0].startswith("RecursionError")
+        assert sum(result.ok for result in results) == 3
+
+        assert main(["validate", os.path.join(directory, "absent.prjt"), "-j", "1"]) == 1
+        assert main(["validate", os.path.join(directory, "archives", "vide")]) == 1
+    finally:
+        shutil.rmtree(directory)
@@ -0,0 +1,130 @@
+import datetime
+import json
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from project_core import (Document, LogEntry, Project, ProjectBlock, ProjectFormatError, Task, TreeNode,
+                          charter_markdown, decision_log_markdown, document_report, load_project_file,
+                          read_project_data, save_project_file, usage_report, validate_project_data)
+
+
+def sample_project(directory):
+    root = TreeNode("Racine")
+    design = TreeNode("Conception")
+    root.add_child(design)
+    first = Task(title="Maquette", status="Terminé", due_date="15/12/2024", linked_node=design)
+    second = Task(title="Recette", priority="Critique", linked_node=root, dependencies=[first])
+    entry = LogEntry(title="Lancement", description="Réunion de démarrage", author="Alice")
+
+    stored = os.path.join(directory, "storage", "specs.pdf")
+    os.makedirs(os.path.dirname(stored))
+    with open(stored, "wb") as f:
+        f.write(b"%PDF-1.4")
+    doc = Document(filename="specs.pdf", category="Spécifications", linked_node=design)
+    doc.stored_path = stored
+    block = ProjectBlock(name="Revue de code", category="Quality")
+
+    return Project("alpha", {'objective': "Livrer"}, [root, design], design, [first, second], [entry], [doc],
+                   [block], settings={'tasks_data': {'view_mode': 'table'}, 'ui_config': {'last_module': 'tasks'}})
+
+
+def test_save_and_load_round_trip():
+    """Test l'écriture puis la lecture d'un projet : liens, dépendances, dates, documents et réglages"""
+    directory = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(directory, "alpha.prjt")
+        assert save_project_file(sample_project(directory), filename) == 1
+
+        project = load_project_file(filename)
+        assert project.name == "alpha" and project.charter_data == {'objective': "Livrer"}
+        root, design = project.tree_nodes
+        assert design.parent is root and project.selected_node is design
+        first, second = project.tasks
+        assert first.linked_node is design and second.dependencies == [first]
+        assert first.due_date == datetime.date(2024, 12, 15)
+        assert project.log_entries[0].author == "Alice"
+        doc, = project.documents
+        assert doc.linked_node is design and os.path.exists(doc.stored_path)
+        assert os.path.dirname(doc.stored_path) == os.path.join(directory, "alpha_files", "documents")
+        assert project.blocks[0].name == "Revue de code"
+        assert project.settings['tasks_data'] == {'view_mode': 'table'}
+        assert project.settings['ui_config'] == {'last_module': 'tasks'}
+        assert validate_project_data(read_project_data(filename), filename) == []
+
+        # Copie du document supprimée : le document est signalé, pas chargé
+        os.remove(doc.stored_path)
+        project = load_project_file(filename)
+        assert project.documents == [] and project.missing_documents[0].filename == "specs.pdf"
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_invalid_files_and_validation_problems():
+    """Test le refus des fichiers qui ne sont pas des projets et les problèmes signalés par la validation"""
+    directory = tempfile.mkdtemp()
+    try:
+        broken = os.path.join(directory, "broken.prjt")
+        with open(broken, "w", encoding="utf-8") as f:
+            f.write("{ pas du json")
+        with pytest.raises(ProjectFormatError):
+            read_project_data(broken)
+        with open(broken, "w", encoding="utf-8") as f:
+            json.dump([1, 2], f)
+        with pytest.raises(ProjectFormatError):
+            read_project_data(broken)
+
+        data = {
+            'metadata': {'file_type': 'autre'},
+            'tree_data': {'nodes': [{'text': "A", 'children': [{'text': "A"}]}]},
+            'tasks_data': {'tasks': [{'id': 1, 'title': "T", 'linked_node_text': "B",
+                                      'due_date': "bientôt", 'depends_on': [2]}]},
+            'documents_data': {'documents': [{'id': 3, 'filename': "plan.pdf"}]},
+        }
+        problems = validate_project_data(data, os.path.join(directory, "p.prjt"))
+        assert len(problems) == 6
+        for text in ("type de fichier", "plusieurs noeuds « A »", "noeud « B » introuvable",
+                     "échéance illisible", "dépendance 2", "plan.pdf"):
+            assert any(text in problem for problem in problems), text
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_reports_and_exports():
+    """Test le contenu des rapports et exports Markdown"""
+    directory = tempfile.mkdtemp()
+    try:
+        project = sample_project(directory)
+        assert "Livrer" in charter_markdown(project.charter_data)
+        assert "## Lancement" in decision_log_markdown(project.log_entries)
+        report = document_report(project.documents, "/stockage")
+        assert "specs.pdf" in report and "Conception" in report and "/stockage" in report
+        assert "1 blocs n'ont jamais été utilisés" in usage_report(project.blocks)
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_unreadable_due_dates_are_kept_as_text():
+    """Test qu'une échéance illisible survit à la lecture et à la réécriture, avec un avertissement"""
+    directory = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(directory, "p.prjt")
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump({'metadata': {}, 'tasks_data': {'tasks': [{'title': "Livraison", 'due_date': "Semaine 2"},
+                                                                 {'title': "Recette", 'due_date': "2025-01-15"}]}}, f)
+        project = load_project_file(filename)
+        delivery, acceptance = project.tasks
+        assert delivery.due_date is None and delivery.due_date_text == "Semaine 2"
+        assert delivery.due_date_label == "Semaine 2" and acceptance.due_date_label == "15/01/2025"
+        assert project.warnings == ["tâche « Livraison » : échéance illisible conservée en texte (Semaine 2)"]
+
+        save_project_file(project, filename)
+        assert load_project_file(filename).tasks[0].due_date_text == "Semaine 2"
+
+        # Une vraie date remplace le texte
+        delivery.due_date = "20/01/2025"
+        assert delivery.due_date_text == "" and delivery.to_dict()['due_date'] == "2025-01-20"
+    finally:
+        shutil.rmtree(directory)
@@ -0,0 +1,90 @@
+import datetime
+
+from reminder_scheduler import MAX_DELAY_MS, REMINDER_TIME, ReminderScheduler
+from task_repository import TaskRepository
+
+
+class Item:
+    def __init__(self, title, due_date=None, status="À faire"):
+        self.title = title
+        self.status = status
+        self.priority = "Moyenne"
+        self.assignee = ""
+        self.due_date = due_date
+
+    def __setattr__(self, name, value):
+        repository = self.__dict__.get("repository")
+        old_value = self.__dict__.get(name)
+        object.__setattr__(self, name, value)
+        if repository is not None:
+            repository.reindex(self, name, old_value)
+
+    def __repr__(self):
+        return self.title
+
+
+class Clock:
+    """Horloge et minuteurs Tk simulés"""
+
+    def __init__(self, now):
+        self.current = now
+        self.timers = {}
+        self.ids = 0
+
+    def now(self):
+        return self.current
+
+    def after(self, delay, callback):
+        self.ids += 1
+        self.timers[self.ids] = (delay, callback)
+        return self.ids
+
+    def after_cancel(self, timer):
+        del self.timers[timer]
+
+    def run(self):
+        """Avance jusqu'au minuteur armé et le déclenche"""
+        (timer, (delay, callback)), = self.timers.items()
+        del self.timers[timer]
+        self.current += datetime.timedelta(milliseconds=delay)
+        callback()
+
+
+def test_single_timer_for_next_due_task():
+    """Test le minuteur unique, les rappels en retard, les changements d'échéance et de statut"""
+    clock = Clock(datetime.datetime(2024, 12, 10, 8, 0))
+    tasks = TaskRepository()
+    reminded = []
+    scheduler = ReminderScheduler(tasks, reminded.append, clock.after, clock.after_cancel, now=clock.now)
+    tasks.on_change = scheduler.update
+
+    late = Item("en retard", datetime.date(2024, 12, 1))
+    today = Item("aujourd'hui", datetime.date(2024, 12, 10))
+    later = Item("plus tard", datetime.date(2025, 3, 1))
+    done = Item("terminée", datetime.date(2024, 12, 2), status="Terminé")
+    tasks.extend([Item(f"t{i}", datetime.date(2025, 1, 1) + datetime.timedelta(days=i)) for i in range(500)])
+    tasks.extend([later, today, late, done, Item("sans date")])
+    assert len(clock.timers) == 1
+
+    # Tâche en retard : rappel immédiat, une seule fois
+    clock.run()
+    assert reminded == [[late]] and len(clock.timers) == 1
+    late.assignee = "Léa"
+    assert scheduler.next_reminder()[1] is today
+
+    # Le rappel du jour arrive à l'heure prévue
+    clock.run()
+    assert reminded[-1] == [today] and clock.current == datetime.datetime.combine(today.due_date, REMINDER_TIME)
+
+    # Échéance avancée, tâche terminée ou retirée : le minuteur suit la prochaine échéance
+    later.due_date = datetime.date(2024, 12, 11)
+    assert scheduler.next_reminder()[1] is later
+    later.status = "Terminé"
+    assert scheduler.next_reminder()[1] is tasks[0]
+    del tasks[0]
+    assert scheduler.next_reminder()[1] is tasks[0]
+    assert len(clock.timers) == 1 and all(delay <= MAX_DELAY_MS for delay, _ in clock.timers.values())
+
+    # Sans échéance restante, aucun minuteur
+    tasks.clear()
+    assert clock.timers == {} and scheduler.next_reminder() is None
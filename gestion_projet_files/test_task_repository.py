@@ -0,0 +1,93 @@
+import datetime
+
+import pytest
+
+from task_repository import TaskRepository
+from undo_stack import UndoStack
+
+
+class Item:
+    def __init__(self, title, status="À faire", priority="Moyenne", assignee="", due_date=""):
+        self.title = title
+        self.status = status
+        self.priority = priority
+        self.assignee = assignee
+        self.due_date = due_date
+
+    def __setattr__(self, name, value):
+        # Même signalement que main.Task
+        repository = self.__dict__.get("repository")
+        old_value = self.__dict__.get(name)
+        object.__setattr__(self, name, value)
+        if repository is not None:
+            repository.reindex(self, name, old_value)
+
+    def __repr__(self):
+        return self.title
+
+
+def test_indexes_follow_mutations():
+    """Test les index après ajouts, suppressions, changements d'attributs et annuler / rétablir"""
+    a = Item("a", priority="Critique", assignee="Léa")
+    b = Item("b", status="En cours", assignee="Léa")
+    c = Item("c")
+    tasks = TaskRepository([a, b])
+    tasks.append(c)
+    assert tasks.with_value("status", "À faire") == [a, c]
+    assert tasks.count_by("assignee", "Léa") == 2 and tasks.count_by("priority", "Critique") == 1
+    with pytest.raises(ValueError):
+        tasks.append(a)
+
+    b.status = "Terminé"
+    c.assignee = "Noé"
+    assert tasks.count_by("status", "En cours") == 0 and tasks.with_value("status", "Terminé") == [b]
+    assert sorted(tasks.values("assignee")) == ["Léa", "Noé"]
+
+    tasks.remove(a)
+    assert a not in tasks and tasks.count_by("priority", "Critique") == 0
+    a.status = "Terminé"
+    assert tasks.count_by("status", "Terminé") == 1
+
+    stack = UndoStack()
+    with stack.transaction("Ajout", "tasks") as t:
+        t.append(tasks, Item("d", status="En cours"))
+        t.remove(tasks, c)
+    assert tasks.count_by("status", "En cours") == 1 and c not in tasks
+    stack.undo()
+    assert [task.title for task in tasks] == ["b", "c"] and tasks.count_by("status", "En cours") == 0
+    with stack.transaction("Remplacement", "tasks") as t:
+        t.replace(tasks, [c])
+    assert list(tasks) == [c] and tasks.count_by("status", "Terminé") == 0
+    stack.undo()
+    assert tasks.with_value("status", "Terminé") == [b]
+
+    tasks.clear()
+    assert len(tasks) == 0 and tasks.values("status") == [] and b not in tasks
+
+
+def test_due_dates_and_overdue():
+    """Test le tri par échéance et les tâches en retard (sans les tâches terminées)"""
+    today = datetime.date(2024, 12, 10)
+    late = Item("en retard", due_date="01/12/2024")
+    later = Item("en retard aussi", status="En cours", due_date="2024-12-09")
+    done = Item("terminée", status="Terminé", due_date="05/12/2024")
+    soon = Item("bientôt", due_date="20/12/2024")
+    undated = Item("sans date")
+    tasks = TaskRepository([soon, undated, later, done, late])
+
+    assert tasks.by_due_date() == [late, done, later, soon]
+    assert tasks.by_due_date(["À faire"]) == [late, soon]
+    assert tasks.overdue(today) == [late, later]
+
+    late.status = "Terminé"
+    soon.due_date = "01/11/2024"
+    undated.due_date = "illisible"
+    assert tasks.overdue(today) == [soon, later]
+    del tasks[0]
+    assert tasks.overdue(today) == [later]
+
+    # 20 000 tâches : la requête ne renvoie que les tâches en retard
+    start = datetime.date(2024, 1, 1)
+    many = TaskRepository(Item(f"t{i}", due_date=start + datetime.timedelta(days=i % 400)) for i in range(20000))
+    overdue = many.overdue(start + datetime.timedelta(days=10))
+    assert len(overdue) == 500 and all(task.due_date < start + datetime.timedelta(days=10) for task in overdue)
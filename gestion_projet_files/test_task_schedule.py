@@ -0,0 +1,107 @@
+import random
+
+import pytest
+
+from task_schedule import CycleError, TaskSchedule
+
+
+class Item:
+    def __init__(self, name, duration=1, dependencies=()):
+        self.name = name
+        self.duration = duration
+        self.dependencies = list(dependencies)
+
+    def __repr__(self):
+        return self.name
+
+
+def full_schedule(tasks):
+    """Calcul complet de référence (sans incrémental)"""
+    start = {}
+    pending = list(tasks)
+    while pending:
+        for task in pending[:]:
+            if all(p in start for p in task.dependencies):
+                start[task] = max((start[p] + p.duration for p in task.dependencies), default=0)
+                pending.remove(task)
+    finish = max((start[t] + t.duration for t in tasks), default=0)
+    late = {}
+    for task in sorted(tasks, key=lambda t: -start[t]):
+        dependents = [t for t in tasks if task in t.dependencies]
+        late[task] = min((late[d] for d in dependents), default=finish) - task.duration
+    return start, late
+
+
+def test_critical_path_and_cycles():
+    """Test les dates au plus tôt / au plus tard, le chemin critique et le refus des cycles"""
+    design = Item("conception", 3)
+    backend = Item("serveur", 5, [design])
+    frontend = Item("interface", 2, [design])
+    tests = Item("recette", 1, [backend, frontend])
+    tasks = [tests, frontend, backend, design]
+
+    schedule = TaskSchedule()
+    assert schedule.sync(tasks) == []
+    assert schedule.project_duration() == 9
+    assert schedule.critical_path() == [design, backend, tests]
+    assert schedule.early_start(frontend) == 3 and schedule.slack(frontend) == 3
+    assert schedule.late_finish(frontend) == 8
+
+    assert schedule.find_cycle(design, [tests]) is tests
+    assert schedule.find_cycle(frontend, [backend]) is None
+    with pytest.raises(CycleError):
+        schedule.add_dependency(design, tests)
+    design.dependencies.append(tests)
+    with pytest.raises(CycleError):
+        schedule.update(design)
+    design.dependencies.clear()
+    assert schedule.project_duration() == 9
+
+    # L'interface devient plus longue que le serveur : le chemin critique change
+    frontend.duration = 7
+    schedule.update(frontend)
+    assert schedule.critical_path() == [design, frontend, tests]
+
+    # Suppression d'une tâche : ses dépendants sont recalculés
+    tasks.remove(frontend)
+    tests.dependencies.remove(frontend)
+    schedule.sync(tasks)
+    assert schedule.project_duration() == 9 and frontend not in schedule
+
+
+def test_incremental_updates_match_full_computation():
+    """Test le recalcul limité aux tâches concernées, comparé à un calcul complet"""
+    rng = random.Random(3)
+    tasks = []
+    for i in range(300):
+        # Des prérequis pris parmi les tâches suivantes forcent la réorganisation de l'ordre
+        task = Item(f"t{i}", rng.randint(1, 5))
+        tasks.append(task)
+    for i, task in enumerate(tasks):
+        others = tasks[:i] if i % 3 else tasks[i + 1:]
+        task.dependencies = rng.sample(others, min(len(others), rng.randint(0, 2)))
+    schedule = TaskSchedule()
+    assert schedule.sync(tasks) == []
+
+    for _ in range(30):
+        task = rng.choice(tasks)
+        task.duration = rng.randint(1, 5)
+        schedule.sync(tasks)
+        start, late = full_schedule(tasks)
+        assert all(schedule.early_start(t) == start[t] and schedule.late_start(t) == late[t] for t in tasks)
+
+    # Une tâche modifiée ne recalcule que sa chaîne (tâches en aval et en amont)
+    chains = []
+    for c in range(1000):
+        chain = [Item(f"c{c}.0")]
+        for i in range(1, 5):
+            chain.append(Item(f"c{c}.{i}", 1, [chain[-1]]))
+        chains.append(chain)
+    tasks = [task for chain in chains for task in chain]
+    schedule = TaskSchedule()
+    schedule.sync(tasks)
+    assert schedule.project_duration() == 5 and len(schedule.critical_path()) == 5000
+    chains[10][2].duration = 3
+    schedule.sync(tasks)
+    assert schedule.project_duration() == 7 and schedule.critical_path() == chains[10]
+    assert schedule.recomputed <= 10
@@ -0,0 +1,125 @@
+from model_events import NODE_CREATED, NODE_DELETED, NODE_RENAMED, EventBus
+from task_repository import TaskRepository
+from task_tree_sync import TaskTreeSync
+from undo_stack import UndoStack
+
+
+class Node:
+    def __init__(self, text):
+        self.text = text
+
+
+class Item:
+    def __init__(self, title="", description="", linked_node=None):
+        self.title = title
+        self.description = description
+        self.status = "À faire"
+        self.priority = "Moyenne"
+        self.assignee = ""
+        self.due_date = None
+        self.linked_node = linked_node
+        self.orphaned = False
+
+    def __setattr__(self, name, value):
+        repository = self.__dict__.get("repository")
+        old_value = self.__dict__.get(name)
+        object.__setattr__(self, name, value)
+        if repository is not None:
+            repository.reindex(self, name, old_value)
+
+
+def make_project():
+    bus = EventBus()
+    stack = UndoStack()
+    tasks = TaskRepository()
+    sync = TaskTreeSync(bus, tasks, stack, Item)
+    tasks.on_change = lambda task: sync.task_changed(task, task in tasks)
+    refreshes = []
+    bus.subscribe_batch(refreshes.append, last=True)
+    return bus, stack, tasks, sync, refreshes
+
+
+def test_node_events_create_rename_and_orphan_tasks():
+    """Test la création, le renommage et le détachement des tâches à partir des événements de noeuds"""
+    bus, stack, tasks, sync, refreshes = make_project()
+    nodes = []
+    node = Node("Conception")
+    with stack.transaction("Créer un noeud", "tree") as t:
+        t.append(nodes, node)
+        bus.publish(NODE_CREATED, node)
+    task, = sync.tasks_of(node)
+    assert task.title == "Tâche: Conception" and list(tasks) == [task] and len(stack) == 1
+
+    # Une tâche renommée à la main garde son titre
+    manual = Item("Maquettes", linked_node=node)
+    tasks.append(manual)
+    node.text = "Architecture"
+    bus.publish(NODE_RENAMED, node, "Conception")
+    assert task.title == "Tâche: Architecture" and manual.title == "Maquettes"
+
+    with stack.transaction("Supprimer le noeud", "tree") as t:
+        t.remove(nodes, node)
+        bus.publish(NODE_DELETED, node)
+    assert sync.tasks_of(node) == [] and task.orphaned and task.linked_node is None
+
+    # L'annulation rétablit le lien, sans nouvelle modification de la synchronisation
+    stack.undo()
+    assert nodes == [node] and not task.orphaned and set(sync.tasks_of(node)) == {task, manual}
+    stack.redo()
+    assert task.orphaned and sync.tasks_of(node) == []
+
+    # Relier une tâche orpheline lève le marqueur
+    other = Node("Tests")
+    with stack.transaction("Lier", "tasks") as t:
+        t.set(task, linked_node=other)
+    assert not task.orphaned and sync.tasks_of(other) == [task]
+
+
+def test_bulk_import_refreshes_once_and_keeps_imported_tasks():
+    """Test un import de 200 noeuds : un seul rafraîchissement, pas de doublon pour les noeuds déjà liés"""
+    bus, stack, tasks, sync, refreshes = make_project()
+    nodes = [Node(f"n{i}") for i in range(200)]
+    with stack.transaction("Importer le bloc", "tree", "tasks") as t, bus.batch():
+        for node in nodes:
+            t.append([], node)
+            bus.publish(NODE_CREATED, node)
+        # Tâches importées avec le bloc, liées à certains noeuds
+        for node in nodes[:50]:
+            t.append(tasks, Item(f"Importée {node.text}", linked_node=node))
+    assert len(refreshes) == 1 and len(stack) == 1
+    assert len(tasks) == 200 and all(len(sync.tasks_of(node)) == 1 for node in nodes)
+    stack.undo()
+    assert len(tasks) == 0 and sync.node_tasks == {}
+
+
+def test_task_created_for_a_node_is_scheduled():
+    """Test que la tâche créée pour un nouveau noeud est connue de l'ordonnancement de l'application"""
+    from types import SimpleNamespace
+
+    import main
+    from project_core import Task, TreeNode
+    from task_schedule import TaskSchedule
+    from tree_rollup import TreeRollup
+
+    bus = EventBus()
+    stack = UndoStack()
+    tasks = TaskRepository()
+    app = SimpleNamespace(tasks=tasks, task_schedule=TaskSchedule(), task_schedule_stale=True,
+                          reminders=SimpleNamespace(update=lambda task: None), tree_rollup=TreeRollup())
+    app.tree_sync = TaskTreeSync(bus, tasks, stack, Task)
+    app.get_task_schedule = lambda: main.App.get_task_schedule(app)
+    tasks.on_change = lambda task: main.App.on_task_change(app, task)
+
+    existing = Task(title="Cadrage")
+    tasks.append(existing)
+    assert app.get_task_schedule().early_start(existing) == 0
+
+    node = TreeNode("Conception")
+    with stack.transaction("Créer un noeud", "tree"):
+        bus.publish(NODE_CREATED, node)
+    task, = app.tree_sync.tasks_of(node)
+    assert main.App.format_task_schedule(app, task).startswith("⏱️ 1 j")
+    assert app.get_task_schedule().is_critical(task)
+
+    stack.undo()
+    assert task not in tasks and task not in app.get_task_schedule()
@@ -0,0 +1,55 @@
+import datetime
+
+from timeline_view import ROW_HEIGHT, TimelineLayout, parse_date, task_span
+
+
+class Item:
+    def __init__(self, title, created_date, due_date="", duration=1, status="À faire"):
+        self.title = title
+        self.created_date = created_date
+        self.due_date = due_date
+        self.duration = duration
+        self.status = status
+
+
+def test_task_spans_from_dates():
+    """Test la lecture des dates et l'étendue des barres (échéance, durée, échéance antérieure)"""
+    assert parse_date("15/12/2024") == datetime.date(2024, 12, 15)
+    assert parse_date(datetime.datetime(2024, 12, 15, 10, 30)) == datetime.date(2024, 12, 15)
+    assert parse_date("2024-12-15T10:30:00") == datetime.date(2024, 12, 15)
+    assert parse_date("bientôt") is None and parse_date("") is None
+
+    day = datetime.date(2024, 12, 1).toordinal()
+    assert task_span(Item("échéance", "01/12/2024", "10/12/2024")) == (day, day + 10)
+    assert task_span(Item("durée", datetime.datetime(2024, 12, 1), duration=2.5)) == (day, day + 3)
+    assert task_span(Item("en retard", "01/12/2024", "28/11/2024")) == (day - 3, day - 2)
+
+
+def test_only_visible_rows_and_window_are_laid_out():
+    """Test la fenêtre visible (lignes, défilement, zoom autour du curseur) sur 10 000 tâches"""
+    start = datetime.date(2024, 1, 1)
+    tasks = [Item(f"Tâche {i}", start + datetime.timedelta(days=i % 365), duration=1 + i % 10) for i in range(10000)]
+    layout = TimelineLayout(tasks, pixels_per_day=10, today=start)
+    width, height = 1000, 30 * ROW_HEIGHT
+
+    layout.first_row = 5000
+    layout.scroll_day = start.toordinal() + 100
+    layout.clamp(width, height)
+    rows = layout.visible_rows(height)
+    assert len(rows) == 30 and rows[0][0] == 5000
+    starts = [layout.rows[row][1] for row, _, _, _ in rows]
+    assert starts == sorted(starts)
+    assert all(x1 == (layout.rows[row][1] - layout.scroll_day) * 10 for row, _, x1, _ in rows)
+
+    # Zoom : le jour sous le curseur ne bouge pas
+    day = layout.day_at(400)
+    layout.zoom(2, 400)
+    assert layout.pixels_per_day == 20 and abs(layout.day_at(400) - day) < 1e-9
+    assert all(x < width for x, _ in layout.ticks(width)) and layout.ticks(width)
+
+    # Défilement au-delà des limites : ramené dans le projet
+    layout.first_row = 20000
+    layout.scroll_day = 0
+    layout.clamp(width, height)
+    assert layout.first_row == 10000 - 30 and layout.scroll_day == layout.first_day
+    assert layout.y_fraction(height)[1] == 1.0
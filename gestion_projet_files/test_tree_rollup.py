@@ -0,0 +1,107 @@
+import random
+
+from task_repository import TaskRepository
+from tree_rollup import EMPTY, Rollup, TreeRollup
+
+
+class Node:
+    def __init__(self, text, parent=None):
+        self.text = text
+        self.parent = parent
+
+    def __repr__(self):
+        return self.text
+
+
+class Item:
+    def __init__(self, title, linked_node=None, status="À faire", priority="Moyenne"):
+        self.title = title
+        self.status = status
+        self.priority = priority
+        self.assignee = ""
+        self.due_date = None
+        self.linked_node = linked_node
+
+    def __setattr__(self, name, value):
+        repository = self.__dict__.get("repository")
+        old_value = self.__dict__.get(name)
+        object.__setattr__(self, name, value)
+        if repository is not None:
+            repository.reindex(self, name, old_value)
+
+
+def full_rollup(node, nodes, tasks, documents):
+    """Calcul complet de référence (parcours des descendants)"""
+    def inside(other):
+        while other is not None:
+            if other is node:
+                return True
+            other = other.parent
+        return False
+    linked = [task for task in tasks if inside(task.linked_node)]
+    return Rollup(sum(task.status == "Terminé" for task in linked), len(linked),
+                  sum(task.priority == "Critique" for task in linked),
+                  sum(inside(document.linked_node) for document in documents))
+
+
+def test_rollups_follow_tasks_documents_and_structure():
+    """Test les totaux par sous-arbre après des changements de tâches, de documents et de parents"""
+    root = Node("racine")
+    design = Node("conception", root)
+    build = Node("réalisation", root)
+    screens = Node("écrans", build)
+    nodes = [root, design, build, screens]
+
+    changes = []
+    rollup = TreeRollup(on_change=changes.append)
+    tasks = TaskRepository()
+    tasks.on_change = lambda task: rollup.update_task(task, task in tasks)
+    a = Item("a", screens, status="Terminé")
+    b = Item("b", screens, priority="Critique")
+    c = Item("c", design)
+    tasks.extend([a, b, c])
+    doc = Item("spécification", design)
+    rollup.update_document(doc)
+
+    assert rollup.totals_of(root) == Rollup(1, 3, 1, 1)
+    assert rollup.totals_of(build) == Rollup(1, 2, 1, 0) and rollup.totals_of(build).progress == 0.5
+    assert rollup.totals_of(Node("vide")) == EMPTY and EMPTY.progress is None
+
+    # Statut : seul le chemin vers la racine est mis à jour
+    b.status = "Terminé"
+    assert changes[-1] == {screens, build, root}
+    assert rollup.totals_of(build) == Rollup(2, 2, 1, 0)
+
+    # Lien vers un autre noeud, retrait d'une tâche et d'un document
+    a.linked_node = design
+    assert rollup.totals_of(design) == Rollup(1, 2, 0, 1) and rollup.totals_of(screens) == Rollup(1, 1, 1, 0)
+    tasks.remove(c)
+    rollup.sync_documents([])
+    assert rollup.totals_of(design) == Rollup(1, 1, 0, 0) and rollup.totals_of(root) == Rollup(2, 2, 1, 0)
+
+    # Changement de structure : totaux recalculés à la lecture
+    screens.parent = design
+    rollup.restructure()
+    assert changes[-1] is None
+    assert rollup.totals_of(build) == EMPTY and rollup.totals_of(design) == Rollup(2, 2, 1, 0)
+
+    # Modifications aléatoires comparées au calcul complet
+    rng = random.Random(5)
+    for i in range(20):
+        nodes.append(Node(f"n{i}", rng.choice(nodes)))
+    documents = []
+    for step in range(300):
+        choice = rng.random()
+        if choice < 0.3:
+            tasks.append(Item(f"t{step}", rng.choice(nodes + [None])))
+        elif choice < 0.5 and len(tasks):
+            tasks.remove(rng.choice(list(tasks)))
+        elif choice < 0.8 and len(tasks):
+            task = rng.choice(list(tasks))
+            task.status = rng.choice(["À faire", "Terminé"])
+            task.priority = rng.choice(["Moyenne", "Critique"])
+            task.linked_node = rng.choice(nodes + [None])
+        else:
+            documents.append(Item(f"d{step}", rng.choice(nodes)))
+            rollup.sync_documents(documents)
+    assert all(rollup.totals_of(node) == full_rollup(node, nodes, tasks, documents) for node in nodes)
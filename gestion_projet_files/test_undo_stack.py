@@ -0,0 +1,116 @@
+import pytest
+
+from undo_stack import UndoStack
+
+
+class Node:
+    def __init__(self, text, parent=None):
+        self.text = text
+        self.parent = parent
+        self.children = []
+
+
+def make_tree():
+    root = Node("Racine")
+    child = Node("Lot 1", root)
+    leaf = Node("Tâche", child)
+    root.children.append(child)
+    child.children.append(leaf)
+    return [root, child, leaf]
+
+
+def test_undo_redo_restores_the_same_objects():
+    """Test l'annulation d'une suppression de noeud et d'un effacement complet (objets identiques)"""
+    nodes = make_tree()
+    root, child, leaf = nodes
+    stack = UndoStack()
+
+    # Suppression d'un noeud : ses enfants sont rattachés à son parent
+    with stack.transaction("Supprimer", "tree") as t:
+        t.remove(root.children, child)
+        t.set(child, parent=None)
+        for node in child.children[:]:
+            t.remove(child.children, node)
+            t.set(node, parent=root)
+            t.append(root.children, node)
+        t.remove(nodes, child)
+    assert nodes == [root, leaf] and root.children == [leaf] and leaf.parent is root
+
+    with stack.transaction("Effacer", "tree") as t:
+        t.replace(nodes, [])
+    assert nodes == [] and len(stack) == 2
+
+    stack.undo()
+    stack.undo()
+    assert nodes == [root, child, leaf]
+    assert root.children == [child] and child.children == [leaf]
+    assert child.parent is root and leaf.parent is child
+
+    assert stack.redo().label == "Supprimer"
+    assert nodes == [root, leaf] and leaf.parent is root
+    assert stack.can_redo() and stack.can_undo()
+
+
+def test_nested_transactions_and_rollback():
+    """Test le regroupement des transactions imbriquées et l'annulation sur exception"""
+    changes = []
+    stack = UndoStack(on_change=changes.append)
+    items = []
+    with stack.transaction("Importer le bloc", "tree") as t:
+        t.append(items, "noeud")
+        with stack.transaction("Importer des tâches", "tasks") as inner:
+            inner.append(items, "tâche")
+    assert len(stack) == 1
+
+    with pytest.raises(ValueError):
+        with stack.transaction("Erreur", "tree") as t:
+            t.append(items, "perdu")
+            raise ValueError
+    assert items == ["noeud", "tâche"] and len(stack) == 1
+
+    command = stack.undo()
+    assert items == [] and command.keys == {"tree", "tasks"}
+    assert changes == [command]
+
+    # Un remplacement annulé conserve les éléments ajoutés hors historique
+    with stack.transaction("Vider", "log") as t:
+        t.replace(items, [])
+    items.append("entrée automatique")
+    stack.undo()
+    assert items == ["entrée automatique"]
+
+
+def test_history_is_bounded():
+    """Test l'oubli des commandes les plus anciennes (nombre et mémoire) et des rétablissements"""
+    discarded = []
+    stack = UndoStack(max_steps=3)
+    items = []
+    for i in range(5):
+        with stack.transaction(f"Ajout {i}", "tasks") as t:
+            t.append(items, i)
+            t.call(lambda: None, lambda: None, lambda applied, i=i: discarded.append((i, applied)))
+    assert len(stack) == 3 and discarded == [(0, True), (1, True)]
+
+    # Une nouvelle commande après une annulation oublie la commande annulée
+    stack.undo()
+    with stack.transaction("Autre", "tasks") as t:
+        t.append(items, "autre")
+    assert discarded[-1] == (4, False) and not stack.can_redo()
+    assert items == [0, 1, 2, 3, "autre"]
+
+    node = Node("Racine")
+    small = UndoStack(max_bytes=4096)
+    for i in range(1000):
+        with small.transaction("Renommer", "tree") as t:
+            t.set(node, text=f"Racine {i}")
+    assert 0 < small.bytes_used <= 4096 and 0 < len(small) < 1000
+
+    # Valeurs volumineuses : comptées dans le budget
+    budget = UndoStack(max_bytes=1024 * 1024)
+    for i in range(50):
+        with budget.transaction("Description", "tasks") as t:
+            t.set(node, text=str(i) * 100000)
+    assert budget.bytes_used <= 1024 * 1024 and len(budget) < 10
+
+    small.clear()
+    assert small.bytes_used == 0 and not small.can_undo()
@@ -0,0 +1,81 @@
+from view_manager import ViewManager
+
+
+class FakeFrame:
+    def __init__(self):
+        self.visible = True
+        self.destroyed = False
+
+    def grid(self):
+        self.visible = True
+
+    def grid_remove(self):
+        self.visible = False
+
+    def destroy(self):
+        self.destroyed = True
+
+
+def make_manager():
+    calls = []
+    activated = []
+    manager = ViewManager(FakeFrame, lambda name, frame: activated.append(name))
+    for name, refresh, depends in (("tree", True, ("tree",)), ("tasks", True, ("tasks", "tree")), ("charter", False, ("charter",))):
+        manager.register(
+            name,
+            lambda name=name: calls.append(("build", name)),
+            (lambda name=name: calls.append(("refresh", name))) if refresh else None,
+            depends,
+        )
+    return manager, calls, activated
+
+
+def test_views_are_built_once_then_hidden_and_shown():
+    """Test la construction unique des modules et leur masquage au changement de module"""
+    manager, calls, activated = make_manager()
+    tree = manager.show("tree")
+    tasks = manager.show("tasks")
+    assert not tree.visible and tasks.visible
+
+    assert manager.show("tree") is tree and tree.visible and not tasks.visible
+    manager.show("tree")
+    manager.show("tasks")
+    assert calls == [("build", "tree"), ("build", "tasks")]
+    assert activated == ["tree", "tasks", "tree", "tasks"]
+    assert manager.current == "tasks"
+
+
+def test_hidden_views_are_updated_when_shown_again():
+    """Test la mise à jour différée des modules masqués et la reconstruction après reset"""
+    manager, calls, _ = make_manager()
+    for name in ("tasks", "charter", "tree"):
+        manager.show(name)
+    del calls[:]
+
+    # Changement de l'arbre : seul le module des tâches (masqué) en dépend
+    manager.invalidate("tree")
+    assert manager.stale == {"tasks"}
+    manager.show("charter")
+    manager.show("tasks")
+    manager.show("tasks")
+    assert calls == [("refresh", "tasks")]
+
+    # refresh : le module affiché est aussi mis à jour
+    manager.refresh("tree")
+    assert calls[-1] == ("refresh", "tasks")
+    manager.refresh("charter")
+    assert calls[-1] == ("refresh", "tasks") and "charter" in manager.stale
+
+    # Un module sans fonction de rafraîchissement est reconstruit
+    manager.invalidate("charter")
+    charter = manager.frames["charter"]
+    manager.show("charter")
+    assert charter.destroyed and manager.frames["charter"] is not charter
+    assert calls[-1] == ("build", "charter")
+
+    # reset : tous les modules, y compris celui affiché, sont reconstruits à leur affichage
+    del calls[:]
+    manager.reset()
+    manager.show("charter")
+    manager.show("tree")
+    assert calls == [("build", "charter"), ("build", "tree")]
@@ -0,0 +1,194 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from workspace_catalog import CatalogIndexer, WorkspaceCatalog, default_catalog_path, summarize_project
+
+
+def project_data(name, tasks=(), description="Projet de test"):
+    return {
+        'metadata': {'project_name': name, 'save_date': "2024-11-02T10:00:00",
+                     'file_type': 'prjt', 'description': description},
+        'charter_data': {'objectifs': "Réduire les délais de livraison"},
+        'tree_data': {'nodes': [{'text': "Racine", 'children': [
+            {'text': "Conception", 'children': []},
+            {'text': "Réalisation", 'children': [{'text': "Tests", 'children': []}]},
+        ]}]},
+        'tasks_data': {'tasks': [{'title': title, 'status': status} for title, status in tasks]},
+        'log_data': {'entries': [{'title': "Lancement", 'description': "Réunion de démarrage"}]},
+        'documents_data': {'documents': [{'filename': "cahier_des_charges.pdf", 'tags': ["specs"]}]},
+        'blocks_data': {'used_blocks': []},
+    }
+
+
+def write_project(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def test_summarize_project_counts_and_text():
+    """Test les compteurs (arbre récursif, tâches terminées) et le texte indexé d'un projet"""
+    summary = summarize_project(project_data("Alpha", [("Maquette", "Terminé"), ("Recette", "À faire")]))
+    assert summary['name'] == "Alpha"
+    assert (summary['nodes'], summary['tasks'], summary['tasks_done']) == (4, 2, 1)
+    assert (summary['log_entries'], summary['documents'], summary['blocks']) == (1, 1, 0)
+    for text in ("Réduire les délais", "Tests", "Maquette", "Réunion de démarrage", "cahier_des_charges.pdf"):
+        assert text in summary['text']
+    # Sans métadonnées, le nom vient du fichier
+    assert summarize_project({}, "/projets/beta.prjt")['name'] == "beta"
+
+
+def test_scan_reindexes_only_changed_files():
+    """Test l'indexation incrémentale : fichiers inchangés, touchés, modifiés, supprimés et illisibles"""
+    directory = tempfile.mkdtemp()
+    catalog = WorkspaceCatalog(os.path.join(directory, "catalog.db"))
+    try:
+        projects = os.path.join(directory, "projets")
+        os.makedirs(os.path.join(projects, "archives"))
+        alpha = os.path.join(projects, "alpha.prjt")
+        beta = os.path.join(projects, "archives", "beta.prjt")
+        write_project(alpha, project_data("Alpha", [("Maquette", "Terminé")]))
+        write_project(beta, project_data("Beta"))
+        with open(os.path.join(projects, "notes.txt"), 'w') as f:
+            f.write("pas un projet")
+        catalog.add_folder(projects)
+
+        assert catalog.scan() == {'indexed': 2, 'unchanged': 0, 'removed': 0, 'errors': 0}
+        assert [project['name'] for project in catalog.projects()] == ["Alpha", "Beta"]
+        assert catalog.scan()['unchanged'] == 2
+
+        # Fichier touché sans changement de contenu : pas de nouvelle analyse
+        os.utime(alpha, ns=(0, 10 ** 9))
+        assert catalog.scan() == {'indexed': 0, 'unchanged': 2, 'removed': 0, 'errors': 0}
+        assert catalog.scan()['unchanged'] == 2
+
+        write_project(alpha, project_data("Alpha", [("Maquette", "Terminé"), ("Déploiement", "En cours")]))
+        os.remove(beta)
+        with open(os.path.join(projects, "casse.prjt"), 'w') as f:
+            f.write("{ pas du json")
+        assert catalog.scan() == {'indexed': 1, 'unchanged': 0, 'removed': 1, 'errors': 1}
+
+        alpha_row, broken = catalog.projects(order="tasks")
+        assert (alpha_row['name'], alpha_row['tasks'], alpha_row['tasks_done']) == ("Alpha", 2, 1)
+        assert broken['name'] == "casse" and broken['error']
+        assert catalog.projects("déploiement")[0]['path'] == alpha
+    finally:
+        catalog.close()
+        shutil.rmtree(directory)
+
+
+def test_unexpected_content_is_recorded_per_file():
+    """Test qu'un contenu de type inattendu est signalé sur son projet sans arrêter l'indexation"""
+    directory = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(directory, "catalog.db")
+        catalog = WorkspaceCatalog(db_path)
+        write_project(os.path.join(directory, "alpha.prjt"), project_data("Alpha"))
+        write_project(os.path.join(directory, "nom.prjt"), {'metadata': {'project_name': 3}})
+        write_project(os.path.join(directory, "taches.prjt"), {'tasks_data': {'tasks': 5}})
+        write_project(os.path.join(directory, "date.prjt"), {'metadata': {'save_date': {'jour': 1}}})
+        catalog.add_folder(directory)
+
+        indexer = CatalogIndexer(db_path)
+        indexer.start()
+        indexer.thread.join(10)
+        messages = indexer.poll()
+        assert messages[-1] == ("done", {'indexed': 1, 'unchanged': 0, 'removed': 0, 'errors': 3})
+        errors = {project['name']: project['error'] for project in catalog.projects()}
+        assert errors['Alpha'] is None
+        assert errors['nom'].startswith("TypeError") and errors['taches'].startswith("TypeError")
+        assert errors['date']
+        catalog.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_nested_folders_index_each_file_once():
+    """Test un dossier ajouté avec l'un de ses sous-dossiers : chaque fichier n'est indexé qu'une fois"""
+    directory = tempfile.mkdtemp()
+    catalog = WorkspaceCatalog(os.path.join(directory, "catalog.db"))
+    try:
+        projects = os.path.join(directory, "projets")
+        archives = os.path.join(projects, "archives")
+        os.makedirs(archives)
+        write_project(os.path.join(projects, "alpha.prjt"), project_data("Alpha"))
+        write_project(os.path.join(archives, "beta.prjt"), project_data("Beta"))
+        catalog.add_folder(projects)
+        catalog.add_folder(archives)
+
+        assert catalog.scan() == {'indexed': 2, 'unchanged': 0, 'removed': 0, 'errors': 0}
+        folders = {project['name']: project['folder'] for project in catalog.projects()}
+        assert folders == {"Alpha": projects, "Beta": archives}
+
+        os.remove(os.path.join(projects, "alpha.prjt"))
+        assert catalog.scan() == {'indexed': 0, 'unchanged': 1, 'removed': 1, 'errors': 0}
+    finally:
+        catalog.close()
+        shutil.rmtree(directory)
+
+
+def test_search_filters_projects_by_their_content():
+    """Test la recherche (mots en préfixe, sans accents) et la suppression d'un dossier"""
+    directory = tempfile.mkdtemp()
+    catalog = WorkspaceCatalog(os.path.join(directory, "catalog.db"))
+    try:
+        write_project(os.path.join(directory, "alpha.prjt"), project_data("Alpha", [("Migration serveur", "À faire")]))
+        write_project(os.path.join(directory, "beta.prjt"), project_data("Beta", [("Formation", "Terminé")]))
+        catalog.add_folder(directory)
+        catalog.scan()
+
+        def names(query):
+            return [project['name'] for project in catalog.projects(query)]
+
+        assert names("migr") == ["Alpha"]
+        assert names("formation") == ["Beta"]
+        assert names("reunion demarrage") == ["Alpha", "Beta"]
+        assert names("formation migration") == []
+        assert names('"') == []
+        assert len(catalog.projects(limit=1)) == 1
+
+        catalog.remove_folder(directory)
+        assert catalog.projects() == [] and catalog.folders() == []
+    finally:
+        catalog.close()
+        shutil.rmtree(directory)
+
+
+def test_indexer_runs_in_background():
+    """Test l'indexation dans un thread et la lecture de sa progression"""
+    directory = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(directory, "catalog.db")
+        catalog = WorkspaceCatalog(db_path)
+        for index in range(3):
+            write_project(os.path.join(directory, f"projet{index}.prjt"), project_data(f"Projet {index}"))
+        catalog.add_folder(directory)
+
+        indexer = CatalogIndexer(db_path)
+        indexer.start()
+        messages = []
+        deadline = time.monotonic() + 10
+        while not any(message[0] == "done" for message in messages) and time.monotonic() < deadline:
+            messages.extend(indexer.poll())
+            time.sleep(0.01)
+        assert ("progress", 3, 3) in messages
+        assert messages[-1] == ("done", {'indexed': 3, 'unchanged': 0, 'removed': 0, 'errors': 0})
+        assert catalog.count() == 3
+        catalog.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_default_catalog_path_is_in_user_data(monkeypatch):
+    """Test que la base du catalogue est créée dans le dossier de données de l'utilisateur"""
+    directory = tempfile.mkdtemp()
+    try:
+        monkeypatch.setenv("APPDATA", directory)
+        monkeypatch.setenv("XDG_DATA_HOME", directory)
+        path = default_catalog_path()
+        assert path == os.path.join(directory, "gestion_projet", "workspace_catalog.db")
+        assert os.path.isdir(os.path.dirname(path))
+    finally:
+        shutil.rmtree(directory)
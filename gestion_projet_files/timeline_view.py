@@ -0,0 +1,300 @@
+"""Vue chronologique (Gantt) des tâches, dessinée sur un tk.Canvas
+
+Seules les lignes et les barres visibles sont dessinées. Les éléments du canvas
+(barres, libellés, graduations) sont conservés d'un rendu à l'autre et déplacés
+(coords / itemconfigure) au lieu d'être recréés : défiler ou zoomer ne crée de
+nouveaux éléments que si la fenêtre visible en demande davantage.
+"""
+
+import datetime
+import math
+import tkinter as tk
+from tkinter import ttk
+
+from model_dates import parse_date
+
+# Dimensions (pixels)
+ROW_HEIGHT = 24
+BAR_HEIGHT = 14
+HEADER_HEIGHT = 32
+LABEL_WIDTH = 220
+# Zoom : pixels par jour
+DEFAULT_PIXELS_PER_DAY = 12
+MIN_PIXELS_PER_DAY = 1
+MAX_PIXELS_PER_DAY = 96
+ZOOM_STEP = 1.25
+# Jours affichés avant la première et après la dernière barre
+MARGIN_DAYS = 7
+# Défilement d'une unité de barre de défilement (pixels)
+SCROLL_UNIT = 40
+
+STATUS_COLORS = {"À faire": "#FF9800", "En cours": "#2196F3", "Terminé": "#4CAF50"}
+
+
+def task_span(task, today=None):
+    """Jours (ordinaux) de début et de fin (exclue) de la barre d'une tâche.
+
+    La barre va de la date de création à l'échéance ; sans échéance, elle dure
+    task.duration jours. Une échéance antérieure à la création donne une barre d'un
+    jour à l'échéance.
+    """
+    start = parse_date(getattr(task, "created_date", None))
+    due = parse_date(getattr(task, "due_date", None))
+    if start is None:
+        start = due or today or datetime.date.today()
+    if due is not None:
+        if due < start:
+            return due.toordinal(), due.toordinal() + 1
+        return start.toordinal(), due.toordinal() + 1
+    duration = max(1, math.ceil(getattr(task, "duration", 1) or 1))
+    return start.toordinal(), start.toordinal() + duration
+
+
+class TimelineLayout:
+    """Position des barres et fenêtre visible (sans dépendance à Tk)"""
+
+    def __init__(self, tasks, pixels_per_day=DEFAULT_PIXELS_PER_DAY, today=None):
+        today = today or datetime.date.today()
+        spans = [(task_span(task, today), index, task) for index, task in enumerate(tasks)]
+        spans.sort(key=lambda span: (span[0], span[1]))
+        self.rows = [(task, start, end) for (start, end), _, task in spans]
+        self.today = today.toordinal()
+        self.first_day = min((start for _, start, _ in self.rows), default=self.today) - MARGIN_DAYS
+        self.last_day = max((end for _, _, end in self.rows), default=self.today + 1) + MARGIN_DAYS
+        self.pixels_per_day = pixels_per_day
+        # Fenêtre visible : premier jour (fractionnaire) à gauche et première ligne en haut
+        self.scroll_day = float(self.first_day)
+        self.first_row = 0
+
+    def visible_days(self, width):
+        return width / self.pixels_per_day
+
+    def row_count(self, height):
+        """Nombre de lignes (au plus) visibles dans une hauteur donnée"""
+        return max(1, math.ceil(height / ROW_HEIGHT))
+
+    def clamp(self, width, height):
+        last_row = max(0, len(self.rows) - height // ROW_HEIGHT)
+        self.first_row = min(max(0, self.first_row), last_row)
+        last_scroll = max(self.first_day, self.last_day - self.visible_days(width))
+        self.scroll_day = min(max(self.first_day, self.scroll_day), last_scroll)
+
+    def x_of(self, day):
+        return (day - self.scroll_day) * self.pixels_per_day
+
+    def day_at(self, x):
+        return self.scroll_day + x / self.pixels_per_day
+
+    def visible_rows(self, height):
+        """[(ligne, tâche, x de début, x de fin)] des lignes visibles ; x relatifs à la zone du graphique"""
+        end_row = min(len(self.rows), self.first_row + self.row_count(height))
+        return [(row, task, self.x_of(start), self.x_of(end))
+                for row, (task, start, end) in enumerate(self.rows[self.first_row:end_row], self.first_row)]
+
+    def zoom(self, factor, anchor_x):
+        """Multiplie l'échelle en gardant sous anchor_x le même jour"""
+        day = self.day_at(anchor_x)
+        self.pixels_per_day = min(MAX_PIXELS_PER_DAY, max(MIN_PIXELS_PER_DAY, self.pixels_per_day * factor))
+        self.scroll_day = day - anchor_x / self.pixels_per_day
+
+    def ticks(self, width):
+        """Graduations visibles [(x, libellé)] : jours, semaines (lundis) ou mois selon le zoom"""
+        first = math.floor(self.scroll_day)
+        last = math.ceil(self.day_at(width))
+        if self.pixels_per_day >= 24:
+            days = range(first, last + 1)
+            label_format = "%d/%m"
+        elif self.pixels_per_day >= 4:
+            days = range(first - datetime.date.fromordinal(first).weekday(), last + 1, 7)
+            label_format = "%d/%m"
+        else:
+            days = [day for day in range(first, last + 1) if datetime.date.fromordinal(day).day == 1]
+            label_format = "%m/%Y"
+        return [(self.x_of(day), datetime.date.fromordinal(day).strftime(label_format)) for day in days]
+
+    def x_fraction(self, width):
+        """Position de la fenêtre pour la barre de défilement horizontale (début, fin)"""
+        total = self.last_day - self.first_day
+        first = (self.scroll_day - self.first_day) / total
+        return first, min(1.0, first + self.visible_days(width) / total)
+
+    def y_fraction(self, height):
+        total = max(1, len(self.rows))
+        first = self.first_row / total
+        return first, min(1.0, first + (height / ROW_HEIGHT) / total)
+
+
+class TimelineView(tk.Frame):
+    """Diagramme de Gantt défilable et zoomable ; on_open(tâche) au double-clic sur une ligne"""
+
+    def __init__(self, parent, tasks, width=1200, height=600, on_open=None, is_critical=None):
+        super().__init__(parent)
+        self.layout = TimelineLayout(tasks)
+        self.on_open = on_open
+        self.is_critical = is_critical or (lambda task: False)
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        self.canvas = tk.Canvas(self, width=width, height=height, bg="white", highlightthickness=0)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.y_scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.y_scrollbar.grid(row=0, column=1, sticky="ns")
+        self.x_scrollbar = ttk.Scrollbar(self, orient="horizontal", command=self.xview)
+        self.x_scrollbar.grid(row=1, column=0, sticky="ew")
+
+        # Éléments réutilisés : (barre, ligne de séparation, libellé) par ligne, (trait, texte) par graduation
+        self.row_items = []
+        self.tick_items = []
+        self.shown_rows = 0
+        self.shown_ticks = 0
+        self.label_background = self.canvas.create_rectangle(0, 0, LABEL_WIDTH, 0, fill="#F5F5F5", width=0)
+        self.header_background = self.canvas.create_rectangle(0, 0, 0, HEADER_HEIGHT, fill="#EEEEEE", width=0)
+        self.today_line = self.canvas.create_line(0, 0, 0, 0, fill="#F44336", dash=(4, 2))
+
+        self.canvas.bind("<Configure>", lambda event: self.render())
+        self.canvas.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.canvas.bind("<Shift-MouseWheel>", lambda event: self.on_mouse_wheel(event, horizontal=True))
+        self.canvas.bind("<Control-MouseWheel>", lambda event: self.on_mouse_wheel(event, zoom=True))
+        for button, delta in (("4", 120), ("5", -120)):
+            self.canvas.bind(f"<Button-{button}>", lambda event, delta=delta: self.on_mouse_wheel(event, delta=delta))
+            self.canvas.bind(f"<Shift-Button-{button}>",
+                             lambda event, delta=delta: self.on_mouse_wheel(event, horizontal=True, delta=delta))
+            self.canvas.bind(f"<Control-Button-{button}>",
+                             lambda event, delta=delta: self.on_mouse_wheel(event, zoom=True, delta=delta))
+        self.canvas.bind("<Double-Button-1>", self.on_double_click)
+
+        # Première vue : autour d'aujourd'hui
+        self.layout.scroll_day = self.layout.today - MARGIN_DAYS
+
+    def chart_size(self):
+        width = max(1, self.canvas.winfo_width() - LABEL_WIDTH)
+        height = max(1, self.canvas.winfo_height() - HEADER_HEIGHT)
+        return width, height
+
+    # --- Défilement et zoom
+
+    def xview(self, action, value, unit=None):
+        width, height = self.chart_size()
+        layout = self.layout
+        if action == "moveto":
+            layout.scroll_day = layout.first_day + float(value) * (layout.last_day - layout.first_day)
+        else:
+            step = width if unit == "pages" else SCROLL_UNIT
+            layout.scroll_day += int(value) * step / layout.pixels_per_day
+        self.render()
+
+    def yview(self, action, value, unit=None):
+        width, height = self.chart_size()
+        layout = self.layout
+        if action == "moveto":
+            layout.first_row = int(float(value) * len(layout.rows))
+        else:
+            step = height // ROW_HEIGHT if unit == "pages" else 1
+            layout.first_row += int(value) * step
+        self.render()
+
+    def zoom(self, factor, anchor_x=None):
+        width, _ = self.chart_size()
+        self.layout.zoom(factor, width / 2 if anchor_x is None else anchor_x)
+        self.render()
+
+    def on_mouse_wheel(self, event, horizontal=False, zoom=False, delta=None):
+        delta = event.delta if delta is None else delta
+        direction = -1 if delta > 0 else 1
+        if zoom:
+            self.zoom(ZOOM_STEP if delta > 0 else 1 / ZOOM_STEP, max(0, event.x - LABEL_WIDTH))
+        elif horizontal:
+            self.xview("scroll", direction, "units")
+        else:
+            self.yview("scroll", 3 * direction, "units")
+        return "break"
+
+    def on_double_click(self, event):
+        if event.y < HEADER_HEIGHT or not self.on_open:
+            return
+        row = self.layout.first_row + int((event.y - HEADER_HEIGHT) // ROW_HEIGHT)
+        if row < len(self.layout.rows):
+            self.on_open(self.layout.rows[row][0])
+
+    # --- Rendu
+
+    def row_item(self, index):
+        while len(self.row_items) <= index:
+            self.row_items.append((
+                self.canvas.create_rectangle(0, 0, 0, 0, width=1, state="hidden"),
+                self.canvas.create_line(0, 0, 0, 0, fill="#EEEEEE", state="hidden"),
+                self.canvas.create_text(0, 0, anchor="w", font=("TkDefaultFont", 9), state="hidden"),
+            ))
+        return self.row_items[index]
+
+    def tick_item(self, index):
+        while len(self.tick_items) <= index:
+            self.tick_items.append((
+                self.canvas.create_line(0, 0, 0, 0, fill="#E0E0E0", state="hidden"),
+                self.canvas.create_text(0, 0, anchor="w", font=("TkDefaultFont", 8), fill="#616161", state="hidden"),
+            ))
+        return self.tick_items[index]
+
+    def render(self):
+        """Positionne les éléments réutilisés sur la fenêtre visible ; masque ceux en trop"""
+        canvas = self.canvas
+        layout = self.layout
+        width, height = self.chart_size()
+        layout.clamp(width, height)
+        right = LABEL_WIDTH + width
+        bottom = HEADER_HEIGHT + height
+
+        # Graduations et lignes verticales
+        ticks = layout.ticks(width)
+        for index, (x, label) in enumerate(ticks):
+            line, text = self.tick_item(index)
+            canvas.coords(line, LABEL_WIDTH + x, 0, LABEL_WIDTH + x, bottom)
+            canvas.coords(text, LABEL_WIDTH + x + 3, HEADER_HEIGHT / 2)
+            canvas.itemconfigure(line, state="normal")
+            canvas.itemconfigure(text, text=label, state="normal")
+        for line, text in self.tick_items[len(ticks):self.shown_ticks]:
+            canvas.itemconfigure(line, state="hidden")
+            canvas.itemconfigure(text, state="hidden")
+        self.shown_ticks = len(ticks)
+
+        # Lignes des tâches : séparation, libellé et barre (coupée aux bords de la zone visible)
+        rows = layout.visible_rows(height)
+        for index, (row, task, x1, x2) in enumerate(rows):
+            bar, separator, label = self.row_item(index)
+            top = HEADER_HEIGHT + index * ROW_HEIGHT
+            canvas.coords(separator, 0, top + ROW_HEIGHT, right, top + ROW_HEIGHT)
+            canvas.coords(label, 8, top + ROW_HEIGHT / 2)
+            canvas.itemconfigure(separator, state="normal")
+            canvas.itemconfigure(label, text=task.title[:32], state="normal")
+            if x2 <= 0 or x1 >= width:
+                canvas.itemconfigure(bar, state="hidden")
+                continue
+            bar_top = top + (ROW_HEIGHT - BAR_HEIGHT) / 2
+            canvas.coords(bar, LABEL_WIDTH + max(x1, 0), bar_top, LABEL_WIDTH + min(x2, width), bar_top + BAR_HEIGHT)
+            canvas.itemconfigure(bar, state="normal", fill=STATUS_COLORS.get(task.status, "#9E9E9E"),
+                                 outline="#B71C1C" if self.is_critical(task) else "#616161")
+        for items in self.row_items[len(rows):self.shown_rows]:
+            for item in items:
+                canvas.itemconfigure(item, state="hidden")
+        self.shown_rows = len(rows)
+
+        # Aujourd'hui
+        today_x = layout.x_of(layout.today)
+        if 0 <= today_x <= width:
+            canvas.coords(self.today_line, LABEL_WIDTH + today_x, HEADER_HEIGHT, LABEL_WIDTH + today_x, bottom)
+            canvas.itemconfigure(self.today_line, state="normal")
+        else:
+            canvas.itemconfigure(self.today_line, state="hidden")
+
+        # Fonds de l'en-tête et de la colonne des libellés au-dessus des barres et graduations
+        canvas.coords(self.header_background, 0, 0, right, HEADER_HEIGHT)
+        canvas.coords(self.label_background, 0, 0, LABEL_WIDTH, bottom)
+        canvas.tag_raise(self.header_background)
+        for _, text in self.tick_items[:self.shown_ticks]:
+            canvas.tag_raise(text)
+        canvas.tag_raise(self.label_background)
+        for _, _, label in self.row_items[:self.shown_rows]:
+            canvas.tag_raise(label)
+
+        self.x_scrollbar.set(*layout.x_fraction(width))
+        self.y_scrollbar.set(*layout.y_fraction(height))
@@ -0,0 +1,133 @@
+"""Totaux par sous-arbre du diagramme : avancement des tâches, tâches critiques, documents
+
+Chaque tâche ou document lié à un noeud y apporte sa contribution (tâche terminée,
+tâche, tâche critique, document). Les totaux d'un noeud couvrent son sous-arbre :
+quand la contribution d'un élément change (statut, priorité, noeud lié, ajout ou
+retrait), seuls le noeud concerné et ses ancêtres sont mis à jour, en remontant les
+parents. Un changement de structure de l'arbre (connexion, suppression de noeud)
+marque les totaux à recalculer depuis les contributions de chaque noeud, à la
+prochaine lecture, sans parcourir les descendants de chaque noeud.
+"""
+
+from collections import namedtuple
+
+from task_repository import DONE_STATUS
+
+CRITICAL_PRIORITY = "Critique"
+
+
+class Rollup(namedtuple("Rollup", "done total critical documents")):
+    """Totaux d'un sous-arbre"""
+
+    __slots__ = ()
+
+    @property
+    def progress(self):
+        """Part des tâches terminées (0 à 1), None sans tâche"""
+        return self.done / self.total if self.total else None
+
+
+EMPTY = Rollup(0, 0, 0, 0)
+
+
+def ancestors(node):
+    """Le noeud puis ses parents jusqu'à la racine (un cycle de parents est interrompu)"""
+    seen = set()
+    while node is not None and node not in seen:
+        seen.add(node)
+        yield node
+        node = node.parent
+
+
+class TreeRollup:
+    """Totaux par noeud et par sous-arbre, mis à jour élément par élément
+
+    on_change(nodes) reçoit les noeuds dont les totaux ont changé, ou None après un
+    changement de structure (tous les totaux peuvent avoir changé).
+    """
+
+    def __init__(self, on_change=None):
+        self.on_change = on_change
+        # élément (tâche ou document) -> (noeud, contribution)
+        self.contributions = {}
+        # noeud -> somme des contributions des éléments liés au noeud lui-même
+        self.own = {}
+        # noeud -> totaux du sous-arbre ; None : à recalculer
+        self.totals = {}
+
+    def totals_of(self, node):
+        if self.totals is None:
+            self._rebuild_totals()
+        return self.totals.get(node, EMPTY)
+
+    def update_task(self, task, present=True):
+        """Prend en compte une tâche ajoutée, retirée ou modifiée (statut, priorité, noeud lié)"""
+        if present:
+            contribution = Rollup(int(task.status == DONE_STATUS), 1, int(task.priority == CRITICAL_PRIORITY), 0)
+            self._move(task, task.linked_node, contribution)
+        else:
+            self._move(task, None, None)
+
+    def update_document(self, document, present=True):
+        """Prend en compte un document ajouté, retiré ou lié à un autre noeud"""
+        self._move(document, document.linked_node if present else None, Rollup(0, 0, 0, 1))
+
+    def sync_documents(self, documents):
+        """Aligne les contributions des documents sur la liste documents (annulation, chargement)"""
+        present = set(documents)
+        for document in [item for item in self.contributions
+                         if item not in present and self.contributions[item][1].documents]:
+            self.update_document(document, present=False)
+        for document in documents:
+            self.update_document(document)
+
+    def restructure(self):
+        """Signale un changement des parents des noeuds"""
+        self.totals = None
+        if self.on_change:
+            self.on_change(None)
+
+    def _move(self, item, node, contribution):
+        old_node, old_contribution = self.contributions.get(item, (None, None))
+        if node is None:
+            contribution = None
+        if old_node is node and old_contribution == contribution:
+            return
+        if node is None:
+            self.contributions.pop(item, None)
+        else:
+            self.contributions[item] = (node, contribution)
+
+        changed = set()
+        if old_node is not None:
+            changed.update(self._add(old_node, old_contribution, -1))
+        if node is not None:
+            changed.update(self._add(node, contribution, 1))
+        if self.on_change and self.totals is not None:
+            self.on_change(changed)
+
+    def _add(self, node, contribution, sign):
+        """Ajoute (sign=1) ou retire (sign=-1) une contribution ; retourne les noeuds modifiés"""
+        self.own[node] = self._sum(self.own.get(node, EMPTY), contribution, sign)
+        if self.own[node] == EMPTY:
+            del self.own[node]
+        if self.totals is None:
+            return []
+        path = list(ancestors(node))
+        for ancestor in path:
+            totals = self._sum(self.totals.get(ancestor, EMPTY), contribution, sign)
+            if totals == EMPTY:
+                self.totals.pop(ancestor, None)
+            else:
+                self.totals[ancestor] = totals
+        return path
+
+    @staticmethod
+    def _sum(values, contribution, sign):
+        return Rollup(*(value + sign * delta for value, delta in zip(values, contribution)))
+
+    def _rebuild_totals(self):
+        self.totals = {}
+        for node, own in self.own.items():
+            for ancestor in ancestors(node):
+                self.totals[ancestor] = self._sum(self.totals.get(ancestor, EMPTY), own, 1)
@@ -0,0 +1,325 @@
+"""Annuler / rétablir par opérations inverses
+
+Une modification est enregistrée comme une commande : la liste des opérations
+élémentaires qu'elle a appliquées (insertion ou retrait dans une liste, changement
+d'attributs, remplacement du contenu d'une liste). Les opérations référencent les
+objets du projet au lieu de les copier : annuler la suppression d'un nœud remet en
+place le même objet. La mémoire de l'historique est ainsi proportionnelle à ce qui a
+changé, et bornée (max_bytes, max_steps) : les commandes les plus anciennes sont
+oubliées au-delà.
+"""
+
+import sys
+from collections import deque
+
+# Budget mémoire de l'historique (octets, estimation) et nombre maximal de commandes
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+DEFAULT_MAX_STEPS = 10000
+
+
+def shallow_size(obj):
+    """Taille d'un objet et de ses attributs (sans suivre les références)"""
+    size = sys.getsizeof(obj)
+    attributes = getattr(obj, "__dict__", None)
+    if attributes is not None:
+        size += sys.getsizeof(attributes)
+    return size
+
+
+class Operation:
+    """Opération élémentaire ; apply() la (ré)applique, revert() l'annule"""
+
+    __slots__ = ()
+
+    def apply(self):
+        raise NotImplementedError
+
+    def revert(self):
+        raise NotImplementedError
+
+    def footprint(self):
+        """Mémoire retenue par l'opération (octets, estimation)"""
+        return sys.getsizeof(self)
+
+    def discard(self, applied):
+        """Appelée quand l'opération quitte l'historique (appliquée ou annulée)"""
+
+
+class Insert(Operation):
+    __slots__ = ("items", "index", "item")
+
+    def __init__(self, items, index, item):
+        self.items = items
+        self.index = index
+        self.item = item
+
+    def apply(self):
+        self.items.insert(min(self.index, len(self.items)), self.item)
+
+    def revert(self):
+        # Retrait par identité : la position a pu changer (entrées ajoutées hors historique)
+        for i, item in enumerate(self.items):
+            if item is self.item:
+                del self.items[i]
+                return
+
+
+class Remove(Insert):
+    __slots__ = ()
+
+    def apply(self):
+        Insert.revert(self)
+
+    def revert(self):
+        Insert.apply(self)
+
+    def footprint(self):
+        # L'objet retiré n'est plus retenu que par l'historique
+        return sys.getsizeof(self) + shallow_size(self.item)
+
+
+class SetAttributes(Operation):
+    __slots__ = ("obj", "before", "after")
+
+    def __init__(self, obj, before, after):
+        self.obj = obj
+        self.before = before
+        self.after = after
+
+    def apply(self):
+        for name, value in self.after.items():
+            setattr(self.obj, name, value)
+
+    def revert(self):
+        for name, value in self.before.items():
+            setattr(self.obj, name, value)
+
+    def footprint(self):
+        # Les valeurs comptent aussi : une description longue modifiée à répétition pèse sur le budget
+        values = sum(sys.getsizeof(value) for value in self.before.values())
+        values += sum(sys.getsizeof(value) for value in self.after.values())
+        return sys.getsizeof(self) + sys.getsizeof(self.before) + sys.getsizeof(self.after) + values
+
+
+class Replace(Operation):
+    """Remplacement de tout le contenu d'une liste (effacement, import en remplacement)"""
+
+    __slots__ = ("items", "before", "after")
+
+    def __init__(self, items, before, after):
+        self.items = items
+        self.before = before
+        self.after = after
+
+    def _swap(self, source, target):
+        # Les éléments ajoutés hors historique depuis (absents de source) sont conservés
+        known = {id(item) for item in source}
+        self.items[:] = list(target) + [item for item in self.items if id(item) not in known]
+
+    def apply(self):
+        self._swap(self.before, self.after)
+
+    def revert(self):
+        self._swap(self.after, self.before)
+
+    def footprint(self):
+        kept = {id(item) for item in self.after}
+        return (sys.getsizeof(self) + sys.getsizeof(self.before) + sys.getsizeof(self.after)
+                + sum(shallow_size(item) for item in self.before if id(item) not in kept))
+
+
+class Call(Operation):
+    """Opération externe (fichiers...) : fonctions d'application, d'annulation et d'oubli"""
+
+    __slots__ = ("apply_function", "revert_function", "discard_function")
+
+    def __init__(self, apply, revert, discard=None):
+        self.apply_function = apply
+        self.revert_function = revert
+        self.discard_function = discard
+
+    def apply(self):
+        self.apply_function()
+
+    def revert(self):
+        self.revert_function()
+
+    def discard(self, applied):
+        if self.discard_function:
+            self.discard_function(applied)
+
+
+class Command:
+    """Modification annulable : libellé, données touchées (clés) et opérations appliquées"""
+
+    __slots__ = ("label", "keys", "operations", "size")
+
+    def __init__(self, label, keys, operations):
+        self.label = label
+        self.keys = keys
+        self.operations = operations
+        self.size = sys.getsizeof(self) + sys.getsizeof(operations) + sum(op.footprint() for op in operations)
+
+    def undo(self):
+        for operation in reversed(self.operations):
+            operation.revert()
+
+    def redo(self):
+        for operation in self.operations:
+            operation.apply()
+
+    def discard(self, applied):
+        for operation in self.operations:
+            operation.discard(applied)
+
+
+class Transaction:
+    """Applique des modifications et les enregistre ; une seule commande à la sortie du bloc with.
+
+    Une transaction ouverte pendant une autre s'y ajoute. Si le bloc lève une
+    exception, les opérations déjà appliquées sont annulées.
+    """
+
+    def __init__(self, stack, label, keys):
+        self.stack = stack
+        self.label = label
+        self.keys = set(keys)
+        self.operations = []
+        self.depth = 0
+
+    def __enter__(self):
+        if not self.depth:
+            self.stack.active = self
+        self.depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.depth -= 1
+        if self.depth:
+            return False
+        self.stack.active = None
+        operations, self.operations = self.operations, []
+        if exc_type is not None:
+            for operation in reversed(operations):
+                operation.revert()
+        elif operations:
+            self.stack.push(Command(self.label, frozenset(self.keys), operations))
+        return False
+
+    def record(self, operation, apply=True):
+        if apply:
+            operation.apply()
+        self.operations.append(operation)
+        return operation
+
+    def append(self, items, item):
+        self.record(Insert(items, len(items), item))
+
+    def insert(self, items, index, item):
+        self.record(Insert(items, index, item))
+
+    def remove(self, items, item):
+        """Retire item de items (par identité) ; sans effet s'il n'y est pas"""
+        for index, current in enumerate(items):
+            if current is item:
+                self.record(Remove(items, index, item))
+                return
+
+    def replace(self, items, new_items):
+        self.record(Replace(items, list(items), list(new_items)))
+
+    def set(self, obj, **values):
+        before = {name: getattr(obj, name) for name in values}
+        self.record(SetAttributes(obj, before, values))
+
+    def changed(self, obj, **before):
+        """Enregistre des attributs déjà modifiés, à partir de leurs anciennes valeurs"""
+        after = {name: getattr(obj, name) for name in before}
+        if after != before:
+            self.record(SetAttributes(obj, before, after), apply=False)
+
+    def call(self, apply, revert, discard=None):
+        self.record(Call(apply, revert, discard))
+
+
+class UndoStack:
+    """Historique des commandes, borné en nombre et en mémoire estimée"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, max_steps=DEFAULT_MAX_STEPS, on_change=None):
+        self.max_bytes = max_bytes
+        self.max_steps = max_steps
+        # on_change(commande) est appelé après chaque annulation ou rétablissement
+        self.on_change = on_change
+        self.done = deque()
+        self.undone = []
+        self.bytes_used = 0
+        self.active = None
+        # Vrai pendant une annulation ou un rétablissement (les observateurs ne modifient rien)
+        self.replaying = False
+
+    def __len__(self):
+        return len(self.done)
+
+    def transaction(self, label, *keys):
+        """Transaction à utiliser dans un bloc with (rejoint celle en cours) ; keys : données modifiées"""
+        if self.active is None:
+            return Transaction(self, label, keys)
+        self.active.keys.update(keys)
+        return self.active
+
+    def push(self, command):
+        for dropped in self.undone:
+            self.bytes_used -= dropped.size
+            dropped.discard(applied=False)
+        self.undone.clear()
+        self.done.append(command)
+        self.bytes_used += command.size
+        while self.done and (len(self.done) > self.max_steps or self.bytes_used > self.max_bytes):
+            oldest = self.done.popleft()
+            self.bytes_used -= oldest.size
+            oldest.discard(applied=True)
+
+    def can_undo(self):
+        return bool(self.done)
+
+    def can_redo(self):
+        return bool(self.undone)
+
+    def undo(self):
+        """Annule la dernière commande ; la retourne (None si l'historique est vide)"""
+        if not self.done:
+            return None
+        command = self.done.pop()
+        self.replaying = True
+        try:
+            command.undo()
+        finally:
+            self.replaying = False
+        self.undone.append(command)
+        if self.on_change:
+            self.on_change(command)
+        return command
+
+    def redo(self):
+        """Rétablit la dernière commande annulée ; la retourne (None s'il n'y en a pas)"""
+        if not self.undone:
+            return None
+        command = self.undone.pop()
+        self.replaying = True
+        try:
+            command.redo()
+        finally:
+            self.replaying = False
+        self.done.append(command)
+        if self.on_change:
+            self.on_change(command)
+        return command
+
+    def clear(self):
+        for command in self.done:
+            command.discard(applied=True)
+        for command in self.undone:
+            command.discard(applied=False)
+        self.done.clear()
+        self.undone.clear()
+        self.bytes_used = 0
@@ -0,0 +1,70 @@
+"""Gestion des modules affichés dans la zone de contenu de l'application"""
+
+
+class ViewManager:
+    """Construit chaque module une seule fois, puis le masque et l'affiche.
+
+    Un module est construit dans son propre cadre (create_frame) à son premier
+    affichage ; changer de module masque ce cadre (grid_remove) sans détruire ses
+    widgets. Un module masqué dont les données ont changé (invalidate) est mis à jour
+    à son prochain affichage par sa fonction refresh, ou reconstruit s'il n'en a pas.
+    reset() demande la reconstruction de tous les modules (chargement d'un projet).
+    """
+
+    def __init__(self, create_frame, activate):
+        self.create_frame = create_frame
+        # activate(nom, cadre) est appelé avant la construction ou la mise à jour d'un module
+        self.activate = activate
+        # nom -> (build, refresh, données affichées)
+        self.views = {}
+        self.frames = {}
+        self.stale = set()
+        self.rebuild = set()
+        self.current = None
+
+    def register(self, name, build, refresh=None, depends=()):
+        self.views[name] = (build, refresh, frozenset(depends))
+
+    def show(self, name):
+        """Affiche un module ; retourne son cadre"""
+        build, refresh, _ = self.views[name]
+        frame = self.frames.get(name)
+        if name == self.current and name not in self.stale and name not in self.rebuild:
+            return frame
+
+        if self.current is not None and self.current != name:
+            self.frames[self.current].grid_remove()
+        self.current = name
+
+        if frame is None or name in self.rebuild or (name in self.stale and refresh is None):
+            if frame is not None:
+                frame.destroy()
+            frame = self.frames[name] = self.create_frame()
+            self.activate(name, frame)
+            build()
+        else:
+            frame.grid()
+            self.activate(name, frame)
+            if name in self.stale:
+                refresh()
+        self.stale.discard(name)
+        self.rebuild.discard(name)
+        return frame
+
+    def invalidate(self, *keys):
+        """Signale un changement des données keys : les modules masqués qui les affichent seront mis à jour"""
+        keys = set(keys)
+        for name, (_, _, depends) in self.views.items():
+            if name in self.frames and name != self.current and depends & keys:
+                self.stale.add(name)
+
+    def refresh(self, *keys):
+        """Comme invalidate, mais met aussi à jour le module affiché s'il affiche ces données"""
+        self.invalidate(*keys)
+        if self.current is not None and self.views[self.current][2] & set(keys):
+            self.stale.add(self.current)
+            self.show(self.current)
+
+    def reset(self):
+        """Tous les modules construits, y compris le module affiché, seront reconstruits"""
+        self.rebuild.update(self.frames)
@@ -0,0 +1,346 @@
+"""Catalogue des projets (.prjt) d'un espace de travail, dans une base SQLite locale
+
+Pour chaque fichier projet des dossiers de l'espace de travail, le catalogue garde
+ses métadonnées (nom, date de sauvegarde, description), des compteurs (noeuds,
+tâches, entrées du journal, documents, blocs) et son texte (charte, noeuds, tâches,
+journal, documents) dans un index plein texte (FTS5, ou LIKE si SQLite n'a pas
+FTS5). Lister, filtrer ou rechercher parmi tous les projets ne relit donc aucun
+fichier.
+
+Une indexation ne relit que les fichiers dont la date de modification ou la taille
+a changé, et ne les analyse à nouveau que si leur empreinte (SHA-256) a changé.
+CatalogIndexer l'exécute dans un thread avec sa propre connexion ; l'interface lit
+sa progression par poll().
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+
+from document_preview import content_hash
+from project_core import PROJECT_EXTENSION
+from task_repository import DONE_STATUS
+
+APP_DATA_NAME = "gestion_projet"
+CATALOG_FILE = "workspace_catalog.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS folders (
+    path TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    folder TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    name TEXT NOT NULL,
+    save_date TEXT,
+    description TEXT,
+    nodes INTEGER NOT NULL DEFAULT 0,
+    tasks INTEGER NOT NULL DEFAULT 0,
+    tasks_done INTEGER NOT NULL DEFAULT 0,
+    log_entries INTEGER NOT NULL DEFAULT 0,
+    documents INTEGER NOT NULL DEFAULT 0,
+    blocks INTEGER NOT NULL DEFAULT 0,
+    error TEXT
+);
+"""
+
+# Tris proposés : libellé -> clause ORDER BY
+ORDERS = {
+    "name": "name COLLATE NOCASE",
+    "date": "save_date DESC",
+    "tasks": "tasks DESC",
+    "progress": "CAST(tasks_done AS REAL) / MAX(tasks, 1) DESC",
+}
+
+COUNT_FIELDS = ("nodes", "tasks", "tasks_done", "log_entries", "documents", "blocks")
+
+
+def count_nodes(nodes):
+    """Nombre de noeuds d'un arbre sérialisé (racines et enfants)"""
+    count = 0
+    stack = list(nodes)
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.get('children', []))
+    return count
+
+
+def node_texts(nodes):
+    stack = list(nodes)
+    while stack:
+        node = stack.pop()
+        yield node.get('text', '')
+        stack.extend(node.get('children', []))
+
+
+def summarize_project(project_data, path=""):
+    """Métadonnées, compteurs et texte indexé d'un projet (contenu d'un fichier .prjt)"""
+    metadata = project_data.get('metadata', {})
+    nodes = project_data.get('tree_data', {}).get('nodes', [])
+    tasks = project_data.get('tasks_data', {}).get('tasks', [])
+    entries = project_data.get('log_data', {}).get('entries', [])
+    documents = project_data.get('documents_data', {}).get('documents', [])
+    blocks = project_data.get('blocks_data', {}).get('used_blocks', [])
+    name = metadata.get('project_name') or os.path.splitext(os.path.basename(path))[0]
+
+    texts = [name, metadata.get('description', '')]
+    texts.extend(value for value in project_data.get('charter_data', {}).values() if isinstance(value, str))
+    texts.extend(node_texts(nodes))
+    for task in tasks:
+        texts.extend((task.get('title', ''), task.get('description', ''), task.get('assignee', '')))
+    for entry in entries:
+        texts.extend((entry.get('title', ''), entry.get('description', ''), entry.get('author', '')))
+    for document in documents:
+        texts.extend((document.get('filename', ''), document.get('description', '')))
+        texts.extend(document.get('tags', []))
+    texts.extend(block.get('name', '') for block in blocks)
+
+    return {
+        'name': name,
+        'save_date': metadata.get('save_date'),
+        'description': metadata.get('description', ''),
+        'nodes': count_nodes(nodes),
+        'tasks': len(tasks),
+        'tasks_done': sum(1 for task in tasks if task.get('status') == DONE_STATUS),
+        'log_entries': len(entries),
+        'documents': len(documents),
+        'blocks': len(blocks),
+        'text': "\n".join(text for text in texts if text),
+    }
+
+
+def default_catalog_path():
+    """Base du catalogue dans le dossier de données de l'utilisateur (créé au besoin)
+
+    %APPDATA% sous Windows, $XDG_DATA_HOME (ou ~/.local/share) ailleurs : le dossier
+    courant peut être en lecture seule.
+    """
+    base = os.environ.get('APPDATA') if os.name == 'nt' else os.environ.get('XDG_DATA_HOME')
+    directory = os.path.join(base or os.path.join(os.path.expanduser("~"), ".local", "share"), APP_DATA_NAME)
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, CATALOG_FILE)
+
+
+def match_expression(query):
+    """Requête FTS5 : chaque mot saisi, en préfixe (« proj » trouve « projet »)"""
+    return " ".join('"{}"*'.format(word.replace('"', '""')) for word in query.split())
+
+
+class WorkspaceCatalog:
+    """Base SQLite des projets ; une instance par thread"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+        try:
+            self.connection.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS project_text USING fts5(body, tokenize='unicode61 remove_diacritics 2')")
+            self.full_text = True
+        except sqlite3.OperationalError:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS project_text (rowid INTEGER PRIMARY KEY, body TEXT)")
+            self.full_text = False
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    # --- Dossiers
+
+    def folders(self):
+        return [row['path'] for row in self.connection.execute("SELECT path FROM folders ORDER BY path")]
+
+    def add_folder(self, path):
+        with self.connection:
+            self.connection.execute("INSERT OR IGNORE INTO folders (path) VALUES (?)", (os.path.abspath(path),))
+
+    def remove_folder(self, path):
+        path = os.path.abspath(path)
+        with self.connection:
+            ids = [row['id'] for row in self.connection.execute("SELECT id FROM projects WHERE folder = ?", (path,))]
+            self.connection.executemany("DELETE FROM project_text WHERE rowid = ?", [(i,) for i in ids])
+            self.connection.execute("DELETE FROM projects WHERE folder = ?", (path,))
+            self.connection.execute("DELETE FROM folders WHERE path = ?", (path,))
+
+    # --- Indexation
+
+    def scan(self, progress=None, cancelled=None):
+        """Met le catalogue à jour avec les fichiers .prjt des dossiers ; retourne les compteurs de l'indexation"""
+        stats = {'indexed': 0, 'unchanged': 0, 'removed': 0, 'errors': 0}
+        known = {row['path']: row for row in self.connection.execute(
+            "SELECT id, path, folder, mtime_ns, size, sha256 FROM projects")}
+        # Un fichier d'un dossier inclus dans un autre dossier du catalogue n'est indexé
+        # qu'une fois, rattaché au dossier le plus profond (folders() est trié par chemin)
+        owners = {path: folder for folder in self.folders() for path in self._project_files(folder)}
+        files = [(folder, path) for path, folder in owners.items()]
+
+        seen = set()
+        for done, (folder, path) in enumerate(files, 1):
+            if cancelled and cancelled():
+                break
+            seen.add(path)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            row = known.get(path)
+            if row is not None and (row['mtime_ns'], row['size']) == (stat.st_mtime_ns, stat.st_size):
+                stats['unchanged'] += 1
+            else:
+                self._index_file(folder, path, stat, row, stats)
+            if progress:
+                progress(done, len(files))
+        else:
+            # Fichiers supprimés ou dossiers retirés
+            removed = [row for path, row in known.items() if path not in seen]
+            with self.connection:
+                self.connection.executemany("DELETE FROM project_text WHERE rowid = ?", [(row['id'],) for row in removed])
+                self.connection.executemany("DELETE FROM projects WHERE id = ?", [(row['id'],) for row in removed])
+            stats['removed'] = len(removed)
+        return stats
+
+    def _project_files(self, folder):
+        for root, _, filenames in os.walk(folder):
+            for filename in sorted(filenames):
+                if filename.lower().endswith(PROJECT_EXTENSION):
+                    yield os.path.join(root, filename)
+
+    def _index_file(self, folder, path, stat, row, stats):
+        try:
+            digest = content_hash(path)
+        except OSError:
+            # Fichier supprimé ou illisible depuis os.stat : repris à la prochaine indexation
+            return
+        if row is not None and row['sha256'] == digest:
+            # Fichier touché mais contenu identique : seule la signature change
+            with self.connection:
+                self.connection.execute("UPDATE projects SET mtime_ns = ?, size = ? WHERE id = ?",
+                                        (stat.st_mtime_ns, stat.st_size, row['id']))
+            stats['unchanged'] += 1
+            return
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                summary = summarize_project(json.load(f), path)
+            self._store(folder, path, stat, digest, row, summary)
+        except Exception as e:
+            # JSON invalide ou contenu inattendu (ex. "tasks": 5) : le projet reste listé avec son erreur
+            stats['errors'] += 1
+            try:
+                self._store(folder, path, stat, digest, row, summarize_project({}, path), f"{type(e).__name__} : {e}")
+            except sqlite3.Error:
+                # Pas même enregistrable en erreur : le fichier sera repris à la prochaine indexation
+                pass
+        else:
+            stats['indexed'] += 1
+
+    def _store(self, folder, path, stat, digest, row, summary, error=None):
+        values = (folder, stat.st_mtime_ns, stat.st_size, digest, summary['name'], summary['save_date'],
+                  summary['description']) + tuple(summary[field] for field in COUNT_FIELDS) + (error,)
+        with self.connection:
+            if row is None:
+                project_id = self.connection.execute(
+                    "INSERT INTO projects (folder, mtime_ns, size, sha256, name, save_date, description, "
+                    + ", ".join(COUNT_FIELDS) + ", error, path) VALUES (" + ", ".join("?" * 15) + ")",
+                    values + (path,)).lastrowid
+            else:
+                project_id = row['id']
+                self.connection.execute(
+                    "UPDATE projects SET folder = ?, mtime_ns = ?, size = ?, sha256 = ?, name = ?, save_date = ?, "
+                    "description = ?, " + ", ".join(f"{field} = ?" for field in COUNT_FIELDS) + ", error = ? WHERE id = ?",
+                    values + (project_id,))
+                self.connection.execute("DELETE FROM project_text WHERE rowid = ?", (project_id,))
+            self.connection.execute("INSERT INTO project_text (rowid, body) VALUES (?, ?)", (project_id, summary['text']))
+
+    # --- Lecture
+
+    def projects(self, query="", order="name", limit=None):
+        """Projets du catalogue, filtrés par les mots de query (nom, charte, noeuds, tâches, journal...)"""
+        sql = "SELECT p.* FROM projects p"
+        parameters = []
+        if query.strip():
+            if self.full_text:
+                sql += " JOIN project_text t ON t.rowid = p.id WHERE project_text MATCH ?"
+                parameters.append(match_expression(query))
+            else:
+                sql += " JOIN project_text t ON t.rowid = p.id WHERE " + " AND ".join("t.body LIKE ?" for _ in query.split())
+                parameters.extend(f"%{word}%" for word in query.split())
+        sql += " ORDER BY " + ORDERS.get(order, ORDERS["name"])
+        if limit:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+        return [dict(row) for row in self.connection.execute(sql, parameters)]
+
+    def count(self):
+        return self.connection.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
+
+
+class CatalogIndexer:
+    """Indexation du catalogue dans un thread ; messages lus par poll()
+
+    Messages : ("progress", fichiers traités, total), ("done", compteurs) ou ("error", message).
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.results = queue.Queue()
+        self.thread = None
+        self.again = False
+        self.stopping = False
+
+    def start(self):
+        """Lance une indexation ; si une est en cours, elle sera refaite à sa fin"""
+        if self.running():
+            self.again = True
+            return
+        self.again = False
+        self.stopping = False
+        self.thread = threading.Thread(target=self._run, name="catalog", daemon=True)
+        self.thread.start()
+
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def stop(self):
+        self.stopping = True
+
+    def _run(self):
+        # Toujours un message de fin, sinon l'interface attendrait indéfiniment
+        message = ("error", "indexation interrompue")
+        try:
+            catalog = WorkspaceCatalog(self.db_path)
+            try:
+                while True:
+                    stats = catalog.scan(lambda done, total: self.results.put(("progress", done, total)),
+                                         lambda: self.stopping)
+                    if not self.again or self.stopping:
+                        break
+                    self.again = False
+            finally:
+                catalog.close()
+            message = ("done", stats)
+        except Exception as e:
+            message = ("error", f"{type(e).__name__} : {e}")
+        finally:
+            self.results.put(message)
+
+    def poll(self):
+        messages = []
+        while True:
+            try:
+                messages.append(self.results.get_nowait())
+            except queue.Empty:
+                break
+        # Indexation demandée pendant la fin de la précédente
+        if self.again and not self.running():
+            self.start()
+        return messages
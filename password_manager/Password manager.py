@@ -2,32 +2,92 @@ import customtkinter as ctk
 import sqlite3
 import bcrypt
 import json
-import os
-from datetime import datetime
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-import base64
+from datetime import datetime, timedelta
 import tkinter.messagebox as messagebox
-from tkinter import ttk
+from tkinter import ttk, filedialog
+from cryptography.fernet import InvalidToken
 import threading
 import time
+from database import ConnectionManager, create_schema
+from search_pipeline import SearchPipeline
+from unit_of_work import UnitOfWork, changed_fields
+import access_control
+import history_retention
+import key_rotation
+import vault_core
+import vault_crypto
+import vault_stats
+import vault_transfer
+
+# Chemin de la base de données
+DB_PATH = 'password_manager.db'
+
+# Nombre de lignes chargées à la fois dans la liste des mots de passe
+PAGE_SIZE = 200
+# Position de la scrollbar (0-1) à partir de laquelle la page suivante est chargée
+SCROLL_PREFETCH_THRESHOLD = 0.9
+# Délai d'inactivité du clavier avant de lancer une recherche (ms)
+SEARCH_DEBOUNCE_MS = 250
+# Intervalle de lecture des résultats de recherche (ms)
+SEARCH_POLL_MS = 30
+# Intervalle de suivi des tâches de fond (ms)
+BACKGROUND_POLL_MS = 50
+# Temps de dérivation de la clé visé lors d'une rotation des clés (ms), et minimum accepté
+KDF_TARGET_MS = 500
+KDF_MIN_TARGET_MS = 100
+# Cache des mots de passe déchiffrés : durée de vie (s) et nombre maximal d'entrées
+SECRET_CACHE_TTL = 60
+SECRET_CACHE_SIZE = 256
+# Nombre d'utilisateurs chargés à la fois dans le panneau d'administration
+USERS_PAGE_SIZE = 100
+# Période couverte par les statistiques d'activité (jours)
+STATS_ACTIVITY_DAYS = 30
+
+
+def session_attribute(name, default=None):
+    """Attribut délégué à la session déverrouillée (vault_core.VaultSession), default hors session"""
+    def getter(self):
+        return getattr(self.session, name) if self.session else default
+    
+    def setter(self, value):
+        setattr(self.session, name, value)
+        
+    return property(getter, setter)
 
 class PasswordManager:
+    # État de l'utilisateur connecté, porté par sa session
+    current_user = session_attribute("username")
+    current_role = session_attribute("role")
+    current_user_id = session_attribute("user_id")
+    access = session_attribute("access")
+    secret_cache = session_attribute("secret_cache")
+    encryption_key = session_attribute("encryption_key")
+    vault_key = session_attribute("vault_key")
+    private_key = session_attribute("private_key")
+    next_vault_key = session_attribute("next_vault_key")
+    kdf_algorithm = session_attribute("kdf_algorithm", vault_crypto.DEFAULT_KDF_ALGORITHM)
+    kdf_params = session_attribute("kdf_params")
+    
     def __init__(self):
         # Configuration de l'apparence
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("blue")
         
-        # Variables d'état
-        self.current_user = None
-        self.current_role = None
-        self.encryption_key = None
+        # Variables d'état : clés, droits et cache des secrets de l'utilisateur connecté
+        self.session = None
+        self.rotation_stop = threading.Event()
+        self.rotation_running = False
+        self.db = None
         self.db_connection = None
         
         # Initialisation de la base de données
         self.init_database()
         
+        # Recherche asynchrone sur une connexion dédiée
+        self.search_pipeline = SearchPipeline(self.db.connect_reader)
+        self.search_after_id = None
+        self.search_polling = False
+        
         # Interface principale
         self.root = ctk.CTk()
         self.root.title("🔒 Gestionnaire de Mots de Passe Entreprise")
@@ -38,129 +98,76 @@ class PasswordManager:
         self.main_frame = None
         self.login_frame = None
         self.password_list = None
+        self.password_scrollbar = None
         self.search_var = ctk.StringVar()
         
+        # État de la pagination de la liste
+        self.list_search_term = ""
+        self.list_last_key = None
+        self.list_exhausted = False
+        self.list_page_pending = False
+        
         # Création de l'interface de connexion
         self.create_login_interface()
         
     def init_database(self):
         """Initialise la base de données SQLite"""
-        self.db_connection = sqlite3.connect('password_manager.db', check_same_thread=False)
-        cursor = self.db_connection.cursor()
-        
-        # Table des utilisateurs
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                password_hash TEXT NOT NULL,
-                role TEXT NOT NULL DEFAULT 'user',
-                encryption_salt BLOB,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                last_login TIMESTAMP
-            )
-        ''')
-        
-        # Table des mots de passe
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS passwords (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                username TEXT,
-                password_encrypted TEXT NOT NULL,
-                url TEXT,
-                notes TEXT,
-                category TEXT DEFAULT 'General',
-                created_by TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                visibility_level INTEGER DEFAULT 1
-            )
-        ''')
-        
-        # Table de l'historique
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS password_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                password_id INTEGER,
-                action TEXT NOT NULL,
-                old_value TEXT,
-                new_value TEXT,
-                changed_by TEXT NOT NULL,
-                changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (password_id) REFERENCES passwords (id)
-            )
-        ''')
-        
-        # Table des permissions d'accès
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS access_permissions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                password_id INTEGER,
-                permission_level INTEGER DEFAULT 1,
-                granted_by TEXT NOT NULL,
-                granted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id),
-                FOREIGN KEY (password_id) REFERENCES passwords (id)
-            )
-        ''')
+        # Mode WAL : une connexion d'écriture et un pool de lecteurs
+        self.db = ConnectionManager(DB_PATH)
+        self.db_connection = self.db.writer
+        create_schema(self.db_connection)
         
-        self.db_connection.commit()
-        
-        # Créer l'utilisateur admin par défaut
-        self.create_default_admin()
+        # Créer l'utilisateur admin par défaut en arrière-plan (bcrypt + KDF) :
+        # la fenêtre de connexion s'affiche sans attendre
+        self.default_admin_error = None
+        self.default_admin_thread = threading.Thread(target=self.create_default_admin, daemon=True)
+        self.default_admin_thread.start()
         
     def create_default_admin(self):
         """Crée l'utilisateur administrateur par défaut"""
-        cursor = self.db_connection.cursor()
-        cursor.execute("SELECT COUNT(*) FROM users WHERE role = 'admin'")
-        
-        if cursor.fetchone()[0] == 0:
-            admin_password = "admin123"
-            hashed_password = bcrypt.hashpw(admin_password.encode('utf-8'), bcrypt.gensalt())
-            
-            # Générer le salt pour le chiffrement
-            _, salt = self.generate_encryption_key(admin_password)
+        try:
+            vault_core.ensure_default_admin(self.db)
+        except Exception as e:
+            self.default_admin_error = e
             
-            cursor.execute(
-                "INSERT INTO users (username, password_hash, role, encryption_salt) VALUES (?, ?, ?, ?)",
-                ("admin", hashed_password, "admin", salt)
-            )
-            self.db_connection.commit()
-            
-    def generate_encryption_key(self, password: str, salt: bytes = None) -> tuple:
-        """Génère une clé de chiffrement à partir d'un mot de passe"""
-        if salt is None:
-            salt = os.urandom(16)
-        
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
-        return key, salt
+    def wait_for_default_admin(self):
+        """Attend la fin de la création de l'administrateur par défaut (erreur affichée une fois)"""
+        self.default_admin_thread.join()
+        if self.default_admin_error is not None:
+            messagebox.showerror("Erreur", f"Impossible de créer l'administrateur par défaut :\n{self.default_admin_error}")
+            self.default_admin_error = None
         
     def encrypt_password(self, password: str) -> str:
         """Chiffre un mot de passe"""
-        if self.encryption_key is None:
-            raise ValueError("Clé de chiffrement non initialisée")
-        
-        f = Fernet(self.encryption_key)
-        encrypted_password = f.encrypt(password.encode())
-        return base64.urlsafe_b64encode(encrypted_password).decode()
+        return self.session.encrypt_password(password)
         
     def decrypt_password(self, encrypted_password: str) -> str:
         """Déchiffre un mot de passe"""
-        if self.encryption_key is None:
-            raise ValueError("Clé de chiffrement non initialisée")
+        return self.session.decrypt_password(encrypted_password)
+        
+    def encrypt_entry(self, password: str) -> tuple:
+        """Chiffre un mot de passe avec une nouvelle clé d'entrée ; retourne (chiffré, clé enveloppée)"""
+        return self.session.encrypt_entry(password)
+        
+    def get_entry_key(self, wrapped_entry_key, sealed_entry_key=None):
+        """Retourne la clé d'une entrée, ou None si elle est chiffrée directement par la KEK"""
+        return self.session.get_entry_key(wrapped_entry_key, sealed_entry_key)
+            
+    def decrypt_entry(self, encrypted_password, wrapped_entry_key, sealed_entry_key=None):
+        """Déchiffre une entrée (clé d'entrée, clé partagée ou ancien chiffrement direct)"""
+        return self.session.decrypt_entry(encrypted_password, wrapped_entry_key, sealed_entry_key)
+        
+    def decrypt_entry_cached(self, password_id, updated_at, encrypted_password, wrapped_entry_key, sealed_entry_key=None):
+        """Déchiffre une entrée en passant par le cache des secrets (clé : id et updated_at)"""
+        return self.session.decrypt_entry_cached(password_id, updated_at, encrypted_password, wrapped_entry_key, sealed_entry_key)
         
-        f = Fernet(self.encryption_key)
-        encrypted_data = base64.urlsafe_b64decode(encrypted_password.encode())
-        decrypted_password = f.decrypt(encrypted_data)
-        return decrypted_password.decode()
+    def fetch_entry_secret(self, password_id):
+        """Lit et déchiffre le mot de passe d'une entrée ; None si elle n'existe pas"""
+        return self.session.fetch_entry_secret(password_id)
+        
+    def seal_entry_keys(self, password_ids, recipient_public_key):
+        """Scelle pour un destinataire les clés des entrées accessibles à l'utilisateur courant"""
+        return self.session.seal_entry_keys(password_ids, recipient_public_key)
         
     def create_login_interface(self):
         """Crée l'interface de connexion"""
@@ -272,18 +279,8 @@ class PasswordManager:
                 messagebox.showerror("Erreur", "Les mots de passe ne correspondent pas")
                 return
                 
-            cursor = self.db_connection.cursor()
             try:
-                hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
-                
-                # Générer le salt pour le chiffrement
-                _, salt = self.generate_encryption_key(password)
-                
-                cursor.execute(
-                    "INSERT INTO users (username, password_hash, role, encryption_salt) VALUES (?, ?, ?, ?)",
-                    (username, hashed_password, "user", salt)
-                )
-                self.db_connection.commit()
+                vault_core.create_user(self.db, username, password)
                 messagebox.showinfo("Succès", "Compte créé avec succès!")
                 dialog.destroy()
             except sqlite3.IntegrityError:
@@ -301,34 +298,80 @@ class PasswordManager:
             messagebox.showerror("Erreur", "Veuillez remplir tous les champs")
             return
             
-        cursor = self.db_connection.cursor()
-        cursor.execute("SELECT id, password_hash, role, encryption_salt FROM users WHERE username = ?", (username,))
-        user = cursor.fetchone()
-        
-        if user and bcrypt.checkpw(password.encode('utf-8'), user[1]):
-            self.current_user = username
-            self.current_role = user[2]
-            
-            # Générer la clé de chiffrement avec le salt stocké
-            stored_salt = user[3]
-            if stored_salt is None:
-                # Première connexion ou migration - générer et stocker le salt
-                self.encryption_key, new_salt = self.generate_encryption_key(password)
-                cursor.execute("UPDATE users SET encryption_salt = ? WHERE username = ?", (new_salt, username))
-                self.db_connection.commit()
-            else:
-                # Utiliser le salt stocké
-                self.encryption_key, _ = self.generate_encryption_key(password, stored_salt)
-            
-            # Mettre à jour la dernière connexion
-            cursor.execute("UPDATE users SET last_login = ? WHERE username = ?", (datetime.now(), username))
-            self.db_connection.commit()
+        self.wait_for_default_admin()
             
-            # Créer l'interface principale
-            self.create_main_interface()
-        else:
+        # Vérification du mot de passe et déballage des clés (chiffrement par enveloppe)
+        try:
+            self.session = vault_core.unlock(self.db, username, password, SECRET_CACHE_TTL, SECRET_CACHE_SIZE)
+        except vault_core.AuthenticationError:
             messagebox.showerror("Erreur", "Nom d'utilisateur ou mot de passe incorrect")
+            return
+        except InvalidToken:
+            messagebox.showerror("Erreur", "Impossible de déchiffrer la clé de coffre de ce compte")
+            return
+            
+        # Créer l'interface principale
+        self.create_main_interface()
+        
+        # Rotation de clés interrompue : les entrées déjà rechiffrées restent lisibles
+        rotation = self.session.pending_rotation
+        if rotation and messagebox.askyesno(
+            "Rotation des clés",
+            f"Une rotation des clés a été interrompue ({rotation['processed']}/{rotation['total']} entrées).\n"
+            "La reprendre maintenant ? (sinon : Rotation des clés, plus tard)"
+        ):
+            self.run_key_rotation(rotation, self.session.pending_kek, self.next_vault_key)
             
+    def show_change_password_dialog(self):
+        """Affiche la boîte de dialogue de changement de mot de passe"""
+        dialog = ctk.CTkToplevel(self.root)
+        dialog.title("Changer le mot de passe")
+        dialog.geometry("400x320")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        # Centrer la fenêtre
+        dialog.update_idletasks()
+        x = (dialog.winfo_screenwidth() // 2) - (400 // 2)
+        y = (dialog.winfo_screenheight() // 2) - (320 // 2)
+        dialog.geometry(f"400x320+{x}+{y}")
+        
+        ctk.CTkLabel(dialog, text="Mot de passe actuel:", font=ctk.CTkFont(size=14)).pack(pady=10)
+        current_entry = ctk.CTkEntry(dialog, width=300, show="*")
+        current_entry.pack(pady=5)
+        
+        ctk.CTkLabel(dialog, text="Nouveau mot de passe:", font=ctk.CTkFont(size=14)).pack(pady=10)
+        new_entry = ctk.CTkEntry(dialog, width=300, show="*")
+        new_entry.pack(pady=5)
+        
+        ctk.CTkLabel(dialog, text="Confirmer le mot de passe:", font=ctk.CTkFont(size=14)).pack(pady=10)
+        confirm_entry = ctk.CTkEntry(dialog, width=300, show="*")
+        confirm_entry.pack(pady=5)
+        
+        def save_password():
+            if not new_entry.get():
+                messagebox.showerror("Erreur", "Veuillez saisir un nouveau mot de passe")
+                return
+            if new_entry.get() != confirm_entry.get():
+                messagebox.showerror("Erreur", "Les mots de passe ne correspondent pas")
+                return
+            try:
+                self.change_login_password(current_entry.get(), new_entry.get())
+            except ValueError as e:
+                messagebox.showerror("Erreur", str(e))
+                return
+            messagebox.showinfo("Succès", "Mot de passe changé avec succès!")
+            dialog.destroy()
+            
+        button_frame = ctk.CTkFrame(dialog)
+        button_frame.pack(pady=20)
+        ctk.CTkButton(button_frame, text="Changer", command=save_password, width=100).pack(side="left", padx=10)
+        ctk.CTkButton(button_frame, text="Annuler", command=dialog.destroy, width=100).pack(side="left", padx=10)
+        
+    def change_login_password(self, current_password, new_password):
+        """Change le mot de passe de connexion : seule la clé de coffre est ré-enveloppée"""
+        self.session.change_password(current_password, new_password)
+        
     def create_main_interface(self):
         """Crée l'interface principale"""
         if self.login_frame:
@@ -359,6 +402,26 @@ class PasswordManager:
         )
         logout_button.pack(side="right", padx=10, pady=10)
         
+        # Bouton de changement de mot de passe
+        change_password_button = ctk.CTkButton(
+            top_frame,
+            text="🔑 Mot de passe",
+            command=self.show_change_password_dialog,
+            width=120,
+            height=30
+        )
+        change_password_button.pack(side="right", padx=10, pady=10)
+        
+        # Bouton de rotation des clés
+        rotation_button = ctk.CTkButton(
+            top_frame,
+            text="🔐 Rotation des clés",
+            command=self.show_key_rotation_dialog,
+            width=140,
+            height=30
+        )
+        rotation_button.pack(side="right", padx=10, pady=10)
+        
         # Barre d'outils
         toolbar_frame = ctk.CTkFrame(self.main_frame)
         toolbar_frame.pack(fill="x", padx=10, pady=5)
@@ -367,7 +430,7 @@ class PasswordManager:
         ctk.CTkLabel(toolbar_frame, text="Rechercher:", font=ctk.CTkFont(size=12)).pack(side="left", padx=5)
         search_entry = ctk.CTkEntry(toolbar_frame, textvariable=self.search_var, width=200)
         search_entry.pack(side="left", padx=5)
-        search_entry.bind('<KeyRelease>', lambda e: self.filter_passwords())
+        search_entry.bind('<KeyRelease>', lambda e: self.schedule_search())
         
         # Boutons d'action
         add_button = ctk.CTkButton(
@@ -398,6 +461,25 @@ class PasswordManager:
         )
         integrity_button.pack(side="left", padx=5)
         
+        # Boutons d'import / export
+        import_button = ctk.CTkButton(
+            toolbar_frame,
+            text="📥 Importer",
+            command=self.import_passwords,
+            width=100,
+            height=30
+        )
+        import_button.pack(side="left", padx=5)
+        
+        export_button = ctk.CTkButton(
+            toolbar_frame,
+            text="📤 Exporter",
+            command=self.export_passwords,
+            width=100,
+            height=30
+        )
+        export_button.pack(side="left", padx=5)
+        
         # Bouton de suppression
         delete_button = ctk.CTkButton(
             toolbar_frame,
@@ -447,12 +529,12 @@ class PasswordManager:
         self.password_list.column("Modifié", width=150)
         
         # Scrollbar
-        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.password_list.yview)
-        self.password_list.configure(yscrollcommand=scrollbar.set)
+        self.password_scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.password_list.yview)
+        self.password_list.configure(yscrollcommand=self.on_password_list_scroll)
         
         # Placement
         self.password_list.pack(side="left", expand=True, fill="both")
-        scrollbar.pack(side="right", fill="y")
+        self.password_scrollbar.pack(side="right", fill="y")
         
         # Binding pour double-clic
         self.password_list.bind("<Double-1>", self.on_password_double_click)
@@ -463,77 +545,82 @@ class PasswordManager:
         
     def refresh_password_list(self):
         """Actualise la liste des mots de passe"""
-        # Vider la liste
-        for item in self.password_list.get_children():
-            self.password_list.delete(item)
+        # Une recherche en cours ne doit pas écraser la liste actualisée
+        self.search_pipeline.cancel()
+        self.list_search_term = ""
+        self.load_password_page(reset=True)
+        
+    def schedule_search(self):
+        """Relance le délai avant recherche à chaque frappe (debounce)"""
+        if self.search_after_id is not None:
+            self.root.after_cancel(self.search_after_id)
+        self.search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self.filter_passwords)
             
-        # Récupérer les données
-        cursor = self.db_connection.cursor()
+    def filter_passwords(self):
+        """Filtre les mots de passe selon la recherche (requête exécutée en arrière-plan)"""
+        self.search_after_id = None
+        search_term = self.search_var.get().lower()
         
-        # Requête adaptée selon le rôle
-        if self.current_role in ["admin", "manager"]:
-            # Admins et managers voient tous les mots de passe
-            query = """
-                SELECT id, title, username, url, category, created_by, updated_at, visibility_level
-                FROM passwords
-                ORDER BY updated_at DESC
-            """
-            cursor.execute(query)
-        else:
-            # Utilisateurs normaux ne voient que les mots de passe qu'ils ont créés
-            query = """
-                SELECT id, title, username, url, category, created_by, updated_at, visibility_level
-                FROM passwords
-                WHERE created_by = ?
-                ORDER BY updated_at DESC
-            """
-            cursor.execute(query, (self.current_user,))
-            
-        passwords = cursor.fetchall()
+        query, params = self.build_password_query(search_term)
+        self.search_pipeline.submit(query, params, context=search_term)
         
-        for password in passwords:
-            self.password_list.insert("", "end", values=(
-                password[1],  # title
-                password[2],  # username
-                password[3],  # url
-                password[4],  # category
-                password[5],  # created_by
-                password[6]   # updated_at
-            ), tags=(password[0],))  # ID comme tag
+        if not self.search_polling:
+            self.search_polling = True
+            self.root.after(SEARCH_POLL_MS, self.poll_search_results)
             
-    def filter_passwords(self):
-        """Filtre les mots de passe selon la recherche"""
-        search_term = self.search_var.get().lower()
+    def poll_search_results(self):
+        """Affiche le résultat de la dernière recherche dès qu'il est disponible"""
+        if self.password_list is None or not self.password_list.winfo_exists():
+            self.search_polling = False
+            return
+            
+        result = self.search_pipeline.poll()
+        if result is not None:
+            _, passwords, search_term, error = result
+            if error:
+                messagebox.showerror("Erreur", f"Erreur lors de la recherche: {error}")
+            else:
+                self.list_search_term = search_term
+                self.password_list.delete(*self.password_list.get_children())
+                self.insert_password_rows(passwords)
+                self.list_last_key = (passwords[-1][6], passwords[-1][0]) if passwords else None
+                self.list_exhausted = len(passwords) < PAGE_SIZE
+                
+        if self.search_pipeline.is_busy():
+            self.root.after(SEARCH_POLL_MS, self.poll_search_results)
+        else:
+            self.search_polling = False
+        
+    def build_password_query(self, search_term="", after=None):
+        """Construit la requête d'une page de la liste (pagination par clé sur updated_at, id)"""
+        return self.session.entries_query(search_term, after, PAGE_SIZE)
         
-        # Vider la liste
-        for item in self.password_list.get_children():
-            self.password_list.delete(item)
+    def load_password_page(self, reset=False):
+        """Charge la page suivante de la liste (ou la première si reset=True)"""
+        self.list_page_pending = False
+        
+        if reset:
+            # Vider la liste en une seule opération
+            self.password_list.delete(*self.password_list.get_children())
+            self.list_last_key = None
+            self.list_exhausted = False
+            
+        if self.list_exhausted:
+            return
             
-        # Récupérer les données filtrées
-        cursor = self.db_connection.cursor()
+        query, params = self.build_password_query(self.list_search_term, self.list_last_key)
+        with self.db.reader() as connection:
+            passwords = connection.execute(query, params).fetchall()
         
-        if self.current_role in ["admin", "manager"]:
-            # Admins et managers voient tous les mots de passe
-            query = """
-                SELECT id, title, username, url, category, created_by, updated_at, visibility_level
-                FROM passwords
-                WHERE LOWER(title) LIKE ? OR LOWER(username) LIKE ? OR LOWER(url) LIKE ?
-                ORDER BY updated_at DESC
-            """
-            cursor.execute(query, (f"%{search_term}%", f"%{search_term}%", f"%{search_term}%"))
-        else:
-            # Utilisateurs normaux ne voient que les mots de passe qu'ils ont créés
-            query = """
-                SELECT id, title, username, url, category, created_by, updated_at, visibility_level
-                FROM passwords
-                WHERE created_by = ?
-                AND (LOWER(title) LIKE ? OR LOWER(username) LIKE ? OR LOWER(url) LIKE ?)
-                ORDER BY updated_at DESC
-            """
-            cursor.execute(query, (self.current_user, f"%{search_term}%", f"%{search_term}%", f"%{search_term}%"))
-            
-        passwords = cursor.fetchall()
+        self.insert_password_rows(passwords)
         
+        if passwords:
+            self.list_last_key = (passwords[-1][6], passwords[-1][0])
+        if len(passwords) < PAGE_SIZE:
+            self.list_exhausted = True
+            
+    def insert_password_rows(self, passwords):
+        """Ajoute des lignes à la fin de la liste"""
         for password in passwords:
             self.password_list.insert("", "end", values=(
                 password[1],  # title
@@ -542,7 +629,15 @@ class PasswordManager:
                 password[4],  # category
                 password[5],  # created_by
                 password[6]   # updated_at
-            ), tags=(password[0],))
+            ), tags=(password[0],))  # ID comme tag
+            
+    def on_password_list_scroll(self, first, last):
+        """Met à jour la scrollbar et charge la page suivante à l'approche de la fin"""
+        self.password_scrollbar.set(first, last)
+        
+        if float(last) >= SCROLL_PREFETCH_THRESHOLD and not self.list_exhausted and not self.list_page_pending:
+            self.list_page_pending = True
+            self.root.after_idle(self.load_password_page)
             
     def show_context_menu(self, event):
         """Affiche le menu contextuel"""
@@ -557,19 +652,17 @@ class PasswordManager:
         context_menu.add_separator()
         context_menu.add_command(label="Historique", command=self.show_password_history)
         
+        context_menu.add_command(label="Changer la catégorie", command=self.bulk_change_category)
+        
         if self.current_role in ["admin", "manager"]:
             context_menu.add_command(label="Gérer les permissions", command=self.manage_permissions)
+            context_menu.add_command(label="Partager avec...", command=self.bulk_share_passwords)
+        
+        # Droits résolus depuis le cache de session, sans requête par clic
+        password_id = self.password_list.item(selection[0])['tags'][0]
+        if self.access.can(access_control.DELETE, password_id):
             context_menu.add_separator()
             context_menu.add_command(label="Supprimer", command=self.delete_password)
-        elif self.current_role == "user":
-            # Vérifier si l'utilisateur peut supprimer ce mot de passe (s'il en est le créateur)
-            password_id = self.password_list.item(selection[0])['tags'][0]
-            cursor = self.db_connection.cursor()
-            cursor.execute("SELECT created_by FROM passwords WHERE id = ?", (password_id,))
-            creator = cursor.fetchone()
-            if creator and creator[0] == self.current_user:
-                context_menu.add_separator()
-                context_menu.add_command(label="Supprimer", command=self.delete_password)
         
         try:
             context_menu.tk_popup(event.x_root, event.y_root)
@@ -587,14 +680,15 @@ class PasswordManager:
         
     def show_password_details(self, password_id):
         """Affiche les détails d'un mot de passe"""
-        cursor = self.db_connection.cursor()
-        cursor.execute("""
-            SELECT title, username, password_encrypted, url, notes, category, visibility_level, created_by
-            FROM passwords WHERE id = ?
-        """, (password_id,))
-        
-        password_data = cursor.fetchone()
-        if not password_data:
+        with self.db.reader() as connection:
+            password_data = connection.execute("""
+                SELECT p.title, p.username, p.password_encrypted, p.url, p.notes, p.category, p.visibility_level, p.created_by,
+                       p.wrapped_entry_key, ap.sealed_entry_key, p.updated_at
+                FROM passwords p
+                LEFT JOIN access_permissions ap ON ap.password_id = p.id AND ap.user_id = ?
+                WHERE p.id = ?
+            """, (self.current_user_id, password_id)).fetchone()
+        if not password_data or not self.access.can(access_control.VIEW, password_id):
             messagebox.showerror("Erreur", "Mot de passe non trouvé")
             return
             
@@ -611,7 +705,7 @@ class PasswordManager:
         dialog.geometry(f"500x600+{x}+{y}")
         
         # Vérifier les permissions
-        can_edit = (self.current_role == "admin" or password_data[7] == self.current_user)
+        can_edit = self.access.can(access_control.EDIT, password_id)
         
         # Champs
         ctk.CTkLabel(dialog, text="Titre:", font=ctk.CTkFont(size=14, weight="bold")).pack(pady=5)
@@ -634,8 +728,11 @@ class PasswordManager:
         
         password_entry = ctk.CTkEntry(password_frame, width=300, show="*")
         decryption_error = False
+        recreated = {'value': False}
         try:
-            decrypted_password = self.decrypt_password(password_data[2])
+            decrypted_password = self.decrypt_entry_cached(
+                password_id, password_data[10], password_data[2], password_data[8], password_data[9]
+            )
             password_entry.insert(0, decrypted_password)
         except Exception as e:
             decryption_error = True
@@ -685,6 +782,7 @@ class PasswordManager:
                 password_entry.configure(state="normal")
                 password_entry.delete(0, "end")
                 password_entry.insert(0, "")
+                recreated['value'] = True
                 show_checkbox.pack(side="left", padx=5)
                 copy_button.pack(side="left", padx=5)
                 error_frame.destroy()
@@ -738,7 +836,9 @@ class PasswordManager:
                     password_changed = False
                     
                     try:
-                        old_password = self.decrypt_password(password_data[2])
+                        old_password = self.decrypt_entry_cached(
+                            password_id, password_data[10], password_data[2], password_data[8], password_data[9]
+                        )
                         new_password = password_entry.get()
                         password_changed = (old_password != new_password)
                     except:
@@ -750,38 +850,70 @@ class PasswordManager:
                         messagebox.showerror("Erreur", "Le mot de passe ne peut pas être vide")
                         return
                     
-                    encrypted_password = self.encrypt_password(new_password)
-                    visibility_level = 1 if (self.current_role != "admin" or visibility_var.get() == "Normal") else 2
+                    # Mot de passe illisible et non recréé : conserver le chiffré existant
+                    if decryption_error and not recreated['value']:
+                        password_changed = False
                     
-                    cursor.execute("""
-                        UPDATE passwords 
-                        SET title=?, username=?, password_encrypted=?, url=?, notes=?, category=?, visibility_level=?, updated_at=?
-                        WHERE id=?
-                    """, (
-                        title_entry.get(),
-                        username_entry.get(),
-                        encrypted_password,
-                        url_entry.get(),
-                        notes_text.get("1.0", "end-1c"),
-                        category_var.get(),
-                        visibility_level,
-                        datetime.now(),
-                        password_id
-                    ))
+                    visibility_level = 1 if (self.current_role != "admin" or visibility_var.get() == "Normal") else 2
+                    fields = {
+                        'title': title_entry.get(),
+                        'username': username_entry.get(),
+                        'url': url_entry.get(),
+                        'notes': notes_text.get("1.0", "end-1c"),
+                        'category': category_var.get(),
+                        'visibility_level': visibility_level
+                    }
+                    # Ne réécrire que ce qui a changé : une sauvegarde sans modification
+                    # n'ajoute rien à l'historique
+                    fields = changed_fields({
+                        'title': password_data[0],
+                        'username': password_data[1],
+                        'url': password_data[3],
+                        'notes': password_data[4],
+                        'category': password_data[5],
+                        'visibility_level': password_data[6]
+                    }, fields)
+                    details_changed = bool(fields)
+                    if not details_changed and not password_changed:
+                        dialog.destroy()
+                        return
                     
-                    # Ajouter à l'historique
+                    sealed_for_creator = None
                     if password_changed:
-                        cursor.execute("""
-                            INSERT INTO password_history (password_id, action, old_value, new_value, changed_by)
-                            VALUES (?, ?, ?, ?, ?)
-                        """, (password_id, "PASSWORD_CHANGED", "***", "***", self.current_user))
+                        # Réutiliser la clé de l'entrée si possible : le créateur et les
+                        # utilisateurs avec qui elle est partagée gardent l'accès
+                        try:
+                            entry_key = self.get_entry_key(password_data[8], password_data[9])
+                        except Exception:
+                            entry_key = None
+                        if entry_key is not None:
+                            fields['password_encrypted'] = vault_crypto.encrypt_secret(entry_key, new_password)
+                        else:
+                            fields['password_encrypted'], fields['wrapped_entry_key'] = self.encrypt_entry(new_password)
+                            if password_data[7] != self.current_user:
+                                # Nouvelle clé enveloppée par notre coffre : la sceller pour le créateur
+                                with self.db.reader() as connection:
+                                    creator = connection.execute(
+                                        "SELECT id, public_key FROM users WHERE username = ?", (password_data[7],)
+                                    ).fetchone()
+                                if creator and creator[1]:
+                                    new_entry_key = self.get_entry_key(fields['wrapped_entry_key'])
+                                    sealed_for_creator = (creator[0], vault_crypto.seal_key(creator[1], new_entry_key))
                     
-                    cursor.execute("""
-                        INSERT INTO password_history (password_id, action, old_value, new_value, changed_by)
-                        VALUES (?, ?, ?, ?, ?)
-                    """, (password_id, "DETAILS_UPDATED", "", f"Title: {title_entry.get()}", self.current_user))
+                    # Mise à jour et historique dans une seule transaction
+                    with UnitOfWork(self.db, self.current_user) as uow:
+                        uow.update_password(password_id, fields)
+                        if sealed_for_creator:
+                            uow.bulk_share([password_id], sealed_for_creator[0], password_data[7],
+                                           sealed_keys={password_id: sealed_for_creator[1]})
+                        
+                        # Ajouter à l'historique
+                        if password_changed:
+                            uow.record(password_id, "PASSWORD_CHANGED", "***", "***")
+                        if details_changed:
+                            uow.record(password_id, "DETAILS_UPDATED", "", f"Title: {title_entry.get()}")
+                    self.secret_cache.invalidate([int(password_id)])
                     
-                    self.db_connection.commit()
                     messagebox.showinfo("Succès", "Mot de passe mis à jour avec succès!")
                     dialog.destroy()
                     self.refresh_password_list()
@@ -808,21 +940,19 @@ class PasswordManager:
             
         password_id = self.password_list.item(selection[0])['tags'][0]
         
-        cursor = self.db_connection.cursor()
-        cursor.execute("SELECT password_encrypted FROM passwords WHERE id = ?", (password_id,))
-        result = cursor.fetchone()
-        
-        if result:
-            try:
-                decrypted_password = self.decrypt_password(result[0])
-                self.copy_to_clipboard(decrypted_password)
-            except Exception as e:
-                messagebox.showerror(
-                    "Erreur de déchiffrement", 
-                    "Impossible de déchiffrer ce mot de passe.\n\n"
-                    "Cause possible: mot de passe créé avant la migration.\n"
-                    "Solution: reconnectez-vous pour générer votre clé de chiffrement."
-                )
+        try:
+            decrypted_password = self.fetch_entry_secret(password_id)
+        except Exception:
+            messagebox.showerror(
+                "Erreur de déchiffrement", 
+                "Impossible de déchiffrer ce mot de passe.\n\n"
+                "Cause possible: mot de passe créé avant la migration ou non partagé avec vous.\n"
+                "Solution: reconnectez-vous ou demandez au créateur de le partager."
+            )
+            return
+            
+        if decrypted_password is not None:
+            self.copy_to_clipboard(decrypted_password)
                 
     def show_add_password_dialog(self):
         """Affiche la boîte de dialogue d'ajout de mot de passe"""
@@ -904,33 +1034,24 @@ class PasswordManager:
                 return
             
             try:
-                encrypted_password = self.encrypt_password(password_entry.get())
+                encrypted_password, wrapped_entry_key = self.encrypt_entry(password_entry.get())
                 visibility_level = 1 if (self.current_role != "admin" or visibility_var.get() == "Normal") else 2
                 
-                cursor = self.db_connection.cursor()
-                cursor.execute("""
-                    INSERT INTO passwords (title, username, password_encrypted, url, notes, category, visibility_level, created_by)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    title_entry.get(),
-                    username_entry.get(),
-                    encrypted_password,
-                    url_entry.get(),
-                    notes_text.get("1.0", "end-1c"),
-                    category_var.get(),
-                    visibility_level,
-                    self.current_user
-                ))
-                
-                password_id = cursor.lastrowid
-                
-                # Ajouter à l'historique
-                cursor.execute("""
-                    INSERT INTO password_history (password_id, action, old_value, new_value, changed_by)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (password_id, "CREATED", "", f"Title: {title_entry.get()}", self.current_user))
+                with UnitOfWork(self.db, self.current_user) as uow:
+                    password_id = uow.insert_password({
+                        'title': title_entry.get(),
+                        'username': username_entry.get(),
+                        'password_encrypted': encrypted_password,
+                        'wrapped_entry_key': wrapped_entry_key,
+                        'url': url_entry.get(),
+                        'notes': notes_text.get("1.0", "end-1c"),
+                        'category': category_var.get(),
+                        'visibility_level': visibility_level
+                    })
+                    
+                    # Ajouter à l'historique
+                    uow.record(password_id, "CREATED", "", f"Title: {title_entry.get()}")
                 
-                self.db_connection.commit()
                 messagebox.showinfo("Succès", "Mot de passe ajouté avec succès!")
                 dialog.destroy()
                 self.refresh_password_list()
@@ -986,19 +1107,22 @@ class PasswordManager:
         scrollbar.pack(side="right", fill="y", padx=(0, 10), pady=10)
         
         # Charger l'historique
-        cursor = self.db_connection.cursor()
-        cursor.execute("""
-            SELECT changed_at, action, changed_by, new_value
-            FROM password_history
-            WHERE password_id = ?
-            ORDER BY changed_at DESC
-        """, (password_id,))
-        
-        history = cursor.fetchall()
+        with self.db.reader() as connection:
+            history = connection.execute("""
+                SELECT changed_at, action, changed_by, new_value
+                FROM password_history
+                WHERE password_id = ?
+                ORDER BY changed_at DESC
+            """, (password_id,)).fetchall()
         
         for record in history:
             history_tree.insert("", "end", values=record)
         
+        # Lignes déplacées dans l'archive par la politique de rétention
+        archived = history_retention.load_archived_history(history_retention.archive_path_for(DB_PATH), password_id)
+        for _, _, action, _, new_value, changed_by, changed_at in archived:
+            history_tree.insert("", "end", values=(changed_at, f"{action} (archivé)", changed_by, new_value))
+        
         # Bouton fermer
         close_button = ctk.CTkButton(dialog, text="Fermer", command=dialog.destroy, width=100)
         close_button.pack(pady=10)
@@ -1037,9 +1161,9 @@ class PasswordManager:
         ctk.CTkLabel(add_frame, text="Ajouter un utilisateur:").pack(side="left", padx=5)
         
         # Récupérer la liste des utilisateurs
-        cursor = self.db_connection.cursor()
-        cursor.execute("SELECT username FROM users WHERE username != ?", (self.current_user,))
-        users = [row[0] for row in cursor.fetchall()]
+        with self.db.reader() as connection:
+            users = [row[0] for row in connection.execute(
+                "SELECT username FROM users WHERE username != ?", (self.current_user,))]
         
         user_var = ctk.StringVar()
         user_combo = ctk.CTkComboBox(add_frame, values=users, variable=user_var, width=200)
@@ -1050,15 +1174,19 @@ class PasswordManager:
                 messagebox.showerror("Erreur", "Veuillez sélectionner un utilisateur")
                 return
             
-            cursor.execute("SELECT id FROM users WHERE username = ?", (user_var.get(),))
-            user_id = cursor.fetchone()[0]
+            with self.db.reader() as connection:
+                user_id, public_key = connection.execute(
+                    "SELECT id, public_key FROM users WHERE username = ?", (user_var.get(),)).fetchone()
             
-            cursor.execute("""
-                INSERT OR REPLACE INTO access_permissions (user_id, password_id, permission_level, granted_by)
-                VALUES (?, ?, ?, ?)
-            """, (user_id, password_id, 1, self.current_user))
+            # La clé de l'entrée est scellée pour le destinataire, sans rien rechiffrer
+            sealed_keys = self.seal_entry_keys([password_id], public_key)
+            with UnitOfWork(self.db, self.current_user) as uow:
+                refused = uow.bulk_share([password_id], user_id, user_var.get(), sealed_keys=sealed_keys)
             
-            self.db_connection.commit()
+            if refused:
+                messagebox.showerror("Erreur", "Impossible de partager ce mot de passe : sa clé n'a pas pu être "
+                                               "scellée pour cet utilisateur (clé inaccessible ou utilisateur sans clé publique)")
+                return
             messagebox.showinfo("Succès", "Permission ajoutée avec succès!")
             dialog.destroy()
         
@@ -1069,49 +1197,119 @@ class PasswordManager:
         close_button = ctk.CTkButton(dialog, text="Fermer", command=dialog.destroy, width=100)
         close_button.pack(pady=10)
         
+    def get_selected_passwords(self):
+        """Retourne [(id, titre), ...] pour les lignes sélectionnées"""
+        return [
+            (self.password_list.item(item)['tags'][0], self.password_list.item(item)['values'][0])
+            for item in self.password_list.selection()
+        ]
+        
     def delete_password(self):
-        """Supprime un mot de passe"""
-        selection = self.password_list.selection()
-        if not selection:
+        """Supprime les mots de passe sélectionnés"""
+        selected = self.get_selected_passwords()
+        if not selected:
             return
             
-        password_id = self.password_list.item(selection[0])['tags'][0]
-        password_title = self.password_list.item(selection[0])['values'][0]
-        
-        # Vérifier les permissions
-        cursor = self.db_connection.cursor()
-        cursor.execute("SELECT created_by FROM passwords WHERE id = ?", (password_id,))
-        creator = cursor.fetchone()
-        
-        if not creator:
-            messagebox.showerror("Erreur", "Mot de passe non trouvé")
-            return
-        
         # Seuls les admins, managers ou le créateur peuvent supprimer
-        if self.current_role not in ["admin", "manager"] and creator[0] != self.current_user:
+        allowed_ids = set(self.access.allowed(access_control.DELETE, [password_id for password_id, _ in selected]))
+        entries = [(password_id, title) for password_id, title in selected if password_id in allowed_ids]
+        
+        if not entries:
             messagebox.showerror("Erreur", "Vous n'avez pas la permission de supprimer ce mot de passe")
             return
-        
-        if messagebox.askyesno("Confirmation", f"Êtes-vous sûr de vouloir supprimer '{password_title}' ?"):
-            # Ajouter à l'historique avant suppression
-            cursor.execute("""
-                INSERT INTO password_history (password_id, action, old_value, new_value, changed_by)
-                VALUES (?, ?, ?, ?, ?)
-            """, (password_id, "DELETED", password_title, "", self.current_user))
             
-            # Supprimer les permissions
-            cursor.execute("DELETE FROM access_permissions WHERE password_id = ?", (password_id,))
+        if len(entries) == 1:
+            question = f"Êtes-vous sûr de vouloir supprimer '{entries[0][1]}' ?"
+        else:
+            question = f"Êtes-vous sûr de vouloir supprimer {len(entries)} mots de passe ?"
+        if len(entries) < len(selected):
+            question += f"\n\n{len(selected) - len(entries)} élément(s) sans permission seront ignorés."
             
-            # Supprimer l'historique (après avoir ajouté l'entrée de suppression)
-            cursor.execute("DELETE FROM password_history WHERE password_id = ?", (password_id,))
+        if messagebox.askyesno("Confirmation", question):
+            # Permissions, historique et entrées supprimés dans une seule transaction
+            with UnitOfWork(self.db, self.current_user) as uow:
+                uow.bulk_delete(entries)
+            self.secret_cache.invalidate([int(password_id) for password_id, _ in entries])
+                
+            messagebox.showinfo("Succès", f"{len(entries)} mot(s) de passe supprimé(s) avec succès!")
+            self.refresh_password_list()
             
-            # Supprimer le mot de passe
-            cursor.execute("DELETE FROM passwords WHERE id = ?", (password_id,))
+    def bulk_change_category(self):
+        """Change la catégorie des mots de passe sélectionnés"""
+        selected = self.get_selected_passwords()
+        password_ids = self.access.allowed(access_control.EDIT, [password_id for password_id, _ in selected])
+        if not password_ids:
+            messagebox.showerror("Erreur", "Vous n'avez pas la permission de modifier ces mots de passe")
+            return
             
-            self.db_connection.commit()
-            messagebox.showinfo("Succès", "Mot de passe supprimé avec succès!")
+        dialog = ctk.CTkToplevel(self.root)
+        dialog.title("Changer la catégorie")
+        dialog.geometry("400x200")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        ctk.CTkLabel(dialog, text=f"Nouvelle catégorie ({len(password_ids)} élément(s)):", font=ctk.CTkFont(size=14)).pack(pady=15)
+        category_var = ctk.StringVar(value="General")
+        ctk.CTkComboBox(dialog, values=["General", "Email", "Social", "Work", "Banking", "Other"], variable=category_var, width=300).pack(pady=5)
+        
+        def apply_category():
+            with UnitOfWork(self.db, self.current_user) as uow:
+                uow.bulk_recategorize(password_ids, category_var.get())
+            dialog.destroy()
             self.refresh_password_list()
             
+        button_frame = ctk.CTkFrame(dialog)
+        button_frame.pack(pady=20)
+        ctk.CTkButton(button_frame, text="Appliquer", command=apply_category, width=100).pack(side="left", padx=10)
+        ctk.CTkButton(button_frame, text="Annuler", command=dialog.destroy, width=100).pack(side="left", padx=10)
+        
+    def bulk_share_passwords(self):
+        """Partage les mots de passe sélectionnés avec un utilisateur"""
+        password_ids = [password_id for password_id, _ in self.get_selected_passwords()]
+        if not password_ids:
+            return
+            
+        dialog = ctk.CTkToplevel(self.root)
+        dialog.title("Partager avec un utilisateur")
+        dialog.geometry("400x200")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        with self.db.reader() as connection:
+            users = [row[0] for row in connection.execute("SELECT username FROM users WHERE username != ?", (self.current_user,))]
+            
+        ctk.CTkLabel(dialog, text=f"Partager {len(password_ids)} élément(s) avec:", font=ctk.CTkFont(size=14)).pack(pady=15)
+        user_var = ctk.StringVar()
+        ctk.CTkComboBox(dialog, values=users, variable=user_var, width=300).pack(pady=5)
+        
+        def apply_share():
+            if not user_var.get():
+                messagebox.showerror("Erreur", "Veuillez sélectionner un utilisateur")
+                return
+            with self.db.reader() as connection:
+                user = connection.execute("SELECT id, public_key FROM users WHERE username = ?", (user_var.get(),)).fetchone()
+            if not user:
+                messagebox.showerror("Erreur", "Utilisateur introuvable")
+                return
+                
+            sealed_keys = self.seal_entry_keys(password_ids, user[1])
+            with UnitOfWork(self.db, self.current_user) as uow:
+                refused = uow.bulk_share(password_ids, user[0], user_var.get(), sealed_keys=sealed_keys)
+            shared = len(password_ids) - len(refused)
+            if refused:
+                messagebox.showwarning("Partage incomplet",
+                                       f"{shared} permission(s) ajoutée(s).\n{len(refused)} élément(s) non partagé(s) : "
+                                       f"leur clé n'a pas pu être scellée pour cet utilisateur (ids : "
+                                       f"{', '.join(map(str, refused))})")
+            else:
+                messagebox.showinfo("Succès", f"{shared} permission(s) ajoutée(s) avec succès!")
+            dialog.destroy()
+            
+        button_frame = ctk.CTkFrame(dialog)
+        button_frame.pack(pady=20)
+        ctk.CTkButton(button_frame, text="Partager", command=apply_share, width=100).pack(side="left", padx=10)
+        ctk.CTkButton(button_frame, text="Annuler", command=dialog.destroy, width=100).pack(side="left", padx=10)
+            
     def delete_selected_password(self):
         """Supprime le mot de passe sélectionné (appelée par le bouton de suppression)"""
         selection = self.password_list.selection()
@@ -1160,17 +1358,31 @@ class PasswordManager:
         users_tree.pack(side="left", expand=True, fill="both")
         users_scrollbar.pack(side="right", fill="y")
         
-        # Charger les utilisateurs
-        cursor = self.db_connection.cursor()
-        cursor.execute("SELECT username, role, last_login, created_at FROM users ORDER BY created_at DESC")
-        users = cursor.fetchall()
-        
-        for user in users:
-            users_tree.insert("", "end", values=user)
+        # Charger les utilisateurs page par page (pagination par clé sur created_at, id)
+        users_page = {'last': None}
+        
+        def load_users_page():
+            condition, params = "", []
+            if users_page['last']:
+                condition, params = "WHERE (created_at, id) < (?, ?)", list(users_page['last'])
+            with self.db.reader() as connection:
+                rows = connection.execute(f"""
+                    SELECT username, role, last_login, created_at, id FROM users
+                    {condition}
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT ?
+                """, params + [USERS_PAGE_SIZE]).fetchall()
+            for row in rows:
+                users_tree.insert("", "end", values=row[:4])
+            if rows:
+                users_page['last'] = (rows[-1][3], rows[-1][4])
+            if len(rows) < USERS_PAGE_SIZE:
+                more_button.configure(state="disabled")
         
         # Boutons de gestion des utilisateurs
         user_buttons_frame = ctk.CTkFrame(users_tab)
         user_buttons_frame.pack(fill="x", padx=10, pady=10)
+        more_button = ctk.CTkButton(user_buttons_frame, text="Plus d'utilisateurs...", command=load_users_page, width=150)
         
         def change_user_role():
             selection = users_tree.selection()
@@ -1200,13 +1412,16 @@ class PasswordManager:
                 return
             
             if messagebox.askyesno("Confirmation", f"Êtes-vous sûr de vouloir supprimer l'utilisateur '{selected_user}' ?"):
-                cursor.execute("DELETE FROM users WHERE username = ?", (selected_user,))
-                self.db_connection.commit()
+                # Transaction du gestionnaire : attend la fin d'une écriture en cours (import, rotation)
+                with self.db.transaction() as connection:
+                    connection.execute("DELETE FROM users WHERE username = ?", (selected_user,))
                 messagebox.showinfo("Succès", "Utilisateur supprimé avec succès!")
                 users_tree.delete(selection[0])
         
         ctk.CTkButton(user_buttons_frame, text="Changer le rôle", command=change_user_role, width=150).pack(side="left", padx=5)
         ctk.CTkButton(user_buttons_frame, text="Supprimer utilisateur", command=delete_user, width=150).pack(side="left", padx=5)
+        more_button.pack(side="right", padx=5)
+        load_users_page()
         
         # Onglet Statistiques
         stats_tab = notebook.add("Statistiques")
@@ -1214,30 +1429,108 @@ class PasswordManager:
         stats_frame = ctk.CTkFrame(stats_tab)
         stats_frame.pack(expand=True, fill="both", padx=10, pady=10)
         
-        # Calculer les statistiques
-        cursor.execute("SELECT COUNT(*) FROM passwords")
-        total_passwords = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM users")
-        total_users = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM password_history WHERE changed_at > date('now', '-30 days')")
-        recent_changes = cursor.fetchone()[0]
+        # Statistiques matérialisées (tables maintenues par triggers) : lecture en temps constant
+        with self.db.reader() as connection:
+            stats = vault_stats.load_stats(connection, days=STATS_ACTIVITY_DAYS)
         
         # Afficher les statistiques
-        ctk.CTkLabel(stats_frame, text="Statistiques du système", font=ctk.CTkFont(size=20, weight="bold")).pack(pady=20)
+        ctk.CTkLabel(stats_frame, text="Statistiques du système", font=ctk.CTkFont(size=20, weight="bold")).pack(pady=10)
         
         stats_info = ctk.CTkFrame(stats_frame)
-        stats_info.pack(pady=20)
+        stats_info.pack(pady=5)
+        
+        ctk.CTkLabel(stats_info, text=f"Nombre total de mots de passe: {stats['total_passwords']}", font=ctk.CTkFont(size=16)).pack(pady=5)
+        ctk.CTkLabel(stats_info, text=f"Nombre total d'utilisateurs: {stats['total_users']}", font=ctk.CTkFont(size=16)).pack(pady=5)
+        ctk.CTkLabel(stats_info, text=f"Modifications récentes ({STATS_ACTIVITY_DAYS} jours): {stats['recent_changes']}", font=ctk.CTkFont(size=16)).pack(pady=5)
+        
+        # Répartitions
+        details_frame = ctk.CTkFrame(stats_frame)
+        details_frame.pack(fill="x", padx=10, pady=5)
+        breakdowns = [
+            ("Par rôle", sorted(stats['roles'].items())),
+            ("Par catégorie", sorted(stats['categories'].items(), key=lambda item: -item[1])),
+            ("Principaux créateurs", stats['creators']),
+        ]
+        for title, items in breakdowns:
+            column = ctk.CTkFrame(details_frame)
+            column.pack(side="left", expand=True, fill="both", padx=5, pady=5)
+            ctk.CTkLabel(column, text=title, font=ctk.CTkFont(size=14, weight="bold")).pack(pady=2)
+            for key, value in items:
+                ctk.CTkLabel(column, text=f"{key or '—'}: {value}", font=ctk.CTkFont(size=12)).pack()
+        
+        # Tendance : modifications par jour
+        self.draw_activity_chart(stats_frame, stats['activity'], STATS_ACTIVITY_DAYS)
+        
+        # Onglet Maintenance : rétention de l'historique et compactage de la base
+        maintenance_tab = notebook.add("Maintenance")
+        
+        maintenance_frame = ctk.CTkFrame(maintenance_tab)
+        maintenance_frame.pack(expand=True, fill="both", padx=10, pady=10)
+        
+        with self.db.reader() as connection:
+            max_age_days, max_rows = history_retention.load_policy(connection)
+            history_rows = connection.execute("SELECT COALESCE(SUM(changes), 0) FROM history_activity").fetchone()[0]
+        
+        ctk.CTkLabel(maintenance_frame, text="Rétention de l'historique", font=ctk.CTkFont(size=20, weight="bold")).pack(pady=10)
+        ctk.CTkLabel(maintenance_frame, text=f"Lignes d'historique dans la base: {history_rows}", font=ctk.CTkFont(size=14)).pack(pady=5)
+        ctk.CTkLabel(
+            maintenance_frame,
+            text="Les lignes hors politique sont archivées (compressées) dans une base séparée.\nLaisser un champ vide pour ne pas limiter.",
+            font=ctk.CTkFont(size=12)
+        ).pack(pady=5)
+        
+        ctk.CTkLabel(maintenance_frame, text="Âge maximal (jours):", font=ctk.CTkFont(size=14, weight="bold")).pack(pady=5)
+        max_age_entry = ctk.CTkEntry(maintenance_frame, width=200)
+        max_age_entry.insert(0, "" if max_age_days is None else str(max_age_days))
+        max_age_entry.pack(pady=5)
+        
+        ctk.CTkLabel(maintenance_frame, text="Lignes maximales par entrée:", font=ctk.CTkFont(size=14, weight="bold")).pack(pady=5)
+        max_rows_entry = ctk.CTkEntry(maintenance_frame, width=200)
+        max_rows_entry.insert(0, "" if max_rows is None else str(max_rows))
+        max_rows_entry.pack(pady=5)
+        
+        def start_maintenance():
+            try:
+                policy = tuple(
+                    int(entry.get()) if entry.get().strip() else None
+                    for entry in (max_age_entry, max_rows_entry)
+                )
+                history_retention.save_policy(self.db, *policy)
+            except ValueError:
+                messagebox.showerror("Erreur", "Les limites doivent être des nombres entiers positifs")
+                return
+            self.run_history_maintenance(policy)
         
-        ctk.CTkLabel(stats_info, text=f"Nombre total de mots de passe: {total_passwords}", font=ctk.CTkFont(size=16)).pack(pady=10)
-        ctk.CTkLabel(stats_info, text=f"Nombre total d'utilisateurs: {total_users}", font=ctk.CTkFont(size=16)).pack(pady=10)
-        ctk.CTkLabel(stats_info, text=f"Modifications récentes (30 jours): {recent_changes}", font=ctk.CTkFont(size=16)).pack(pady=10)
+        ctk.CTkButton(maintenance_frame, text="🧹 Enregistrer et lancer la maintenance", command=start_maintenance, width=280).pack(pady=15)
         
         # Bouton fermer
         close_button = ctk.CTkButton(dialog, text="Fermer", command=dialog.destroy, width=100)
         close_button.pack(pady=10)
         
+    def draw_activity_chart(self, parent, activity, days):
+        """Dessine un histogramme des modifications par jour [(jour, modifications), ...]"""
+        width, height, margin = 700, 140, 20
+        canvas = ctk.CTkCanvas(parent, width=width, height=height, bg="#2b2b2b", highlightthickness=0)
+        canvas.pack(pady=5)
+        
+        # Les jours de l'historique sont en UTC (CURRENT_TIMESTAMP)
+        changes_by_day = dict(activity)
+        today = datetime.utcnow().date()
+        series = [changes_by_day.get((today - timedelta(days=offset)).isoformat(), 0) for offset in range(days - 1, -1, -1)]
+        peak = max(series) or 1
+        bar_width = (width - 2 * margin) / days
+        
+        for index, changes in enumerate(series):
+            x0 = margin + index * bar_width
+            bar_height = (height - 2 * margin) * changes / peak
+            canvas.create_rectangle(
+                x0 + 1, height - margin - bar_height, x0 + bar_width - 1, height - margin,
+                fill="#1f6aa5", outline=""
+            )
+        canvas.create_text(margin, margin / 2, text=f"Modifications par jour (max {peak})", fill="white", anchor="w")
+        canvas.create_text(margin, height - margin / 2, text=f"-{days} j", fill="gray", anchor="w")
+        canvas.create_text(width - margin, height - margin / 2, text="aujourd'hui", fill="gray", anchor="e")
+        
     def show_change_role_dialog(self, username, current_role, users_tree):
         """Affiche la boîte de dialogue pour changer le rôle d'un utilisateur"""
         dialog = ctk.CTkToplevel(self.root)
@@ -1315,9 +1608,8 @@ class PasswordManager:
                 dialog.destroy()
                 return
             
-            cursor = self.db_connection.cursor()
-            cursor.execute("UPDATE users SET role = ? WHERE username = ?", (new_role, username))
-            self.db_connection.commit()
+            with self.db.transaction() as connection:
+                connection.execute("UPDATE users SET role = ? WHERE username = ?", (new_role, username))
             
             messagebox.showinfo("Succès", f"Rôle de {username} changé en {new_role}")
             
@@ -1334,28 +1626,375 @@ class PasswordManager:
         ctk.CTkButton(button_frame, text="Sauvegarder", command=save_role, width=100).pack(side="left", padx=10)
         ctk.CTkButton(button_frame, text="Annuler", command=dialog.destroy, width=100).pack(side="left", padx=10)
         
+    def run_in_background(self, task, on_done, on_tick=None):
+        """Exécute task() dans un thread et appelle on_done(résultat, erreur) dans le thread Tk
+        
+        on_tick() est appelé dans le thread Tk à chaque vérification tant que la tâche tourne.
+        """
+        outcome = {}
+        
+        def worker():
+            try:
+                outcome['result'] = task()
+            except Exception as e:
+                outcome['error'] = e
+                
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        
+        def check():
+            if thread.is_alive():
+                if on_tick:
+                    on_tick()
+                self.root.after(BACKGROUND_POLL_MS, check)
+            else:
+                on_done(outcome.get('result'), outcome.get('error'))
+                
+        self.root.after(BACKGROUND_POLL_MS, check)
+        
+    def show_progress_dialog(self, title, modal=True, initial=0):
+        """Affiche une fenêtre de progression ; retourne (dialog, fonction de mise à jour)
+        
+        initial est le nombre d'entrées déjà traitées (reprise), exclu du calcul du débit.
+        """
+        dialog = ctk.CTkToplevel(self.root)
+        dialog.title(title)
+        dialog.geometry("400x150")
+        dialog.transient(self.root)
+        if modal:
+            dialog.grab_set()
+        
+        status_label = ctk.CTkLabel(dialog, text="Préparation...", font=ctk.CTkFont(size=14))
+        status_label.pack(pady=20)
+        progress_bar = ctk.CTkProgressBar(dialog, width=320)
+        progress_bar.pack(pady=10)
+        progress_bar.set(0)
+        
+        start_time = time.time()
+        
+        def update(done, total):
+            rate = (done - initial) / max(time.time() - start_time, 1e-6)
+            if total:
+                progress_bar.set(done / total)
+                status_label.configure(text=f"{done}/{total} entrées ({rate:.0f}/s)")
+            else:
+                status_label.configure(text=f"{done} entrées ({rate:.0f}/s)")
+                
+        return dialog, update
+        
+    def run_transfer(self, title, task, on_done):
+        """Lance un import/export en arrière-plan avec une fenêtre de progression"""
+        progress = {'done': 0, 'total': None}
+        dialog, update = self.show_progress_dialog(title)
+        
+        def report(done, total):
+            # Appelé depuis le worker : l'affichage est mis à jour par on_tick
+            progress['done'], progress['total'] = done, total
+            
+        def finished(result, error):
+            dialog.destroy()
+            on_done(result, error)
+            
+        self.run_in_background(
+            lambda: task(report),
+            finished,
+            on_tick=lambda: update(progress['done'], progress['total'])
+        )
+        
+    def import_passwords(self):
+        """Importe des mots de passe depuis un fichier CSV ou JSON"""
+        path = filedialog.askopenfilename(
+            title="Importer des mots de passe",
+            filetypes=[("Fichiers CSV", "*.csv"), ("Fichiers JSON", "*.json *.jsonl")]
+        )
+        if not path:
+            return
+            
+        vault_key, user = self.vault_key, self.current_user
+        
+        def on_done(result, error):
+            if error:
+                messagebox.showerror("Erreur", f"Erreur lors de l'import: {str(error)}")
+                return
+            imported, skipped = result
+            message = f"{imported} mot(s) de passe importé(s)"
+            if skipped:
+                message += f"\n{skipped} ligne(s) ignorée(s) (titre ou mot de passe manquant)"
+            messagebox.showinfo("Succès", message)
+            self.refresh_password_list()
+            
+        self.run_transfer(
+            "Import en cours",
+            lambda progress: vault_transfer.import_vault(self.db, path, vault_key, user, progress=progress),
+            on_done
+        )
+        
+    def export_passwords(self):
+        """Exporte les mots de passe de l'utilisateur en clair (CSV ou JSON)"""
+        if not messagebox.askyesno(
+            "Attention",
+            "Le fichier exporté contiendra vos mots de passe en clair.\nContinuer ?"
+        ):
+            return
+            
+        path = filedialog.asksaveasfilename(
+            title="Exporter les mots de passe",
+            defaultextension=".csv",
+            filetypes=[("Fichiers CSV", "*.csv"), ("Fichiers JSON", "*.json"), ("JSON Lines", "*.jsonl")]
+        )
+        if not path:
+            return
+            
+        if self.next_vault_key is not None:
+            messagebox.showwarning("Attention", "Une rotation des clés est en cours ou interrompue : "
+                                                "terminez-la (Rotation des clés) puis réessayez")
+            return
+            
+        vault_key, legacy_key, user = self.vault_key, self.encryption_key, self.current_user
+        
+        def on_done(result, error):
+            if error:
+                messagebox.showerror("Erreur", f"Erreur lors de l'export: {str(error)}")
+                return
+            exported, failed = result
+            message = f"{exported} mot(s) de passe exporté(s)"
+            if failed:
+                message += f"\n{failed} mot(s) de passe impossible(s) à déchiffrer"
+            messagebox.showinfo("Succès", message)
+            
+        # Seules les entrées de l'utilisateur peuvent être déchiffrées avec sa clé
+        self.run_transfer(
+            "Export en cours",
+            lambda progress: vault_transfer.export_vault(
+                self.db, path, vault_key, created_by=user, legacy_key=legacy_key, progress=progress
+            ),
+            on_done
+        )
+        
+    def show_key_rotation_dialog(self):
+        """Affiche la boîte de dialogue de rotation des clés"""
+        if self.next_vault_key is not None:
+            if self.rotation_running:
+                messagebox.showinfo("Rotation des clés", "Une rotation des clés est déjà en cours")
+                return
+            # Reprise refusée à la connexion : la nouvelle clé de coffre protège déjà une partie
+            # des entrées, la rotation ne peut qu'être menée à son terme
+            rotation = key_rotation.find_pending_rotation(self.db, self.current_user_id)
+            if rotation and messagebox.askyesno(
+                "Rotation des clés",
+                f"Une rotation des clés a été interrompue ({rotation['processed']}/{rotation['total']} entrées).\n"
+                "L'export et le changement de mot de passe restent bloqués jusqu'à sa fin.\nLa reprendre maintenant ?"
+            ):
+                self.run_key_rotation(rotation, self.session.pending_kek, self.next_vault_key)
+            return
+            
+        dialog = ctk.CTkToplevel(self.root)
+        dialog.title("Rotation des clés")
+        dialog.geometry("420x380")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        # Centrer la fenêtre
+        dialog.update_idletasks()
+        x = (dialog.winfo_screenwidth() // 2) - (420 // 2)
+        y = (dialog.winfo_screenheight() // 2) - (380 // 2)
+        dialog.geometry(f"420x380+{x}+{y}")
+        
+        ctk.CTkLabel(
+            dialog,
+            text="Toutes vos entrées seront rechiffrées avec de nouvelles clés.\nVous pouvez continuer à travailler pendant l'opération.",
+            font=ctk.CTkFont(size=12)
+        ).pack(pady=10)
+        
+        ctk.CTkLabel(dialog, text="Mot de passe de connexion:", font=ctk.CTkFont(size=14)).pack(pady=5)
+        password_entry = ctk.CTkEntry(dialog, width=300, show="*")
+        password_entry.pack(pady=5)
+        
+        # Les paramètres de la KDF sont calibrés sur cette machine pour le temps cible
+        ctk.CTkLabel(dialog, text="Fonction de dérivation:", font=ctk.CTkFont(size=14)).pack(pady=5)
+        algorithm_var = ctk.StringVar(value=self.kdf_algorithm)
+        ctk.CTkComboBox(
+            dialog, values=vault_crypto.available_kdf_algorithms(), variable=algorithm_var, width=300, state="readonly"
+        ).pack(pady=5)
+        
+        ctk.CTkLabel(dialog, text="Temps de déverrouillage cible (ms):", font=ctk.CTkFont(size=14)).pack(pady=5)
+        target_entry = ctk.CTkEntry(dialog, width=300)
+        target_entry.insert(0, str(KDF_TARGET_MS))
+        target_entry.pack(pady=5)
+        
+        def start():
+            try:
+                target_ms = int(target_entry.get())
+            except ValueError:
+                target_ms = 0
+            if target_ms < KDF_MIN_TARGET_MS:
+                messagebox.showerror("Erreur", f"Le temps cible doit être d'au moins {KDF_MIN_TARGET_MS} ms")
+                return
+                
+            with self.db.reader() as connection:
+                password_hash = connection.execute(
+                    "SELECT password_hash FROM users WHERE id = ?", (self.current_user_id,)
+                ).fetchone()[0]
+            password = password_entry.get()
+            if not bcrypt.checkpw(password.encode('utf-8'), password_hash):
+                messagebox.showerror("Erreur", "Mot de passe incorrect")
+                return
+                
+            algorithm, user_id, user = algorithm_var.get(), self.current_user_id, self.current_user
+            dialog.destroy()
+            
+            def prepare():
+                # Calibration et dérivation de la nouvelle KEK : hors du thread Tk
+                params = vault_crypto.calibrate_kdf(algorithm, target_ms / 1000)
+                return key_rotation.start_rotation(self.db, user_id, user, password, algorithm, params)
+                
+            def prepared(result, error):
+                if error:
+                    messagebox.showerror("Erreur", f"Erreur lors de la rotation des clés: {str(error)}")
+                    return
+                if self.current_user_id != user_id:
+                    return
+                rotation, new_kek, new_vault_key = result
+                self.next_vault_key = new_vault_key
+                self.run_key_rotation(rotation, new_kek, new_vault_key)
+                
+            self.run_in_background(prepare, prepared)
+            
+        button_frame = ctk.CTkFrame(dialog)
+        button_frame.pack(pady=15)
+        ctk.CTkButton(button_frame, text="Démarrer", command=start, width=100).pack(side="left", padx=10)
+        ctk.CTkButton(button_frame, text="Annuler", command=dialog.destroy, width=100).pack(side="left", padx=10)
+        
+    def run_history_maintenance(self, policy):
+        """Archive l'historique hors politique puis compacte la base, en arrière-plan
+        
+        Chaque lot d'archivage et chaque étape de VACUUM est une courte transaction :
+        l'interface reste utilisable pendant la maintenance.
+        """
+        progress = {'done': 0}
+        dialog, update = self.show_progress_dialog("Maintenance de l'historique", modal=False)
+        
+        def report(done, total):
+            progress['done'] = done
+            
+        def task():
+            archived = history_retention.apply_retention(
+                self.db, history_retention.archive_path_for(DB_PATH), policy, progress=report
+            )
+            return archived, history_retention.run_maintenance(self.db)
+            
+        def finished(result, error):
+            dialog.destroy()
+            if error:
+                messagebox.showerror("Erreur", f"Erreur lors de la maintenance: {str(error)}")
+                return
+            archived, maintenance = result
+            message = f"{archived} ligne(s) d'historique archivée(s)\n{maintenance['freed_pages']} page(s) libérée(s)"
+            if not maintenance['incremental']:
+                message += "\n\nCompactage incrémental indisponible sur cette base : lancez une fois\npython maintain_history.py --full-vacuum"
+            messagebox.showinfo("Maintenance terminée", message)
+            
+        self.run_in_background(task, finished, on_tick=lambda: update(progress['done'], None))
+        
+    def run_key_rotation(self, rotation, new_kek, new_vault_key):
+        """Rechiffre les entrées en arrière-plan ; l'interface reste utilisable
+        
+        L'avancement est enregistré après chaque lot : après une déconnexion ou un arrêt,
+        la rotation est proposée à la reprise lors de la connexion suivante.
+        """
+        user_id, user = self.current_user_id, self.current_user
+        old_vault_key, legacy_key, private_key = self.vault_key, self.encryption_key, self.private_key
+        self.rotation_stop = threading.Event()
+        stop = self.rotation_stop
+        self.rotation_running = True
+        
+        progress = {'done': rotation['processed'], 'total': rotation['total']}
+        dialog, update = self.show_progress_dialog("Rotation des clés", modal=False, initial=rotation['processed'])
+        
+        def report(done, total):
+            progress['done'], progress['total'] = done, total
+            
+        def task():
+            completed = key_rotation.run_rotation(
+                self.db, rotation, user, user_id, old_vault_key, new_vault_key, legacy_key,
+                progress=report, should_stop=stop.is_set
+            )
+            if not completed:
+                return completed, []
+            unrotated = key_rotation.unrotated_entries(self.db, user, new_vault_key)
+            key_rotation.complete_rotation(self.db, rotation, user_id, private_key, new_vault_key)
+            return completed, unrotated
+            
+        def finished(result, error):
+            dialog.destroy()
+            self.rotation_running = False
+            completed, unrotated = result or (False, [])
+            if self.current_user_id != user_id:
+                # Session fermée pendant la rotation : elle reprendra à la prochaine connexion
+                return
+            if error:
+                messagebox.showerror("Erreur", f"Erreur lors de la rotation des clés: {str(error)}")
+                return
+            if completed:
+                self.vault_key, self.encryption_key = new_vault_key, new_kek
+                self.kdf_algorithm, self.kdf_params = vault_crypto.load_kdf(
+                    rotation['pending_kdf_algorithm'], rotation['pending_kdf_params']
+                )
+                self.next_vault_key = None
+                message = f"{rotation['processed']} entrée(s) rechiffrée(s)"
+                if rotation['failed']:
+                    message += f"\n{rotation['failed']} entrée(s) impossible(s) à déchiffrer"
+                if unrotated:
+                    message += ("\n\nEntrées non rechiffrées, illisibles avec la nouvelle clé :\n"
+                                + "\n".join(f"• {title}" for _, title in unrotated[:20]))
+                    if len(unrotated) > 20:
+                        message += f"\n… et {len(unrotated) - 20} autre(s)"
+                    messagebox.showwarning("Rotation terminée", message)
+                else:
+                    messagebox.showinfo("Succès", message)
+                
+        self.run_in_background(task, finished, on_tick=lambda: update(progress['done'], progress['total']))
+        
     def check_password_integrity(self):
-        """Vérifie l'intégrité des mots de passe"""
+        """Vérifie l'intégrité des mots de passe (analyse en arrière-plan)"""
         if self.encryption_key is None:
             messagebox.showerror("Erreur", "Clé de chiffrement non disponible")
             return
             
-        cursor = self.db_connection.cursor()
-        cursor.execute("SELECT id, title, password_encrypted, created_by FROM passwords")
-        all_passwords = cursor.fetchall()
+        def on_done(problematic_passwords, error):
+            if error:
+                messagebox.showerror("Erreur", f"Erreur lors de la vérification: {str(error)}")
+            else:
+                self.show_integrity_report(problematic_passwords)
+                
+        self.run_in_background(self.scan_password_integrity, on_done)
+        
+    def scan_password_integrity(self):
+        """Retourne les mots de passe de l'utilisateur ou partagés avec lui impossibles à déchiffrer"""
+        with self.db.reader() as connection:
+            all_passwords = connection.execute("""
+                SELECT p.id, p.title, p.password_encrypted, p.created_by, p.wrapped_entry_key, ap.sealed_entry_key
+                FROM passwords p
+                LEFT JOIN access_permissions ap ON ap.password_id = p.id AND ap.user_id = ?
+                WHERE p.created_by = ? OR ap.id IS NOT NULL
+            """, (self.current_user_id, self.current_user)).fetchall()
         
         problematic_passwords = []
         
         for password in all_passwords:
             try:
-                self.decrypt_password(password[2])
+                self.decrypt_entry(password[2], password[4], password[5])
             except:
                 problematic_passwords.append({
                     'id': password[0],
                     'title': password[1],
                     'created_by': password[3]
                 })
+                
+        return problematic_passwords
         
+    def show_integrity_report(self, problematic_passwords):
+        """Affiche le résultat de la vérification d'intégrité"""
         if problematic_passwords:
             dialog = ctk.CTkToplevel(self.root)
             dialog.title("Mots de passe problématiques")
@@ -1397,15 +2036,22 @@ class PasswordManager:
             
     def logout(self):
         """Déconnecte l'utilisateur"""
-        self.current_user = None
-        self.current_role = None
-        self.encryption_key = None
+        self.search_pipeline.cancel()
+        self.rotation_stop.set()
+        if self.session:
+            self.session.close()
+        self.session = None
         self.create_login_interface()
         
     def on_closing(self):
         """Gère la fermeture de l'application"""
-        if self.db_connection:
-            self.db_connection.close()
+        self.search_pipeline.close()
+        self.rotation_stop.set()
+        self.default_admin_thread.join()
+        if self.session:
+            self.session.close()
+        if self.db:
+            self.db.close()
         self.root.destroy()
         
     def run(self):
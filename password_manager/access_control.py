@@ -0,0 +1,138 @@
+"""Contrôle d'accès aux entrées du coffre.
+
+Les droits d'un utilisateur sur les entrées (créées par lui ou partagées avec lui) sont
+résolus en une requête indexée et mis en cache pour la session. Un compteur de version,
+incrémenté par des triggers à chaque changement de permission ou de propriétaire,
+invalide le cache, y compris quand le changement vient d'une autre instance de
+l'application.
+"""
+
+import threading
+
+# Niveaux d'accès à une entrée (access_permissions.permission_level pour les partages)
+READ = 1
+WRITE = 2
+OWNER = 3
+
+# Actions contrôlées
+VIEW = "view"
+EDIT = "edit"
+DELETE = "delete"
+
+VERSION_KEY = "access_version"
+
+_BUMP_VERSION = f"""
+    INSERT INTO settings (key, value) VALUES ('{VERSION_KEY}', 1)
+    ON CONFLICT (key) DO UPDATE SET value = value + 1;
+"""
+
+TRIGGERS = {
+    "trg_access_permissions_insert": f"AFTER INSERT ON access_permissions BEGIN {_BUMP_VERSION} END",
+    "trg_access_permissions_update": f"AFTER UPDATE ON access_permissions BEGIN {_BUMP_VERSION} END",
+    "trg_access_permissions_delete": f"AFTER DELETE ON access_permissions BEGIN {_BUMP_VERSION} END",
+    "trg_access_passwords_insert": f"AFTER INSERT ON passwords BEGIN {_BUMP_VERSION} END",
+    "trg_access_passwords_delete": f"AFTER DELETE ON passwords BEGIN {_BUMP_VERSION} END",
+    "trg_access_passwords_creator": f"""
+        AFTER UPDATE OF created_by ON passwords WHEN OLD.created_by IS NOT NEW.created_by BEGIN
+            {_BUMP_VERSION}
+        END
+    """,
+}
+
+# Entrées créées par l'utilisateur ou partagées avec lui, avec son niveau d'accès :
+# index (user_id, password_id) des permissions et (created_by, ...) des entrées
+RIGHTS_QUERY = f"""
+    SELECT p.id, CASE WHEN p.created_by = ? THEN {OWNER} ELSE ap.permission_level END
+    FROM access_permissions ap
+    JOIN passwords p ON p.id = ap.password_id
+    WHERE ap.user_id = ?
+    UNION ALL
+    SELECT id, {OWNER} FROM passwords WHERE created_by = ?
+"""
+
+
+def create_access_schema(connection):
+    """Crée les triggers qui versionnent les droits d'accès"""
+    for name, body in TRIGGERS.items():
+        connection.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+
+def read_version(connection):
+    """Version courante des droits d'accès (0 si aucune écriture depuis la création)"""
+    row = connection.execute("SELECT value FROM settings WHERE key = ?", (VERSION_KEY,)).fetchone()
+    return int(row[0]) if row else 0
+
+
+class AccessControl:
+    """Droits d'un utilisateur connecté sur les entrées, mis en cache pour la session.
+
+    Admin : tous les droits. Manager : voit et supprime toutes les entrées, modifie les
+    siennes et celles partagées en écriture. Utilisateur : voit ses entrées et celles
+    partagées avec lui, modifie les siennes et celles partagées en écriture, ne
+    supprime que les siennes.
+    """
+
+    def __init__(self, db, user_id, username, role):
+        self.db = db
+        self.user_id = user_id
+        self.username = username
+        self.role = role
+        self.lock = threading.Lock()
+        self.version = None
+        # id de l'entrée -> niveau d'accès (OWNER pour les entrées créées par l'utilisateur)
+        self.rights = {}
+
+    def invalidate(self):
+        """Force la relecture des droits au prochain contrôle"""
+        with self.lock:
+            self.version = None
+
+    def load_rights(self):
+        """Retourne les droits à jour {id: niveau} (relus seulement si la version a changé)"""
+        with self.lock:
+            with self.db.reader() as connection:
+                version = read_version(connection)
+                if version != self.version:
+                    rights = {}
+                    for password_id, level in connection.execute(
+                        RIGHTS_QUERY, (self.username, self.user_id, self.username)
+                    ):
+                        rights[password_id] = max(rights.get(password_id, 0), level or READ)
+                    self.rights, self.version = rights, version
+            return self.rights
+
+    def level(self, password_id, rights=None):
+        """Niveau d'accès de l'utilisateur à une entrée (0 : aucun)"""
+        if self.role == "admin":
+            return OWNER
+        if rights is None:
+            rights = self.load_rights()
+        level = rights.get(int(password_id), 0)
+        if self.role == "manager":
+            return max(level, READ)
+        return level
+
+    def can(self, action, password_id, rights=None):
+        """Indique si l'utilisateur peut effectuer action (VIEW, EDIT, DELETE) sur l'entrée"""
+        level = self.level(password_id, rights)
+        if action == DELETE:
+            return self.role in ("admin", "manager") or level >= OWNER
+        if action == EDIT:
+            return level >= WRITE
+        return level >= READ
+
+    def allowed(self, action, password_ids):
+        """Filtre les ids sur lesquels l'action est permise (dans l'ordre donné)"""
+        rights = self.load_rights() if self.role != "admin" else {}
+        return [password_id for password_id in password_ids if self.can(action, password_id, rights)]
+
+    def visibility_condition(self, alias=""):
+        """Condition SQL (et paramètres) limitant une requête sur passwords aux entrées visibles"""
+        if self.role in ("admin", "manager"):
+            return "", []
+        prefix = f"{alias}." if alias else ""
+        return (
+            f"({prefix}created_by = ? OR {prefix}id IN "
+            f"(SELECT password_id FROM access_permissions WHERE user_id = ?))",
+            [self.username, self.user_id],
+        )
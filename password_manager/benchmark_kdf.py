@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Mesure le temps de connexion (déverrouillage du coffre) pour chaque configuration de KDF
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+import bcrypt
+
+import vault_crypto
+
+# Configurations de référence, en plus des paramètres calibrés
+REFERENCE_CONFIGURATIONS = [
+    ("pbkdf2", {"iterations": 100000}),
+    ("pbkdf2", {"iterations": 600000}),
+    ("scrypt", {"n": 2 ** 14, "r": 8, "p": 1}),
+    ("scrypt", {"n": 2 ** 17, "r": 8, "p": 1}),
+    ("argon2id", {"iterations": 2, "memory_cost": 19456, "lanes": 1}),
+    ("argon2id", {"iterations": 3, "memory_cost": 65536, "lanes": 4}),
+]
+
+
+def measure_login(algorithm, params, repeat):
+    """Temps médian (secondes) de la partie chiffrement d'une connexion :
+    dérivation de la KEK puis déballage de la clé de coffre et de la clé privée"""
+    password = "benchmark password"
+    kek, salt = vault_crypto.generate_encryption_key(password, None, algorithm, params)
+    keys = vault_crypto.create_user_keys(kek)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        login_kek, _ = vault_crypto.generate_encryption_key(password, salt, algorithm, params)
+        vault_key = vault_crypto.unwrap_key(login_kek, keys['wrapped_vault_key'])
+        vault_crypto.unwrap_key(vault_key, keys['wrapped_private_key'])
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def measure_bcrypt(repeat):
+    """Temps médian (secondes) de la vérification bcrypt, identique pour toutes les KDF"""
+    hashed = bcrypt.hashpw(b"benchmark password", bcrypt.gensalt())
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        bcrypt.checkpw(b"benchmark password", hashed)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du temps de connexion par configuration de KDF")
+    parser.add_argument("--repeat", type=int, default=5, help="Mesures par configuration (défaut: 5)")
+    parser.add_argument("--target-ms", type=int, nargs="*", default=[250, 500, 1000],
+                        help="Temps cibles pour lesquels calibrer chaque KDF (défaut: 250 500 1000)")
+    args = parser.parse_args()
+
+    algorithms = vault_crypto.available_kdf_algorithms()
+    configurations = [(algorithm, params, "référence") for algorithm, params in REFERENCE_CONFIGURATIONS
+                      if algorithm in algorithms]
+    for target_ms in args.target_ms:
+        for algorithm in algorithms:
+            params = vault_crypto.calibrate_kdf(algorithm, target_ms / 1000)
+            configurations.append((algorithm, params, f"calibré {target_ms} ms"))
+
+    print("⏱️  Benchmark du temps de connexion par KDF")
+    print("=" * 80)
+    print(f"CPU: {os.cpu_count()} | Mesures par configuration: {args.repeat}")
+    bcrypt_time = measure_bcrypt(args.repeat)
+    print(f"🔑 Vérification bcrypt (commune) : {bcrypt_time * 1000:.0f} ms\n")
+
+    print(f"{'KDF':<10} {'Origine':<16} {'Paramètres':<50} {'Connexion':>10}")
+    for algorithm, params, origin in configurations:
+        login_time = measure_login(algorithm, params, args.repeat) + bcrypt_time
+        print(f"{algorithm:<10} {origin:<16} {vault_crypto.dump_kdf_params(params):<50} {login_time * 1000:>7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
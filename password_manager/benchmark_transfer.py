@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Mesure le débit (entrées/seconde) de l'import et de l'export du coffre
+"""
+
+import argparse
+import csv
+import os
+import shutil
+import tempfile
+import time
+
+from database import ConnectionManager, create_schema
+import vault_crypto
+import vault_transfer
+
+
+def generate_csv(path, rows):
+    """Génère un fichier CSV de test"""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=vault_transfer.TRANSFER_FIELDS)
+        writer.writeheader()
+        for i in range(rows):
+            writer.writerow({
+                "title": f"Service {i}",
+                "username": f"user{i}@example.com",
+                "password": f"S3cret!{i:08d}",
+                "url": f"https://service{i}.example.com",
+                "notes": "",
+                "category": "Work",
+            })
+
+
+def run_benchmark(rows, workers, chunk_size):
+    directory = tempfile.mkdtemp()
+    try:
+        source = os.path.join(directory, "source.csv")
+        generate_csv(source, rows)
+        key, _ = vault_crypto.generate_encryption_key("benchmark")
+
+        db = ConnectionManager(os.path.join(directory, f"bench_{workers}.db"))
+        create_schema(db.writer)
+
+        start = time.perf_counter()
+        imported, _ = vault_transfer.import_vault(db, source, key, "bench", chunk_size=chunk_size, workers=workers)
+        import_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        exported, _ = vault_transfer.export_vault(
+            db, os.path.join(directory, "export.jsonl"), key, chunk_size=chunk_size, workers=workers
+        )
+        export_time = time.perf_counter() - start
+
+        db.close()
+        return imported / import_time, exported / export_time, import_time, export_time
+    finally:
+        shutil.rmtree(directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de l'import/export du coffre")
+    parser.add_argument("--rows", type=int, default=100000, help="Nombre d'entrées (défaut: 100000)")
+    parser.add_argument("--chunk-size", type=int, default=vault_transfer.CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, vault_transfer.DEFAULT_WORKERS])
+    args = parser.parse_args()
+
+    print("⏱️  Benchmark import/export du coffre")
+    print("=" * 60)
+    print(f"Entrées: {args.rows} | Taille des lots: {args.chunk_size}")
+
+    for workers in args.workers:
+        import_rate, export_rate, import_time, export_time = run_benchmark(args.rows, workers, args.chunk_size)
+        print(f"\n🔧 {workers} worker(s)")
+        print(f"   📥 Import : {import_rate:10.0f} entrées/s ({import_time:.2f} s)")
+        print(f"   📤 Export : {export_rate:10.0f} entrées/s ({export_time:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
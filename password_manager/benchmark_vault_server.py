@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test de charge du service headless du coffre (vault_server.py)
+
+Crée une base temporaire (un compte, N entrées), démarre le service sur une socket
+Unix et envoie des lectures de secrets depuis plusieurs clients, chacun avec plusieurs
+requêtes en vol (pipelining). Affiche le débit et la latence (médiane, p95, p99).
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from database import ConnectionManager, create_schema
+from unit_of_work import UnitOfWork
+import vault_core
+import vault_server
+
+BENCHMARK_USER = "ci"
+BENCHMARK_PASSWORD = "benchmark-password"
+
+
+def create_vault(db, entry_count):
+    """Crée le compte de test et ses entrées ; retourne leurs ids"""
+    vault_core.create_user(db, BENCHMARK_USER, BENCHMARK_PASSWORD)
+    session = vault_core.unlock(db, BENCHMARK_USER, BENCHMARK_PASSWORD)
+    entries = []
+    for i in range(entry_count):
+        encrypted, wrapped = session.encrypt_entry(f"secret-{i}")
+        entries.append({"title": f"Entry {i}", "password_encrypted": encrypted, "wrapped_entry_key": wrapped})
+    with UnitOfWork(db, BENCHMARK_USER) as uow:
+        return uow.bulk_insert(entries)
+
+
+async def run_client(socket_path, entry_ids, requests, pipeline, latencies):
+    """Un client : se connecte, s'authentifie puis lit requests secrets, pipeline à la fois"""
+    client = await vault_server.VaultClient.connect(socket_path)
+    await client.login(BENCHMARK_USER, BENCHMARK_PASSWORD)
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            await client.request("get", entry_id=random.choice(entry_ids))
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(worker() for _ in range(pipeline)))
+    await client.close()
+
+
+async def run_benchmark(socket_path, db, entry_ids, args):
+    server = vault_server.VaultServer(db, worker_count=args.workers)
+    await server.start(socket_path)
+    try:
+        # Échauffement : connexions (bcrypt + KDF) et premières lectures hors mesure
+        await asyncio.gather(*(
+            run_client(socket_path, entry_ids, args.pipeline, 1, []) for _ in range(args.clients)
+        ))
+        latencies = []
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            run_client(socket_path, entry_ids, args.requests // args.clients, args.pipeline, latencies)
+            for _ in range(args.clients)
+        ))
+        return latencies, time.perf_counter() - start
+    finally:
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge du service headless du coffre")
+    parser.add_argument("--entries", type=int, default=1000, help="Entrées dans le coffre de test")
+    parser.add_argument("--requests", type=int, default=5000, help="Lectures au total")
+    parser.add_argument("--clients", type=int, default=4, help="Connexions simultanées")
+    parser.add_argument("--pipeline", type=int, default=16, help="Requêtes en vol par connexion")
+    parser.add_argument("--workers", type=int, default=vault_server.WORKER_COUNT, help="Threads du service")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    db = ConnectionManager(os.path.join(directory, "benchmark.db"), reader_count=args.workers)
+    try:
+        create_schema(db.writer)
+        print(f"📦 Création de {args.entries} entrées...")
+        entry_ids = create_vault(db, args.entries)
+
+        print(f"🚀 {args.requests} lectures, {args.clients} client(s) x {args.pipeline} requêtes en vol")
+        latencies, elapsed = asyncio.run(
+            run_benchmark(os.path.join(directory, "vault.sock"), db, entry_ids, args)
+        )
+        latencies.sort()
+        percentile = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+        print(f"✅ {len(latencies) / elapsed:.0f} requêtes/s")
+        print(f"   Latence : médiane {statistics.median(latencies) * 1000:.2f} ms, "
+              f"p95 {percentile(0.95):.2f} ms, p99 {percentile(0.99):.2f} ms")
+        return 0
+    finally:
+        db.close()
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
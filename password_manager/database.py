@@ -0,0 +1,240 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from access_control import create_access_schema
+from vault_stats import create_stats_schema
+
+# Pragmas appliqués à chaque connexion
+BUSY_TIMEOUT_MS = 5000
+CACHE_SIZE_KB = 16384
+
+
+class ConnectionManager:
+    """Gère la base SQLite en mode WAL : une connexion d'écriture et un pool de lecteurs.
+
+    En mode WAL les lecteurs ne sont pas bloqués par une écriture en cours, ce qui
+    permet aux dialogues et aux tâches de fond de lire pendant une sauvegarde.
+    """
+
+    def __init__(self, db_path, reader_count=4):
+        self.db_path = db_path
+        self.write_lock = threading.RLock()
+        # Profondeur des blocs transaction() ouverts (protégée par write_lock)
+        self.transaction_depth = 0
+
+        # La connexion d'écriture active le mode WAL (persistant dans le fichier) ; une
+        # nouvelle base est créée en VACUUM incrémental (sans effet sur une base existante)
+        self.writer = self.open_connection()
+        self.writer.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self.writer.execute("PRAGMA journal_mode=WAL")
+
+        self.readers = queue.Queue()
+        self.all_readers = []
+        for _ in range(reader_count):
+            connection = self.connect_reader()
+            self.readers.put(connection)
+            self.all_readers.append(connection)
+
+    def open_connection(self):
+        """Ouvre une connexion configurée (utilisable depuis n'importe quel thread)"""
+        connection = sqlite3.connect(self.db_path, check_same_thread=False, timeout=BUSY_TIMEOUT_MS / 1000)
+        # NORMAL est sûr en mode WAL : seul un crash système peut perdre la dernière transaction
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KB}")
+        connection.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        connection.execute("PRAGMA temp_store=MEMORY")
+        return connection
+
+    def connect_reader(self):
+        """Ouvre une connexion de lecture dédiée (hors pool), par exemple pour un worker"""
+        connection = self.open_connection()
+        connection.execute("PRAGMA query_only=ON")
+        return connection
+
+    @contextmanager
+    def reader(self):
+        """Emprunte une connexion de lecture au pool"""
+        connection = self.readers.get()
+        try:
+            yield connection
+        finally:
+            # Terminer une éventuelle transaction de lecture pour ne pas figer le snapshot WAL
+            if connection.in_transaction:
+                connection.rollback()
+            self.readers.put(connection)
+
+    @contextmanager
+    def transaction(self):
+        """Exécute un bloc d'écritures dans une seule transaction (commit ou rollback)
+
+        Un bloc imbriqué (même thread) fait partie de la transaction englobante, validée
+        par le bloc le plus externe. Une transaction implicite laissée ouverte sur la
+        connexion d'écriture hors de transaction() est une erreur : elle serait validée ici
+        à l'insu de son auteur.
+        """
+        with self.write_lock:
+            if self.transaction_depth:
+                self.transaction_depth += 1
+                try:
+                    yield self.writer
+                finally:
+                    self.transaction_depth -= 1
+                return
+            if self.writer.in_transaction:
+                raise RuntimeError("Transaction implicite ouverte sur la connexion d'écriture hors de transaction()")
+            self.writer.execute("BEGIN IMMEDIATE")
+            self.transaction_depth = 1
+            try:
+                yield self.writer
+            except BaseException:
+                self.writer.rollback()
+                raise
+            else:
+                self.writer.commit()
+            finally:
+                self.transaction_depth = 0
+
+    def close(self):
+        """Ferme toutes les connexions (après la transaction d'écriture en cours)"""
+        with self.write_lock:
+            for connection in self.all_readers:
+                connection.close()
+            self.writer.close()
+
+
+def create_schema(connection):
+    """Crée les tables et index du coffre s'ils n'existent pas"""
+    cursor = connection.cursor()
+
+    # Table des utilisateurs
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            role TEXT NOT NULL DEFAULT 'user',
+            encryption_salt BLOB,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_login TIMESTAMP
+        )
+    ''')
+
+    # Table des mots de passe
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS passwords (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            username TEXT,
+            password_encrypted TEXT NOT NULL,
+            url TEXT,
+            notes TEXT,
+            category TEXT DEFAULT 'General',
+            created_by TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            visibility_level INTEGER DEFAULT 1
+        )
+    ''')
+
+    # Table de l'historique
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS password_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            password_id INTEGER,
+            action TEXT NOT NULL,
+            old_value TEXT,
+            new_value TEXT,
+            changed_by TEXT NOT NULL,
+            changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (password_id) REFERENCES passwords (id)
+        )
+    ''')
+
+    # Table des permissions d'accès
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS access_permissions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            password_id INTEGER,
+            permission_level INTEGER DEFAULT 1,
+            granted_by TEXT NOT NULL,
+            granted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id),
+            FOREIGN KEY (password_id) REFERENCES passwords (id)
+        )
+    ''')
+
+    # Index pour la pagination de la liste (tri par date de modification)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_passwords_updated ON passwords (updated_at, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_passwords_creator_updated ON passwords (created_by, updated_at, id)")
+
+    # Index de l'historique : affichage par entrée et rétention par âge
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_history_password_changed ON password_history (password_id, changed_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_history_changed ON password_history (changed_at)")
+
+    # Une seule permission par (utilisateur, mot de passe) : supprimer les doublons existants
+    cursor.execute("""
+        DELETE FROM access_permissions WHERE id NOT IN (
+            SELECT MAX(id) FROM access_permissions GROUP BY user_id, password_id
+        )
+    """)
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_permissions_user_password ON access_permissions (user_id, password_id)")
+
+    # Chiffrement par enveloppe : clés enveloppées (colonnes ajoutées aux bases existantes)
+    add_missing_columns(connection, "users", {
+        "wrapped_vault_key": "BLOB",
+        "public_key": "BLOB",
+        "wrapped_private_key": "BLOB",
+    })
+    add_missing_columns(connection, "passwords", {"wrapped_entry_key": "BLOB"})
+    add_missing_columns(connection, "access_permissions", {"sealed_entry_key": "BLOB"})
+    # Fonction de dérivation de la KEK et ses paramètres JSON (NULL : PBKDF2 par défaut)
+    add_missing_columns(connection, "users", {"kdf_algorithm": "TEXT", "kdf_params": "TEXT"})
+
+    # Rotations de clés : point de reprise de chaque rotation en cours
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS key_rotations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            status TEXT NOT NULL DEFAULT 'running',
+            pending_wrapped_vault_key BLOB NOT NULL,
+            pending_salt BLOB NOT NULL,
+            pending_kdf_algorithm TEXT NOT NULL,
+            pending_kdf_params TEXT NOT NULL,
+            last_password_id INTEGER NOT NULL DEFAULT 0,
+            processed INTEGER NOT NULL DEFAULT 0,
+            failed INTEGER NOT NULL DEFAULT 0,
+            total INTEGER NOT NULL DEFAULT 0,
+            started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            completed_at TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_key_rotations_user_status ON key_rotations (user_id, status)")
+
+    # Réglages de l'application (politique de rétention de l'historique, ...)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS settings (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        ) WITHOUT ROWID
+    ''')
+
+    # Version des droits d'accès, incrémentée par triggers (invalide le cache des sessions)
+    create_access_schema(connection)
+
+    # Statistiques du panneau d'administration, maintenues par triggers
+    create_stats_schema(connection)
+
+    connection.commit()
+
+
+def add_missing_columns(connection, table, columns):
+    """Ajoute à une table les colonnes {nom: type} qui n'existent pas encore"""
+    existing = {row[1] for row in connection.execute(f"PRAGMA table_info({table})")}
+    for name, column_type in columns.items():
+        if name not in existing:
+            connection.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
@@ -0,0 +1,210 @@
+"""Rétention, archivage et maintenance de l'historique des modifications.
+
+La politique de rétention (âge maximal et nombre maximal de lignes par entrée) est
+enregistrée dans la table settings. Les lignes qui la dépassent sont déplacées par lots
+dans une base d'archive séparée, compressées par entrée : la base principale reste
+petite et chaque lot ne tient le verrou d'écriture que quelques millisecondes.
+
+La maintenance (VACUUM incrémental puis ANALYZE borné) procède elle aussi par petites
+étapes, entre lesquelles l'interface peut écrire.
+"""
+
+import json
+import os
+import sqlite3
+import zlib
+
+# Politique par défaut : un an d'historique, 100 lignes au plus par entrée
+DEFAULT_MAX_AGE_DAYS = 365
+DEFAULT_MAX_ROWS_PER_PASSWORD = 100
+
+# Lignes archivées par transaction et pages libérées par étape de VACUUM incrémental
+ARCHIVE_BATCH_SIZE = 500
+VACUUM_STEP_PAGES = 256
+# Nombre de lignes échantillonnées par index pour ANALYZE (borne sa durée)
+ANALYSIS_LIMIT = 400
+
+HISTORY_COLUMNS = ("id", "password_id", "action", "old_value", "new_value", "changed_by", "changed_at")
+POLICY_KEYS = ("history_max_age_days", "history_max_rows_per_password")
+
+
+def archive_path_for(db_path):
+    """Chemin de la base d'archive associée à une base (password_manager_archive.db)"""
+    root, extension = os.path.splitext(db_path)
+    return f"{root}_archive{extension or '.db'}"
+
+
+def load_policy(connection):
+    """Retourne (âge maximal en jours, lignes maximales par entrée) ; None : pas de limite"""
+    stored = dict(connection.execute(
+        f"SELECT key, value FROM settings WHERE key IN ({', '.join('?' for _ in POLICY_KEYS)})", POLICY_KEYS
+    ).fetchall())
+    max_age_days, max_rows = (
+        stored.get(POLICY_KEYS[0], str(DEFAULT_MAX_AGE_DAYS)),
+        stored.get(POLICY_KEYS[1], str(DEFAULT_MAX_ROWS_PER_PASSWORD)),
+    )
+    return (int(max_age_days) if max_age_days else None, int(max_rows) if max_rows else None)
+
+
+def save_policy(db, max_age_days, max_rows_per_password):
+    """Enregistre la politique de rétention (None : pas de limite)"""
+    for value in (max_age_days, max_rows_per_password):
+        if value is not None and value < 1:
+            raise ValueError("Les limites de rétention doivent être positives")
+    with db.transaction() as connection:
+        connection.executemany("""
+            INSERT INTO settings (key, value) VALUES (?, ?)
+            ON CONFLICT (key) DO UPDATE SET value = excluded.value
+        """, [
+            (POLICY_KEYS[0], "" if max_age_days is None else str(max_age_days)),
+            (POLICY_KEYS[1], "" if max_rows_per_password is None else str(max_rows_per_password)),
+        ])
+
+
+def open_archive(path):
+    """Ouvre (et crée si besoin) la base d'archive"""
+    connection = sqlite3.connect(path, check_same_thread=False)
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS archived_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            password_id INTEGER,
+            first_changed_at TIMESTAMP,
+            last_changed_at TIMESTAMP,
+            row_count INTEGER NOT NULL,
+            payload BLOB NOT NULL,
+            archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    connection.execute("CREATE INDEX IF NOT EXISTS idx_archived_history_password ON archived_history (password_id)")
+    connection.commit()
+    return connection
+
+
+def write_archive_chunks(archive, rows):
+    """Écrit des lignes d'historique dans l'archive : un bloc compressé par entrée"""
+    by_password = {}
+    for row in rows:
+        by_password.setdefault(row[1], []).append(row)
+    chunks = []
+    for password_id, group in by_password.items():
+        dates = [row[6] or "" for row in group]
+        chunks.append((password_id, min(dates), max(dates), len(group),
+                       zlib.compress(json.dumps(group).encode("utf-8"))))
+    archive.executemany("""
+        INSERT INTO archived_history (password_id, first_changed_at, last_changed_at, row_count, payload)
+        VALUES (?, ?, ?, ?, ?)
+    """, chunks)
+    archive.commit()
+
+
+def load_archived_history(archive_path, password_id):
+    """Retourne les lignes archivées d'une entrée, de la plus récente à la plus ancienne"""
+    if not os.path.exists(archive_path):
+        return []
+    archive = sqlite3.connect(archive_path)
+    try:
+        payloads = archive.execute(
+            "SELECT payload FROM archived_history WHERE password_id = ?", (password_id,)
+        ).fetchall()
+    finally:
+        archive.close()
+    # Un lot interrompu entre l'archive et la suppression peut être archivé deux fois
+    rows = {}
+    for (payload,) in payloads:
+        for row in json.loads(zlib.decompress(payload)):
+            rows[row[0]] = tuple(row)
+    return sorted(rows.values(), key=lambda row: (row[6] or "", row[0]), reverse=True)
+
+
+def _expired_batches(policy, db):
+    """Requêtes (sql, paramètres nommés) sélectionnant un lot de lignes hors politique (:batch lignes)"""
+    max_age_days, max_rows = policy
+    columns = ", ".join(HISTORY_COLUMNS)
+    if max_age_days is not None:
+        yield (f"""
+            SELECT {columns} FROM password_history
+            WHERE changed_at < datetime('now', :age)
+            ORDER BY changed_at, id
+            LIMIT :batch
+        """, {"age": f"-{max_age_days} days"})
+    if max_rows is not None:
+        # Entrées en excès, lues une fois (après l'archivage par âge) ; puis, entrée par
+        # entrée, les lignes au-delà des max_rows plus récentes via idx_history_password_changed
+        with db.reader() as connection:
+            password_ids = [row[0] for row in connection.execute(
+                "SELECT password_id FROM password_history GROUP BY password_id HAVING COUNT(*) > ?", (max_rows,)
+            )]
+        for password_id in password_ids:
+            yield (f"""
+                SELECT {columns} FROM password_history
+                WHERE password_id = :password_id
+                ORDER BY changed_at DESC, id DESC
+                LIMIT :batch OFFSET :max_rows
+            """, {"password_id": password_id, "max_rows": max_rows})
+
+
+def apply_retention(db, archive_path, policy=None, batch_size=ARCHIVE_BATCH_SIZE, progress=None, should_stop=None):
+    """Archive puis supprime les lignes d'historique qui dépassent la politique.
+
+    Chaque lot est écrit dans l'archive puis supprimé de la base dans sa propre
+    transaction. progress(lignes archivées, None) est appelé après chaque lot ;
+    should_stop() permet d'arrêter entre deux lots. Retourne le nombre de lignes archivées.
+    """
+    if policy is None:
+        with db.reader() as connection:
+            policy = load_policy(connection)
+
+    archived = 0
+    archive = open_archive(archive_path)
+    try:
+        for query, params in _expired_batches(policy, db):
+            while not (should_stop and should_stop()):
+                with db.transaction() as connection:
+                    rows = connection.execute(query, dict(params, batch=batch_size)).fetchall()
+                    if not rows:
+                        break
+                    # L'archive est validée avant la suppression : un crash entre les deux
+                    # laisse au pire un doublon dans l'archive, jamais une perte
+                    write_archive_chunks(archive, rows)
+                    connection.executemany("DELETE FROM password_history WHERE id = ?", [(row[0],) for row in rows])
+                archived += len(rows)
+                if progress:
+                    progress(archived, None)
+    finally:
+        archive.close()
+    return archived
+
+
+def run_maintenance(db, step_pages=VACUUM_STEP_PAGES, full_vacuum=False, should_stop=None):
+    """VACUUM incrémental par étapes puis ANALYZE borné.
+
+    Une base créée avant le mode incrémental doit être convertie une fois par un VACUUM
+    complet, qui bloque les écritures pendant toute sa durée : il n'est lancé que si
+    full_vacuum est vrai (ligne de commande). Retourne un dictionnaire de résultats.
+    """
+    result = {"incremental": False, "converted": False, "freed_pages": 0, "analyzed": False}
+
+    with db.write_lock:
+        auto_vacuum = db.writer.execute("PRAGMA auto_vacuum").fetchone()[0]
+        if auto_vacuum != 2 and full_vacuum:
+            db.writer.executescript("PRAGMA auto_vacuum=INCREMENTAL; VACUUM")
+            result["converted"] = True
+            auto_vacuum = 2
+    result["incremental"] = auto_vacuum == 2
+
+    # Une étape libère au plus step_pages pages ; le verrou est relâché entre deux étapes
+    while auto_vacuum == 2 and not (should_stop and should_stop()):
+        with db.write_lock:
+            free_pages = db.writer.execute("PRAGMA freelist_count").fetchone()[0]
+            if not free_pages:
+                break
+            db.writer.executescript(f"PRAGMA incremental_vacuum({step_pages})")
+            result["freed_pages"] += min(free_pages, step_pages)
+
+    if not (should_stop and should_stop()):
+        with db.write_lock:
+            db.writer.executescript(f"PRAGMA analysis_limit={ANALYSIS_LIMIT}; ANALYZE")
+            # Reporte les pages du WAL dans la base sans attendre les lecteurs
+            db.writer.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        result["analyzed"] = True
+    return result
@@ -0,0 +1,221 @@
+from datetime import datetime
+
+from cryptography.fernet import InvalidToken
+
+import vault_crypto
+
+# Nombre d'entrées rechiffrées par transaction : le verrou d'écriture est relâché
+# entre deux lots pour que l'interface reste utilisable pendant la rotation
+ROTATION_BATCH_SIZE = 200
+
+# Entrées concernées par la rotation d'un utilisateur : les siennes et celles partagées avec lui
+ROTATION_SCOPE = """
+    FROM passwords p
+    WHERE (p.created_by = ? OR p.id IN (SELECT password_id FROM access_permissions WHERE user_id = ?))
+"""
+
+ROTATION_FIELDS = ("id", "pending_wrapped_vault_key", "pending_salt", "pending_kdf_algorithm",
+                   "pending_kdf_params", "last_password_id", "processed", "failed", "total")
+
+
+def find_pending_rotation(db, user_id):
+    """Retourne la rotation en cours d'un utilisateur (dictionnaire), ou None"""
+    with db.reader() as connection:
+        row = connection.execute(f"""
+            SELECT {", ".join(ROTATION_FIELDS)}
+            FROM key_rotations
+            WHERE user_id = ? AND status = 'running'
+            ORDER BY id DESC LIMIT 1
+        """, (user_id,)).fetchone()
+    return dict(zip(ROTATION_FIELDS, row)) if row else None
+
+
+def unwrap_pending_key(rotation, password):
+    """Retourne (nouvelle KEK, nouvelle clé de coffre) d'une rotation à partir du mot de passe"""
+    algorithm, params = vault_crypto.load_kdf(rotation["pending_kdf_algorithm"], rotation["pending_kdf_params"])
+    kek, _ = vault_crypto.generate_encryption_key(password, rotation["pending_salt"], algorithm, params)
+    return kek, vault_crypto.unwrap_key(kek, rotation["pending_wrapped_vault_key"])
+
+
+def start_rotation(db, user_id, username, password, kdf_algorithm=vault_crypto.DEFAULT_KDF_ALGORITHM, kdf_params=None):
+    """Crée une rotation : nouvelle clé de coffre, enveloppée par une KEK (nouveau sel, KDF donnée)
+
+    Retourne (rotation, nouvelle KEK, nouvelle clé de coffre). Rien n'est modifié dans les entrées tant
+    que run_rotation n'a pas traité de lot.
+    """
+    kdf_params = {**vault_crypto.DEFAULT_KDF_PARAMS[kdf_algorithm], **(kdf_params or {})}
+    new_kek, new_salt = vault_crypto.generate_encryption_key(password, None, kdf_algorithm, kdf_params)
+    new_vault_key = vault_crypto.generate_data_key()
+    rotation = {
+        "pending_wrapped_vault_key": vault_crypto.wrap_key(new_kek, new_vault_key),
+        "pending_salt": new_salt,
+        "pending_kdf_algorithm": kdf_algorithm,
+        "pending_kdf_params": vault_crypto.dump_kdf_params(kdf_params),
+        "last_password_id": 0,
+        "processed": 0,
+        "failed": 0,
+    }
+    with db.transaction() as connection:
+        rotation["total"] = connection.execute(f"SELECT COUNT(*) {ROTATION_SCOPE}", (username, user_id)).fetchone()[0]
+        rotation["id"] = connection.execute("""
+            INSERT INTO key_rotations (user_id, pending_wrapped_vault_key, pending_salt,
+                                       pending_kdf_algorithm, pending_kdf_params, total)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (user_id, rotation["pending_wrapped_vault_key"], new_salt, kdf_algorithm,
+              rotation["pending_kdf_params"], rotation["total"])).lastrowid
+    return rotation, new_kek, new_vault_key
+
+
+def _entry_key(row, old_vault_key, new_vault_key):
+    """Clé actuelle d'une entrée : enveloppée par l'ancienne ou la nouvelle clé de coffre,
+    ou None pour une entrée chiffrée directement par l'ancienne KEK"""
+    wrapped_entry_key = row[3]
+    if wrapped_entry_key is None:
+        return None
+    for vault_key in (new_vault_key, old_vault_key):
+        try:
+            return vault_crypto.unwrap_key(vault_key, wrapped_entry_key)
+        except InvalidToken:
+            pass
+    raise InvalidToken
+
+
+def rotate_batch(connection, username, user_id, after_id, batch_size, old_vault_key, new_vault_key, legacy_key):
+    """Rechiffre un lot d'entrées ; retourne (dernier id traité, traitées, en échec)
+
+    Les entrées de l'utilisateur reçoivent une nouvelle clé d'entrée, enveloppée par la
+    nouvelle clé de coffre et rescellée pour chaque destinataire d'un partage. Pour une
+    entrée d'un autre utilisateur, seule la clé enveloppée par notre coffre est
+    ré-enveloppée (le créateur garde sa copie scellée). Doit être appelé dans une transaction.
+    """
+    rows = connection.execute(f"""
+        SELECT p.id, p.created_by, p.password_encrypted, p.wrapped_entry_key
+        {ROTATION_SCOPE} AND p.id > ?
+        ORDER BY p.id
+        LIMIT ?
+    """, (username, user_id, after_id, batch_size)).fetchall()
+    if not rows:
+        return None, 0, 0
+
+    owned_ids = [row[0] for row in rows if row[1] == username]
+    recipients = {}
+    if owned_ids:
+        for permission_id, password_id, public_key in connection.execute(f"""
+            SELECT ap.id, ap.password_id, u.public_key
+            FROM access_permissions ap
+            JOIN users u ON u.id = ap.user_id
+            WHERE ap.password_id IN ({", ".join("?" for _ in owned_ids)}) AND u.public_key IS NOT NULL
+        """, owned_ids):
+            recipients.setdefault(password_id, []).append((permission_id, public_key))
+
+    entry_updates, seal_updates = [], []
+    failed = 0
+    for row in rows:
+        password_id, created_by, encrypted_password = row[0], row[1], row[2]
+        if created_by != username:
+            # Entrée partagée avec nous : en général sa clé est dans le coffre du créateur
+            try:
+                entry_key = _entry_key(row, old_vault_key, new_vault_key)
+            except InvalidToken:
+                entry_key = None
+            if entry_key is not None:
+                entry_updates.append((encrypted_password, vault_crypto.wrap_key(new_vault_key, entry_key), password_id))
+            continue
+
+        try:
+            entry_key = _entry_key(row, old_vault_key, new_vault_key)
+        except InvalidToken:
+            # Clé enveloppée par un autre coffre : entrée laissée telle quelle (voir unrotated_entries)
+            failed += 1
+            continue
+        try:
+            if entry_key is None:
+                secret = vault_crypto.decrypt_secret(legacy_key, encrypted_password)
+            else:
+                secret = vault_crypto.decrypt_secret(entry_key, encrypted_password)
+        except Exception:
+            # Secret illisible : sa clé est tout de même ré-enveloppée, l'ancienne clé de coffre disparaît
+            failed += 1
+            if entry_key is not None:
+                entry_updates.append((encrypted_password, vault_crypto.wrap_key(new_vault_key, entry_key), password_id))
+            continue
+        entry_key = vault_crypto.generate_data_key()
+        encrypted_password = vault_crypto.encrypt_secret(entry_key, secret)
+        for permission_id, public_key in recipients.get(password_id, []):
+            seal_updates.append((vault_crypto.seal_key(public_key, entry_key), permission_id))
+        entry_updates.append((encrypted_password, vault_crypto.wrap_key(new_vault_key, entry_key), password_id))
+
+    connection.executemany(
+        "UPDATE passwords SET password_encrypted = ?, wrapped_entry_key = ? WHERE id = ?", entry_updates
+    )
+    connection.executemany("UPDATE access_permissions SET sealed_entry_key = ? WHERE id = ?", seal_updates)
+    return rows[-1][0], len(rows), failed
+
+
+def run_rotation(db, rotation, username, user_id, old_vault_key, new_vault_key, legacy_key,
+                 batch_size=ROTATION_BATCH_SIZE, progress=None, should_stop=None):
+    """Rechiffre les entrées par lots à partir du point de reprise de la rotation.
+
+    Chaque lot et l'avancement sont validés dans la même transaction : après un arrêt ou
+    un crash, la rotation reprend au lot suivant. legacy_key est l'ancienne KEK (entrées
+    antérieures au chiffrement par enveloppe). progress(traitées, total) est appelé après
+    chaque lot ; should_stop() permet d'interrompre proprement entre deux lots.
+    Retourne True si toutes les entrées ont été traitées.
+    """
+    while not (should_stop and should_stop()):
+        with db.transaction() as connection:
+            last_id, processed, failed = rotate_batch(
+                connection, username, user_id, rotation["last_password_id"], batch_size,
+                old_vault_key, new_vault_key, legacy_key
+            )
+            if last_id is None:
+                return True
+            rotation["last_password_id"] = last_id
+            rotation["processed"] += processed
+            rotation["failed"] += failed
+            # Des entrées peuvent être ajoutées pendant la rotation
+            rotation["total"] = max(rotation["total"], rotation["processed"])
+            connection.execute("""
+                UPDATE key_rotations
+                SET last_password_id = ?, processed = ?, failed = ?, total = ?, updated_at = ?
+                WHERE id = ?
+            """, (last_id, rotation["processed"], rotation["failed"], rotation["total"], datetime.now(), rotation["id"]))
+        if progress:
+            progress(rotation["processed"], rotation["total"])
+    return False
+
+
+def unrotated_entries(db, username, new_vault_key):
+    """(id, titre) des entrées de l'utilisateur que la nouvelle clé de coffre ne permet pas de lire
+
+    Entrées dont la clé est enveloppée par un autre coffre, ou anciennes entrées restées
+    chiffrées par l'ancienne KEK : à signaler avant complete_rotation, qui abandonne les anciennes clés.
+    """
+    with db.reader() as connection:
+        rows = connection.execute(
+            "SELECT id, title, wrapped_entry_key FROM passwords WHERE created_by = ? ORDER BY id", (username,)
+        ).fetchall()
+    unrotated = []
+    for password_id, title, wrapped_entry_key in rows:
+        try:
+            if wrapped_entry_key is None:
+                raise InvalidToken
+            vault_crypto.unwrap_key(new_vault_key, wrapped_entry_key)
+        except InvalidToken:
+            unrotated.append((password_id, title))
+    return unrotated
+
+
+def complete_rotation(db, rotation, user_id, private_key, new_vault_key):
+    """Termine une rotation : la nouvelle clé de coffre et la nouvelle KEK deviennent actives"""
+    with db.transaction() as connection:
+        connection.execute("""
+            UPDATE users
+            SET wrapped_vault_key = ?, encryption_salt = ?, kdf_algorithm = ?, kdf_params = ?, wrapped_private_key = ?
+            WHERE id = ?
+        """, (rotation["pending_wrapped_vault_key"], rotation["pending_salt"], rotation["pending_kdf_algorithm"],
+              rotation["pending_kdf_params"], vault_crypto.wrap_key(new_vault_key, private_key), user_id))
+        connection.execute(
+            "UPDATE key_rotations SET status = 'done', completed_at = ? WHERE id = ?",
+            (datetime.now(), rotation["id"])
+        )
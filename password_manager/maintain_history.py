@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Maintenance de l'historique en ligne de commande (sans interface graphique)
+
+Archive les lignes d'historique qui dépassent la politique de rétention dans la base
+d'archive compressée, puis compacte la base (VACUUM incrémental) et met à jour les
+statistiques de l'optimiseur (ANALYZE). Peut tourner pendant que l'application est
+ouverte : chaque lot est une courte transaction.
+"""
+
+import argparse
+import os
+import sys
+
+from database import ConnectionManager, create_schema
+import history_retention
+
+
+def parse_limit(value):
+    """Limite de rétention : entier positif, ou « aucune » pour ne pas limiter"""
+    if value.lower() in ("aucune", "none", ""):
+        return None
+    if not value.isdigit() or int(value) < 1:
+        raise argparse.ArgumentTypeError("entier positif attendu")
+    return int(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rétention et maintenance de l'historique")
+    parser.add_argument("--db", default="password_manager.db", help="Base de données (défaut: password_manager.db)")
+    parser.add_argument("--max-age-days", type=parse_limit, default=argparse.SUPPRESS,
+                        help="Âge maximal de l'historique (défaut: politique enregistrée, « aucune » : illimité)")
+    parser.add_argument("--max-rows", type=parse_limit, default=argparse.SUPPRESS,
+                        help="Lignes maximales par entrée (défaut: politique enregistrée, « aucune » : illimité)")
+    parser.add_argument("--save-policy", action="store_true", help="Enregistre les limites données comme nouvelle politique")
+    parser.add_argument("--full-vacuum", action="store_true",
+                        help="Convertit une ancienne base au VACUUM incrémental (VACUUM complet, bloque les écritures)")
+    parser.add_argument("--batch-size", type=int, default=history_retention.ARCHIVE_BATCH_SIZE)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"❌ Base de données introuvable : {args.db}")
+        return 1
+
+    db = ConnectionManager(args.db, reader_count=1)
+    try:
+        create_schema(db.writer)
+        with db.reader() as connection:
+            max_age_days, max_rows = history_retention.load_policy(connection)
+        # Limites données sur la ligne de commande (« aucune » : pas de limite)
+        max_age_days = getattr(args, "max_age_days", max_age_days)
+        max_rows = getattr(args, "max_rows", max_rows)
+        policy = (max_age_days, max_rows)
+        if args.save_policy:
+            history_retention.save_policy(db, *policy)
+            print("💾 Politique de rétention enregistrée")
+
+        print(f"📜 Rétention : {max_age_days or '∞'} jours, {max_rows or '∞'} lignes par entrée")
+        archive_path = history_retention.archive_path_for(args.db)
+
+        def progress(done, total):
+            print(f"\r   {done} lignes archivées", end="", flush=True)
+
+        try:
+            archived = history_retention.apply_retention(
+                db, archive_path, policy, batch_size=args.batch_size, progress=progress
+            )
+        except KeyboardInterrupt:
+            print("\n⏸️  Archivage interrompu : les lots terminés sont archivés, relancez la commande pour continuer")
+            return 130
+        print(f"\n✅ {archived} ligne(s) archivée(s) dans {archive_path}")
+
+        print("🧹 Compactage et analyse de la base...")
+        result = history_retention.run_maintenance(db, full_vacuum=args.full_vacuum)
+        if result["converted"]:
+            print("✅ Base convertie au VACUUM incrémental")
+        elif not result["incremental"]:
+            print("⚠️  VACUUM incrémental indisponible : relancez avec --full-vacuum (bloque les écritures le temps du VACUUM)")
+        print(f"✅ {result['freed_pages']} page(s) libérée(s), statistiques mises à jour")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Rotation des clés d'un utilisateur en ligne de commande (sans interface graphique)
+
+Rechiffre toutes les entrées de l'utilisateur avec de nouvelles clés et peut changer
+la fonction de dérivation de sa clé (paramètres calibrés pour un temps cible). Le mot
+de passe de l'utilisateur est nécessaire pour déballer ses clés. Une rotation
+interrompue (Ctrl+C, crash) reprend à son dernier lot.
+"""
+
+import argparse
+import getpass
+import os
+import sys
+import time
+
+import bcrypt
+
+from database import ConnectionManager, create_schema
+import key_rotation
+import vault_crypto
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rotation des clés de chiffrement d'un utilisateur")
+    parser.add_argument("user", help="Nom de l'utilisateur")
+    parser.add_argument("--db", default="password_manager.db", help="Base de données (défaut: password_manager.db)")
+    parser.add_argument("--kdf", choices=vault_crypto.available_kdf_algorithms(), help="Fonction de dérivation (défaut: inchangée)")
+    parser.add_argument("--target-ms", type=int, help="Calibre la KDF pour ce temps de déverrouillage (défaut: paramètres actuels)")
+    parser.add_argument("--batch-size", type=int, default=key_rotation.ROTATION_BATCH_SIZE)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"❌ Base de données introuvable : {args.db}")
+        return 1
+
+    db = ConnectionManager(args.db, reader_count=1)
+    try:
+        create_schema(db.writer)
+        with db.reader() as connection:
+            user = connection.execute("""
+                SELECT id, password_hash, encryption_salt, wrapped_vault_key, wrapped_private_key, kdf_algorithm, kdf_params
+                FROM users WHERE username = ?
+            """, (args.user,)).fetchone()
+        if user is None:
+            print(f"❌ Utilisateur inconnu : {args.user}")
+            return 1
+        if user[3] is None:
+            print("❌ Ce compte n'a pas encore de clé de coffre : connectez-vous une fois à l'application")
+            return 1
+
+        password = getpass.getpass(f"Mot de passe de {args.user} : ")
+        if not bcrypt.checkpw(password.encode("utf-8"), user[1]):
+            print("❌ Mot de passe incorrect")
+            return 1
+
+        user_id = user[0]
+        kdf_algorithm, kdf_params = vault_crypto.load_kdf(user[5], user[6])
+        kek, _ = vault_crypto.generate_encryption_key(password, user[2], kdf_algorithm, kdf_params)
+        vault_key = vault_crypto.unwrap_key(kek, user[3])
+        private_key = vault_crypto.unwrap_key(vault_key, user[4])
+
+        rotation = key_rotation.find_pending_rotation(db, user_id)
+        if rotation:
+            print(f"🔄 Reprise de la rotation ({rotation['processed']}/{rotation['total']} entrées déjà traitées)")
+            _, new_vault_key = key_rotation.unwrap_pending_key(rotation, password)
+        else:
+            if args.kdf and args.kdf != kdf_algorithm:
+                kdf_algorithm, kdf_params = args.kdf, None
+            if args.target_ms:
+                print(f"⏱️  Calibration de {kdf_algorithm} pour {args.target_ms} ms...")
+                kdf_params = vault_crypto.calibrate_kdf(kdf_algorithm, args.target_ms / 1000)
+            rotation, _, new_vault_key = key_rotation.start_rotation(
+                db, user_id, args.user, password, kdf_algorithm, kdf_params
+            )
+            print(f"🔐 Nouvelle rotation : {rotation['total']} entrées, {kdf_algorithm} {rotation['pending_kdf_params']}")
+
+        start_time = time.perf_counter()
+        initial = rotation["processed"]
+
+        def progress(done, total):
+            rate = (done - initial) / max(time.perf_counter() - start_time, 1e-6)
+            print(f"\r   {done}/{total} entrées ({rate:.0f}/s)", end="", flush=True)
+
+        try:
+            key_rotation.run_rotation(
+                db, rotation, args.user, user_id, vault_key, new_vault_key, kek,
+                batch_size=args.batch_size, progress=progress
+            )
+        except KeyboardInterrupt:
+            print(f"\n⏸️  Rotation interrompue après {rotation['processed']} entrées : relancez la commande pour la reprendre")
+            return 130
+        print()
+
+        unrotated = key_rotation.unrotated_entries(db, args.user, new_vault_key)
+        key_rotation.complete_rotation(db, rotation, user_id, private_key, new_vault_key)
+        print(f"✅ Rotation terminée : {rotation['processed']} entrées traitées")
+        if rotation["failed"]:
+            print(f"⚠️  {rotation['failed']} entrée(s) impossible(s) à déchiffrer, laissée(s) inchangée(s)")
+        for password_id, title in unrotated:
+            print(f"   ⚠️  non rechiffrée, illisible avec la nouvelle clé : #{password_id} {title}")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+import queue
+import sqlite3
+import threading
+
+
+class SearchPipeline:
+    """Exécute les recherches sur une connexion dédiée et annule les requêtes obsolètes.
+
+    Seule la dernière requête soumise est exécutée : une nouvelle soumission remplace
+    la requête en attente et interrompt (sqlite3.Connection.interrupt) celle en cours.
+    """
+
+    def __init__(self, connect):
+        self.connect = connect
+        self.connection = None
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.results = queue.Queue()
+
+        self.generation = 0
+        self.pending = None
+        self.running_generation = None
+        self.closed = False
+
+        self.worker = threading.Thread(target=self._run, name="vault-search", daemon=True)
+        self.worker.start()
+
+    def submit(self, query, params, context=None):
+        """Soumet une requête et retourne son numéro de génération"""
+        with self.lock:
+            self.generation += 1
+            self.pending = (self.generation, query, params, context)
+            self._interrupt_running()
+        self.wakeup.set()
+        return self.generation
+
+    def cancel(self):
+        """Rend obsolètes la requête en attente et celle en cours"""
+        with self.lock:
+            self.generation += 1
+            self.pending = None
+            self._interrupt_running()
+
+    def poll(self):
+        """Retourne le dernier résultat à jour (generation, rows, context, error) ou None"""
+        latest = None
+        while True:
+            try:
+                result = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if result[0] == self.generation:
+                latest = result
+        return latest
+
+    def is_busy(self):
+        """Indique si une requête est en attente, en cours ou non encore lue"""
+        with self.lock:
+            return self.pending is not None or self.running_generation is not None or not self.results.empty()
+
+    def close(self):
+        """Arrête le worker et ferme sa connexion"""
+        with self.lock:
+            self.closed = True
+            self.pending = None
+            self._interrupt_running()
+        self.wakeup.set()
+        self.worker.join(timeout=2)
+
+    def _interrupt_running(self):
+        # Appelé avec self.lock acquis
+        if self.running_generation is not None and self.connection is not None:
+            self.connection.interrupt()
+
+    def _run(self):
+        self.connection = self.connect()
+        try:
+            while True:
+                self.wakeup.wait()
+                with self.lock:
+                    self.wakeup.clear()
+                    if self.closed:
+                        break
+                    job = self.pending
+                    self.pending = None
+                    if job is None:
+                        continue
+                    self.running_generation = job[0]
+
+                generation, query, params, context = job
+                rows, error = None, None
+                try:
+                    rows = self.connection.execute(query, params).fetchall()
+                except sqlite3.OperationalError as e:
+                    # Une requête interrompue est simplement abandonnée
+                    if "interrupted" not in str(e):
+                        error = str(e)
+
+                with self.lock:
+                    self.running_generation = None
+                    is_current = (generation == self.generation)
+
+                if is_current and (rows is not None or error is not None):
+                    self.results.put((generation, rows, context, error))
+        finally:
+            self.connection.close()
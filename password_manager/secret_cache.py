@@ -0,0 +1,68 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Durée de vie d'un secret déchiffré (secondes) et nombre maximal de secrets conservés
+DEFAULT_TTL = 60
+DEFAULT_MAX_SIZE = 256
+
+
+class SecretCache:
+    """Cache mémoire des secrets déchiffrés, pour éviter de repayer Fernet à chaque accès.
+
+    Les secrets sont indexés par (id de l'entrée, updated_at) : une entrée modifiée n'est
+    jamais servie depuis le cache. Ils expirent après ttl secondes et les moins récemment
+    utilisés sont évincés au-delà de max_size. Un secret évincé est effacé : il est
+    stocké dans un bytearray remis à zéro (les chaînes déjà remises à l'interface ne
+    peuvent pas l'être).
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, max_size=DEFAULT_MAX_SIZE, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.clock = clock
+        self.lock = threading.Lock()
+        # id -> (updated_at, expiration, secret en bytearray), du moins au plus récemment utilisé
+        self.entries = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, password_id, updated_at):
+        """Retourne le secret en cache, ou None s'il est absent, expiré ou obsolète"""
+        with self.lock:
+            cached = self.entries.get(password_id)
+            if cached is None:
+                return None
+            cached_updated_at, expires_at, secret = cached
+            if cached_updated_at != updated_at or expires_at <= self.clock():
+                self._evict(password_id)
+                return None
+            self.entries.move_to_end(password_id)
+            return secret.decode()
+
+    def put(self, password_id, updated_at, secret):
+        """Met un secret déchiffré en cache"""
+        with self.lock:
+            if password_id in self.entries:
+                self._evict(password_id)
+            self.entries[password_id] = (updated_at, self.clock() + self.ttl, bytearray(secret.encode()))
+            while len(self.entries) > self.max_size:
+                self._evict(next(iter(self.entries)))
+
+    def invalidate(self, password_ids):
+        """Efface les secrets d'entrées modifiées ou supprimées"""
+        with self.lock:
+            for password_id in password_ids:
+                if password_id in self.entries:
+                    self._evict(password_id)
+
+    def clear(self):
+        """Efface tous les secrets (déconnexion, fermeture)"""
+        with self.lock:
+            while self.entries:
+                self._evict(next(iter(self.entries)))
+
+    def _evict(self, password_id):
+        secret = self.entries.pop(password_id)[2]
+        secret[:] = bytes(len(secret))
@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+
+import access_control
+from access_control import AccessControl, DELETE, EDIT, VIEW
+from database import ConnectionManager, create_schema
+from unit_of_work import UnitOfWork
+
+
+def test_rights_and_cache_invalidation():
+    """Test la résolution des entrées visibles (dont les partages) et l'invalidation du cache"""
+    directory = tempfile.mkdtemp()
+    db = ConnectionManager(os.path.join(directory, "test.db"), reader_count=2)
+    try:
+        create_schema(db.writer)
+        with db.transaction() as connection:
+            connection.executemany(
+                "INSERT INTO users (id, username, password_hash, role) VALUES (?, ?, '', ?)",
+                [(1, "alice", "user"), (2, "bob", "user"), (3, "carol", "manager")]
+            )
+        with UnitOfWork(db, "alice") as uow:
+            own, shared, private = uow.bulk_insert([{"title": title, "password_encrypted": "x"} for title in "abc"])
+
+        bob = AccessControl(db, 2, "bob", "user")
+        assert bob.load_rights() == {}
+        assert not bob.can(VIEW, own)
+
+        # Partage en lecture puis en écriture : le cache de session est invalidé par la version
+        version = bob.version
+        with UnitOfWork(db, "alice") as uow:
+            uow.bulk_share([own], 2, "bob")
+            uow.bulk_share([shared], 2, "bob", permission_level=access_control.WRITE)
+        assert bob.can(VIEW, own) and not bob.can(EDIT, own) and not bob.can(DELETE, own)
+        assert bob.can(EDIT, str(shared)) and not bob.can(VIEW, private)
+        assert bob.version != version
+
+        # La condition de visibilité de la liste utilise les mêmes règles
+        condition, params = bob.visibility_condition()
+        with db.reader() as connection:
+            visible = [row[0] for row in connection.execute(f"SELECT id FROM passwords WHERE {condition} ORDER BY id", params)]
+        assert visible == [own, shared]
+
+        alice = AccessControl(db, 1, "alice", "user")
+        carol = AccessControl(db, 3, "carol", "manager")
+        assert alice.allowed(DELETE, [own, shared, private]) == [own, shared, private]
+        assert carol.allowed(DELETE, [own, private]) == [own, private]
+        assert carol.allowed(EDIT, [own, private]) == [] and carol.visibility_condition() == ("", [])
+
+        with UnitOfWork(db, "alice") as uow:
+            uow.bulk_delete([(own, "a")])
+        assert not bob.can(VIEW, own)
+    finally:
+        db.close()
+        shutil.rmtree(directory)
@@ -0,0 +1,96 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from database import ConnectionManager
+
+
+def create_manager(reader_count=2):
+    directory = tempfile.mkdtemp()
+    manager = ConnectionManager(os.path.join(directory, "test.db"), reader_count=reader_count)
+    with manager.transaction() as connection:
+        connection.execute("CREATE TABLE passwords (id INTEGER PRIMARY KEY, title TEXT)")
+    return manager, directory
+
+
+def test_wal_mode_and_pragmas():
+    """Test la configuration des connexions (WAL, synchronous, lecteurs en lecture seule)"""
+    manager, directory = create_manager()
+    try:
+        assert manager.writer.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        # 1 = NORMAL
+        assert manager.writer.execute("PRAGMA synchronous").fetchone()[0] == 1
+        with manager.reader() as connection:
+            assert connection.execute("PRAGMA query_only").fetchone()[0] == 1
+    finally:
+        manager.close()
+        shutil.rmtree(directory)
+
+
+def test_read_during_write_transaction():
+    """Test qu'un lecteur n'est pas bloqué par une transaction d'écriture en cours"""
+    manager, directory = create_manager()
+    try:
+        with manager.transaction() as connection:
+            connection.execute("INSERT INTO passwords (title) VALUES ('committed')")
+
+        with manager.transaction() as connection:
+            connection.execute("INSERT INTO passwords (title) VALUES ('pending')")
+            with manager.reader() as reader:
+                # Le lecteur voit le dernier état validé, sans attendre le verrou d'écriture
+                titles = [row[0] for row in reader.execute("SELECT title FROM passwords")]
+                assert titles == ["committed"]
+
+        with manager.reader() as reader:
+            assert reader.execute("SELECT COUNT(*) FROM passwords").fetchone()[0] == 2
+    finally:
+        manager.close()
+        shutil.rmtree(directory)
+
+
+def test_transaction_rollback_on_error():
+    """Test que la transaction est annulée en cas d'erreur"""
+    manager, directory = create_manager()
+    try:
+        try:
+            with manager.transaction() as connection:
+                connection.execute("INSERT INTO passwords (title) VALUES ('lost')")
+                raise RuntimeError("échec")
+        except RuntimeError:
+            pass
+
+        with manager.reader() as reader:
+            assert reader.execute("SELECT COUNT(*) FROM passwords").fetchone()[0] == 0
+    finally:
+        manager.close()
+        shutil.rmtree(directory)
+
+
+def test_nested_transactions_and_implicit_transaction():
+    """Test qu'un bloc imbriqué est validé par le bloc externe et qu'une transaction implicite est refusée"""
+    manager, directory = create_manager()
+    try:
+        with manager.transaction() as connection:
+            with manager.transaction() as nested:
+                nested.execute("INSERT INTO passwords (title) VALUES ('nested')")
+            assert connection.in_transaction
+            with manager.reader() as reader:
+                assert reader.execute("SELECT COUNT(*) FROM passwords").fetchone()[0] == 0
+        with manager.reader() as reader:
+            assert reader.execute("SELECT COUNT(*) FROM passwords").fetchone()[0] == 1
+
+        # Écriture directe sur la connexion d'écriture, jamais validée
+        manager.writer.execute("INSERT INTO passwords (title) VALUES ('implicit')")
+        with pytest.raises(RuntimeError):
+            with manager.transaction():
+                pass
+        manager.writer.rollback()
+        with manager.transaction() as connection:
+            connection.execute("INSERT INTO passwords (title) VALUES ('ok')")
+        with manager.reader() as reader:
+            assert reader.execute("SELECT COUNT(*) FROM passwords").fetchone()[0] == 2
+    finally:
+        manager.close()
+        shutil.rmtree(directory)
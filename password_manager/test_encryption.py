@@ -3,8 +3,6 @@ import bcrypt
 import os
 from datetime import datetime
 from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import base64
 
 def test_encryption_decryption():
@@ -18,18 +16,8 @@ def test_encryption_decryption():
     password = "test_password"
     salt = os.urandom(16)
     
-    def generate_encryption_key(password: str, salt: bytes = None) -> tuple:
-        if salt is None:
-            salt = os.urandom(16)
-        
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
-        return key, salt
+    # Même dérivation que l'application (paramètres par défaut de vault_crypto)
+    from vault_crypto import generate_encryption_key
     
     key1, salt1 = generate_encryption_key(password)
     key2, salt2 = generate_encryption_key(password, salt1)  # Même salt
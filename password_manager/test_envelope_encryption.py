@@ -0,0 +1,48 @@
+import vault_crypto
+
+
+def test_entry_key_round_trip():
+    """Test le chiffrement d'une entrée avec une clé d'entrée enveloppée par la clé de coffre"""
+    kek, _ = vault_crypto.generate_encryption_key("user123")
+    keys = vault_crypto.create_user_keys(kek)
+
+    encrypted, wrapped_entry_key = vault_crypto.encrypt_entry(keys['vault_key'], "secret")
+    assert vault_crypto.decrypt_entry(keys['vault_key'], encrypted, wrapped_entry_key) == "secret"
+
+    # Chaque entrée a sa propre clé
+    _, other_wrapped_key = vault_crypto.encrypt_entry(keys['vault_key'], "secret")
+    assert vault_crypto.unwrap_key(keys['vault_key'], wrapped_entry_key) != vault_crypto.unwrap_key(keys['vault_key'], other_wrapped_key)
+
+
+def test_password_change_only_rewraps_vault_key():
+    """Test qu'un changement de mot de passe laisse les entrées lisibles sans les rechiffrer"""
+    old_kek, _ = vault_crypto.generate_encryption_key("old password")
+    keys = vault_crypto.create_user_keys(old_kek)
+    encrypted, wrapped_entry_key = vault_crypto.encrypt_entry(keys['vault_key'], "secret")
+
+    new_kek, _ = vault_crypto.generate_encryption_key("new password")
+    rewrapped_vault_key = vault_crypto.wrap_key(new_kek, vault_crypto.unwrap_key(old_kek, keys['wrapped_vault_key']))
+
+    vault_key = vault_crypto.unwrap_key(new_kek, rewrapped_vault_key)
+    assert vault_crypto.decrypt_entry(vault_key, encrypted, wrapped_entry_key) == "secret"
+    assert vault_crypto.unwrap_key(vault_key, keys['wrapped_private_key']) == keys['private_key']
+
+
+def test_sealed_key_sharing():
+    """Test le partage d'une clé d'entrée avec la clé publique d'un autre utilisateur"""
+    owner = vault_crypto.create_user_keys(vault_crypto.generate_data_key())
+    recipient = vault_crypto.create_user_keys(vault_crypto.generate_data_key())
+    outsider = vault_crypto.create_user_keys(vault_crypto.generate_data_key())
+
+    encrypted, wrapped_entry_key = vault_crypto.encrypt_entry(owner['vault_key'], "shared secret")
+    entry_key = vault_crypto.unwrap_key(owner['vault_key'], wrapped_entry_key)
+    sealed = vault_crypto.seal_key(recipient['public_key'], entry_key)
+
+    opened = vault_crypto.open_sealed_key(recipient['private_key'], sealed)
+    assert vault_crypto.decrypt_secret(opened, encrypted) == "shared secret"
+
+    try:
+        vault_crypto.open_sealed_key(outsider['private_key'], sealed)
+        assert False, "Un autre utilisateur ne doit pas pouvoir ouvrir la clé"
+    except Exception:
+        pass
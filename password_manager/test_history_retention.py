@@ -0,0 +1,61 @@
+import os
+import shutil
+import tempfile
+
+from database import ConnectionManager, create_schema
+import history_retention
+from unit_of_work import changed_fields
+
+
+def test_retention_archives_by_age_and_count():
+    """Test l'archivage des lignes trop anciennes ou en excès, et leur relecture depuis l'archive"""
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "test.db")
+    db = ConnectionManager(path, reader_count=1)
+    try:
+        create_schema(db.writer)
+        with db.transaction() as connection:
+            # Entrée 1 : 10 lignes récentes ; entrée 2 : 3 lignes dont 2 vieilles de deux ans
+            connection.executemany("""
+                INSERT INTO password_history (password_id, action, new_value, changed_by, changed_at)
+                VALUES (?, 'DETAILS_UPDATED', ?, 'alice', datetime('now', ?))
+            """, [(1, f"v{i}", f"-{10 - i} minutes") for i in range(10)]
+                + [(2, "old", "-730 days"), (2, "older", "-731 days"), (2, "new", "-1 days")])
+
+        history_retention.save_policy(db, 365, 4)
+        with db.reader() as connection:
+            assert history_retention.load_policy(connection) == (365, 4)
+
+        archive_path = history_retention.archive_path_for(path)
+        archived = history_retention.apply_retention(db, archive_path, batch_size=3)
+        assert archived == 8
+
+        with db.reader() as connection:
+            kept = connection.execute(
+                "SELECT password_id, new_value FROM password_history ORDER BY password_id, id"
+            ).fetchall()
+        assert kept == [(1, "v6"), (1, "v7"), (1, "v8"), (1, "v9"), (2, "new")]
+
+        assert [row[4] for row in history_retention.load_archived_history(archive_path, 1)] == [f"v{i}" for i in range(5, -1, -1)]
+        assert [row[4] for row in history_retention.load_archived_history(archive_path, 2)] == ["old", "older"]
+        archive = history_retention.open_archive(archive_path)
+        try:
+            chunks = archive.execute("SELECT first_changed_at, last_changed_at FROM archived_history").fetchall()
+        finally:
+            archive.close()
+        assert all(first <= last for first, last in chunks)
+
+        # Politique respectée : rien de plus à archiver, puis compactage de la base
+        assert history_retention.apply_retention(db, archive_path) == 0
+        result = history_retention.run_maintenance(db)
+        assert result["incremental"] and result["analyzed"]
+    finally:
+        db.close()
+        shutil.rmtree(directory)
+
+
+def test_unchanged_fields_are_skipped():
+    """Test qu'une sauvegarde sans modification ne produit aucune écriture"""
+    current = {"title": "Mail", "username": None, "notes": "", "visibility_level": 1}
+    assert changed_fields(current, {"title": "Mail", "username": "", "notes": "", "visibility_level": 1}) == {}
+    assert changed_fields(current, {"title": "Mail pro", "username": "", "notes": "x"}) == {"title": "Mail pro", "notes": "x"}
@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+import vault_crypto
+
+
+@pytest.mark.parametrize("algorithm", vault_crypto.available_kdf_algorithms())
+def test_derive_key_per_algorithm(algorithm):
+    """Test que chaque KDF dérive une clé Fernet stable pour un même sel et des paramètres donnés"""
+    params = {
+        "pbkdf2": {"iterations": 1000},
+        "scrypt": {"n": 2 ** 10},
+        "argon2id": {"iterations": 1, "memory_cost": 1024, "lanes": 1},
+    }[algorithm]
+    salt = os.urandom(16)
+
+    key, _ = vault_crypto.generate_encryption_key("password", salt, algorithm, params)
+    assert vault_crypto.generate_encryption_key("password", salt, algorithm, params)[0] == key
+    assert vault_crypto.generate_encryption_key("other", salt, algorithm, params)[0] != key
+    assert vault_crypto.decrypt_secret(key, vault_crypto.encrypt_secret(key, "secret")) == "secret"
+
+
+def test_stored_kdf_parameters():
+    """Test la lecture des paramètres stockés (colonnes NULL : PBKDF2 par défaut)"""
+    assert vault_crypto.load_kdf(None, None) == ("pbkdf2", {"iterations": vault_crypto.PBKDF2_ITERATIONS})
+
+    stored = vault_crypto.dump_kdf_params({"n": 2 ** 16})
+    assert vault_crypto.load_kdf("scrypt", stored) == ("scrypt", {"n": 2 ** 16, "r": 8, "p": 1})
+
+    with pytest.raises(ValueError):
+        vault_crypto.derive_key("password", os.urandom(16), "md5")
+
+
+def test_calibration_never_weakens_defaults():
+    """Test qu'un temps cible très court ne descend pas sous les paramètres par défaut"""
+    assert vault_crypto.calibrate_kdf("pbkdf2", 0.001)["iterations"] == vault_crypto.PBKDF2_ITERATIONS
+    assert vault_crypto.calibrate_kdf("scrypt", 0.001) == vault_crypto.DEFAULT_KDF_PARAMS["scrypt"]
+
+
+def test_calibration_on_a_slow_machine(monkeypatch):
+    """Test qu'une dérivation lente ne fait pas descendre la calibration sous les défauts"""
+    monkeypatch.setattr(vault_crypto, "measure_kdf", lambda algorithm, params, rounds=1: 1.0)
+    for algorithm in ("pbkdf2", "scrypt", "argon2id"):
+        assert vault_crypto.calibrate_kdf(algorithm, 0.5) == vault_crypto.DEFAULT_KDF_PARAMS[algorithm]
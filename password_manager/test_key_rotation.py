@@ -0,0 +1,140 @@
+import os
+import shutil
+import tempfile
+
+from database import ConnectionManager, create_schema
+from unit_of_work import UnitOfWork
+import key_rotation
+import vault_crypto
+
+KDF_PARAMS = {"iterations": 1000}
+
+
+def create_user(db, username, password):
+    kek, salt = vault_crypto.generate_encryption_key(password, None, "pbkdf2", KDF_PARAMS)
+    keys = vault_crypto.create_user_keys(kek)
+    with db.transaction() as connection:
+        keys['id'] = connection.execute("""
+            INSERT INTO users (username, password_hash, encryption_salt, wrapped_vault_key, public_key, wrapped_private_key,
+                               kdf_algorithm, kdf_params)
+            VALUES (?, '', ?, ?, ?, ?, 'pbkdf2', ?)
+        """, (username, salt, keys['wrapped_vault_key'], keys['public_key'], keys['wrapped_private_key'],
+              vault_crypto.dump_kdf_params(KDF_PARAMS))).lastrowid
+    keys['kek'] = kek
+    return keys
+
+
+def load_vault_key(db, user_id, password):
+    """Déballe la clé de coffre comme à la connexion"""
+    with db.reader() as connection:
+        salt, wrapped_vault_key, kdf_algorithm, kdf_params = connection.execute(
+            "SELECT encryption_salt, wrapped_vault_key, kdf_algorithm, kdf_params FROM users WHERE id = ?", (user_id,)
+        ).fetchone()
+    kek, _ = vault_crypto.generate_encryption_key(password, salt, *vault_crypto.load_kdf(kdf_algorithm, kdf_params))
+    return vault_crypto.unwrap_key(kek, wrapped_vault_key)
+
+
+def test_rotation_resumes_and_keeps_shares():
+    """Test une rotation interrompue puis reprise : entrées, partages et anciennes entrées"""
+    directory = tempfile.mkdtemp()
+    db = ConnectionManager(os.path.join(directory, "test.db"), reader_count=1)
+    try:
+        create_schema(db.writer)
+        alice = create_user(db, "alice", "alice pwd")
+        bob = create_user(db, "bob", "bob pwd")
+
+        encrypted = [vault_crypto.encrypt_entry(alice['vault_key'], f"secret {i}") for i in range(9)]
+        with UnitOfWork(db, "alice") as uow:
+            ids = uow.bulk_insert([
+                {"title": f"Entry {i}", "password_encrypted": secret, "wrapped_entry_key": wrapped}
+                for i, (secret, wrapped) in enumerate(encrypted)
+            ])
+            # Entrée antérieure au chiffrement par enveloppe
+            legacy_id = uow.insert_password({
+                "title": "Legacy", "password_encrypted": vault_crypto.encrypt_secret(alice['kek'], "legacy")
+            })
+            entry_key = vault_crypto.unwrap_key(alice['vault_key'], encrypted[0][1])
+            uow.bulk_share([ids[0]], bob['id'], "bob", {ids[0]: vault_crypto.seal_key(bob['public_key'], entry_key)})
+
+        rotation, _, new_vault_key = key_rotation.start_rotation(
+            db, alice['id'], "alice", "alice pwd", "scrypt", {"n": 2 ** 10}
+        )
+        assert rotation['total'] == 10
+
+        # Arrêt après le premier lot : le point de reprise est enregistré
+        batches = []
+        completed = key_rotation.run_rotation(
+            db, rotation, "alice", alice['id'], alice['vault_key'], new_vault_key, alice['kek'],
+            batch_size=4, progress=lambda done, total: batches.append(done), should_stop=lambda: bool(batches)
+        )
+        assert not completed and batches == [4]
+
+        pending = key_rotation.find_pending_rotation(db, alice['id'])
+        assert (pending['last_password_id'], pending['processed']) == (ids[3], 4)
+        _, resumed_key = key_rotation.unwrap_pending_key(pending, "alice pwd")
+        assert resumed_key == new_vault_key
+
+        assert key_rotation.run_rotation(
+            db, pending, "alice", alice['id'], alice['vault_key'], resumed_key, alice['kek'], batch_size=4
+        )
+        key_rotation.complete_rotation(db, pending, alice['id'], alice['private_key'], resumed_key)
+        assert pending['processed'] == 10 and pending['failed'] == 0
+        assert key_rotation.find_pending_rotation(db, alice['id']) is None
+
+        vault_key = load_vault_key(db, alice['id'], "alice pwd")
+        assert vault_key == new_vault_key
+        with db.reader() as connection:
+            rows = {row[0]: row[1:] for row in connection.execute(
+                "SELECT id, password_encrypted, wrapped_entry_key FROM passwords"
+            )}
+            sealed = connection.execute(
+                "SELECT sealed_entry_key FROM access_permissions WHERE password_id = ?", (ids[0],)
+            ).fetchone()[0]
+            assert connection.execute("SELECT kdf_algorithm FROM users WHERE id = ?", (alice['id'],)).fetchone()[0] == "scrypt"
+
+        for password_id, (encrypted_password, wrapped_entry_key) in rows.items():
+            expected = "legacy" if password_id == legacy_id else f"secret {ids.index(password_id)}"
+            assert vault_crypto.decrypt_entry(vault_key, encrypted_password, wrapped_entry_key) == expected
+
+        # Le partage est rescellé avec la nouvelle clé de l'entrée
+        entry_key = vault_crypto.open_sealed_key(bob['private_key'], sealed)
+        assert vault_crypto.decrypt_secret(entry_key, rows[ids[0]][0]) == "secret 0"
+    finally:
+        db.close()
+        shutil.rmtree(directory)
+
+
+def test_rotation_reports_entries_it_cannot_rotate():
+    """Test les entrées non rechiffrées : clé d'un autre coffre signalée, secret illisible ré-enveloppé"""
+    directory = tempfile.mkdtemp()
+    db = ConnectionManager(os.path.join(directory, "test.db"), reader_count=1)
+    try:
+        create_schema(db.writer)
+        alice = create_user(db, "alice", "alice pwd")
+        bob = create_user(db, "bob", "bob pwd")
+
+        readable = vault_crypto.encrypt_entry(alice['vault_key'], "secret")
+        # Entrée d'alice dont la clé est enveloppée par le coffre de bob
+        foreign = vault_crypto.encrypt_entry(bob['vault_key'], "modifiée par bob")
+        # Secret corrompu, mais clé bien enveloppée par le coffre d'alice
+        entry_key = vault_crypto.generate_data_key()
+        corrupt_wrapped = vault_crypto.wrap_key(alice['vault_key'], entry_key)
+        with UnitOfWork(db, "alice") as uow:
+            ids = uow.bulk_insert([
+                {"title": "Lisible", "password_encrypted": readable[0], "wrapped_entry_key": readable[1]},
+                {"title": "Autre coffre", "password_encrypted": foreign[0], "wrapped_entry_key": foreign[1]},
+                {"title": "Corrompue", "password_encrypted": "illisible", "wrapped_entry_key": corrupt_wrapped},
+            ])
+
+        rotation, _, new_vault_key = key_rotation.start_rotation(db, alice['id'], "alice", "alice pwd", "pbkdf2", KDF_PARAMS)
+        assert key_rotation.run_rotation(db, rotation, "alice", alice['id'], alice['vault_key'], new_vault_key, alice['kek'])
+        assert rotation['failed'] == 2
+        assert key_rotation.unrotated_entries(db, "alice", new_vault_key) == [(ids[1], "Autre coffre")]
+
+        # La clé de l'entrée corrompue ne dépend plus de l'ancienne clé de coffre
+        with db.reader() as connection:
+            wrapped = connection.execute("SELECT wrapped_entry_key FROM passwords WHERE id = ?", (ids[2],)).fetchone()[0]
+        assert vault_crypto.unwrap_key(new_vault_key, wrapped) == entry_key
+    finally:
+        db.close()
+        shutil.rmtree(directory)
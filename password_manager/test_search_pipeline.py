@@ -0,0 +1,76 @@
+import os
+import sqlite3
+import tempfile
+import time
+
+from search_pipeline import SearchPipeline
+
+# Requête volontairement lente pour pouvoir l'interrompre
+SLOW_QUERY = """
+    WITH RECURSIVE counter(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM counter WHERE n < 50000000)
+    SELECT COUNT(*) FROM counter
+"""
+
+
+def wait_for_result(pipeline, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        result = pipeline.poll()
+        if result is not None:
+            return result
+        time.sleep(0.01)
+    return None
+
+
+def create_test_database():
+    fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE passwords (id INTEGER PRIMARY KEY, title TEXT)")
+    conn.executemany("INSERT INTO passwords (title) VALUES (?)", [(f"entry {i}",) for i in range(100)])
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def test_search_returns_latest_result():
+    """Test que seul le résultat de la dernière recherche est retourné"""
+    db_path = create_test_database()
+    pipeline = SearchPipeline(lambda: sqlite3.connect(db_path, check_same_thread=False))
+    try:
+        pipeline.submit(SLOW_QUERY, (), context="slow")
+        time.sleep(0.05)
+        generation = pipeline.submit("SELECT id FROM passwords WHERE title LIKE ?", ("%entry 4%",), context="fast")
+
+        result = wait_for_result(pipeline)
+        assert result is not None
+        assert result[0] == generation
+        assert result[2] == "fast"
+        assert len(result[1]) == 11
+
+        # La requête lente a été interrompue : aucun résultat obsolète ne doit arriver
+        time.sleep(0.1)
+        assert pipeline.poll() is None
+        assert not pipeline.is_busy()
+    finally:
+        pipeline.close()
+        os.remove(db_path)
+
+
+def test_cancel_discards_running_query():
+    """Test que l'annulation abandonne la requête en cours"""
+    db_path = create_test_database()
+    pipeline = SearchPipeline(lambda: sqlite3.connect(db_path, check_same_thread=False))
+    try:
+        pipeline.submit(SLOW_QUERY, ())
+        time.sleep(0.05)
+        pipeline.cancel()
+
+        deadline = time.time() + 5
+        while pipeline.is_busy() and time.time() < deadline:
+            time.sleep(0.01)
+        assert not pipeline.is_busy()
+        assert pipeline.poll() is None
+    finally:
+        pipeline.close()
+        os.remove(db_path)
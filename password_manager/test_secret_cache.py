@@ -0,0 +1,44 @@
+from secret_cache import SecretCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_and_version():
+    """Test qu'un secret expiré ou dont l'entrée a été modifiée n'est pas servi"""
+    clock = FakeClock()
+    cache = SecretCache(ttl=10, max_size=8, clock=clock)
+    cache.put(1, "2024-01-01 10:00", "secret")
+
+    assert cache.get(1, "2024-01-01 10:00") == "secret"
+    assert cache.get(1, "2024-01-02 09:00") is None
+    assert len(cache) == 0
+
+    cache.put(1, "2024-01-01 10:00", "secret")
+    clock.now = 10
+    assert cache.get(1, "2024-01-01 10:00") is None
+
+
+def test_lru_eviction_wipes_secrets():
+    """Test l'éviction du moins récemment utilisé et l'effacement des secrets évincés"""
+    cache = SecretCache(ttl=60, max_size=2)
+    cache.put(1, "v", "one")
+    cache.put(2, "v", "two")
+    cache.get(1, "v")
+    buffer = cache.entries[2][2]
+
+    cache.put(3, "v", "three")
+    assert cache.get(2, "v") is None
+    assert buffer == bytearray(3)
+    assert (cache.get(1, "v"), cache.get(3, "v")) == ("one", "three")
+
+    buffers = [entry[2] for entry in cache.entries.values()]
+    cache.invalidate([1])
+    assert cache.get(1, "v") is None and buffers[0] == bytearray(3)
+    cache.clear()
+    assert len(cache) == 0 and buffers[1] == bytearray(5)
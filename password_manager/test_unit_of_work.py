@@ -0,0 +1,109 @@
+import os
+import shutil
+import tempfile
+
+from database import ConnectionManager, create_schema
+from unit_of_work import UnitOfWork
+
+
+def create_vault(entry_count):
+    directory = tempfile.mkdtemp()
+    manager = ConnectionManager(os.path.join(directory, "test.db"), reader_count=1)
+    create_schema(manager.writer)
+
+    with UnitOfWork(manager, "alice") as uow:
+        for i in range(entry_count):
+            password_id = uow.insert_password({'title': f"Entry {i}", 'password_encrypted': "x"})
+            uow.record(password_id, "CREATED", "", f"Title: Entry {i}")
+    return manager, directory
+
+
+def count_commits(connection, operation):
+    statements = []
+    connection.set_trace_callback(statements.append)
+    try:
+        operation()
+    finally:
+        connection.set_trace_callback(None)
+    return sum(1 for statement in statements if statement.strip().upper() == "COMMIT")
+
+
+def test_bulk_operations_use_one_commit():
+    """Test qu'une opération groupée sur 1000 entrées ne fait qu'un seul commit"""
+    manager, directory = create_vault(1000)
+    try:
+        with manager.reader() as reader:
+            password_ids = [row[0] for row in reader.execute("SELECT id FROM passwords")]
+
+        def recategorize_and_share():
+            with UnitOfWork(manager, "alice") as uow:
+                uow.bulk_recategorize(password_ids, "Work")
+                uow.bulk_share(password_ids, 2, "bob")
+
+        assert count_commits(manager.writer, recategorize_and_share) == 1
+
+        with manager.reader() as reader:
+            assert reader.execute("SELECT COUNT(*) FROM passwords WHERE category = 'Work'").fetchone()[0] == 1000
+            assert reader.execute("SELECT COUNT(*) FROM access_permissions").fetchone()[0] == 1000
+            assert reader.execute("SELECT COUNT(*) FROM password_history").fetchone()[0] == 3000
+
+        def delete_all():
+            with UnitOfWork(manager, "alice") as uow:
+                uow.bulk_delete([(password_id, f"Entry {password_id}") for password_id in password_ids])
+
+        assert count_commits(manager.writer, delete_all) == 1
+
+        with manager.reader() as reader:
+            assert reader.execute("SELECT COUNT(*) FROM passwords").fetchone()[0] == 0
+            assert reader.execute("SELECT COUNT(*) FROM access_permissions").fetchone()[0] == 0
+            # Seule la trace de suppression reste dans l'historique
+            assert reader.execute("SELECT COUNT(*) FROM password_history WHERE action = 'DELETED'").fetchone()[0] == 1000
+            assert reader.execute("SELECT COUNT(*) FROM password_history").fetchone()[0] == 1000
+    finally:
+        manager.close()
+        shutil.rmtree(directory)
+
+
+def test_failed_unit_of_work_writes_nothing():
+    """Test qu'une erreur annule l'entrée et son historique"""
+    manager, directory = create_vault(0)
+    try:
+        try:
+            with UnitOfWork(manager, "alice") as uow:
+                password_id = uow.insert_password({'title': "Entry", 'password_encrypted': "x"})
+                uow.record(password_id, "CREATED")
+                raise RuntimeError("échec")
+        except RuntimeError:
+            pass
+
+        with manager.reader() as reader:
+            assert reader.execute("SELECT COUNT(*) FROM passwords").fetchone()[0] == 0
+            assert reader.execute("SELECT COUNT(*) FROM password_history").fetchone()[0] == 0
+    finally:
+        manager.close()
+        shutil.rmtree(directory)
+
+
+def test_bulk_share_keeps_sealed_keys_and_permission_levels():
+    """Test qu'un nouveau partage ne perd ni la clé scellée ni le droit d'écriture, et refuse les entrées sans clé"""
+    manager, directory = create_vault(3)
+    try:
+        with manager.reader() as reader:
+            first, second, third = [row[0] for row in reader.execute("SELECT id FROM passwords ORDER BY id")]
+
+        with UnitOfWork(manager, "alice") as uow:
+            assert uow.bulk_share([first, second], 2, "bob", {first: b"sealed-1", second: b"sealed-2"},
+                                  permission_level=2) == []
+
+        # Partage repris par un utilisateur qui ne peut sceller que la seconde clé
+        with UnitOfWork(manager, "carol") as uow:
+            assert uow.bulk_share([first, second, third], 2, "bob", {second: b"sealed-2bis"}) == [third]
+
+        with manager.reader() as reader:
+            rows = reader.execute(
+                "SELECT password_id, permission_level, sealed_entry_key FROM access_permissions ORDER BY password_id"
+            ).fetchall()
+        assert rows == [(first, 2, b"sealed-1"), (second, 2, b"sealed-2bis")]
+    finally:
+        manager.close()
+        shutil.rmtree(directory)
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import shutil
+import stat
+import tempfile
+
+import pytest
+
+from database import ConnectionManager, create_schema
+from unit_of_work import UnitOfWork
+import vault_core
+import vault_server
+
+KDF_PARAMS = {"iterations": 1000}
+
+
+def test_core_unlock_and_access():
+    """Test le déverrouillage headless et la lecture des seules entrées visibles"""
+    directory = tempfile.mkdtemp()
+    db = ConnectionManager(os.path.join(directory, "test.db"), reader_count=2)
+    try:
+        create_schema(db.writer)
+        vault_core.create_user(db, "alice", "alice-pw", kdf_params=KDF_PARAMS)
+        vault_core.create_user(db, "bob", "bob-pw", kdf_params=KDF_PARAMS)
+        with pytest.raises(vault_core.AuthenticationError):
+            vault_core.unlock(db, "alice", "wrong")
+
+        alice = vault_core.unlock(db, "alice", "alice-pw")
+        encrypted, wrapped = alice.encrypt_entry("s3cret")
+        with UnitOfWork(db, "alice") as uow:
+            password_id = uow.insert_password({"title": "Deploy", "password_encrypted": encrypted, "wrapped_entry_key": wrapped})
+        assert alice.fetch_entry_secret(password_id) == "s3cret"
+        assert [row[1] for row in alice.list_entries()] == ["Deploy"]
+
+        bob = vault_core.unlock(db, "bob", "bob-pw")
+        assert bob.fetch_entry_secret(password_id) is None and bob.list_entries() == []
+    finally:
+        db.close()
+        shutil.rmtree(directory)
+
+
+def test_socket_api_with_pipelining():
+    """Test le service : jetons de session, requêtes pipelinées et erreurs"""
+    directory = tempfile.mkdtemp()
+    socket_path = os.path.join(directory, "vault.sock")
+    db = ConnectionManager(os.path.join(directory, "test.db"), reader_count=4)
+    try:
+        create_schema(db.writer)
+        vault_core.create_user(db, "ci", "ci-pw", kdf_params=KDF_PARAMS)
+        session = vault_core.unlock(db, "ci", "ci-pw")
+        with UnitOfWork(db, "ci") as uow:
+            ids = uow.bulk_insert([
+                dict(zip(("password_encrypted", "wrapped_entry_key"), session.encrypt_entry(f"secret-{i}")), title=f"Entry {i}")
+                for i in range(20)
+            ])
+
+        async def scenario():
+            server = vault_server.VaultServer(db, worker_count=4)
+            await server.start(socket_path)
+            assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+            client = await vault_server.VaultClient.connect(socket_path)
+            try:
+                with pytest.raises(vault_server.RequestError):
+                    await client.request("get", entry_id=ids[0], token="invalid")
+                with pytest.raises(vault_server.RequestError):
+                    await client.login("ci", "wrong")
+                await client.login("ci", "ci-pw")
+
+                # Toutes les requêtes sont envoyées avant la première réponse
+                responses = await asyncio.gather(*(client.request("get", entry_id=i) for i in ids))
+                assert [r["entry"]["password"] for r in responses] == [f"secret-{i}" for i in range(20)]
+                assert (await client.request("get", title="Entry 7"))["entry"]["password"] == "secret-7"
+
+                page = await client.request("list", limit=15)
+                rest = await client.request("list", after=page["next"])
+                assert len(page["entries"]) == 15 and len(rest["entries"]) == 5 and rest["next"] is None
+                for limit in (0, -1, vault_core.DEFAULT_PAGE_SIZE + 1, "10", 2.5, True):
+                    with pytest.raises(vault_server.RequestError):
+                        await client.request("list", limit=limit)
+                for after in (5, "2024-01-01", [page["next"][0]], page["next"] + [1], [page["next"][1], page["next"][0]]):
+                    with pytest.raises(vault_server.RequestError, match="after"):
+                        await client.request("list", after=after)
+                assert (await client.request("list", search="absente", limit=1))["entries"] == []
+
+                await client.request("logout")
+                with pytest.raises(vault_server.RequestError):
+                    await client.request("list")
+            finally:
+                await client.close()
+                await server.close()
+
+        asyncio.run(scenario())
+    finally:
+        db.close()
+        shutil.rmtree(directory)
@@ -0,0 +1,103 @@
+import os
+import shutil
+import tempfile
+
+from database import ConnectionManager, create_schema
+from unit_of_work import UnitOfWork
+import vault_stats
+
+
+def snapshot(connection):
+    return (
+        sorted(connection.execute("SELECT scope, key, value FROM vault_stats WHERE value != 0").fetchall()),
+        sorted(connection.execute("SELECT day, changes FROM history_activity WHERE changes != 0").fetchall()),
+    )
+
+
+def test_triggers_match_full_recount():
+    """Test que les compteurs tenus par les triggers égalent un recalcul complet"""
+    directory = tempfile.mkdtemp()
+    db = ConnectionManager(os.path.join(directory, "test.db"), reader_count=1)
+    try:
+        create_schema(db.writer)
+        with db.transaction() as connection:
+            connection.executemany(
+                "INSERT INTO users (username, password_hash, role) VALUES (?, '', ?)",
+                [("alice", "admin"), ("bob", "user"), ("carol", "user")]
+            )
+            connection.execute("UPDATE users SET role = 'manager' WHERE username = 'carol'")
+            connection.execute("DELETE FROM users WHERE username = 'bob'")
+
+        with UnitOfWork(db, "alice") as uow:
+            ids = uow.bulk_insert([
+                {"title": f"Entry {i}", "password_encrypted": "x", "category": ("Work", "Email")[i % 2]}
+                for i in range(6)
+            ])
+            uow.bulk_recategorize(ids[:2], "Banking")
+            uow.bulk_delete([(ids[5], "Entry 5")])
+
+        with db.reader() as connection:
+            stats = vault_stats.load_stats(connection)
+            incremental = snapshot(connection)
+
+        assert (stats["total_users"], stats["total_passwords"]) == (2, 5)
+        assert stats["roles"] == {"admin": 1, "manager": 1}
+        assert stats["categories"] == {"Banking": 2, "Work": 2, "Email": 1}
+        assert stats["creators"] == [("alice", 5)]
+        # 6 créations + 2 changements de catégorie + 1 suppression (historique écrit au commit)
+        assert stats["recent_changes"] == 9
+
+        with db.transaction() as connection:
+            vault_stats.rebuild_stats(connection)
+        with db.reader() as connection:
+            assert snapshot(connection) == incremental
+    finally:
+        db.close()
+        shutil.rmtree(directory)
+
+
+def test_existing_database_is_backfilled():
+    """Test que les statistiques d'une base existante sont calculées à la première ouverture"""
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "test.db")
+    try:
+        # Base créée avant les statistiques : tables et triggers absents
+        db = ConnectionManager(path, reader_count=1)
+        create_schema(db.writer)
+        with db.transaction() as connection:
+            for name in vault_stats.TRIGGERS:
+                connection.execute(f"DROP TRIGGER {name}")
+            connection.execute("DROP TABLE vault_stats")
+            connection.execute("DROP TABLE history_activity")
+            connection.execute("INSERT INTO users (username, password_hash, role) VALUES ('alice', '', 'admin')")
+            connection.execute("INSERT INTO passwords (title, password_encrypted, category, created_by) VALUES ('a', 'x', NULL, 'alice')")
+        db.close()
+
+        db = ConnectionManager(path, reader_count=1)
+        create_schema(db.writer)
+        with db.reader() as connection:
+            stats = vault_stats.load_stats(connection)
+        db.close()
+        assert (stats["total_users"], stats["total_passwords"], stats["categories"]) == (1, 1, {"": 1})
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_activity_covers_exactly_the_requested_days():
+    """Test que l'activité des `days` derniers jours compte aujourd'hui et days - 1 jours précédents"""
+    directory = tempfile.mkdtemp()
+    db = ConnectionManager(os.path.join(directory, "test.db"), reader_count=1)
+    try:
+        create_schema(db.writer)
+        with db.transaction() as connection:
+            connection.executemany(
+                "INSERT INTO history_activity (day, changes) VALUES (date('now', ?), 1)",
+                [(f"-{offset} days",) for offset in range(40)]
+            )
+        with db.reader() as connection:
+            for days in (1, 7, 30):
+                activity = vault_stats.load_stats(connection, days=days)["activity"]
+                assert len(activity) == days
+    finally:
+        db.close()
+        shutil.rmtree(directory)
@@ -0,0 +1,89 @@
+import os
+import shutil
+import tempfile
+
+from database import ConnectionManager, create_schema
+import vault_crypto
+import vault_transfer
+
+ENTRIES = [
+    {"title": f"Service {i}", "username": f"user{i}", "password": f"secret,\"{i}\"\nline",
+     "url": f"https://{i}.example.com", "notes": "é", "category": "Work"}
+    for i in range(25)
+]
+
+
+def create_vault(directory):
+    db = ConnectionManager(os.path.join(directory, "test.db"), reader_count=1)
+    create_schema(db.writer)
+    return db
+
+
+def test_import_export_round_trip():
+    """Test qu'un export puis un import restituent les mêmes entrées, pour chaque format"""
+    directory = tempfile.mkdtemp()
+    key, _ = vault_crypto.generate_encryption_key("test")
+    try:
+        for extension in (".csv", ".json", ".jsonl"):
+            source = os.path.join(directory, "source" + extension)
+            with vault_transfer.EntryWriter(source) as writer:
+                for entry in ENTRIES:
+                    writer.write(entry)
+
+            db = create_vault(directory)
+            progress = []
+            imported, skipped = vault_transfer.import_vault(
+                db, source, key, "alice", chunk_size=10, workers=2,
+                progress=lambda done, total: progress.append(done)
+            )
+            assert (imported, skipped) == (len(ENTRIES), 0)
+            assert progress == [10, 20, 25]
+
+            with db.reader() as connection:
+                stored, wrapped_entry_key = connection.execute(
+                    "SELECT password_encrypted, wrapped_entry_key FROM passwords"
+                ).fetchone()
+                assert vault_crypto.decrypt_entry(key, stored, wrapped_entry_key) == ENTRIES[0]["password"]
+                assert connection.execute("SELECT COUNT(*) FROM password_history WHERE action = 'IMPORTED'").fetchone()[0] == len(ENTRIES)
+
+            target = os.path.join(directory, "export" + extension)
+            exported, failed = vault_transfer.export_vault(db, target, key, created_by="alice", chunk_size=7, workers=3)
+            assert (exported, failed) == (len(ENTRIES), 0)
+            assert list(vault_transfer.read_entries(target)) == ENTRIES
+
+            db.close()
+            os.remove(os.path.join(directory, "test.db"))
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_export_skips_undecryptable_entries():
+    """Test que les entrées chiffrées avec une autre clé sont comptées en échec"""
+    directory = tempfile.mkdtemp()
+    key, _ = vault_crypto.generate_encryption_key("test")
+    other_key, _ = vault_crypto.generate_encryption_key("other")
+    try:
+        source = os.path.join(directory, "source.jsonl")
+        with vault_transfer.EntryWriter(source) as writer:
+            for entry in ENTRIES[:5]:
+                writer.write(entry)
+            writer.write({"title": "", "password": "missing title"})
+
+        db = create_vault(directory)
+        assert vault_transfer.import_vault(db, source, key, "alice") == (5, 1)
+        assert vault_transfer.import_vault(db, source, other_key, "alice") == (5, 1)
+
+        exported, failed = vault_transfer.export_vault(db, os.path.join(directory, "export.csv"), key)
+        assert (exported, failed) == (5, 5)
+
+        # Entrée antérieure au chiffrement par enveloppe : déchiffrée avec la clé historique
+        with db.transaction() as connection:
+            connection.execute(
+                "INSERT INTO passwords (title, password_encrypted, created_by) VALUES (?, ?, ?)",
+                ("Legacy", vault_crypto.encrypt_secret(other_key, "old"), "alice")
+            )
+        exported, failed = vault_transfer.export_vault(db, os.path.join(directory, "export.csv"), key, legacy_key=other_key)
+        assert (exported, failed) == (6, 5)
+        db.close()
+    finally:
+        shutil.rmtree(directory)
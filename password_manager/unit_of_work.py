@@ -0,0 +1,154 @@
+from datetime import datetime
+
+# Colonnes modifiables d'une entrée
+PASSWORD_FIELDS = ("title", "username", "password_encrypted", "wrapped_entry_key", "url", "notes", "category", "visibility_level")
+
+
+def changed_fields(current, fields):
+    """Retourne les colonnes de fields dont la valeur diffère de current (None vaut "")"""
+    return {
+        column: value for column, value in fields.items()
+        if (value if value is not None else "") != (current.get(column) if current.get(column) is not None else "")
+    }
+
+
+class UnitOfWork:
+    """Regroupe les écritures d'une opération dans une seule transaction.
+
+    Les lignes d'historique sont accumulées puis écrites en une fois (executemany)
+    juste avant le commit. Usage :
+
+        with UnitOfWork(db, "alice") as uow:
+            uow.update_password(password_id, {"title": "Nouveau titre"})
+            uow.record(password_id, "DETAILS_UPDATED", "", "Title: Nouveau titre")
+    """
+
+    def __init__(self, db, user):
+        self.db = db
+        self.user = user
+        self.connection = None
+        self.history = []
+        self._transaction = None
+
+    def __enter__(self):
+        self._transaction = self.db.transaction()
+        self.connection = self._transaction.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            try:
+                self.flush_history()
+            except BaseException as e:
+                # Annule la transaction puis propage l'erreur
+                self._transaction.__exit__(type(e), e, e.__traceback__)
+                raise
+        return self._transaction.__exit__(exc_type, exc, tb)
+
+    def execute(self, query, params=()):
+        return self.connection.execute(query, params)
+
+    def record(self, password_id, action, old_value="", new_value=""):
+        """Ajoute une ligne d'historique, écrite au commit"""
+        self.history.append((password_id, action, old_value, new_value, self.user))
+
+    def flush_history(self):
+        """Écrit les lignes d'historique accumulées"""
+        if not self.history:
+            return
+        self.connection.executemany("""
+            INSERT INTO password_history (password_id, action, old_value, new_value, changed_by)
+            VALUES (?, ?, ?, ?, ?)
+        """, self.history)
+        self.history = []
+
+    def insert_password(self, fields):
+        """Crée une entrée pour l'utilisateur courant et retourne son id"""
+        columns = [column for column in PASSWORD_FIELDS if column in fields]
+        cursor = self.connection.execute(f"""
+            INSERT INTO passwords ({", ".join(columns)}, created_by)
+            VALUES ({", ".join("?" for _ in columns)}, ?)
+        """, [fields[column] for column in columns] + [self.user])
+        return cursor.lastrowid
+
+    def bulk_insert(self, entries, action="CREATED"):
+        """Crée plusieurs entrées (dictionnaires aux mêmes colonnes) et retourne leurs ids"""
+        if not entries:
+            return []
+        columns = [column for column in PASSWORD_FIELDS if column in entries[0]]
+        self.connection.executemany(f"""
+            INSERT INTO passwords ({", ".join(columns)}, created_by)
+            VALUES ({", ".join("?" for _ in columns)}, ?)
+        """, [[entry[column] for column in columns] + [self.user] for entry in entries])
+
+        # Le verrou d'écriture est tenu : les ids AUTOINCREMENT insérés sont consécutifs
+        last_id = self.connection.execute("SELECT last_insert_rowid()").fetchone()[0]
+        password_ids = list(range(last_id - len(entries) + 1, last_id + 1))
+        for password_id, entry in zip(password_ids, entries):
+            self.record(password_id, action, "", f"Title: {entry.get('title', '')}")
+        return password_ids
+
+    def update_password(self, password_id, fields):
+        """Met à jour les colonnes fournies d'une entrée et sa date de modification"""
+        columns = [column for column in PASSWORD_FIELDS if column in fields]
+        assignments = ", ".join(f"{column}=?" for column in columns + ["updated_at"])
+        self.connection.execute(
+            f"UPDATE passwords SET {assignments} WHERE id=?",
+            [fields[column] for column in columns] + [datetime.now(), password_id]
+        )
+
+    def bulk_delete(self, entries):
+        """Supprime des entrées [(id, titre), ...] avec leurs permissions et leur historique"""
+        ids = [(password_id,) for password_id, _ in entries]
+        self.connection.executemany("DELETE FROM access_permissions WHERE password_id = ?", ids)
+        self.connection.executemany("DELETE FROM password_history WHERE password_id = ?", ids)
+        self.connection.executemany("DELETE FROM passwords WHERE id = ?", ids)
+
+        # La trace de suppression est conservée dans l'historique
+        for password_id, title in entries:
+            self.record(password_id, "DELETED", title, "")
+
+    def bulk_recategorize(self, password_ids, category):
+        """Change la catégorie de plusieurs entrées"""
+        now = datetime.now()
+        self.connection.executemany(
+            "UPDATE passwords SET category = ?, updated_at = ? WHERE id = ?",
+            [(category, now, password_id) for password_id in password_ids]
+        )
+        for password_id in password_ids:
+            self.record(password_id, "CATEGORY_CHANGED", "", f"Category: {category}")
+
+    def bulk_share(self, password_ids, user_id, username, sealed_keys=None, permission_level=1):
+        """Donne accès à plusieurs entrées à un utilisateur ; retourne les ids non partagés
+
+        sealed_keys associe à chaque id la clé d'entrée scellée pour le destinataire. Quand
+        il est fourni, une entrée sans clé scellée n'est pas partagée (le destinataire ne
+        pourrait pas la déchiffrer), sauf si le destinataire y a déjà accès. Un partage
+        existant garde sa clé scellée si aucune n'est fournie et n'est jamais rétrogradé.
+        """
+        refused = []
+        if sealed_keys is not None:
+            shared = []
+            for password_id in password_ids:
+                if password_id in sealed_keys or self.connection.execute(
+                        "SELECT 1 FROM access_permissions WHERE user_id = ? AND password_id = ? "
+                        "AND sealed_entry_key IS NOT NULL", (user_id, password_id)).fetchone():
+                    shared.append(password_id)
+                else:
+                    refused.append(password_id)
+            password_ids = shared
+        sealed_keys = sealed_keys or {}
+
+        self.connection.executemany("""
+            INSERT INTO access_permissions (user_id, password_id, permission_level, granted_by, sealed_entry_key)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(user_id, password_id) DO UPDATE SET
+                sealed_entry_key = COALESCE(excluded.sealed_entry_key, sealed_entry_key),
+                permission_level = MAX(permission_level, excluded.permission_level)
+        """, [
+            (user_id, password_id, permission_level, self.user, sealed_keys.get(password_id))
+            for password_id in password_ids
+        ])
+        for password_id in password_ids:
+            self.record(password_id, "SHARED", "", f"User: {username}")
+        return refused
@@ -0,0 +1,311 @@
+"""Cœur du coffre, sans interface graphique.
+
+Création des comptes, déverrouillage (bcrypt puis KDF), clés de la session, droits
+d'accès et lecture des secrets : utilisé par l'application Tk comme par le service
+headless (vault_server.py). Une VaultSession peut être utilisée depuis plusieurs
+threads : les lectures passent par le pool de lecteurs, le cache des secrets et celui
+des droits ont leur propre verrou.
+"""
+
+from datetime import datetime
+
+import bcrypt
+from cryptography.fernet import InvalidToken
+
+import access_control
+import key_rotation
+from secret_cache import SecretCache
+from unit_of_work import UnitOfWork
+import vault_crypto
+
+# Mot de passe du compte administrateur créé sur une base vide
+DEFAULT_ADMIN_USERNAME = "admin"
+DEFAULT_ADMIN_PASSWORD = "admin123"
+
+# Nombre d'entrées par page de la liste
+DEFAULT_PAGE_SIZE = 200
+
+# Secret chiffré d'une entrée et clés permettant à l'utilisateur courant de le déchiffrer
+ENTRY_SECRET_QUERY = """
+    SELECT p.password_encrypted, p.created_by, p.wrapped_entry_key, ap.sealed_entry_key, p.updated_at
+    FROM passwords p
+    LEFT JOIN access_permissions ap ON ap.password_id = p.id AND ap.user_id = ?
+    WHERE p.id = ?
+"""
+
+
+class AuthenticationError(Exception):
+    """Nom d'utilisateur ou mot de passe incorrect"""
+
+
+def create_user(db, username, password, role="user", kdf_algorithm=None, kdf_params=None):
+    """Crée un compte avec ses clés (sqlite3.IntegrityError si le nom existe déjà) ; retourne son id"""
+    hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+
+    # Générer le salt et les clés de chiffrement
+    kdf_algorithm, kdf_params = vault_crypto.load_kdf(kdf_algorithm, vault_crypto.dump_kdf_params(kdf_params) if kdf_params else None)
+    kek, salt = vault_crypto.generate_encryption_key(password, None, kdf_algorithm, kdf_params)
+    keys = vault_crypto.create_user_keys(kek)
+
+    with db.transaction() as connection:
+        cursor = connection.execute("""
+            INSERT INTO users (username, password_hash, role, encryption_salt, kdf_algorithm, kdf_params,
+                               wrapped_vault_key, public_key, wrapped_private_key)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (username, hashed_password, role, salt, kdf_algorithm, vault_crypto.dump_kdf_params(kdf_params),
+              keys['wrapped_vault_key'], keys['public_key'], keys['wrapped_private_key']))
+    return cursor.lastrowid
+
+
+def ensure_default_admin(db):
+    """Crée l'administrateur par défaut si la base n'en a aucun ; retourne True s'il a été créé"""
+    with db.reader() as connection:
+        if connection.execute("SELECT COUNT(*) FROM users WHERE role = 'admin'").fetchone()[0]:
+            return False
+    create_user(db, DEFAULT_ADMIN_USERNAME, DEFAULT_ADMIN_PASSWORD, role="admin")
+    return True
+
+
+def unlock(db, username, password, cache_ttl=None, cache_size=None):
+    """Vérifie le mot de passe et déverrouille les clés de l'utilisateur.
+
+    Retourne une VaultSession. AuthenticationError si les identifiants sont incorrects,
+    InvalidToken si la clé de coffre ne peut pas être déballée. Une rotation de clés
+    interrompue est exposée par session.pending_rotation et session.pending_kek.
+    """
+    with db.reader() as connection:
+        user = connection.execute("""
+            SELECT id, password_hash, role, encryption_salt, wrapped_vault_key, wrapped_private_key, kdf_algorithm, kdf_params
+            FROM users WHERE username = ?
+        """, (username,)).fetchone()
+    if not user or not bcrypt.checkpw(password.encode('utf-8'), user[1]):
+        raise AuthenticationError("Nom d'utilisateur ou mot de passe incorrect")
+
+    user_id = user[0]
+    kdf_algorithm, kdf_params = vault_crypto.load_kdf(user[6], user[7])
+    # Première connexion ou migration : générer et stocker le salt
+    kek, salt = vault_crypto.generate_encryption_key(password, user[3], kdf_algorithm, kdf_params)
+    if user[3] is None:
+        with db.transaction() as connection:
+            connection.execute("UPDATE users SET encryption_salt = ? WHERE id = ?", (salt, user_id))
+
+    session = VaultSession(db, user_id, username, user[2], kek, kdf_algorithm, kdf_params, cache_ttl, cache_size)
+    session.load_user_keys(user[4], user[5])
+
+    # Rotation de clés interrompue : les entrées déjà rechiffrées restent lisibles
+    rotation = key_rotation.find_pending_rotation(db, user_id)
+    if rotation:
+        session.pending_kek, session.next_vault_key = key_rotation.unwrap_pending_key(rotation, password)
+        session.pending_rotation = rotation
+
+    with db.transaction() as connection:
+        connection.execute("UPDATE users SET last_login = ? WHERE id = ?", (datetime.now(), user_id))
+    return session
+
+
+class VaultSession:
+    """Utilisateur déverrouillé : ses clés, ses droits et le cache de ses secrets"""
+
+    def __init__(self, db, user_id, username, role, encryption_key, kdf_algorithm, kdf_params,
+                 cache_ttl=None, cache_size=None):
+        self.db = db
+        self.user_id = user_id
+        self.username = username
+        self.role = role
+        self.encryption_key = encryption_key  # Clé dérivée du mot de passe (KEK)
+        self.vault_key = None  # Clé de coffre, enveloppée par la KEK
+        self.private_key = None  # Clé privée X25519 pour les partages
+        # Fonction de dérivation de la KEK de l'utilisateur et ses paramètres
+        self.kdf_algorithm, self.kdf_params = kdf_algorithm, kdf_params
+        self.next_vault_key = None  # Nouvelle clé de coffre pendant une rotation
+        self.pending_rotation = None
+        self.pending_kek = None
+        # Droits de l'utilisateur sur les entrées (cache de session)
+        self.access = access_control.AccessControl(db, user_id, username, role)
+        cache_options = {}
+        if cache_ttl is not None:
+            cache_options['ttl'] = cache_ttl
+        if cache_size is not None:
+            cache_options['max_size'] = cache_size
+        self.secret_cache = SecretCache(**cache_options)
+
+    def close(self):
+        """Efface les secrets en cache et oublie les clés"""
+        self.secret_cache.clear()
+        self.encryption_key = self.vault_key = self.private_key = self.next_vault_key = None
+
+    def load_user_keys(self, wrapped_vault_key, wrapped_private_key):
+        """Déballe la clé de coffre et la clé privée de l'utilisateur (créées si absentes)"""
+        if wrapped_vault_key is None:
+            # Compte antérieur au chiffrement par enveloppe
+            keys = vault_crypto.create_user_keys(self.encryption_key)
+            with self.db.transaction() as connection:
+                connection.execute(
+                    "UPDATE users SET wrapped_vault_key = ?, public_key = ?, wrapped_private_key = ? WHERE id = ?",
+                    (keys['wrapped_vault_key'], keys['public_key'], keys['wrapped_private_key'], self.user_id)
+                )
+            self.vault_key, self.private_key = keys['vault_key'], keys['private_key']
+        else:
+            self.vault_key = vault_crypto.unwrap_key(self.encryption_key, wrapped_vault_key)
+            self.private_key = vault_crypto.unwrap_key(self.vault_key, wrapped_private_key)
+
+    def encrypt_password(self, password):
+        """Chiffre un mot de passe directement avec la KEK (ancien format)"""
+        if self.encryption_key is None:
+            raise ValueError("Clé de chiffrement non initialisée")
+        return vault_crypto.encrypt_secret(self.encryption_key, password)
+
+    def decrypt_password(self, encrypted_password):
+        """Déchiffre un mot de passe chiffré directement avec la KEK (ancien format)"""
+        if self.encryption_key is None:
+            raise ValueError("Clé de chiffrement non initialisée")
+        return vault_crypto.decrypt_secret(self.encryption_key, encrypted_password)
+
+    def encrypt_entry(self, password):
+        """Chiffre un mot de passe avec une nouvelle clé d'entrée ; retourne (chiffré, clé enveloppée)"""
+        if self.vault_key is None:
+            raise ValueError("Clé de coffre non initialisée")
+        # Pendant une rotation, les nouvelles clés sont enveloppées par la nouvelle clé de coffre
+        return vault_crypto.encrypt_entry(self.next_vault_key or self.vault_key, password)
+
+    def get_entry_key(self, wrapped_entry_key, sealed_entry_key=None):
+        """Retourne la clé d'une entrée, ou None si elle est chiffrée directement par la KEK"""
+        if wrapped_entry_key is None:
+            return None
+        # Clé enveloppée par notre clé de coffre (ou par la nouvelle, pendant une rotation)
+        for vault_key in (self.vault_key, self.next_vault_key):
+            if vault_key is None:
+                continue
+            try:
+                return vault_crypto.unwrap_key(vault_key, wrapped_entry_key)
+            except InvalidToken:
+                pass
+
+        # Sinon, clé scellée pour nous lors d'un partage
+        if sealed_entry_key is None:
+            raise ValueError("Ce mot de passe n'est pas partagé avec vous")
+        return vault_crypto.open_sealed_key(self.private_key, sealed_entry_key)
+
+    def decrypt_entry(self, encrypted_password, wrapped_entry_key, sealed_entry_key=None):
+        """Déchiffre une entrée (clé d'entrée, clé partagée ou ancien chiffrement direct)"""
+        entry_key = self.get_entry_key(wrapped_entry_key, sealed_entry_key)
+        if entry_key is None:
+            return self.decrypt_password(encrypted_password)
+        return vault_crypto.decrypt_secret(entry_key, encrypted_password)
+
+    def decrypt_entry_cached(self, password_id, updated_at, encrypted_password, wrapped_entry_key, sealed_entry_key=None):
+        """Déchiffre une entrée en passant par le cache des secrets (clé : id et updated_at)"""
+        secret = self.secret_cache.get(int(password_id), updated_at)
+        if secret is None:
+            secret = self.decrypt_entry(encrypted_password, wrapped_entry_key, sealed_entry_key)
+            self.secret_cache.put(int(password_id), updated_at, secret)
+        return secret
+
+    def fetch_entry_secret(self, password_id):
+        """Lit et déchiffre le mot de passe d'une entrée ; None si elle n'existe pas ou n'est pas visible"""
+        if not self.access.can(access_control.VIEW, password_id):
+            return None
+        with self.db.reader() as connection:
+            row = connection.execute(ENTRY_SECRET_QUERY, (self.user_id, password_id)).fetchone()
+        if row is None:
+            return None
+        return self.decrypt_entry_cached(password_id, row[4], row[0], row[2], row[3])
+
+    def seal_entry_keys(self, password_ids, recipient_public_key):
+        """Scelle pour un destinataire les clés des entrées accessibles à l'utilisateur"""
+        sealed_keys = {}
+        if recipient_public_key is None:
+            return sealed_keys
+
+        with self.db.reader() as connection:
+            for password_id in password_ids:
+                row = connection.execute(ENTRY_SECRET_QUERY, (self.user_id, password_id)).fetchone()
+                if row is None:
+                    continue
+                try:
+                    entry_key = self.get_entry_key(row[2], row[3])
+                except Exception:
+                    entry_key = None
+                if entry_key is not None:
+                    sealed_keys[password_id] = vault_crypto.seal_key(recipient_public_key, entry_key)
+        return sealed_keys
+
+    def entries_query(self, search_term="", after=None, limit=DEFAULT_PAGE_SIZE):
+        """Requête d'une page des entrées visibles (pagination par clé sur updated_at, id)
+
+        Colonnes : id, title, username, url, category, created_by, updated_at, visibility_level.
+        """
+        conditions = []
+        params = []
+
+        # Utilisateurs normaux : entrées créées par eux ou partagées avec eux
+        visibility, visibility_params = self.access.visibility_condition()
+        if visibility:
+            conditions.append(visibility)
+            params.extend(visibility_params)
+
+        if search_term:
+            pattern = f"%{search_term}%"
+            conditions.append("(LOWER(title) LIKE ? OR LOWER(username) LIKE ? OR LOWER(url) LIKE ?)")
+            params.extend([pattern, pattern, pattern])
+
+        # Reprendre juste après la dernière ligne déjà lue
+        if after is not None:
+            conditions.append("(updated_at, id) < (?, ?)")
+            params.extend(after)
+
+        where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+        query = f"""
+            SELECT id, title, username, url, category, created_by, updated_at, visibility_level
+            FROM passwords
+            {where_clause}
+            ORDER BY updated_at DESC, id DESC
+            LIMIT ?
+        """
+        params.append(limit)
+        return query, params
+
+    def list_entries(self, search_term="", after=None, limit=DEFAULT_PAGE_SIZE):
+        """Retourne une page des entrées visibles (voir entries_query)"""
+        query, params = self.entries_query(search_term, after, limit)
+        with self.db.reader() as connection:
+            return connection.execute(query, params).fetchall()
+
+    def change_password(self, current_password, new_password):
+        """Change le mot de passe de connexion : seule la clé de coffre est ré-enveloppée"""
+        if self.next_vault_key is not None:
+            raise ValueError("Une rotation des clés est en cours : terminez-la avant de changer de mot de passe")
+
+        with self.db.reader() as connection:
+            user = connection.execute("SELECT password_hash FROM users WHERE id = ?", (self.user_id,)).fetchone()
+            # Entrées antérieures au chiffrement par enveloppe, liées à l'ancienne clé
+            legacy_rows = connection.execute(
+                "SELECT id, password_encrypted FROM passwords WHERE created_by = ? AND wrapped_entry_key IS NULL",
+                (self.username,)
+            ).fetchall()
+
+        if not user or not bcrypt.checkpw(current_password.encode('utf-8'), user[0]):
+            raise ValueError("Mot de passe actuel incorrect")
+
+        new_kek, new_salt = vault_crypto.generate_encryption_key(new_password, None, self.kdf_algorithm, self.kdf_params)
+        hashed_password = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt())
+
+        with UnitOfWork(self.db, self.username) as uow:
+            # Migration unique des anciennes entrées vers des clés d'entrée
+            for password_id, encrypted_password in legacy_rows:
+                try:
+                    secret = self.decrypt_password(encrypted_password)
+                except Exception:
+                    continue
+                encrypted_password, wrapped_entry_key = self.encrypt_entry(secret)
+                uow.execute(
+                    "UPDATE passwords SET password_encrypted = ?, wrapped_entry_key = ? WHERE id = ?",
+                    (encrypted_password, wrapped_entry_key, password_id)
+                )
+
+            uow.execute(
+                "UPDATE users SET password_hash = ?, encryption_salt = ?, wrapped_vault_key = ? WHERE id = ?",
+                (hashed_password, new_salt, vault_crypto.wrap_key(new_kek, self.vault_key), self.user_id)
+            )
+
+        self.encryption_key = new_kek
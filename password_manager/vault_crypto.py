@@ -0,0 +1,211 @@
+import base64
+import json
+import os
+import time
+
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric.x25519 import X25519PrivateKey, X25519PublicKey
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
+
+try:
+    # Argon2id n'est disponible qu'à partir de cryptography 44
+    from cryptography.hazmat.primitives.kdf.argon2 import Argon2id
+except ImportError:
+    Argon2id = None
+
+# Nombre d'itérations PBKDF2 par défaut
+PBKDF2_ITERATIONS = 100000
+
+# Paramètres par défaut de chaque fonction de dérivation (KDF)
+DEFAULT_KDF_PARAMS = {
+    "pbkdf2": {"iterations": PBKDF2_ITERATIONS},
+    # 2**15 * 128 * r octets = 32 Mio de mémoire
+    "scrypt": {"n": 2 ** 15, "r": 8, "p": 1},
+    # memory_cost en Kio (64 Mio)
+    "argon2id": {"iterations": 3, "memory_cost": 65536, "lanes": 4},
+}
+DEFAULT_KDF_ALGORITHM = "pbkdf2"
+
+
+def available_kdf_algorithms() -> list:
+    """Fonctions de dérivation utilisables avec la version installée de cryptography"""
+    return [algorithm for algorithm in DEFAULT_KDF_PARAMS if algorithm != "argon2id" or Argon2id is not None]
+
+
+def derive_key(password: str, salt: bytes, algorithm: str = DEFAULT_KDF_ALGORITHM, params: dict = None) -> bytes:
+    """Dérive une clé Fernet d'un mot de passe avec la KDF et les paramètres donnés"""
+    if algorithm not in DEFAULT_KDF_PARAMS:
+        raise ValueError(f"Fonction de dérivation inconnue: {algorithm}")
+    params = {**DEFAULT_KDF_PARAMS[algorithm], **(params or {})}
+
+    if algorithm == "pbkdf2":
+        kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=params["iterations"])
+    elif algorithm == "scrypt":
+        kdf = Scrypt(salt=salt, length=32, n=params["n"], r=params["r"], p=params["p"])
+    else:
+        if Argon2id is None:
+            raise ValueError("Argon2id nécessite cryptography >= 44")
+        kdf = Argon2id(
+            salt=salt, length=32, iterations=params["iterations"],
+            lanes=params["lanes"], memory_cost=params["memory_cost"]
+        )
+    return base64.urlsafe_b64encode(kdf.derive(password.encode()))
+
+
+def generate_encryption_key(password: str, salt: bytes = None,
+                            algorithm: str = DEFAULT_KDF_ALGORITHM, params: dict = None) -> tuple:
+    """Génère une clé de chiffrement à partir d'un mot de passe"""
+    if salt is None:
+        salt = os.urandom(16)
+    return derive_key(password, salt, algorithm, params), salt
+
+
+def load_kdf(algorithm: str, params_json: str) -> tuple:
+    """Retourne (algorithme, paramètres) stockés pour un utilisateur ; défauts si absents"""
+    algorithm = algorithm or DEFAULT_KDF_ALGORITHM
+    params = json.loads(params_json) if params_json else {}
+    return algorithm, {**DEFAULT_KDF_PARAMS[algorithm], **params}
+
+
+def dump_kdf_params(params: dict) -> str:
+    """Sérialise des paramètres de KDF pour la colonne users.kdf_params"""
+    return json.dumps(params, sort_keys=True)
+
+
+def measure_kdf(algorithm: str, params: dict, rounds: int = 1) -> float:
+    """Durée moyenne (secondes) d'une dérivation avec ces paramètres"""
+    salt = os.urandom(16)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        derive_key("calibration", salt, algorithm, params)
+    return (time.perf_counter() - start) / rounds
+
+
+def calibrate_kdf(algorithm: str = DEFAULT_KDF_ALGORITHM, target_seconds: float = 0.5) -> dict:
+    """Choisit les paramètres d'une KDF pour qu'une dérivation dure environ target_seconds.
+
+    PBKDF2 et Argon2id : le coût est linéaire en nombre d'itérations, estimé à partir
+    d'une mesure courte. scrypt : n (puissance de 2, donc la mémoire) est doublé tant
+    que la cible n'est pas atteinte. Les paramètres ne descendent jamais sous les défauts.
+    """
+    params = dict(DEFAULT_KDF_PARAMS[algorithm])
+    if algorithm == "pbkdf2":
+        # Mesure assez longue (>= 50 ms) pour que l'extrapolation soit fiable
+        sample = 10000
+        elapsed = measure_kdf(algorithm, {"iterations": sample})
+        while elapsed < 0.05:
+            sample *= 2
+            elapsed = measure_kdf(algorithm, {"iterations": sample})
+        params["iterations"] = max(PBKDF2_ITERATIONS, int(sample * target_seconds / elapsed) // 1000 * 1000)
+    elif algorithm == "scrypt":
+        # Au-delà de 2**20 (1 Gio avec r=8), la mémoire nécessaire devient déraisonnable
+        while params["n"] < 2 ** 20 and measure_kdf(algorithm, params) * 2 <= target_seconds:
+            params["n"] *= 2
+    else:
+        elapsed = measure_kdf(algorithm, {**params, "iterations": 1})
+        params["iterations"] = max(DEFAULT_KDF_PARAMS["argon2id"]["iterations"], min(50, round(target_seconds / elapsed)))
+    return params
+
+
+def encrypt_secret(key: bytes, secret: str) -> str:
+    """Chiffre un secret (format stocké : base64 du jeton Fernet)"""
+    encrypted_secret = Fernet(key).encrypt(secret.encode())
+    return base64.urlsafe_b64encode(encrypted_secret).decode()
+
+
+def decrypt_secret(key: bytes, encrypted_secret: str) -> str:
+    """Déchiffre un secret chiffré par encrypt_secret"""
+    encrypted_data = base64.urlsafe_b64decode(encrypted_secret.encode())
+    return Fernet(key).decrypt(encrypted_data).decode()
+
+
+# --- Chiffrement par enveloppe ---
+#
+# Chaque entrée est chiffrée avec sa propre clé (clé d'entrée), elle-même chiffrée
+# ("enveloppée") par la clé de coffre de son créateur. La clé de coffre est enveloppée
+# par la clé dérivée du mot de passe de connexion (KEK) : changer de mot de passe ne
+# ré-enveloppe donc qu'une seule petite clé. Pour partager une entrée, sa clé est
+# scellée avec la clé publique X25519 du destinataire.
+
+def generate_data_key() -> bytes:
+    """Génère une clé aléatoire (clé de coffre ou clé d'entrée)"""
+    return Fernet.generate_key()
+
+
+def wrap_key(wrapping_key: bytes, key: bytes) -> bytes:
+    """Chiffre une clé avec une autre clé"""
+    return Fernet(wrapping_key).encrypt(key)
+
+
+def unwrap_key(wrapping_key: bytes, wrapped_key: bytes) -> bytes:
+    """Déchiffre une clé enveloppée par wrap_key"""
+    return Fernet(wrapping_key).decrypt(wrapped_key)
+
+
+def encrypt_entry(vault_key: bytes, secret: str) -> tuple:
+    """Chiffre un secret avec une nouvelle clé d'entrée ; retourne (secret chiffré, clé enveloppée)"""
+    entry_key = generate_data_key()
+    return encrypt_secret(entry_key, secret), wrap_key(vault_key, entry_key)
+
+
+def decrypt_entry(vault_key: bytes, encrypted_secret: str, wrapped_entry_key: bytes, legacy_key: bytes = None) -> str:
+    """Déchiffre une entrée ; sans clé enveloppée, l'entrée est chiffrée directement par legacy_key"""
+    if wrapped_entry_key is None:
+        if legacy_key is None:
+            raise ValueError("Entrée sans clé d'entrée et aucune clé historique fournie")
+        return decrypt_secret(legacy_key, encrypted_secret)
+    return decrypt_secret(unwrap_key(vault_key, wrapped_entry_key), encrypted_secret)
+
+
+def generate_key_pair() -> tuple:
+    """Génère une paire de clés X25519 ; retourne (clé privée, clé publique) en octets bruts"""
+    private_key = X25519PrivateKey.generate()
+    private_bytes = private_key.private_bytes(
+        serialization.Encoding.Raw, serialization.PrivateFormat.Raw, serialization.NoEncryption()
+    )
+    public_bytes = private_key.public_key().public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+    return private_bytes, public_bytes
+
+
+def _sealing_key(shared_secret: bytes, ephemeral_public: bytes, recipient_public: bytes) -> bytes:
+    derived = HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=None,
+        info=b"password-manager-share" + ephemeral_public + recipient_public,
+    ).derive(shared_secret)
+    return base64.urlsafe_b64encode(derived)
+
+
+def seal_key(recipient_public_key: bytes, key: bytes) -> bytes:
+    """Scelle une clé pour le détenteur de la clé privée correspondant à recipient_public_key"""
+    ephemeral = X25519PrivateKey.generate()
+    ephemeral_public = ephemeral.public_key().public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+    shared_secret = ephemeral.exchange(X25519PublicKey.from_public_bytes(recipient_public_key))
+    sealing_key = _sealing_key(shared_secret, ephemeral_public, recipient_public_key)
+    return ephemeral_public + Fernet(sealing_key).encrypt(key)
+
+
+def open_sealed_key(private_key: bytes, sealed_key: bytes) -> bytes:
+    """Ouvre une clé scellée par seal_key"""
+    recipient = X25519PrivateKey.from_private_bytes(private_key)
+    recipient_public = recipient.public_key().public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+    ephemeral_public, token = sealed_key[:32], sealed_key[32:]
+    shared_secret = recipient.exchange(X25519PublicKey.from_public_bytes(ephemeral_public))
+    return Fernet(_sealing_key(shared_secret, ephemeral_public, recipient_public)).decrypt(token)
+
+
+def create_user_keys(kek: bytes) -> dict:
+    """Crée la clé de coffre et la paire de clés d'un utilisateur, enveloppées pour le stockage"""
+    vault_key = generate_data_key()
+    private_key, public_key = generate_key_pair()
+    return {
+        'vault_key': vault_key,
+        'private_key': private_key,
+        'wrapped_vault_key': wrap_key(kek, vault_key),
+        'public_key': public_key,
+        'wrapped_private_key': wrap_key(vault_key, private_key),
+    }
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Service headless du coffre sur une socket Unix locale (accès scripté, CI)
+
+Protocole : une requête JSON par ligne, une réponse JSON par ligne.
+
+    {"id": 1, "op": "login", "username": "ci", "password": "..."}
+    -> {"id": 1, "ok": true, "token": "..."}
+    {"id": 2, "op": "get", "token": "...", "entry_id": 42}
+    -> {"id": 2, "ok": true, "entry": {"id": 42, "title": "...", "password": "..."}}
+
+Opérations : login, logout, list (search, after, limit), get (entry_id ou title), ping.
+Les requêtes d'une connexion sont traitées en parallèle (pipelining) : les réponses
+peuvent arriver dans le désordre et portent l'id de leur requête. Les lectures et le
+déchiffrement s'exécutent dans un pool de threads, un lecteur SQLite par thread.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import secrets
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cryptography.fernet import InvalidToken
+
+from database import ConnectionManager, create_schema
+import vault_core
+
+DEFAULT_SOCKET = "vault.sock"
+# Requêtes en cours au plus par connexion, threads de lecture et durée d'inactivité d'une session
+MAX_PIPELINE = 64
+WORKER_COUNT = 8
+SESSION_IDLE_TIMEOUT = 15 * 60
+# Taille maximale d'une ligne de requête (octets)
+MAX_REQUEST_SIZE = 64 * 1024
+
+
+class RequestError(Exception):
+    """Erreur renvoyée au client dans la réponse"""
+
+
+class VaultServer:
+    """Serveur asyncio : sessions par jeton, requêtes exécutées dans un pool de threads"""
+
+    def __init__(self, db, worker_count=WORKER_COUNT, idle_timeout=SESSION_IDLE_TIMEOUT):
+        self.db = db
+        self.executor = ThreadPoolExecutor(max_workers=worker_count)
+        self.idle_timeout = idle_timeout
+        # jeton -> [VaultSession, dernière utilisation]
+        self.sessions = {}
+        self.server = None
+
+    async def start(self, socket_path):
+        """Écoute sur socket_path (accessible au seul propriétaire)"""
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        # Socket créé directement en 0600 : pas d'instant où un autre utilisateur pourrait s'y connecter
+        previous_umask = os.umask(0o177)
+        try:
+            self.server = await asyncio.start_unix_server(self.handle_connection, socket_path, limit=MAX_REQUEST_SIZE)
+        finally:
+            os.umask(previous_umask)
+        return self.server
+
+    async def close(self):
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        for session, _ in self.sessions.values():
+            session.close()
+        self.sessions.clear()
+        self.executor.shutdown(wait=True)
+
+    async def handle_connection(self, reader, writer):
+        """Lit les requêtes d'une connexion et répond à chacune dès qu'elle est traitée"""
+        write_lock = asyncio.Lock()
+        pipeline = asyncio.Semaphore(MAX_PIPELINE)
+        tasks = set()
+
+        async def respond(request_line):
+            try:
+                response = await self.dispatch(request_line)
+            finally:
+                pipeline.release()
+            async with write_lock:
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Ligne plus longue que MAX_REQUEST_SIZE
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                await pipeline.acquire()
+                task = asyncio.create_task(respond(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, request_line):
+        """Traite une requête ; retourne la réponse (jamais d'exception)"""
+        request_id = None
+        try:
+            request = json.loads(request_line)
+            if not isinstance(request, dict):
+                raise RequestError("Requête invalide")
+            request_id = request.get("id")
+            handler = getattr(self, f"op_{request.get('op')}", None)
+            if handler is None:
+                raise RequestError(f"Opération inconnue : {request.get('op')}")
+            result = await handler(request)
+            return {"id": request_id, "ok": True, **result}
+        except (RequestError, vault_core.AuthenticationError) as e:
+            return {"id": request_id, "ok": False, "error": str(e)}
+        except json.JSONDecodeError:
+            return {"id": request_id, "ok": False, "error": "JSON invalide"}
+        except Exception as e:
+            return {"id": request_id, "ok": False, "error": f"Erreur interne : {type(e).__name__}"}
+
+    async def run(self, function, *args):
+        """Exécute un appel bloquant (SQLite, KDF, déchiffrement) dans le pool de threads"""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    def session_for(self, request):
+        """Session associée au jeton de la requête"""
+        token = request.get("token")
+        entry = self.sessions.get(token) if isinstance(token, str) else None
+        now = time.monotonic()
+        if entry is None or now - entry[1] > self.idle_timeout:
+            self.end_session(token)
+            raise RequestError("Session invalide ou expirée")
+        entry[1] = now
+        return entry[0]
+
+    def end_session(self, token):
+        """Ferme une session : ses secrets en cache sont effacés"""
+        entry = self.sessions.pop(token, None) if isinstance(token, str) else None
+        if entry is not None:
+            entry[0].close()
+
+    def purge_expired(self):
+        """Ferme les sessions inactives depuis plus de idle_timeout"""
+        deadline = time.monotonic() - self.idle_timeout
+        for token in [token for token, (_, last_used) in self.sessions.items() if last_used < deadline]:
+            self.end_session(token)
+
+    async def op_ping(self, request):
+        return {}
+
+    async def op_login(self, request):
+        username, password = request.get("username"), request.get("password")
+        if not isinstance(username, str) or not isinstance(password, str):
+            raise RequestError("username et password sont requis")
+        try:
+            session = await self.run(vault_core.unlock, self.db, username, password)
+        except InvalidToken:
+            raise RequestError("Impossible de déchiffrer la clé de coffre de ce compte")
+        self.purge_expired()
+        token = secrets.token_urlsafe(32)
+        self.sessions[token] = [session, time.monotonic()]
+        return {"token": token, "role": session.role}
+
+    async def op_logout(self, request):
+        self.session_for(request)
+        self.end_session(request["token"])
+        return {}
+
+    async def op_list(self, request):
+        session = self.session_for(request)
+        limit = request.get("limit", vault_core.DEFAULT_PAGE_SIZE)
+        if isinstance(limit, bool) or not isinstance(limit, int) or not 1 <= limit <= vault_core.DEFAULT_PAGE_SIZE:
+            raise RequestError(f"limit doit être un entier entre 1 et {vault_core.DEFAULT_PAGE_SIZE}")
+        # Curseur de la page précédente : [updated_at, id] tel que renvoyé dans "next"
+        after = request.get("after")
+        if after is not None and not (
+            isinstance(after, list) and len(after) == 2 and isinstance(after[0], str)
+            and isinstance(after[1], int) and not isinstance(after[1], bool)
+        ):
+            raise RequestError("after doit être le curseur [updated_at, id] renvoyé dans next")
+        rows = await self.run(session.list_entries, str(request.get("search", "")).lower(), after and tuple(after), limit)
+        entries = [
+            {"id": row[0], "title": row[1], "username": row[2], "url": row[3], "category": row[4],
+             "created_by": row[5], "updated_at": row[6]}
+            for row in rows
+        ]
+        return {"entries": entries, "next": [rows[-1][6], rows[-1][0]] if rows and len(rows) == limit else None}
+
+    async def op_get(self, request):
+        session = self.session_for(request)
+        return {"entry": await self.run(self.read_entry, session, request.get("entry_id"), request.get("title"))}
+
+    def read_entry(self, session, entry_id, title):
+        """Lit une entrée visible par son id ou son titre exact (la plus récente)"""
+        with self.db.reader() as connection:
+            if entry_id is None:
+                if not isinstance(title, str):
+                    raise RequestError("entry_id ou title est requis")
+                condition, params = session.access.visibility_condition()
+                row = connection.execute(f"""
+                    SELECT id FROM passwords WHERE title = ? {"AND " + condition if condition else ""}
+                    ORDER BY updated_at DESC, id DESC LIMIT 1
+                """, [title] + params).fetchone()
+                if row is None:
+                    raise RequestError("Entrée introuvable")
+                entry_id = row[0]
+            row = connection.execute(
+                "SELECT id, title, username, url, category, updated_at FROM passwords WHERE id = ?", (entry_id,)
+            ).fetchone()
+        secret = session.fetch_entry_secret(entry_id) if row else None
+        if secret is None:
+            raise RequestError("Entrée introuvable")
+        return {"id": row[0], "title": row[1], "username": row[2], "url": row[3], "category": row[4],
+                "updated_at": row[5], "password": secret}
+
+
+class VaultClient:
+    """Client asyncio du service, avec pipelining : plusieurs requêtes en vol par connexion"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.token = None
+        self.next_id = 0
+        self.pending = {}
+        self.receiver = asyncio.create_task(self.receive())
+
+    @classmethod
+    async def connect(cls, socket_path):
+        reader, writer = await asyncio.open_unix_connection(socket_path, limit=16 * MAX_REQUEST_SIZE)
+        return cls(reader, writer)
+
+    async def receive(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            response = json.loads(line)
+            future = self.pending.pop(response.get("id"), None)
+            if future is not None and not future.done():
+                future.set_result(response)
+        for future in self.pending.values():
+            future.set_exception(ConnectionError("Connexion fermée par le serveur"))
+
+    async def request(self, op, **fields):
+        """Envoie une requête et attend sa réponse ; RequestError si elle échoue"""
+        self.next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self.pending[self.next_id] = future
+        if self.token and "token" not in fields:
+            fields["token"] = self.token
+        self.writer.write(json.dumps({"id": self.next_id, "op": op, **fields}).encode("utf-8") + b"\n")
+        await self.writer.drain()
+        response = await future
+        if not response["ok"]:
+            raise RequestError(response["error"])
+        return response
+
+    async def login(self, username, password):
+        self.token = (await self.request("login", username=username, password=password))["token"]
+
+    async def close(self):
+        self.writer.close()
+        self.receiver.cancel()
+
+
+async def serve(db_path, socket_path, worker_count):
+    db = ConnectionManager(db_path, reader_count=worker_count)
+    create_schema(db.writer)
+    server = VaultServer(db, worker_count)
+    await server.start(socket_path)
+    print(f"🔌 Service du coffre à l'écoute sur {socket_path}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+        db.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Service headless du coffre (socket Unix)")
+    parser.add_argument("--db", default="password_manager.db", help="Base de données (défaut: password_manager.db)")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help=f"Chemin de la socket (défaut: {DEFAULT_SOCKET})")
+    parser.add_argument("--workers", type=int, default=WORKER_COUNT, help="Threads de lecture et de déchiffrement")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"❌ Base de données introuvable : {args.db}")
+        return 1
+    try:
+        asyncio.run(serve(args.db, args.socket, args.workers))
+    except KeyboardInterrupt:
+        print("\n👋 Service arrêté")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""Statistiques du coffre maintenues par des triggers SQLite.
+
+Les compteurs (utilisateurs par rôle, mots de passe par catégorie et par créateur) et
+l'activité de l'historique par jour sont mis à jour à chaque écriture : le panneau
+d'administration les lit sans parcourir les tables, quelle que soit la taille du coffre.
+"""
+
+# Portées des compteurs de vault_stats
+ROLE = "role"
+CATEGORY = "category"
+CREATOR = "creator"
+
+
+def _increment(scope, key):
+    return f"""
+        INSERT INTO vault_stats (scope, key, value) VALUES ('{scope}', {key}, 1)
+        ON CONFLICT (scope, key) DO UPDATE SET value = value + 1;
+    """
+
+
+def _decrement(scope, key):
+    return f"UPDATE vault_stats SET value = value - 1 WHERE scope = '{scope}' AND key = {key};"
+
+
+TRIGGERS = {
+    "trg_stats_users_insert": f"""
+        AFTER INSERT ON users BEGIN
+            {_increment(ROLE, "NEW.role")}
+        END
+    """,
+    "trg_stats_users_delete": f"""
+        AFTER DELETE ON users BEGIN
+            {_decrement(ROLE, "OLD.role")}
+        END
+    """,
+    "trg_stats_users_role": f"""
+        AFTER UPDATE OF role ON users WHEN OLD.role IS NOT NEW.role BEGIN
+            {_decrement(ROLE, "OLD.role")}
+            {_increment(ROLE, "NEW.role")}
+        END
+    """,
+    "trg_stats_passwords_insert": f"""
+        AFTER INSERT ON passwords BEGIN
+            {_increment(CATEGORY, "COALESCE(NEW.category, '')")}
+            {_increment(CREATOR, "NEW.created_by")}
+        END
+    """,
+    "trg_stats_passwords_delete": f"""
+        AFTER DELETE ON passwords BEGIN
+            {_decrement(CATEGORY, "COALESCE(OLD.category, '')")}
+            {_decrement(CREATOR, "OLD.created_by")}
+        END
+    """,
+    "trg_stats_passwords_category": f"""
+        AFTER UPDATE OF category ON passwords WHEN OLD.category IS NOT NEW.category BEGIN
+            {_decrement(CATEGORY, "COALESCE(OLD.category, '')")}
+            {_increment(CATEGORY, "COALESCE(NEW.category, '')")}
+        END
+    """,
+    "trg_stats_passwords_creator": f"""
+        AFTER UPDATE OF created_by ON passwords WHEN OLD.created_by IS NOT NEW.created_by BEGIN
+            {_decrement(CREATOR, "OLD.created_by")}
+            {_increment(CREATOR, "NEW.created_by")}
+        END
+    """,
+    "trg_stats_history_insert": """
+        AFTER INSERT ON password_history BEGIN
+            INSERT INTO history_activity (day, changes) VALUES (COALESCE(date(NEW.changed_at), date('now')), 1)
+            ON CONFLICT (day) DO UPDATE SET changes = changes + 1;
+        END
+    """,
+    "trg_stats_history_delete": """
+        AFTER DELETE ON password_history BEGIN
+            UPDATE history_activity SET changes = changes - 1 WHERE day = COALESCE(date(OLD.changed_at), date('now'));
+        END
+    """,
+}
+
+
+def create_stats_schema(connection):
+    """Crée les tables de statistiques et leurs triggers ; les remplit à la première création"""
+    created = connection.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN ('vault_stats', 'history_activity')"
+    ).fetchone()[0] < 2
+
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS vault_stats (
+            scope TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (scope, key)
+        ) WITHOUT ROWID
+    """)
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS history_activity (
+            day TEXT PRIMARY KEY,
+            changes INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    """)
+    for name, body in TRIGGERS.items():
+        connection.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+    if created:
+        rebuild_stats(connection)
+
+
+def rebuild_stats(connection):
+    """Recalcule toutes les statistiques à partir des tables (base existante, réparation)"""
+    connection.execute("DELETE FROM vault_stats")
+    connection.execute("DELETE FROM history_activity")
+    connection.execute(f"""
+        INSERT INTO vault_stats (scope, key, value)
+        SELECT '{ROLE}', role, COUNT(*) FROM users GROUP BY role
+    """)
+    connection.execute(f"""
+        INSERT INTO vault_stats (scope, key, value)
+        SELECT '{CATEGORY}', COALESCE(category, ''), COUNT(*) FROM passwords GROUP BY COALESCE(category, '')
+    """)
+    connection.execute(f"""
+        INSERT INTO vault_stats (scope, key, value)
+        SELECT '{CREATOR}', created_by, COUNT(*) FROM passwords GROUP BY created_by
+    """)
+    connection.execute("""
+        INSERT INTO history_activity (day, changes)
+        SELECT COALESCE(date(changed_at), date('now')) AS day, COUNT(*) FROM password_history GROUP BY day
+    """)
+
+
+def load_stats(connection, days=30, top_creators=10):
+    """Lit les statistiques du panneau d'administration.
+
+    Retourne un dictionnaire : totaux, répartition par rôle et par catégorie, principaux
+    créateurs et activité des `days` derniers jours [(jour, modifications), ...].
+    """
+    counters = {ROLE: {}, CATEGORY: {}}
+    for scope, key, value in connection.execute(
+        "SELECT scope, key, value FROM vault_stats WHERE scope IN (?, ?) AND value > 0", (ROLE, CATEGORY)
+    ):
+        counters[scope][key] = value
+
+    creators = connection.execute("""
+        SELECT key, value FROM vault_stats
+        WHERE scope = ? AND value > 0
+        ORDER BY value DESC, key
+        LIMIT ?
+    """, (CREATOR, top_creators)).fetchall()
+
+    # `days` jours : aujourd'hui et les days - 1 jours précédents
+    activity = connection.execute("""
+        SELECT day, changes FROM history_activity
+        WHERE day >= date('now', ?) AND changes > 0
+        ORDER BY day
+    """, (f"-{days - 1} days",)).fetchall()
+
+    return {
+        "total_users": sum(counters[ROLE].values()),
+        "total_passwords": sum(counters[CATEGORY].values()),
+        "recent_changes": sum(changes for _, changes in activity),
+        "roles": counters[ROLE],
+        "categories": counters[CATEGORY],
+        "creators": creators,
+        "activity": activity,
+    }
@@ -0,0 +1,203 @@
+import csv
+import itertools
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import vault_crypto
+from unit_of_work import UnitOfWork
+
+# Colonnes des fichiers d'import/export (mot de passe en clair)
+TRANSFER_FIELDS = ("title", "username", "password", "url", "notes", "category")
+# Nombre d'entrées lues, chiffrées et écrites à la fois
+CHUNK_SIZE = 1000
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+
+SUPPORTED_FORMATS = {".csv": "csv", ".json": "json", ".jsonl": "jsonl"}
+
+
+def detect_format(path):
+    """Déduit le format (csv, json, jsonl) de l'extension du fichier"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in SUPPORTED_FORMATS:
+        raise ValueError(f"Format non supporté: {extension} (formats acceptés: .csv, .json, .jsonl)")
+    return SUPPORTED_FORMATS[extension]
+
+
+def read_entries(path, file_format=None):
+    """Lit les entrées d'un fichier une par une.
+
+    CSV et JSON Lines sont lus en flux ; un fichier .json (tableau) est chargé en une fois.
+    """
+    file_format = file_format or detect_format(path)
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if file_format == "csv":
+            yield from csv.DictReader(f)
+        elif file_format == "jsonl":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)
+
+
+class EntryWriter:
+    """Écrit des entrées en flux dans un fichier CSV, JSON ou JSON Lines"""
+
+    def __init__(self, path, file_format=None):
+        self.path = path
+        self.file_format = file_format or detect_format(path)
+        self.file = None
+        self.csv_writer = None
+        self.count = 0
+
+    def __enter__(self):
+        self.file = open(self.path, "w", encoding="utf-8", newline="")
+        if self.file_format == "csv":
+            self.csv_writer = csv.DictWriter(self.file, fieldnames=TRANSFER_FIELDS)
+            self.csv_writer.writeheader()
+        elif self.file_format == "json":
+            self.file.write("[\n")
+        return self
+
+    def write(self, entry):
+        if self.file_format == "csv":
+            self.csv_writer.writerow(entry)
+        elif self.file_format == "jsonl":
+            self.file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        else:
+            if self.count:
+                self.file.write(",\n")
+            self.file.write(json.dumps(entry, ensure_ascii=False))
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.file_format == "json":
+            self.file.write("\n]\n")
+        self.file.close()
+        return False
+
+
+def chunked(iterable, size):
+    """Découpe un itérable en listes de taille size"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def encrypt_batch(vault_key, secrets):
+    """Chiffre une liste de secrets ; retourne [(secret chiffré, clé d'entrée enveloppée), ...]"""
+    return [vault_crypto.encrypt_entry(vault_key, secret) for secret in secrets]
+
+
+def decrypt_batch(vault_key, legacy_key, encrypted_entries):
+    """Déchiffre [(secret chiffré, clé enveloppée), ...] ; None pour ceux qui ne peuvent pas l'être"""
+    secrets = []
+    for encrypted_secret, wrapped_entry_key in encrypted_entries:
+        try:
+            secrets.append(vault_crypto.decrypt_entry(vault_key, encrypted_secret, wrapped_entry_key, legacy_key))
+        except Exception:
+            secrets.append(None)
+    return secrets
+
+
+def map_in_pool(pool, function, items, workers):
+    """Répartit items en workers lots, les traite dans le pool et conserve l'ordre"""
+    if not items:
+        return []
+    batch_size = -(-len(items) // workers)
+    batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+    return list(itertools.chain.from_iterable(pool.map(function, batches)))
+
+
+def export_vault(db, path, vault_key, created_by=None, file_format=None, legacy_key=None,
+                 chunk_size=CHUNK_SIZE, workers=DEFAULT_WORKERS, progress=None):
+    """Exporte les entrées du coffre en clair, par lots.
+
+    Les entrées sont déchiffrées via leur clé d'entrée enveloppée par vault_key ; les
+    entrées antérieures au chiffrement par enveloppe le sont avec legacy_key.
+    Retourne (exportées, en échec) ; les entrées impossibles à déchiffrer sont ignorées.
+    progress(traitées, total) est appelé après chaque lot.
+    """
+    condition, params = ("AND created_by = ?", [created_by]) if created_by else ("", [])
+    with db.reader() as connection:
+        total = connection.execute(f"SELECT COUNT(*) FROM passwords WHERE 1 = 1 {condition}", params).fetchone()[0]
+
+    exported = failed = processed = 0
+    last_id = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool, EntryWriter(path, file_format) as writer:
+        while True:
+            with db.reader() as connection:
+                rows = connection.execute(f"""
+                    SELECT id, title, username, password_encrypted, url, notes, category, wrapped_entry_key
+                    FROM passwords
+                    WHERE id > ? {condition}
+                    ORDER BY id
+                    LIMIT ?
+                """, [last_id] + params + [chunk_size]).fetchall()
+            if not rows:
+                break
+
+            secrets = map_in_pool(
+                pool, partial(decrypt_batch, vault_key, legacy_key), [(row[3], row[7]) for row in rows], workers
+            )
+            for row, secret in zip(rows, secrets):
+                if secret is None:
+                    failed += 1
+                    continue
+                writer.write({
+                    "title": row[1],
+                    "username": row[2] or "",
+                    "password": secret,
+                    "url": row[4] or "",
+                    "notes": row[5] or "",
+                    "category": row[6] or "General",
+                })
+                exported += 1
+
+            last_id = rows[-1][0]
+            processed += len(rows)
+            if progress:
+                progress(processed, total)
+
+    return exported, failed
+
+
+def import_vault(db, path, vault_key, user, file_format=None,
+                 chunk_size=CHUNK_SIZE, workers=DEFAULT_WORKERS, progress=None):
+    """Importe les entrées d'un fichier dans une seule transaction.
+
+    Retourne (importées, ignorées) ; une entrée sans titre ou sans mot de passe est ignorée.
+    progress(importées, None) est appelé après chaque lot (total inconnu en flux).
+    """
+    imported = skipped = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool, UnitOfWork(db, user) as uow:
+        for chunk in chunked(read_entries(path, file_format), chunk_size):
+            valid = [entry for entry in chunk if (entry.get("title") or "").strip() and entry.get("password")]
+            skipped += len(chunk) - len(valid)
+
+            encrypted = map_in_pool(pool, partial(encrypt_batch, vault_key), [entry["password"] for entry in valid], workers)
+            uow.bulk_insert([
+                {
+                    "title": entry["title"],
+                    "username": entry.get("username") or "",
+                    "password_encrypted": encrypted_secret,
+                    "wrapped_entry_key": wrapped_entry_key,
+                    "url": entry.get("url") or "",
+                    "notes": entry.get("notes") or "",
+                    "category": entry.get("category") or "General",
+                    "visibility_level": 1,
+                }
+                for entry, (encrypted_secret, wrapped_entry_key) in zip(valid, encrypted)
+            ], action="IMPORTED")
+            uow.flush_history()
+
+            imported += len(valid)
+            if progress:
+                progress(imported, None)
+
+    return imported, skipped